@@ -8,10 +8,18 @@ from __future__ import annotations
 
 from typing import Any, Literal
 
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Request
+from fastapi.responses import Response
 from pydantic import BaseModel, Field
 
-from services.retrieval.compare_service import compare, CompareResponse
+from api.serialization import render_response
+from services.retrieval.compare_result_store import get_compare_result_store
+from services.retrieval.compare_service import (
+    compare,
+    CompareResponse,
+    is_hybrid_enabled,
+    merge_compare_responses,
+)
 from api.config_loader import (
     get_coverage_domains,
     get_domain_keywords,
@@ -63,6 +71,8 @@ class QueryAnchor(BaseModel):
         default="lookup",
         description="질의 의도 (lookup=단일조회, compare=비교)"
     )
+    # STEP 4.13: 서버에 저장된 비교 결과 (insurer-only 후속 질의에서 보험사별 결과 재사용)
+    result_token: str | None = Field(None, description="이전 응답의 결과 토큰")
 
 
 class CompareRequest(BaseModel):
@@ -94,6 +104,11 @@ class CompareRequest(BaseModel):
         None,
         description="UI 이벤트 타입 (coverage_button_click 등 - intent 변경 차단)"
     )
+    # STEP 4.14: 응답 범위 (ui=비교표/슬롯/근거 참조, full=전체 섹션 + 요약 debug, debug=전체)
+    view: Literal["ui", "full", "debug"] = Field(
+        "debug",
+        description="응답 범위 (ui / full / debug, 기본: debug - 기존 응답과 동일)",
+    )
 
     model_config = {
         "json_schema_extra": {
@@ -280,36 +295,6 @@ class CompareResponseModel(BaseModel):
     debug: dict[str, Any]
 
 
-def _convert_evidence(e) -> EvidenceResponse:
-    """Evidence를 EvidenceResponse로 변환 (amount/condition_snippet 포함)"""
-    amount_resp = None
-    if e.amount is not None:
-        amount_resp = AmountInfoResponse(
-            amount_value=e.amount.amount_value,
-            amount_text=e.amount.amount_text,
-            unit=e.amount.unit,
-            confidence=e.amount.confidence,
-            method=e.amount.method,
-        )
-
-    condition_resp = None
-    if e.condition_snippet is not None:
-        condition_resp = ConditionInfoResponse(
-            snippet=e.condition_snippet.snippet,
-            matched_terms=e.condition_snippet.matched_terms,
-        )
-
-    return EvidenceResponse(
-        document_id=e.document_id,
-        doc_type=e.doc_type,
-        page_start=e.page_start,
-        preview=e.preview,
-        score=e.score,
-        amount=amount_resp,
-        condition_snippet=condition_resp,
-    )
-
-
 # =============================================================================
 # STEP 2.5 + 2.7 + 2.7-α: 대표 담보 선택 및 사용자 요약 생성
 # =============================================================================
@@ -1142,43 +1127,48 @@ def _generate_user_summary(
     return "\n".join(lines)
 
 
-def _convert_slots(slots: list) -> list[ComparisonSlotResponse]:
-    """슬롯 결과를 API 응답 모델로 변환"""
+def _slots_payload(slots: list, include_trace: bool = True) -> list[dict[str, Any]]:
+    """슬롯 결과를 응답 payload로 변환 (STEP 4.14: include_trace=False면 LLM trace 생략)"""
     return [
-        ComparisonSlotResponse(
-            slot_key=slot.slot_key,
-            label=slot.label,
-            comparable=slot.comparable,
-            insurers=[
-                SlotInsurerValueResponse(
-                    insurer_code=iv.insurer_code,
-                    value=iv.value,
-                    confidence=iv.confidence,
-                    reason=iv.reason,
-                    evidence_refs=[
-                        SlotEvidenceRefResponse(
-                            document_id=ref.document_id,
-                            page_start=ref.page_start,
-                            chunk_id=getattr(ref, 'chunk_id', None),
-                        )
+        {
+            "slot_key": slot.slot_key,
+            "label": slot.label,
+            "comparable": slot.comparable,
+            "insurers": [
+                {
+                    "insurer_code": iv.insurer_code,
+                    "value": iv.value,
+                    "confidence": iv.confidence,
+                    "reason": iv.reason,
+                    "evidence_refs": [
+                        {
+                            "document_id": ref.document_id,
+                            "page_start": ref.page_start,
+                            "chunk_id": getattr(ref, 'chunk_id', None),
+                        }
                         for ref in iv.evidence_refs
                     ],
-                    trace=LLMTraceResponse(
-                        method=iv.trace.method,
-                        llm_used=iv.trace.llm_used,
-                        llm_reason=iv.trace.llm_reason,
-                        model=iv.trace.model,
-                    ) if iv.trace else None,
-                )
+                    "trace": iv.trace if include_trace else None,
+                }
                 for iv in slot.insurers
             ],
-            diff_summary=slot.diff_summary,
-        )
+            "diff_summary": slot.diff_summary,
+        }
         for slot in slots
     ]
 
 
-def _convert_response(
+# STEP 4.14: view=full 응답에 남기는 debug 항목
+_FULL_VIEW_DEBUG_KEYS = (
+    "query",
+    "insurers",
+    "resolved_coverage_codes",
+    "timing_ms",
+    "insurer_counts",
+)
+
+
+def _response_payload(
     result: CompareResponse,
     final_insurers: list[str],
     query: str,
@@ -1192,8 +1182,26 @@ def _convert_response(
     # STEP 3.7: Coverage Resolution
     coverage_resolution: CoverageResolutionResponse | None = None,
     resolution_debug: dict[str, Any] | None = None,
-) -> CompareResponseModel:
-    """내부 결과를 API 응답 모델로 변환"""
+    # STEP 4.13: 결과 저장소 token
+    result_token: str | None = None,
+    # STEP 4.14: 응답 범위
+    view: Literal["ui", "full", "debug"] = "debug",
+) -> dict[str, Any]:
+    """
+    내부 결과를 CompareResponseModel 형태의 payload로 변환
+
+    STEP 4.15: 섹션은 dataclass 그대로 담는다. HTTP 응답은 이 payload를
+    바로 직렬화하고(api/serialization.py), 모델이 필요하면 _convert_response 사용.
+
+    STEP 4.14: view에 없는 섹션은 변환하지 않는다
+    - ui: compare_axis / policy_axis 근거 목록, 슬롯 LLM trace 생략, debug는 만들지 않음
+    - full: debug는 _FULL_VIEW_DEBUG_KEYS만
+    - debug: 전체 (기존 응답)
+
+    view는 응답 구성 / 직렬화 범위만 정한다. compare()의 조회와 추출은 view와 무관하게
+    같다: policy_axis는 ui에 내보내지 않아도 슬롯 추출 입력이고, compare 캐시(STEP 4.6)와
+    결과 저장소(STEP 4.13)의 결과는 view가 다른 요청끼리 공유된다.
+    """
     # STEP 2.5 + 2.7: 대표 담보 선택 (query 의도 기반)
     primary_code, primary_name, related_codes = _select_primary_coverage(
         result.resolved_coverage_codes,
@@ -1201,9 +1209,6 @@ def _convert_response(
         query=query,  # STEP 2.7: query 전달하여 메인/파생 의도 파악
     )
 
-    # 슬롯 변환
-    converted_slots = _convert_slots(getattr(result, 'slots', []))
-
     # STEP 2.5: 사용자 친화적 요약 생성 (STEP 2.6: final_insurers만 사용)
     user_summary = _generate_user_summary(
         query=query,
@@ -1214,20 +1219,22 @@ def _convert_response(
         coverage_compare_result=result.coverage_compare_result,
     )
 
-    # STEP 2.6: debug에 insurer scope 정보 추가
-    merged_debug = {**result.debug, "insurer_scope": insurer_scope_debug}
+    # STEP 2.6: debug에 insurer scope 정보 추가 (STEP 4.14: ui는 debug 없음)
+    include_debug = view != "ui"
+    merged_debug = {**result.debug, "insurer_scope": insurer_scope_debug} if include_debug else {}
 
-    # STEP 2.9: anchor debug 정보 추가
-    if anchor_debug:
-        merged_debug["anchor"] = anchor_debug
+    if include_debug:
+        # STEP 2.9: anchor debug 정보 추가
+        if anchor_debug:
+            merged_debug["anchor"] = anchor_debug
 
-    # STEP 3.6: intent debug 정보 추가
-    if intent_debug:
-        merged_debug["intent"] = intent_debug
+        # STEP 3.6: intent debug 정보 추가
+        if intent_debug:
+            merged_debug["intent"] = intent_debug
 
-    # STEP 3.7: resolution debug 정보 추가
-    if resolution_debug:
-        merged_debug["coverage_resolution"] = resolution_debug
+        # STEP 3.7: resolution debug 정보 추가
+        if resolution_debug:
+            merged_debug["coverage_resolution"] = resolution_debug
 
     # STEP 2.9 + 3.6 + 3.7: 새 anchor 생성 (intent 포함)
     # 기존 anchor 유지 조건:
@@ -1249,8 +1256,9 @@ def _convert_response(
         # STEP 3.7: coverage 미확정 시 anchor 생성 금지
         # 기존 anchor도 유지하지 않음 (새 질의로 처리)
         new_anchor = None
-        merged_debug["anchor_blocked"] = True
-        merged_debug["anchor_blocked_reason"] = f"resolution_status={resolution_status}"
+        if include_debug:
+            merged_debug["anchor_blocked"] = True
+            merged_debug["anchor_blocked_reason"] = f"resolution_status={resolution_status}"
     elif should_preserve_anchor and input_anchor:
         # 기존 anchor 유지 (intent도 유지)
         new_anchor = input_anchor
@@ -1265,85 +1273,172 @@ def _convert_response(
             intent=resolved_intent,  # STEP 3.6: intent 포함
         )
 
-    return CompareResponseModel(
-        compare_axis=[
-            CompareAxisItemResponse(
-                insurer_code=item.insurer_code,
-                coverage_code=item.coverage_code,
-                coverage_name=item.coverage_name,
-                doc_type_counts=item.doc_type_counts,
-                evidence=[_convert_evidence(e) for e in item.evidence],
-            )
-            for item in result.compare_axis
-        ],
-        policy_axis=[
-            PolicyAxisItemResponse(
-                insurer_code=item.insurer_code,
-                keyword=item.keyword,
-                evidence=[_convert_evidence(e) for e in item.evidence],
-            )
-            for item in result.policy_axis
-        ],
-        coverage_compare_result=[
-            CoverageCompareRowResponse(
-                coverage_code=row.coverage_code,
-                coverage_name=row.coverage_name,
-                insurers=[
-                    InsurerCompareCellResponse(
-                        insurer_code=cell.insurer_code,
-                        doc_type_counts=cell.doc_type_counts,
-                        best_evidence=[_convert_evidence(e) for e in cell.best_evidence],
-                    )
+    # STEP 4.13: anchor에 이번 결과의 token 부여 (유지된 anchor도 갱신)
+    if new_anchor is not None and result_token:
+        new_anchor = new_anchor.model_copy(update={"result_token": result_token})
+
+    # STEP 4.14: ui는 근거 목록 대신 비교표 / 요약의 근거 참조만 사용
+    include_axes = view != "ui"
+    if view == "full":
+        merged_debug = {key: merged_debug[key] for key in _FULL_VIEW_DEBUG_KEYS if key in merged_debug}
+
+    # STEP 4.15: 응답 모델과 필드가 같은 dataclass는 그대로 두고 다른 것만 dict로 변환
+    return {
+        "compare_axis": result.compare_axis if include_axes else [],
+        "policy_axis": result.policy_axis if include_axes else [],
+        "coverage_compare_result": [
+            {
+                "coverage_code": row.coverage_code,
+                "coverage_name": row.coverage_name,
+                # resolved_amount는 응답 모델에 없음
+                "insurers": [
+                    {
+                        "insurer_code": cell.insurer_code,
+                        "doc_type_counts": cell.doc_type_counts,
+                        "best_evidence": cell.best_evidence,
+                    }
                     for cell in row.insurers
                 ],
-            )
+            }
             for row in result.coverage_compare_result
         ],
-        diff_summary=[
-            DiffSummaryItemResponse(
-                coverage_code=item.coverage_code,
-                coverage_name=item.coverage_name,
-                bullets=[
-                    DiffBulletResponse(
-                        text=bullet.text,
-                        evidence_refs=[
-                            EvidenceRefResponse(
-                                insurer_code=ref.insurer_code,
-                                document_id=ref.document_id,
-                                page_start=ref.page_start,
-                            )
-                            for ref in bullet.evidence_refs
-                        ],
-                    )
-                    for bullet in item.bullets
-                ],
-            )
-            for item in result.diff_summary
-        ],
+        "diff_summary": result.diff_summary,
         # U-4.8: Comparison Slots
-        slots=converted_slots,
+        "slots": _slots_payload(getattr(result, 'slots', []), include_trace=view != "ui"),
         # resolved_coverage_codes: top-level 승격
-        resolved_coverage_codes=result.resolved_coverage_codes,
+        "resolved_coverage_codes": result.resolved_coverage_codes,
         # STEP 2.5: 대표 담보 / 연관 담보 / 사용자 요약
-        primary_coverage_code=primary_code,
-        primary_coverage_name=primary_name,
-        related_coverage_codes=related_codes,
-        user_summary=user_summary,
+        "primary_coverage_code": primary_code,
+        "primary_coverage_name": primary_name,
+        "related_coverage_codes": related_codes,
+        "user_summary": user_summary,
         # STEP 2.9: Query Anchor
-        anchor=new_anchor,
+        "anchor": new_anchor,
         # STEP 3.5: Insurer Auto-Recovery 메시지
-        recovery_message=recovery_message,
+        "recovery_message": recovery_message,
         # STEP 3.7: Coverage Resolution
-        coverage_resolution=coverage_resolution,
-        debug=merged_debug,
-    )
+        "coverage_resolution": coverage_resolution,
+        "debug": merged_debug,
+    }
+
+
+def _convert_response(*args: Any, **kwargs: Any) -> CompareResponseModel:
+    """내부 결과를 API 응답 모델로 변환 (인자는 _response_payload와 동일)"""
+    return CompareResponseModel.model_validate(_response_payload(*args, **kwargs), from_attributes=True)
+
+
+# =============================================================================
+# STEP 4.13: 후속 질의 결과 재사용 (result token)
+# =============================================================================
+
+# 저장된 결과를 재사용하려면 같아야 하는 compare() 입력 (query / coverage_codes 제외)
+_REUSE_PARAM_KEYS = (
+    "top_k_per_insurer",
+    "compare_doc_types",
+    "policy_doc_types",
+    "policy_keywords",
+    "age",
+    "gender",
+)
+
+
+def _compare_with_result_store(
+    request: CompareRequest,
+    final_insurers: list[str],
+    coverage_codes: list[str] | None,
+    query_type: str,
+) -> tuple[CompareResponse, str | None]:
+    """
+    STEP 4.13: compare() 실행 + 결과 저장 (insurer-only 후속 질의는 저장된 결과 재사용)
 
+    후속 질의는 anchor.result_token의 결과에 없는 보험사만 compare()로 조회하고
+    저장된 보험사별 결과와 병합한다. 추가 보험사도 저장된 결과와 같은 입력
+    (원 질의, 실제 사용한 coverage_codes)으로 조회하므로 한 표 안의 셀 기준이 같다.
+    재사용 조건이 맞지 않으면(만료 / 파라미터 변경 / anchor 담보 불일치) 전체 재조회.
+    hybrid fallback은 보험사 전체 근거 수에 따라 달라지므로 저장소를 쓰지 않는다.
+
+    Returns:
+        (CompareResponse, 새 result token 또는 None)
+    """
+    params: dict[str, Any] = {
+        "query": request.query,
+        "coverage_codes": coverage_codes,
+        "top_k_per_insurer": request.top_k_per_insurer,
+        "compare_doc_types": request.compare_doc_types,
+        "policy_doc_types": request.policy_doc_types,
+        "policy_keywords": request.policy_keywords,
+        "age": request.age,
+        "gender": request.gender,
+    }
 
-@router.post("/compare", response_model=CompareResponseModel)
-async def compare_insurers(request: CompareRequest) -> CompareResponseModel:
+    store = get_compare_result_store() if not is_hybrid_enabled() else None
+    if store is None:
+        return compare(insurers=final_insurers, **params), None
+
+    store_debug: dict[str, Any] = {"reused": False}
+    stored = None
+    if query_type == "insurer_only" and request.anchor and request.anchor.result_token:
+        stored = store.get(request.anchor.result_token)
+        if stored is None:
+            store_debug["miss_reason"] = "unknown_or_expired_token"
+        elif any(stored.params[key] != params[key] for key in _REUSE_PARAM_KEYS):
+            store_debug["miss_reason"] = "params_changed"
+            stored = None
+        elif request.anchor.coverage_code not in (stored.response.resolved_coverage_codes or []):
+            store_debug["miss_reason"] = "anchor_coverage_changed"
+            stored = None
+
+    if stored is None:
+        result = compare(insurers=final_insurers, **params)
+        # 추가 보험사 조회 시 추천을 다시 하지 않도록 실제 사용한 coverage_codes로 저장
+        params["coverage_codes"] = result.resolved_coverage_codes
+        stored_insurers = final_insurers
+        stored_result = result
+        reused: list[str] = []
+        computed = final_insurers
+    else:
+        params = stored.params
+        reused = [ic for ic in final_insurers if ic in stored.insurers]
+        computed = [ic for ic in final_insurers if ic not in stored.insurers]
+        stored_insurers = stored.insurers + computed
+        parts = [(stored.insurers, stored.response)]
+        if computed:
+            parts.append((computed, compare(insurers=computed, **params)))
+        stored_result = merge_compare_responses(parts, stored_insurers)
+        result = merge_compare_responses([(stored_insurers, stored_result)], final_insurers)
+        store_debug.update({"reused": True, "original_query": params["query"]})
+
+    store.record_reuse(len(reused), len(computed))
+    token = store.put(params, stored_insurers, stored_result)
+    store_debug.update({
+        "reused_insurers": reused,
+        "computed_insurers": computed,
+        "stats": store.stats(),
+    })
+    result.debug["result_store"] = store_debug
+    return result, token
+
+
+@router.post(
+    "/compare",
+    response_model=CompareResponseModel,
+    responses={200: {"content": {"application/msgpack": {}}}},
+)
+async def compare_insurers(request: CompareRequest, http_request: Request) -> Response:
     """
     2-Phase Retrieval 비교 검색
 
+    STEP 4.15: payload를 응답 모델 변환 / 재검증 없이 바로 직렬화
+    (Accept: application/msgpack이면 MessagePack, msgpack 설치 시)
+    """
+    payload = await build_compare_payload(request)
+    return render_response(payload, http_request.headers.get("accept"))
+
+
+async def build_compare_payload(request: CompareRequest) -> dict[str, Any]:
+    """
+    2-Phase Retrieval 비교 검색 (응답 payload, 형태는 CompareResponseModel과 동일)
+
     - **compare_axis**: 가입설계서/상품요약서/사업방법서에서 coverage_code 기반 근거 수집
     - **policy_axis**: 약관에서 키워드 기반 조문 근거 수집 (A2 정책)
 
@@ -1410,16 +1505,13 @@ async def compare_insurers(request: CompareRequest) -> CompareResponseModel:
             anchor_debug["restored_from_anchor"] = True
             anchor_debug["anchor_coverage_code"] = request.anchor.coverage_code
 
-        result = compare(
-            insurers=final_insurers,  # STEP 2.6: resolved insurers 사용
-            query=request.query,
-            coverage_codes=coverage_codes_to_use,  # STEP 2.9: anchor에서 복원된 코드 사용
-            top_k_per_insurer=request.top_k_per_insurer,
-            compare_doc_types=request.compare_doc_types,
-            policy_doc_types=request.policy_doc_types,
-            policy_keywords=request.policy_keywords,
-            age=request.age,
-            gender=request.gender,
+        # STEP 2.6: resolved insurers 사용, STEP 2.9: anchor에서 복원된 코드 사용
+        # STEP 4.13: insurer-only 후속 질의는 저장된 보험사별 결과 재사용
+        result, result_token = _compare_with_result_store(
+            request,
+            final_insurers,
+            coverage_codes_to_use,
+            query_type,
         )
 
         # STEP 3.7: Coverage Resolution 평가
@@ -1437,7 +1529,7 @@ async def compare_insurers(request: CompareRequest) -> CompareResponseModel:
                 coverage_recommendations=coverage_recommendations,
             )
 
-        return _convert_response(
+        return _response_payload(
             result,
             final_insurers,
             request.query,
@@ -1451,6 +1543,10 @@ async def compare_insurers(request: CompareRequest) -> CompareResponseModel:
             # STEP 3.7: Coverage Resolution
             coverage_resolution=coverage_resolution,
             resolution_debug=resolution_debug,
+            # STEP 4.13: 결과 저장소 token
+            result_token=result_token,
+            # STEP 4.14: 응답 범위
+            view=request.view,
         )
     except HTTPException:
         raise
@@ -21,7 +21,7 @@ import yaml
 CONFIG_DIR = Path(__file__).parent.parent / "config"
 
 
-@lru_cache(maxsize=1)
+@lru_cache(maxsize=None)
 def _load_yaml(filename: str) -> dict[str, Any]:
     """YAML 파일 로드 (캐싱)"""
     filepath = CONFIG_DIR / filename
@@ -131,6 +131,21 @@ def clear_cache():
     _load_yaml.cache_clear()
 
 
+def preload() -> list[str]:
+    """
+    STEP 4.11: config/*.yaml 전체 로드 (pre-fork 서버가 fork 전에 호출)
+
+    Returns:
+        로드한 파일명
+    """
+    filenames = sorted(
+        path.relative_to(CONFIG_DIR).as_posix() for path in CONFIG_DIR.rglob("*.yaml")
+    )
+    for filename in filenames:
+        _load_yaml(filename)
+    return filenames
+
+
 # =============================================================================
 # STEP 2.8: P0 외부화 로더
 # =============================================================================
@@ -391,3 +406,18 @@ def get_max_recommendations() -> int:
     """추천 최대 개수 반환"""
     config = get_coverage_resolution_config()
     return config.get("max_recommendations", 5)
+
+
+# =============================================================================
+# STEP 4.12: Startup warmup 설정 로더
+# =============================================================================
+
+def get_warmup_queries() -> list[dict[str, Any]]:
+    """
+    시작 시 replay할 대표 질의
+
+    Returns:
+        [{"query": "암진단비", "insurers": ["SAMSUNG", ...]}, ...]
+    """
+    config = _load_yaml("rules/warmup_queries.yaml")
+    return config.get("queries", [])
@@ -4,16 +4,80 @@ Insurance Comparison RAG API
 Main FastAPI application
 """
 
+import asyncio
+import logging
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse
 
+from api import config_loader
 from api.compare import router as compare_router
-from api.document_viewer import router as document_viewer_router
+from api.document_viewer import cached_render, router as document_viewer_router
+from api.preload import get_preloaded_corpus_version
+from api.warmup import get_warmup_state, run_warmup
+from services.extraction.amount_facts import clear_amount_fact_index, get_amount_fact_index
+from services.extraction.chunk_extraction import (
+    clear_stored_extraction_index,
+    get_stored_extraction_index,
+)
+from services.extraction.extraction_memo import get_extraction_memo
+from services.extraction.slot_extractor import clear_slot_rules
+from services.retrieval.compare_cache import clear_compare_cache, get_compare_cache
+from services.retrieval.compare_cube import clear_compare_cube
+from services.retrieval.compare_result_store import (
+    clear_compare_result_store,
+    get_compare_result_store,
+)
+from services.retrieval.compare_service import get_db_url
+from services.retrieval.corpus_version import (
+    get_invalidation_metrics,
+    register_cache_invalidator,
+    start_corpus_listener,
+    stop_corpus_listener,
+)
+from services.retrieval.coverage_availability import clear_coverage_availability
+from services.retrieval.db_router import get_db_router
+from services.retrieval.ef_search_tuning import clear_ef_search_table
+
+logger = logging.getLogger(__name__)
+
+
+def _register_cache_invalidators() -> None:
+    """STEP 4.7: corpus 변경(NOTIFY) 시 비울 프로세스 캐시"""
+    register_cache_invalidator("config", config_loader.clear_cache)
+    register_cache_invalidator("compare_cube", clear_compare_cube)
+    register_cache_invalidator("coverage_availability", clear_coverage_availability)
+    register_cache_invalidator("compare_cache", clear_compare_cache)
+    register_cache_invalidator("compare_result_store", clear_compare_result_store)
+    register_cache_invalidator("ef_search_table", clear_ef_search_table)
+    register_cache_invalidator("stored_extraction", clear_stored_extraction_index)
+    register_cache_invalidator("amount_fact", clear_amount_fact_index)
+    register_cache_invalidator("slot_rules", clear_slot_rules)
+    register_cache_invalidator("page_render", cached_render.cache_clear)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    _register_cache_invalidators()
+    # NOTIFY는 replica로 전달되지 않으므로 listener는 primary에 연결
+    # STEP 4.11: pre-fork 워커는 스냅샷 이후 변경이 있으면 연결 즉시 무효화
+    start_corpus_listener(get_db_url(), known_version=get_preloaded_corpus_version())
+    # STEP 4.12: warmup은 기동을 막지 않고 진행 (끝나면 /ready 200)
+    # STEP 4.5 coverage 가용성 인덱스 빌드도 warmup database 단계에서 수행
+    warmup_task = asyncio.create_task(asyncio.to_thread(run_warmup))
+    yield
+    stop_corpus_listener()
+    if not warmup_task.done():
+        logger.info("shutting down before warmup finished")
+
 
 app = FastAPI(
     title="Insurance Comparison RAG API",
     description="보험 약관 비교 RAG 시스템 API",
     version="0.1.0",
+    lifespan=lifespan,
 )
 
 # CORS 설정
@@ -32,10 +96,41 @@ app.include_router(document_viewer_router)
 
 @app.get("/health")
 async def health_check():
-    """헬스 체크"""
+    """헬스 체크 (liveness)"""
     return {"status": "healthy"}
 
 
+@app.get("/ready")
+async def readiness_check():
+    """STEP 4.12: readiness - 시작 warmup이 끝나기 전에는 503"""
+    state = get_warmup_state()
+    return JSONResponse(status_code=200 if state.ready else 503, content=state.to_dict())
+
+
+@app.get("/metrics/cache")
+async def cache_metrics():
+    """STEP 4.7: 워커 단위 캐시 무효화 / 캐시 통계"""
+    result_cache = get_compare_cache()
+    result_store = get_compare_result_store()
+    extraction_index = get_stored_extraction_index()
+    extraction_memo = get_extraction_memo()
+    amount_fact_index = get_amount_fact_index()
+    return {
+        "invalidation": get_invalidation_metrics(),
+        "compare_cache": result_cache.stats() if result_cache else None,
+        "compare_result_store": result_store.stats() if result_store else None,
+        "stored_extraction": extraction_index.stats() if extraction_index else None,
+        "extraction_memo": extraction_memo.stats() if extraction_memo else None,
+        "amount_fact": amount_fact_index.stats() if amount_fact_index else None,
+    }
+
+
+@app.get("/metrics/db")
+async def db_metrics():
+    """STEP 4.9: 읽기 라우팅 통계 (replica별 버전 / 지연 / 조회 수)"""
+    return get_db_router().stats()
+
+
 @app.get("/")
 async def root():
     """API 정보"""
@@ -47,5 +142,8 @@ async def root():
             {"path": "/documents/{id}/page/{page}", "method": "GET", "description": "PDF 페이지 이미지"},
             {"path": "/documents/{id}/info", "method": "GET", "description": "문서 정보 조회"},
             {"path": "/health", "method": "GET", "description": "헬스 체크"},
+            {"path": "/ready", "method": "GET", "description": "warmup 완료 여부 (readiness)"},
+            {"path": "/metrics/cache", "method": "GET", "description": "캐시 무효화 / 캐시 통계"},
+            {"path": "/metrics/db", "method": "GET", "description": "읽기 replica 라우팅 통계"},
         ],
     }
@@ -0,0 +1,102 @@
+"""
+STEP 4.11: fork 전 공유 캐시 preload
+
+pre-fork 서버(api/server.py)는 워커를 fork하기 전에 읽기 전용 캐시를 채운다.
+워커는 fork 시점 메모리를 copy-on-write로 공유하므로 워커마다 같은 캐시를
+다시 만들지 않고(워커 warmup 없음) 상주 메모리도 한 벌만 쓴다.
+
+- config/*.yaml (config_loader)
+- compare cube (STEP 4.1), ef_search 테이블 (STEP 4.4), coverage 가용성 인덱스 (STEP 4.5)
+- API 모듈 import (모듈 전역 정규식 / 사전 등)
+
+마지막에 gc.freeze()로 preload한 객체를 GC 대상에서 빼서
+GC 순회가 객체 헤더를 건드려 공유 페이지가 복사되는 것을 줄인다.
+corpus가 바뀌면 워커는 STEP 4.7 listener로 자기 캐시만 다시 만든다.
+"""
+
+from __future__ import annotations
+
+import gc
+import logging
+import time
+from dataclasses import dataclass, field
+
+from psycopg.rows import dict_row
+
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class PreloadResult:
+    """preload 결과"""
+    corpus_version: int | None = None               # 스냅샷 시점 corpus_version
+    timings_ms: dict[str, float] = field(default_factory=dict)
+    errors: dict[str, str] = field(default_factory=dict)
+    frozen_objects: int = 0
+
+
+_preloaded: PreloadResult | None = None
+
+
+def preload_shared_caches(freeze: bool = True) -> PreloadResult:
+    """
+    읽기 전용 캐시 preload (DB 연결은 닫고 반환 - fork 후 연결 공유 방지)
+
+    DB 캐시 로드에 실패해도 예외를 올리지 않는다 (워커가 기존처럼 lazy 로드).
+    """
+    global _preloaded
+
+    from api import config_loader
+    from services.retrieval.compare_cube import get_compare_cube
+    from services.retrieval.corpus_version import get_corpus_version
+    from services.retrieval.coverage_availability import get_coverage_availability
+    from services.retrieval.db_router import connect_read
+    from services.retrieval.ef_search_tuning import get_ef_search_table
+
+    result = PreloadResult()
+
+    def timed(name, load) -> None:
+        start = time.perf_counter()
+        try:
+            load()
+        except Exception as e:
+            logger.warning(f"preload skipped ({name}): {e}")
+            result.errors[name] = str(e)
+        result.timings_ms[name] = round((time.perf_counter() - start) * 1000, 2)
+
+    def import_app() -> None:
+        import api.main  # noqa: F401
+
+    timed("modules", import_app)
+    timed("config", config_loader.preload)
+
+    try:
+        conn, _ = connect_read(row_factory=dict_row)
+    except Exception as e:
+        logger.warning(f"preload skipped (database): {e}")
+        result.errors["database"] = str(e)
+    else:
+        with conn:
+            # 스냅샷 버전을 먼저 읽어야 preload 도중 바뀐 변경을 워커 listener가 놓치지 않음
+            result.corpus_version = get_corpus_version(conn)
+            timed("compare_cube", lambda: get_compare_cube(conn))
+            timed("ef_search_table", lambda: get_ef_search_table(conn))
+            timed("coverage_availability", lambda: get_coverage_availability(conn))
+
+    if freeze:
+        gc.collect()
+        gc.freeze()
+        result.frozen_objects = gc.get_freeze_count()
+
+    _preloaded = result
+    logger.info(
+        f"shared caches preloaded (corpus_version={result.corpus_version}, "
+        f"timings_ms={result.timings_ms}, frozen_objects={result.frozen_objects})"
+    )
+    return result
+
+
+def get_preloaded_corpus_version() -> int | None:
+    """fork 전 스냅샷의 corpus_version (preload하지 않았으면 None)"""
+    return _preloaded.corpus_version if _preloaded else None
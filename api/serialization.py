@@ -0,0 +1,104 @@
+"""
+STEP 4.15: /compare 응답 직렬화 fast path
+
+기존 경로는 dataclass → Pydantic 응답 모델(필드 단위 생성) → FastAPI 재검증 → JSON으로
+같은 데이터를 세 번 순회했다. 응답 payload(api/compare.py _response_payload)는
+응답 모델과 필드가 같은 dataclass를 그대로 담고 있으므로 orjson으로 바로 직렬화한다.
+
+- JSON: orjson (dataclass 직접 직렬화, Pydantic 모델은 model_dump)
+- MessagePack: Accept가 application/msgpack(또는 x-msgpack)을 JSON보다 선호하고
+  msgpack 패키지가 설치된 경우만 (선택 의존성, 없으면 JSON).
+  msgpack.packb로 바로 직렬화하고, orjson이 직접 처리하는 dataclass / set은
+  같은 _default 훅에서 변환한다 (map 키는 원래 타입 그대로)
+
+OpenAPI 스키마는 라우트의 response_model(CompareResponseModel)로 그대로 유지된다.
+"""
+
+from __future__ import annotations
+
+from dataclasses import fields, is_dataclass
+from typing import Any
+
+import orjson
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import Response
+from pydantic import BaseModel
+
+
+JSON_MEDIA_TYPE = "application/json"
+MSGPACK_MEDIA_TYPES = ("application/msgpack", "application/x-msgpack")
+
+
+def is_msgpack_available() -> bool:
+    """msgpack 패키지 설치 여부"""
+    try:
+        import msgpack  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+def _default(obj: Any) -> Any:
+    """orjson이 직접 처리하지 못하는 타입"""
+    if isinstance(obj, BaseModel):
+        return obj.model_dump(mode="json")
+    return jsonable_encoder(obj)
+
+
+def dumps_json(payload: Any) -> bytes:
+    """payload → JSON bytes"""
+    return orjson.dumps(payload, default=_default, option=orjson.OPT_NON_STR_KEYS)
+
+
+def _msgpack_default(obj: Any) -> Any:
+    """msgpack이 직접 처리하지 못하는 타입 (orjson 기본 변환 + _default)"""
+    if is_dataclass(obj) and not isinstance(obj, type):
+        return {f.name: getattr(obj, f.name) for f in fields(obj)}
+    if isinstance(obj, (set, frozenset)):
+        return list(obj)
+    return _default(obj)
+
+
+def dumps_msgpack(payload: Any) -> bytes:
+    """payload → MessagePack bytes (msgpack 필요)"""
+    import msgpack
+
+    return msgpack.packb(payload, default=_msgpack_default)
+
+
+def _accept_quality(accept: str, media_types: tuple[str, ...]) -> tuple[float, int]:
+    """Accept 헤더에서 media_types의 (q, 등장 순서) - 없으면 (0, 0)"""
+    for position, part in enumerate(accept.split(",")):
+        media_type, _, params = part.strip().partition(";")
+        if media_type.strip().lower() not in media_types:
+            continue
+        q = 1.0
+        for param in params.split(";"):
+            key, _, value = param.strip().partition("=")
+            if key == "q":
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+        return q, -position
+    return 0.0, 0
+
+
+def negotiate_media_type(accept: str | None) -> str:
+    """응답 media type 선택 (MessagePack은 JSON보다 선호될 때만)"""
+    if not accept or not is_msgpack_available():
+        return JSON_MEDIA_TYPE
+
+    msgpack_quality = _accept_quality(accept, MSGPACK_MEDIA_TYPES)
+    if msgpack_quality[0] <= 0:
+        return JSON_MEDIA_TYPE
+    json_quality = _accept_quality(accept, (JSON_MEDIA_TYPE, "application/*", "*/*"))
+    return MSGPACK_MEDIA_TYPES[0] if msgpack_quality > json_quality else JSON_MEDIA_TYPE
+
+
+def render_response(payload: Any, accept: str | None = None) -> Response:
+    """payload를 협상된 형식으로 직렬화한 Response"""
+    media_type = negotiate_media_type(accept)
+    if media_type == JSON_MEDIA_TYPE:
+        return Response(content=dumps_json(payload), media_type=JSON_MEDIA_TYPE)
+    return Response(content=dumps_msgpack(payload), media_type=media_type)
@@ -0,0 +1,170 @@
+"""
+STEP 4.11: pre-fork API 서버 (운영용 진입점)
+
+`uvicorn --workers N`은 워커를 spawn으로 새로 띄우므로 워커마다 모듈 import,
+config YAML, compare cube, coverage 가용성 인덱스 등을 각자 다시 만든다.
+이 서버는 부모 프로세스에서 공유 캐시를 한 번 preload(api/preload.py)한 뒤
+리슨 소켓을 열고 워커를 fork한다.
+
+- 워커는 preload된 캐시를 copy-on-write로 공유 (워커 RSS 중 공유분 증가, 고유분 감소)
+- 워커 warmup 없음: 첫 요청부터 캐시 적중
+- 죽은 워커는 preload된 부모에서 다시 fork (재시작 warmup 없음)
+- SIGTERM / SIGINT: 워커에 SIGTERM 전달 후 종료 대기 (graceful shutdown)
+
+부모는 요청을 처리하지 않고 스레드 / DB 연결도 만들지 않는다 (fork 안전).
+corpus 변경은 워커별 STEP 4.7 listener가 처리한다.
+
+Usage:
+    python -m api.server --host 0.0.0.0 --port 8000 --workers 4
+    API_WORKERS=4 python -m api.server
+"""
+
+from __future__ import annotations
+
+import argparse
+import logging
+import os
+import signal
+import socket
+import sys
+import time
+
+import uvicorn
+
+
+logger = logging.getLogger("api.server")
+
+
+def get_api_workers() -> int:
+    """API_WORKERS 환경변수 (기본: CPU 수)"""
+    return int(os.environ.get("API_WORKERS", str(os.cpu_count() or 1)))
+
+
+def get_worker_min_uptime_sec() -> float:
+    """이보다 빨리 죽은 워커는 재시작 전에 대기 (crash loop 방지, 기본: 1초)"""
+    return float(os.environ.get("API_WORKER_MIN_UPTIME_SEC", "1"))
+
+
+def bind_socket(host: str, port: int, backlog: int = 2048) -> socket.socket:
+    """워커가 공유할 리슨 소켓"""
+    family = socket.AF_INET6 if ":" in host else socket.AF_INET
+    sock = socket.socket(family, socket.SOCK_STREAM)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    sock.bind((host, port))
+    sock.listen(backlog)
+    sock.set_inheritable(True)
+    return sock
+
+
+class PreforkServer:
+    """preload → bind → fork N workers → supervise"""
+
+    def __init__(self, config: uvicorn.Config, workers: int):
+        self.config = config
+        self.workers = max(1, workers)
+        self._children: dict[int, float] = {}      # pid → 시작 시각 (monotonic)
+        self._stopping = False
+
+    def _spawn(self, sock: socket.socket) -> int:
+        pid = os.fork()
+        if pid == 0:
+            # 워커: 부모의 신호 처리 해제 후 uvicorn이 자체 handler 설치
+            signal.signal(signal.SIGTERM, signal.SIG_DFL)
+            signal.signal(signal.SIGINT, signal.SIG_DFL)
+            exit_code = 0
+            try:
+                uvicorn.Server(self.config).run(sockets=[sock])
+            except BaseException:
+                logger.exception("worker crashed")
+                exit_code = 1
+            finally:
+                os._exit(exit_code)
+
+        self._children[pid] = time.monotonic()
+        logger.info(f"worker started (pid={pid})")
+        return pid
+
+    def _handle_stop(self, signum: int, frame: object) -> None:
+        if self._stopping:
+            return
+        self._stopping = True
+        logger.info(f"shutting down {len(self._children)} workers ({signal.Signals(signum).name})")
+        for pid in list(self._children):
+            try:
+                os.kill(pid, signal.SIGTERM)
+            except ProcessLookupError:
+                pass
+
+    def run(self) -> int:
+        from api.preload import preload_shared_caches
+
+        # 부모에서 app / 프로토콜 모듈까지 로드해 두면 워커가 그대로 공유
+        self.config.load()
+        preload_shared_caches()
+
+        sock = bind_socket(self.config.host, self.config.port, self.config.backlog)
+        logger.info(
+            f"pre-fork server listening on http://{self.config.host}:{self.config.port} "
+            f"({self.workers} workers, pid={os.getpid()})"
+        )
+
+        signal.signal(signal.SIGTERM, self._handle_stop)
+        signal.signal(signal.SIGINT, self._handle_stop)
+
+        for _ in range(self.workers):
+            self._spawn(sock)
+
+        while self._children:
+            try:
+                pid, status = os.wait()
+            except ChildProcessError:
+                break
+
+            started_at = self._children.pop(pid, None)
+            if started_at is None:
+                continue
+            if self._stopping:
+                continue
+
+            uptime = time.monotonic() - started_at
+            logger.warning(
+                f"worker exited (pid={pid}, status={os.waitstatus_to_exitcode(status)}, "
+                f"uptime={uptime:.1f}s); restarting"
+            )
+            if uptime < get_worker_min_uptime_sec():
+                time.sleep(get_worker_min_uptime_sec())
+            if not self._stopping:
+                self._spawn(sock)
+
+        sock.close()
+        logger.info("pre-fork server stopped")
+        return 0
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Insurance Comparison RAG API (pre-fork)")
+    parser.add_argument("--host", type=str, default=os.environ.get("API_HOST", "127.0.0.1"))
+    parser.add_argument("--port", type=int, default=int(os.environ.get("API_PORT", "8000")))
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=None,
+        help="워커 수 (기본: API_WORKERS 환경변수 또는 CPU 수)",
+    )
+    parser.add_argument("--log-level", type=str, default="info")
+    args = parser.parse_args()
+
+    config = uvicorn.Config(
+        "api.main:app",
+        host=args.host,
+        port=args.port,
+        log_level=args.log_level,
+        lifespan="on",
+    )
+    logging.basicConfig(level=args.log_level.upper(), format="%(levelname)s:     %(message)s")
+
+    return PreforkServer(config, args.workers or get_api_workers()).run()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
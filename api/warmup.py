@@ -0,0 +1,302 @@
+"""
+STEP 4.12: 시작 warmup + readiness
+
+배포 직후 첫 요청들이 YAML 파싱, 지연 import, 차가운 Postgres 버퍼,
+비어 있는 프로세스 캐시 비용을 내지 않도록 워커 시작 시 미리 실행한다.
+/ready는 warmup이 끝난 뒤에만 200을 반환한다 (/health는 liveness용으로 그대로).
+
+단계:
+1. config      - config/**/*.yaml 전체 로드
+2. slot_rules  - slot_definitions.yaml → 슬롯 규칙 컴파일 (STEP 4.19)
+3. imports     - 요청 경로에서 지연 import 되는 모듈
+4. database    - 읽기 라우터 probe, coverage 가용성 인덱스 / ef_search 테이블 / compare cube
+5. pg_prewarm  - (WARMUP_PG_PREWARM=1) chunk 인덱스를 읽기 대상 DB 버퍼에 적재
+6. queries     - 대표 질의 replay (질의 분석 + 검색 경로 + 결과 캐시)
+
+단계 실패는 기록만 하고 다음 단계로 진행한다 (warmup이 서비스를 막지 않도록).
+pre-fork 서버(STEP 4.11)에서는 1~4단계가 부모에서 끝나 있으므로 워커는 5~6단계만 실질 비용.
+LLM_ENABLED=1이면 replay도 LLM을 호출하므로 필요하면 WARMUP_MAX_QUERIES=0으로 끈다.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import csv
+import importlib
+import logging
+import os
+import time
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Any, Callable
+
+import psycopg
+import yaml
+from psycopg.rows import dict_row
+
+
+logger = logging.getLogger(__name__)
+
+# 요청 경로에서 함수 안에서 import 되는 모듈
+LAZY_IMPORT_MODULES = (
+    "psycopg2.extras",
+    "services.ingestion.embedding",
+    "services.retrieval.compare_cube",
+    "services.retrieval.coverage_availability",
+    "services.retrieval.ef_search_tuning",
+)
+
+
+def is_warmup_enabled() -> bool:
+    """WARMUP_ENABLED 환경변수 확인 (기본: 사용)"""
+    return os.environ.get("WARMUP_ENABLED", "1") == "1"
+
+
+def is_pg_prewarm_enabled() -> bool:
+    """WARMUP_PG_PREWARM 환경변수 확인 (기본: 미사용, pg_prewarm extension 필요)"""
+    return os.environ.get("WARMUP_PG_PREWARM", "0") == "1"
+
+
+def get_pg_prewarm_relations() -> list[str]:
+    """WARMUP_PG_PREWARM_RELATIONS (쉼표 구분, 기본: chunk 테이블의 인덱스 전체)"""
+    return [
+        rel.strip()
+        for rel in os.environ.get("WARMUP_PG_PREWARM_RELATIONS", "").split(",")
+        if rel.strip()
+    ]
+
+
+def get_warmup_queries_path() -> str | None:
+    """WARMUP_QUERIES: 대표 질의 파일 (.yaml 또는 eval goldset .csv, 기본: config 설정)"""
+    return os.environ.get("WARMUP_QUERIES") or None
+
+
+def get_warmup_max_queries() -> int:
+    """replay할 최대 질의 수 (기본: 20, 0이면 replay 안 함)"""
+    return int(os.environ.get("WARMUP_MAX_QUERIES", "20"))
+
+
+@dataclass
+class WarmupStep:
+    """warmup 단계 결과"""
+    name: str
+    ok: bool
+    elapsed_ms: float
+    detail: Any = None
+
+
+@dataclass
+class WarmupState:
+    """워커 단위 warmup 상태"""
+    status: str = "pending"             # pending → running → ready
+    started_at: float | None = None
+    finished_at: float | None = None
+    steps: list[WarmupStep] = field(default_factory=list)
+
+    @property
+    def ready(self) -> bool:
+        return self.status == "ready"
+
+    def to_dict(self) -> dict[str, Any]:
+        data = asdict(self)
+        data["ready"] = self.ready
+        if self.started_at is not None and self.finished_at is not None:
+            data["elapsed_ms"] = round((self.finished_at - self.started_at) * 1000, 2)
+        return data
+
+
+# =============================================================================
+# Canonical queries
+# =============================================================================
+
+def load_warmup_queries(path: str | Path) -> list[dict[str, Any]]:
+    """
+    대표 질의 파일 로드
+
+    - .yaml: {"queries": [{"query": ..., "insurers": [...]}, ...]}
+    - .csv:  eval goldset (query + insurer 또는 insurers 컬럼) → 질의별 보험사 합집합
+    """
+    path = Path(path)
+    if path.suffix in (".yaml", ".yml"):
+        with open(path, "r", encoding="utf-8") as f:
+            return (yaml.safe_load(f) or {}).get("queries", [])
+
+    queries: dict[str, list[str]] = {}
+    with open(path, "r", encoding="utf-8") as f:
+        for row in csv.DictReader(f):
+            insurers = queries.setdefault(row["query"], [])
+            for insurer_code in (row.get("insurers") or row.get("insurer") or "").split(","):
+                insurer_code = insurer_code.strip()
+                if insurer_code and insurer_code not in insurers:
+                    insurers.append(insurer_code)
+    return [{"query": query, "insurers": insurers} for query, insurers in queries.items()]
+
+
+def replay_queries(queries: list[dict[str, Any]]) -> dict[str, Any]:
+    """
+    대표 질의를 /compare 핸들러로 실행 (HTTP 계층만 제외하고 같은 경로)
+
+    Returns:
+        {"count": 실행 수, "failed": 실패 수, "max_ms": 최대 지연}
+    """
+    from api.compare import CompareRequest, build_compare_payload
+    from api.serialization import dumps_json
+
+    count = 0
+    failed = 0
+    max_ms = 0.0
+    for item in queries:
+        start = time.perf_counter()
+        try:
+            dumps_json(asyncio.run(build_compare_payload(CompareRequest(**item))))
+        except Exception as e:
+            failed += 1
+            logger.warning(f"warmup query failed ({item.get('query')}): {e}")
+        count += 1
+        max_ms = max(max_ms, (time.perf_counter() - start) * 1000)
+
+    return {"count": count, "failed": failed, "max_ms": round(max_ms, 2)}
+
+
+# =============================================================================
+# pg_prewarm
+# =============================================================================
+
+def prewarm_relations(conn: psycopg.Connection, relations: list[str] | None = None) -> dict[str, int]:
+    """
+    pg_prewarm으로 relation을 공유 버퍼에 적재
+
+    Args:
+        relations: 대상 (None이면 chunk 테이블의 인덱스 전체)
+
+    Returns:
+        {relation: 적재한 블록 수}
+    """
+    with conn.cursor() as cur:
+        if not relations:
+            cur.execute(
+                """
+                SELECT indexrelid::regclass::text AS relation
+                FROM pg_index
+                WHERE indrelid = to_regclass('chunk')
+                ORDER BY 1
+                """
+            )
+            relations = [row["relation"] for row in cur.fetchall()]
+
+        blocks: dict[str, int] = {}
+        for relation in relations:
+            cur.execute("SELECT pg_prewarm(%s::regclass) AS blocks", (relation,))
+            blocks[relation] = cur.fetchone()["blocks"]
+    return blocks
+
+
+# =============================================================================
+# Warmup
+# =============================================================================
+
+_state = WarmupState()
+
+
+def get_warmup_state() -> WarmupState:
+    return _state
+
+
+def _run_step(state: WarmupState, name: str, step: Callable[[], Any]) -> None:
+    start = time.perf_counter()
+    try:
+        detail = step()
+        ok = True
+    except Exception as e:
+        logger.warning(f"warmup step failed ({name}): {e}")
+        detail = str(e)
+        ok = False
+    state.steps.append(
+        WarmupStep(name=name, ok=ok, elapsed_ms=round((time.perf_counter() - start) * 1000, 2), detail=detail)
+    )
+
+
+def _compile_slot_rules() -> dict[str, Any]:
+    from services.extraction.slot_extractor import get_slot_rules
+
+    # STEP 4.19: slot_definitions.yaml 파싱 + 규칙 컴파일 (첫 compare 요청에서 하지 않도록)
+    rules = get_slot_rules()
+    return {
+        "version": rules.version,
+        "slots": {ct: len(ct_rules) for ct, ct_rules in rules.coverage_types.items()},
+    }
+
+
+def _warm_database() -> dict[str, Any]:
+    from services.retrieval.compare_cube import get_compare_cube
+    from services.retrieval.coverage_availability import get_coverage_availability
+    from services.retrieval.db_router import connect_read, get_db_router
+    from services.retrieval.ef_search_tuning import get_ef_search_table
+
+    # replica health / lag probe (첫 요청에서 probe하지 않도록)
+    read_candidates = len(get_db_router().read_candidates())
+
+    conn, _ = connect_read(row_factory=dict_row)
+    with conn:
+        availability = get_coverage_availability(conn)
+        ef_table = get_ef_search_table(conn)
+        cube = get_compare_cube(conn)
+
+    return {
+        "read_candidates": read_candidates,
+        "coverage_availability": availability is not None,
+        "ef_search_partitions": len(ef_table),
+        "compare_cube": cube is not None,
+    }
+
+
+def _pg_prewarm() -> dict[str, Any]:
+    from services.retrieval.db_router import get_db_router, redact_db_url
+
+    # 버퍼는 서버마다 따로이므로 지금 읽기 대상 전체에 적재
+    relations = get_pg_prewarm_relations() or None
+    result: dict[str, Any] = {}
+    for url in get_db_router().read_candidates():
+        with psycopg.connect(url, row_factory=dict_row, autocommit=True) as conn:
+            result[redact_db_url(url)] = sum(prewarm_relations(conn, relations).values())
+    return {"blocks": result}
+
+
+def _replay() -> dict[str, Any]:
+    from api import config_loader
+
+    path = get_warmup_queries_path()
+    queries = load_warmup_queries(path) if path else config_loader.get_warmup_queries()
+    return replay_queries(queries[: get_warmup_max_queries()])
+
+
+def run_warmup(state: WarmupState | None = None) -> WarmupState:
+    """warmup 실행 (동기, 워커 시작 시 별도 스레드에서 호출)"""
+    from api import config_loader
+
+    state = state or _state
+    state.status = "running"
+    state.started_at = time.time()
+    state.steps = []
+
+    if is_warmup_enabled():
+        _run_step(state, "config", lambda: len(config_loader.preload()))
+        _run_step(state, "slot_rules", _compile_slot_rules)
+        _run_step(
+            state,
+            "imports",
+            lambda: [importlib.import_module(name).__name__ for name in LAZY_IMPORT_MODULES],
+        )
+        _run_step(state, "database", _warm_database)
+        if is_pg_prewarm_enabled():
+            _run_step(state, "pg_prewarm", _pg_prewarm)
+        if get_warmup_max_queries() > 0:
+            _run_step(state, "queries", _replay)
+
+    state.finished_at = time.time()
+    state.status = "ready"
+    logger.info(
+        f"warmup finished in {(state.finished_at - state.started_at) * 1000:.0f}ms "
+        f"({', '.join(f'{s.name}={s.elapsed_ms:.0f}ms' for s in state.steps)})"
+    )
+    return state
@@ -0,0 +1,42 @@
+-- =============================================================================
+-- STEP 4.1 Migration: Comparison Cube (사전계산 비교표)
+-- =============================================================================
+--
+-- (insurer_code, coverage_code, plan_id) 단위로 best_evidence / resolved_amount /
+-- condition_snippet을 미리 계산해 둔다. compare()는 COMPARE_CUBE_ENABLED=1일 때
+-- 이 테이블을 메모리에 올려 비교표 셀을 조회한다.
+--
+-- 빌드: python tools/build_compare_cube.py
+-- 실행: psql -U postgres -d inca_rag -f db/migrations/20251220_add_comparison_cube.sql
+-- =============================================================================
+
+-- 빌드 메타 (최신 build_id 1건만 유지)
+CREATE TABLE IF NOT EXISTS comparison_cube_build (
+    build_id            BIGSERIAL PRIMARY KEY,
+    build_version       INT NOT NULL,                   -- CUBE_BUILD_VERSION
+    compare_doc_types   TEXT[] NOT NULL,                -- 빌드 시 compare_doc_types
+    top_k               INT NOT NULL,                   -- 빌드 시 top_k_per_insurer
+    corpus_fingerprint  TEXT,                           -- chunk 건수:최대 chunk_id (stale 판정)
+    cell_count          INT NOT NULL DEFAULT 0,
+    built_at            TIMESTAMPTZ DEFAULT NOW()
+);
+
+-- 셀 (insurer × coverage_code × plan)
+CREATE TABLE IF NOT EXISTS comparison_cube (
+    build_id            BIGINT NOT NULL REFERENCES comparison_cube_build(build_id) ON DELETE CASCADE,
+    insurer_code        TEXT NOT NULL,
+    coverage_code       TEXT NOT NULL,
+    plan_id             BIGINT,                         -- NULL이면 공통 문서 파티션
+    coverage_name       TEXT,
+    doc_type_counts     JSONB DEFAULT '{}'::jsonb,
+    best_evidence       JSONB DEFAULT '[]'::jsonb,      -- [{document_id, doc_type, page_start, preview, score, amount, condition_snippet}]
+    resolved_amount     JSONB                           -- {amount_value, amount_text, unit, confidence, source_doc_type, source_document_id}
+);
+
+-- plan_id NULL 포함 유니크
+CREATE UNIQUE INDEX IF NOT EXISTS uq_comparison_cube_cell
+    ON comparison_cube (build_id, insurer_code, coverage_code, COALESCE(plan_id, 0));
+
+COMMENT ON TABLE comparison_cube_build IS 'STEP 4.1: comparison cube 빌드 메타';
+COMMENT ON TABLE comparison_cube IS 'STEP 4.1: (insurer, coverage_code, plan) 사전계산 비교표 셀';
+COMMENT ON COLUMN comparison_cube.plan_id IS 'NULL=공통 문서만, N=(plan_id=N OR NULL) 조회 결과';
@@ -0,0 +1,27 @@
+-- =============================================================================
+-- STEP 4.4 Migration: HNSW ef_search 파티션별 튜닝 테이블
+-- =============================================================================
+--
+-- (insurer_code, doc_type) 파티션마다 recall 목표를 만족하는 최소 지연 ef_search를
+-- 저장한다. get_compare_axis_vector는 보험사별로 검색 대상 doc_type 파티션 값 중
+-- 최대값을 hnsw.ef_search로 적용한다 (없으면 COMPARE_AXIS_EF_SEARCH).
+--
+-- 튜닝: python tools/tune_ef_search.py
+-- 실행: psql -U postgres -d inca_rag -f db/migrations/20251221_add_hnsw_ef_search_tuning.sql
+-- =============================================================================
+
+CREATE TABLE IF NOT EXISTS hnsw_ef_search_tuning (
+    insurer_code        TEXT NOT NULL,
+    doc_type            TEXT NOT NULL,
+    ef_search           INT NOT NULL,                   -- 선택된 ef_search
+    recall              DOUBLE PRECISION NOT NULL,      -- 선택된 ef_search의 평균 recall@k
+    latency_ms          DOUBLE PRECISION NOT NULL,      -- 선택된 ef_search의 중앙값 지연
+    recall_target       DOUBLE PRECISION NOT NULL,      -- 튜닝 시 recall 목표
+    top_k               INT NOT NULL,                   -- recall@k의 k
+    sample_queries      INT NOT NULL,                   -- 측정 질의 수
+    measurements        JSONB DEFAULT '[]'::jsonb,      -- [{ef_search, recall, latency_ms}] 전체 grid
+    tuned_at            TIMESTAMPTZ DEFAULT NOW(),
+    PRIMARY KEY (insurer_code, doc_type)
+);
+
+COMMENT ON TABLE hnsw_ef_search_tuning IS 'STEP 4.4: (insurer, doc_type) 파티션별 HNSW ef_search 튜닝 결과';
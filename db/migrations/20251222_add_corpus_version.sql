@@ -0,0 +1,52 @@
+-- =============================================================================
+-- STEP 4.7 Migration: corpus_version + LISTEN/NOTIFY 캐시 무효화
+-- =============================================================================
+--
+-- ingestion / 매핑 적재 / backfill 도구가 데이터를 바꾸면
+-- bump_corpus_version(source)를 호출한다. 버전이 1 증가하고
+-- 'corpus_changed' 채널로 NOTIFY가 발행된다 (commit 시 전달).
+-- API 워커는 이 채널을 LISTEN하여 프로세스 내 캐시를 무효화한다.
+--
+-- 실행: psql -U postgres -d inca_rag -f db/migrations/20251222_add_corpus_version.sql
+-- =============================================================================
+
+-- 단일 행 테이블 (id = 1)
+CREATE TABLE IF NOT EXISTS corpus_version (
+    id                  SMALLINT PRIMARY KEY DEFAULT 1 CHECK (id = 1),
+    version             BIGINT NOT NULL DEFAULT 0,
+    source              TEXT,                           -- 마지막 변경 출처 (ingest, load_coverage_mapping 등)
+    updated_at          TIMESTAMPTZ DEFAULT NOW()
+);
+
+INSERT INTO corpus_version (id, version) VALUES (1, 0)
+ON CONFLICT (id) DO NOTHING;
+
+-- 버전 증가 + NOTIFY (payload: {"version", "source", "at": epoch 초})
+CREATE OR REPLACE FUNCTION bump_corpus_version(p_source TEXT)
+RETURNS BIGINT AS $$
+DECLARE
+    v_version BIGINT;
+BEGIN
+    INSERT INTO corpus_version (id, version, source, updated_at)
+    VALUES (1, 1, p_source, clock_timestamp())
+    ON CONFLICT (id) DO UPDATE SET
+        version = corpus_version.version + 1,
+        source = EXCLUDED.source,
+        updated_at = EXCLUDED.updated_at
+    RETURNING version INTO v_version;
+
+    PERFORM pg_notify(
+        'corpus_changed',
+        json_build_object(
+            'version', v_version,
+            'source', p_source,
+            'at', EXTRACT(EPOCH FROM clock_timestamp())
+        )::text
+    );
+
+    RETURN v_version;
+END;
+$$ LANGUAGE plpgsql;
+
+COMMENT ON TABLE corpus_version IS 'STEP 4.7: corpus 변경 버전 (캐시 무효화 기준)';
+COMMENT ON FUNCTION bump_corpus_version(TEXT) IS 'STEP 4.7: corpus_version 증가 + corpus_changed NOTIFY';
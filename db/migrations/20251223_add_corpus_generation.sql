@@ -0,0 +1,38 @@
+-- =============================================================================
+-- STEP 4.8 Migration: Blue/Green corpus generation
+-- =============================================================================
+--
+-- document / chunk를 세대(generation) 단위로 교체한다.
+--   corpus_staging  : 새 세대 적재 + 인덱스 빌드 + ANALYZE (서빙 영향 없음)
+--   public          : 서빙 중인 세대
+--   corpus_previous : 직전 세대 (rollback 대상)
+--
+-- 전환(switch)은 한 트랜잭션에서 ALTER TABLE ... SET SCHEMA로 수행한다.
+-- 이 테이블은 세대 이력만 기록한다 (테이블 이동은 services/ingestion/corpus_generation.py).
+--
+-- 도구: python tools/corpus_generation.py {stage,build,switch,rollback,discard,status}
+-- 실행: psql -U postgres -d inca_rag -f db/migrations/20251223_add_corpus_generation.sql
+-- =============================================================================
+
+CREATE SCHEMA IF NOT EXISTS corpus_staging;
+CREATE SCHEMA IF NOT EXISTS corpus_previous;
+
+CREATE TABLE IF NOT EXISTS corpus_generation (
+    generation_id       BIGSERIAL PRIMARY KEY,
+    state               TEXT NOT NULL
+                        CHECK (state IN ('staging', 'live', 'previous', 'retired', 'discarded')),
+    note                TEXT,                           -- 세대 설명 (예: 2025-12 약관 개정 반영)
+    copied_from_live    BOOLEAN NOT NULL DEFAULT FALSE, -- stage 시 서빙 세대를 복사했는지
+    document_count      INT,
+    chunk_count         INT,
+    created_at          TIMESTAMPTZ DEFAULT NOW(),
+    built_at            TIMESTAMPTZ,                    -- 인덱스 빌드 + ANALYZE 완료
+    switched_at         TIMESTAMPTZ                     -- 마지막으로 서빙 세대가 된 시각
+);
+
+-- 상태별 최대 1개 세대 (retired / discarded는 이력)
+CREATE UNIQUE INDEX IF NOT EXISTS idx_corpus_generation_active_state
+    ON corpus_generation(state)
+    WHERE state IN ('staging', 'live', 'previous');
+
+COMMENT ON TABLE corpus_generation IS 'STEP 4.8: document/chunk 세대 이력 (blue/green 전환)';
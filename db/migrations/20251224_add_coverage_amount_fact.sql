@@ -0,0 +1,47 @@
+-- =============================================================================
+-- STEP 4.24 Migration: 가입설계서 담보 표 금액 (coverage_amount_fact)
+-- =============================================================================
+--
+-- 가입설계서 담보 표의 행(담보명 / 가입금액 / 보험료)을 적재 시 PyMuPDF 표 / 단어
+-- 좌표로 파싱해 저장한다 (services/ingestion/amount_table.py).
+-- 조회 경로(비교표 셀 / 진단비·수술비 슬롯)는 (document_id, coverage_code) 행의
+-- 가입금액을 먼저 쓰고, 행이 없으면 preview regex 추출로 fallback한다.
+--
+-- document_id는 FK를 두지 않는다: document는 corpus 세대(STEP 4.8)로
+-- corpus_staging / corpus_previous 스키마를 오가므로 이 테이블(public)과 스키마가 다르다.
+-- 세대 전환 / 재적재로 남은 행은 tools/build_amount_facts.py --prune으로 정리한다.
+--
+-- 적재: ingest.py (가입설계서) 또는 python tools/build_amount_facts.py (기존 문서 backfill)
+-- 실행: psql -U postgres -d inca_rag -f db/migrations/20251224_add_coverage_amount_fact.sql
+-- =============================================================================
+
+CREATE TABLE IF NOT EXISTS coverage_amount_fact (
+    fact_id         BIGSERIAL PRIMARY KEY,
+    document_id     BIGINT NOT NULL,
+    insurer_id      BIGINT,
+    product_id      BIGINT,
+    plan_id         BIGINT,
+    coverage_code   TEXT,                   -- 담보명 → coverage_alias / ontology 매핑 (실패 시 NULL)
+    coverage_name   TEXT NOT NULL,          -- 담보 셀 원문
+    benefit_amount  BIGINT NOT NULL,        -- 가입금액 (원)
+    benefit_text    TEXT NOT NULL,          -- 예: 3,000만원
+    benefit_unit    TEXT,                   -- 만원 / 천만원 / 억원 / 원
+    premium_amount  BIGINT,                 -- 보험료 (원, 열이 없으면 NULL)
+    premium_text    TEXT,
+    page_no         INT NOT NULL,           -- 1-indexed
+    row_index       INT NOT NULL,           -- 페이지 내 행 순서
+    bbox            REAL[],                 -- 행 영역 [x0, y0, x1, y1] (pt)
+    source          TEXT NOT NULL CHECK (source IN ('table', 'words')),
+    created_at      TIMESTAMPTZ DEFAULT NOW(),
+    UNIQUE (document_id, page_no, row_index)
+);
+
+-- 조회 경로: 문서별 담보 행
+CREATE INDEX IF NOT EXISTS idx_coverage_amount_fact_document
+    ON coverage_amount_fact(document_id, coverage_code);
+
+-- 보험사 / 담보별 분석
+CREATE INDEX IF NOT EXISTS idx_coverage_amount_fact_insurer_coverage
+    ON coverage_amount_fact(insurer_id, coverage_code);
+
+COMMENT ON TABLE coverage_amount_fact IS 'STEP 4.24: 가입설계서 담보 표 행 (가입금액 / 보험료)';
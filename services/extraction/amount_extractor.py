@@ -7,10 +7,13 @@ Amount Extractor - Rule-based extraction of insurance amounts
 from __future__ import annotations
 
 import re
+from bisect import bisect_left
 from dataclasses import dataclass
 
+from .extraction_memo import memoize_extractor
 
-@dataclass
+
+@dataclass(frozen=True)
 class AmountExtract:
     """금액 추출 결과"""
     amount_value: int | None  # 원 단위 정수 (예: 10000000)
@@ -115,6 +118,7 @@ SURGERY_COUNT_PATTERNS = [
     r"회당",                     # 회당 (횟수 제한 없음 표시)
     r"(\d+)\s*회\s*(?:까지|이내)", # 5회까지, 3회이내
 ]
+_SURGERY_COUNT_RES = [re.compile(pattern) for pattern in SURGERY_COUNT_PATTERNS]
 
 # DAILY_ANCILLARY 키워드: 일당/특약 금액 관련 (제외해야 함)
 # NOTE: "1회" 제거 - "최초 1회한"은 일시금을 의미함
@@ -150,6 +154,9 @@ PREMIUM_HEADER_TOKENS = [
     # "보험료" 단독은 제외 (너무 일반적이라 오탐 유발)
 ]
 
+# 보험료 컬럼 라인 판별 토큰 (같은 라인에 있으면 보험료 금액)
+PREMIUM_LINE_TOKENS = ["보험료(원)", "보험료 (원)"]
+
 # Coverage block header tokens (표에서 보험금/가입금액 컬럼 식별)
 COVERAGE_HEADER_TOKENS = [
     "가입금액(만원)",
@@ -227,93 +234,228 @@ def _parse_korean_number(num_str: str) -> int | None:
     return result if result > 0 else None
 
 
-def _find_amounts_with_positions(text: str) -> list[tuple[int, str, str, int | None]]:
-    """
-    텍스트에서 모든 금액 표현을 찾아 위치와 함께 반환
+# =============================================================================
+# STEP 4.16: 금액 토큰화 (1회 스캔)
+# =============================================================================
 
-    Returns:
-        [(position, matched_text, unit, value_in_won), ...]
-    """
-    results = []
+# 패턴 1: 숫자 + 만원/천만원/억원 (띄어쓰기 변형 포함)
+# 예: 1,000만원, 500만 원, 2천만원, 1억원, 3억 5천만원
+_AMOUNT_PATTERN_MAIN = re.compile(
+    r"(\d{1,3}(?:,\d{3})*|\d+)(?:\s*)(억\s*)?(\d{1,3}(?:,\d{3})*|\d+)?(?:\s*)(천만|천|만)?\s*(원)"
+)
+# 패턴 2: 간단한 형태 - "X만원", "X천만원", "X억원"
+_AMOUNT_PATTERN_SIMPLE = re.compile(r"(\d{1,3}(?:,\d{3})*)\s*(만\s*원|천만\s*원|억\s*원)")
+# 패턴 3: "X억 Y천만원" 복합 형태
+_AMOUNT_PATTERN_COMPLEX = re.compile(r"(\d+)\s*억\s*(\d+)?\s*(천만|천)?\s*만?\s*원")
 
-    # 패턴 1: 숫자 + 만원/천만원/억원 (띄어쓰기 변형 포함)
-    # 예: 1,000만원, 500만 원, 2천만원, 1억원, 3억 5천만원
-    pattern_main = r"(\d{1,3}(?:,\d{3})*|\d+)(?:\s*)(억\s*)?(\d{1,3}(?:,\d{3})*|\d+)?(?:\s*)(천만|천|만)?\s*(원)"
+# 세 패턴의 매칭은 모두 [숫자 , 공백 억 천 만]* 뒤에 "원" 하나로 끝나므로
+# "원"과 그 앞의 연속된 [숫자 , 공백 억 천 만] 구간(segment) 안에서만 시작/종료된다.
+# 구간당 패턴별 매칭은 최대 1개.
+# 뒤집은 텍스트에서 "원"으로 시작하는 패턴으로 찾는다 (리터럴 prefix 탐색 → 선형)
+_AMOUNT_SEGMENT_REVERSED = re.compile(r"원[\d,\s억천만]*")
 
-    for match in re.finditer(pattern_main, text):
-        pos = match.start()
-        matched_text = match.group(0).strip()
+# 패턴 2/3 매칭이 이미 찾은 금액과 이 거리 미만이면 중복으로 간주
+_DUPLICATE_DISTANCE = 5
 
-        # 파싱
-        try:
-            # 전체 매칭에서 금액 추출
-            value = _calculate_amount_value(matched_text)
-            unit = _extract_unit(matched_text)
-            results.append((pos, matched_text, unit, value))
-        except (ValueError, TypeError):
-            continue
 
-    # 패턴 2: 간단한 형태 - "X만원", "X천만원", "X억원"
-    pattern_simple = r"(\d{1,3}(?:,\d{3})*)\s*(만\s*원|천만\s*원|억\s*원)"
-    for match in re.finditer(pattern_simple, text):
-        pos = match.start()
-        matched_text = match.group(0).strip()
+@dataclass
+class AmountToken:
+    """금액 토큰 (STEP 4.16)"""
+    position: int  # 매칭 시작 위치
+    text: str  # 매칭 원문 (strip)
+    unit: str | None
+    value: int | None  # 원 단위
+    kind: str  # "main"|"simple"|"complex" (매칭 패턴)
+
+
+def _main_token(match: re.Match) -> AmountToken | None:
+    matched_text = match.group(0).strip()
+    try:
+        value = _calculate_amount_value(matched_text)
+        unit = _extract_unit(matched_text)
+    except (ValueError, TypeError):
+        return None
+    return AmountToken(match.start(), matched_text, unit, value, "main")
+
+
+def _simple_token(match: re.Match) -> AmountToken | None:
+    try:
+        num = int(match.group(1).replace(",", ""))
+    except (ValueError, TypeError):
+        return None
+    unit_part = match.group(2).replace(" ", "")
+
+    if "억" in unit_part:
+        value = num * 100_000_000
+        unit = "억원"
+    elif "천만" in unit_part:
+        value = num * 10_000_000
+        unit = "천만원"
+    elif "만" in unit_part:
+        value = num * 10_000
+        unit = "만원"
+    else:
+        value = num
+        unit = "원"
+
+    return AmountToken(match.start(), match.group(0).strip(), unit, value, "simple")
+
+
+def _complex_token(match: re.Match) -> AmountToken | None:
+    try:
+        eok = int(match.group(1)) * 100_000_000
+        rest = 0
+        if match.group(2):
+            rest_num = int(match.group(2))
+            if match.group(3) == "천만":
+                rest = rest_num * 10_000_000
+            elif match.group(3) == "천":
+                rest = rest_num * 10_000_000  # 억 다음 천은 천만원
+            else:
+                rest = rest_num * 10_000  # 만원
+    except (ValueError, TypeError):
+        return None
+    return AmountToken(match.start(), match.group(0).strip(), "억원", eok + rest, "complex")
 
-        # 이미 찾은 것과 중복 체크
-        if any(abs(pos - p) < 5 for p, _, _, _ in results):
-            continue
 
-        try:
-            num_part = match.group(1).replace(",", "")
-            unit_part = match.group(2).replace(" ", "")
-            num = int(num_part)
-
-            if "억" in unit_part:
-                value = num * 100_000_000
-                unit = "억원"
-            elif "천만" in unit_part:
-                value = num * 10_000_000
-                unit = "천만원"
-            elif "만" in unit_part:
-                value = num * 10_000
-                unit = "만원"
-            else:
-                value = num
-                unit = "원"
+def _is_duplicate(accepted: list[int], position: int) -> bool:
+    """정렬된 accepted 위치 중 |position - p| < _DUPLICATE_DISTANCE 인 것이 있는지"""
+    i = bisect_left(accepted, position - _DUPLICATE_DISTANCE + 1)
+    return i < len(accepted) and accepted[i] < position + _DUPLICATE_DISTANCE
 
-            results.append((pos, matched_text, unit, value))
-        except (ValueError, TypeError):
-            continue
 
-    # 패턴 3: "X억 Y천만원" 복합 형태
-    pattern_complex = r"(\d+)\s*억\s*(\d+)?\s*(천만|천)?\s*만?\s*원"
-    for match in re.finditer(pattern_complex, text):
-        pos = match.start()
-        matched_text = match.group(0).strip()
+def tokenize_amounts(text: str) -> list[AmountToken]:
+    """
+    텍스트에서 모든 금액 토큰을 찾는다 (STEP 4.16)
+
+    "원"으로 끝나는 후보 구간을 한 번 스캔하고, 구간 안에서만 세 패턴을 매칭한다
+    (기존: 패턴별 전체 텍스트 finditer 3회 + O(n²) 중복 검사).
+    결과 순서 / 중복 제거는 패턴별 전체 스캔과 동일하다:
+    패턴 1 매칭 전부 → 패턴 2 → 패턴 3 순, 패턴 2/3은 앞서 채택된 금액과
+    시작 위치가 5자 미만 차이면 제외.
+    """
+    if "원" not in text:
+        return []
+
+    main: list[AmountToken] = []
+    simple: list[AmountToken] = []
+    complex_: list[AmountToken] = []
+
+    n = len(text)
+    segments = [
+        (n - match.end(), n - match.start())
+        for match in _AMOUNT_SEGMENT_REVERSED.finditer(text[::-1])
+        if match.end() - match.start() > 1  # 숫자 없는 "원" 제외
+    ]
 
-        # 이미 찾은 것과 중복 체크
-        if any(abs(pos - p) < 5 for p, _, _, _ in results):
+    for seg_start, seg_end in reversed(segments):
+        match = _AMOUNT_PATTERN_MAIN.search(text, seg_start, seg_end)
+        if match and (token := _main_token(match)):
+            main.append(token)
+        match = _AMOUNT_PATTERN_SIMPLE.search(text, seg_start, seg_end)
+        if match and (token := _simple_token(match)):
+            simple.append(token)
+        match = _AMOUNT_PATTERN_COMPLEX.search(text, seg_start, seg_end)
+        if match and (token := _complex_token(match)):
+            complex_.append(token)
+
+    tokens = main
+    accepted = [token.position for token in main]
+    for token in simple + complex_:
+        if _is_duplicate(accepted, token.position):
             continue
+        tokens.append(token)
+        accepted.insert(bisect_left(accepted, token.position), token.position)
 
-        try:
-            eok = int(match.group(1)) * 100_000_000
-            rest = 0
-            if match.group(2):
-                rest_num = int(match.group(2))
-                if match.group(3) == "천만":
-                    rest = rest_num * 10_000_000
-                elif match.group(3) == "천":
-                    rest = rest_num * 10_000_000  # 억 다음 천은 천만원
-                else:
-                    rest = rest_num * 10_000  # 만원
+    return tokens
+
+
+def _find_amounts_with_positions(text: str) -> list[tuple[int, str, str, int | None]]:
+    """
+    텍스트에서 모든 금액 표현을 찾아 위치와 함께 반환
+
+    Returns:
+        [(position, matched_text, unit, value_in_won), ...]
+    """
+    return [(t.position, t.text, t.unit, t.value) for t in tokenize_amounts(text)]
 
-            value = eok + rest
-            unit = "억원"
-            results.append((pos, matched_text, unit, value))
-        except (ValueError, TypeError):
-            continue
 
-    return results
+class AmountText:
+    """
+    STEP 4.16: 추출 대상 텍스트 인덱스 (추출 함수 호출 1회 동안 공유)
+
+    - amounts: 금액 토큰 (tokenize_amounts 1회)
+    - 라인 오프셋 테이블: position → 라인 번호 / 라인 범위 (bisect)
+    - 키워드 위치 인덱스: 키워드별 등장 위치 (처음 조회 시 1회 계산)
+
+    `keyword in text[start:end]` 와 `context.find(keyword)` 를
+    키워드 등장 위치 bisect로 대체한다.
+    """
+
+    def __init__(self, text: str):
+        self.text = text
+        self.newlines: list[int] = []
+        idx = text.find("\n")
+        while idx != -1:
+            self.newlines.append(idx)
+            idx = text.find("\n", idx + 1)
+        self._keyword_positions: dict[str, list[int]] = {}
+        self._amounts: list[tuple[int, str, str, int | None]] | None = None
+
+    @property
+    def amounts(self) -> list[tuple[int, str, str, int | None]]:
+        """[(position, matched_text, unit, value_in_won), ...]"""
+        if self._amounts is None:
+            self._amounts = _find_amounts_with_positions(self.text)
+        return self._amounts
+
+    def line_index(self, position: int) -> int:
+        """position이 몇 번째 라인에 있는지 (0-based)"""
+        return bisect_left(self.newlines, position)
+
+    def line_bounds(self, position: int) -> tuple[int, int]:
+        """position이 속한 라인의 [start, end) (줄바꿈 제외)"""
+        i = bisect_left(self.newlines, position)
+        start = self.newlines[i - 1] + 1 if i > 0 else 0
+        end = self.newlines[i] if i < len(self.newlines) else len(self.text)
+        return start, end
+
+    def window(self, position: int, window: int) -> tuple[int, int]:
+        """금액 위치 주변 ±window 자 범위"""
+        return max(0, position - window), min(len(self.text), position + window)
+
+    def keyword_positions(self, keyword: str) -> list[int]:
+        """keyword 등장 시작 위치 (겹침 포함, 오름차순)"""
+        positions = self._keyword_positions.get(keyword)
+        if positions is None:
+            positions = []
+            idx = self.text.find(keyword)
+            while idx != -1:
+                positions.append(idx)
+                idx = self.text.find(keyword, idx + 1)
+            self._keyword_positions[keyword] = positions
+        return positions
+
+    def find(self, keyword: str, start: int, end: int) -> int:
+        """text[start:end].find(keyword) 와 같은 첫 등장 위치 (text 기준, 없으면 -1)"""
+        positions = self.keyword_positions(keyword)
+        i = bisect_left(positions, start)
+        if i < len(positions) and positions[i] + len(keyword) <= end:
+            return positions[i]
+        return -1
+
+    def contains_any(self, keywords: list[str], start: int, end: int) -> bool:
+        """keywords 중 하나라도 text[start:end] 안에 있는지"""
+        return any(self.find(keyword, start, end) != -1 for keyword in keywords)
+
+    def closest_distance(self, keywords: list[str], position: int, start: int, end: int) -> float:
+        """text[start:end] 안 keywords 첫 등장 중심과 position의 최소 거리 (없으면 inf)"""
+        closest = float("inf")
+        for keyword in keywords:
+            idx = self.find(keyword, start, end)
+            if idx != -1:
+                closest = min(closest, abs(idx + len(keyword) // 2 - position))
+        return closest
 
 
 def _calculate_amount_value(text: str) -> int | None:
@@ -374,113 +516,52 @@ def _extract_unit(text: str) -> str | None:
     return None
 
 
-def _has_keyword_nearby(text: str, position: int, window: int = 30) -> bool:
+def _has_keyword_nearby(doc: AmountText, position: int, window: int = 30) -> bool:
     """
     금액 위치 주변(±window 자)에 금액 관련 키워드가 있는지 확인
     """
-    start = max(0, position - window)
-    end = min(len(text), position + window)
-    context = text[start:end]
-
-    for keyword in AMOUNT_KEYWORDS:
-        if keyword in context:
-            return True
-    return False
+    start, end = doc.window(position, window)
+    return doc.contains_any(AMOUNT_KEYWORDS, start, end)
 
 
-def _has_positive_keyword_nearby(text: str, position: int, window: int = 40) -> bool:
+def _has_positive_keyword_nearby(doc: AmountText, position: int, window: int = 40) -> bool:
     """
     금액 위치 주변(±window 자)에 POSITIVE 키워드(보험금 관련)가 있는지 확인
     """
-    start = max(0, position - window)
-    end = min(len(text), position + window)
-    context = text[start:end]
+    start, end = doc.window(position, window)
+    return doc.contains_any(POSITIVE_KEYWORDS, start, end)
 
-    for keyword in POSITIVE_KEYWORDS:
-        if keyword in context:
-            return True
-    return False
 
-
-def _has_negative_keyword_nearby(text: str, position: int, window: int = 40) -> bool:
+def _has_negative_keyword_nearby(doc: AmountText, position: int, window: int = 40) -> bool:
     """
     금액 위치 주변(±window 자)에 NEGATIVE 키워드(보험료 관련)가 있는지 확인
 
     NOTE: LUMP_SUM 키워드가 NEGATIVE 키워드보다 금액에 더 가까우면 False 반환
+    (거리: 윈도우 내 각 키워드 첫 등장의 중심 ↔ 금액 위치)
     """
-    start = max(0, position - window)
-    end = min(len(text), position + window)
-    context = text[start:end]
-
-    # Find closest NEGATIVE keyword
-    closest_neg_dist = float('inf')
-    for keyword in NEGATIVE_KEYWORDS:
-        idx = context.find(keyword)
-        if idx != -1:
-            # Distance from keyword center to amount position in context
-            keyword_center = idx + len(keyword) // 2
-            amount_pos_in_context = position - start
-            dist = abs(keyword_center - amount_pos_in_context)
-            closest_neg_dist = min(closest_neg_dist, dist)
+    start, end = doc.window(position, window)
 
+    closest_neg_dist = doc.closest_distance(NEGATIVE_KEYWORDS, position, start, end)
     if closest_neg_dist == float('inf'):
         return False  # No negative keyword found
 
-    # Find closest LUMP_SUM keyword
-    closest_lump_dist = float('inf')
-    for keyword in LUMP_SUM_KEYWORDS:
-        idx = context.find(keyword)
-        if idx != -1:
-            keyword_center = idx + len(keyword) // 2
-            amount_pos_in_context = position - start
-            dist = abs(keyword_center - amount_pos_in_context)
-            closest_lump_dist = min(closest_lump_dist, dist)
-
     # If LUMP_SUM keyword is closer, this is not a premium amount
+    closest_lump_dist = doc.closest_distance(LUMP_SUM_KEYWORDS, position, start, end)
     if closest_lump_dist < closest_neg_dist:
         return False
 
     return True
 
 
-def _get_line_context(text: str, position: int) -> str:
-    """
-    금액이 위치한 라인 전체를 반환 (표 컬럼 구분용)
-    """
-    # 이전 줄바꿈 찾기
-    line_start = text.rfind("\n", 0, position)
-    if line_start == -1:
-        line_start = 0
-    else:
-        line_start += 1  # 줄바꿈 다음부터
-
-    # 다음 줄바꿈 찾기
-    line_end = text.find("\n", position)
-    if line_end == -1:
-        line_end = len(text)
-
-    return text[line_start:line_end]
-
-
-def _is_premium_line(text: str, position: int) -> bool:
+def _is_premium_line(doc: AmountText, position: int) -> bool:
     """
     금액이 보험료 컬럼 라인에 있는지 확인
     '보험료(원)' 등이 같은 라인에 있으면 보험료 금액으로 판단
     """
-    line = _get_line_context(text, position)
+    line_start, line_end = doc.line_bounds(position)
 
     # 라인에 보험료 컬럼 헤더가 있으면 보험료 금액
-    if "보험료(원)" in line or "보험료 (원)" in line:
-        return True
-
-    return False
-
-
-def _get_line_index(text: str, position: int) -> int:
-    """
-    position이 몇 번째 라인에 있는지 반환 (0-based)
-    """
-    return text[:position].count("\n")
+    return doc.contains_any(PREMIUM_LINE_TOKENS, line_start, line_end)
 
 
 def _find_premium_block_lines(lines: list[str]) -> set[int]:
@@ -537,22 +618,21 @@ def _find_coverage_block_lines(lines: list[str]) -> set[int]:
     return coverage_lines
 
 
-def _is_in_premium_block(text: str, position: int, premium_lines: set[int]) -> bool:
+def _is_in_premium_block(doc: AmountText, position: int, premium_lines: set[int]) -> bool:
     """
     position이 premium block 내에 있는지 확인
     """
-    line_idx = _get_line_index(text, position)
-    return line_idx in premium_lines
+    return doc.line_index(position) in premium_lines
 
 
-def _is_in_coverage_block(text: str, position: int, coverage_lines: set[int]) -> bool:
+def _is_in_coverage_block(doc: AmountText, position: int, coverage_lines: set[int]) -> bool:
     """
     position이 coverage block 내에 있는지 확인
     """
-    line_idx = _get_line_index(text, position)
-    return line_idx in coverage_lines
+    return doc.line_index(position) in coverage_lines
 
 
+@memoize_extractor("amount", version="1")
 def extract_amount(text: str, doc_type: str | None = None) -> AmountExtract:
     """
     한국어 보험 문서에서 금액/한도 관련 표현을 1차 rule-based로 추출
@@ -576,7 +656,8 @@ def extract_amount(text: str, doc_type: str | None = None) -> AmountExtract:
         )
 
     # 모든 금액 표현 찾기
-    amounts = _find_amounts_with_positions(text)
+    doc = AmountText(text)
+    amounts = doc.amounts
 
     if not amounts:
         return AmountExtract(
@@ -591,28 +672,22 @@ def extract_amount(text: str, doc_type: str | None = None) -> AmountExtract:
 
     # 가입설계서: 더 엄격한 필터링 (보험료 오탐 방지)
     if doc_type == "가입설계서":
-        return _extract_amount_strict(text, amounts)
+        return _extract_amount_strict(doc, amounts)
 
     # 기타 doc_type: 기존 로직 유지
-    return _extract_amount_default(text, amounts)
+    return _extract_amount_default(doc, amounts)
 
 
-def _has_close_negative_keyword(text: str, position: int, window: int = 15) -> bool:
+def _has_close_negative_keyword(doc: AmountText, position: int, window: int = 15) -> bool:
     """
     금액 위치 주변(±window 자)에 NEGATIVE 키워드가 매우 가까이 있는지 확인
     좁은 범위로 체크하여 확실한 보험료 금액만 제외
     """
-    start = max(0, position - window)
-    end = min(len(text), position + window)
-    context = text[start:end]
-
-    for keyword in NEGATIVE_KEYWORDS:
-        if keyword in context:
-            return True
-    return False
+    start, end = doc.window(position, window)
+    return doc.contains_any(NEGATIVE_KEYWORDS, start, end)
 
 
-def _extract_amount_strict(text: str, amounts: list) -> AmountExtract:
+def _extract_amount_strict(doc: AmountText, amounts: list) -> AmountExtract:
     """
     가입설계서용 엄격한 추출 로직 (H-1.7: premium_block 휴리스틱 추가)
 
@@ -628,7 +703,7 @@ def _extract_amount_strict(text: str, amounts: list) -> AmountExtract:
     - 보험료 라인의 금액
     """
     # 라인 단위 분할 및 block 감지
-    lines = text.split("\n")
+    lines = doc.text.split("\n")
 
     # 단일 라인이면 block 휴리스틱 미적용 (인라인 텍스트)
     # 최소 3줄 이상일 때만 표 구조로 간주
@@ -647,10 +722,10 @@ def _extract_amount_strict(text: str, amounts: list) -> AmountExtract:
         coverage_block_amounts = [
             (pos, matched, unit, value)
             for pos, matched, unit, value in amounts
-            if _is_in_coverage_block(text, pos, coverage_lines)
-            and not _is_in_premium_block(text, pos, premium_lines)
-            and not _has_close_negative_keyword(text, pos)
-            and not _is_premium_line(text, pos)
+            if _is_in_coverage_block(doc, pos, coverage_lines)
+            and not _is_in_premium_block(doc, pos, premium_lines)
+            and not _has_close_negative_keyword(doc, pos)
+            and not _is_premium_line(doc, pos)
         ]
 
         if coverage_block_amounts:
@@ -670,10 +745,10 @@ def _extract_amount_strict(text: str, amounts: list) -> AmountExtract:
     positive_amounts = [
         (pos, matched, unit, value)
         for pos, matched, unit, value in amounts
-        if _has_positive_keyword_nearby(text, pos)
-        and not _is_in_premium_block(text, pos, premium_lines)
-        and not _has_close_negative_keyword(text, pos)
-        and not _is_premium_line(text, pos)
+        if _has_positive_keyword_nearby(doc, pos)
+        and not _is_in_premium_block(doc, pos, premium_lines)
+        and not _has_close_negative_keyword(doc, pos)
+        and not _is_premium_line(doc, pos)
     ]
 
     if positive_amounts:
@@ -696,8 +771,8 @@ def _extract_amount_strict(text: str, amounts: list) -> AmountExtract:
         wide_positive_amounts = [
             (pos, matched, unit, value)
             for pos, matched, unit, value in amounts
-            if _has_positive_keyword_nearby(text, pos, window=150)
-            and not _has_close_negative_keyword(text, pos)
+            if _has_positive_keyword_nearby(doc, pos, window=150)
+            and not _has_close_negative_keyword(doc, pos)
         ]
 
         if wide_positive_amounts:
@@ -725,7 +800,7 @@ def _extract_amount_strict(text: str, amounts: list) -> AmountExtract:
     )
 
 
-def _extract_amount_default(text: str, amounts: list) -> AmountExtract:
+def _extract_amount_default(doc: AmountText, amounts: list) -> AmountExtract:
     """
     기본 추출 로직 (상품요약서, 사업방법서 등)
 
@@ -735,7 +810,7 @@ def _extract_amount_default(text: str, amounts: list) -> AmountExtract:
     filtered_amounts = [
         (pos, matched, unit, value)
         for pos, matched, unit, value in amounts
-        if not _has_negative_keyword_nearby(text, pos)
+        if not _has_negative_keyword_nearby(doc, pos)
     ]
 
     # 필터링 후 금액이 없으면 원본에서 선택 (하위 호환)
@@ -746,7 +821,7 @@ def _extract_amount_default(text: str, amounts: list) -> AmountExtract:
     keyword_nearby_amounts = [
         (pos, matched, unit, value)
         for pos, matched, unit, value in filtered_amounts
-        if _has_keyword_nearby(text, pos)
+        if _has_keyword_nearby(doc, pos)
     ]
 
     if keyword_nearby_amounts:
@@ -777,40 +852,28 @@ def _extract_amount_default(text: str, amounts: list) -> AmountExtract:
 # U-4.10: 진단비 일시금 전용 추출 함수
 # =============================================================================
 
-def _has_lump_sum_keyword_nearby(text: str, position: int, window: int = 80) -> bool:
+def _has_lump_sum_keyword_nearby(doc: AmountText, position: int, window: int = 80) -> bool:
     """
     금액 위치 주변(±window 자)에 LUMP_SUM 키워드가 있는지 확인
     """
-    start = max(0, position - window)
-    end = min(len(text), position + window)
-    context = text[start:end]
+    start, end = doc.window(position, window)
+    return doc.contains_any(LUMP_SUM_KEYWORDS, start, end)
 
-    for keyword in LUMP_SUM_KEYWORDS:
-        if keyword in context:
-            return True
-    return False
 
-
-def _has_daily_ancillary_keyword_nearby(text: str, position: int, window: int = 30) -> bool:
+def _has_daily_ancillary_keyword_nearby(doc: AmountText, position: int, window: int = 30) -> bool:
     """
     금액 위치 주변(±window 자)에 DAILY_ANCILLARY 키워드가 있는지 확인
     좁은 범위(30자)로 확인하여 확실히 일당/특약 금액인 경우만 제외
 
     NOTE: LUMP_SUM_CONTEXT_PATTERNS이 더 가까이 있으면 False 반환 (일시금 우선)
     """
-    start = max(0, position - window)
-    end = min(len(text), position + window)
-    context = text[start:end]
+    start, end = doc.window(position, window)
 
     # 일시금 문맥 패턴이 있으면 일당이 아님 (일시금 우선)
-    for pattern in LUMP_SUM_CONTEXT_PATTERNS:
-        if pattern in context:
-            return False
+    if doc.contains_any(LUMP_SUM_CONTEXT_PATTERNS, start, end):
+        return False
 
-    for keyword in DAILY_ANCILLARY_KEYWORDS:
-        if keyword in context:
-            return True
-    return False
+    return doc.contains_any(DAILY_ANCILLARY_KEYWORDS, start, end)
 
 
 def _is_likely_lump_sum_amount(value: int | None) -> bool:
@@ -826,7 +889,7 @@ def _is_likely_lump_sum_amount(value: int | None) -> bool:
     return value >= 1_000_000
 
 
-@dataclass
+@dataclass(frozen=True)
 class DiagnosisLumpSumResult:
     """진단비 일시금 추출 결과"""
     amount_value: int | None
@@ -836,6 +899,7 @@ class DiagnosisLumpSumResult:
     method: str = "regex"
 
 
+@memoize_extractor("diagnosis_lump_sum", version="1")
 def extract_diagnosis_lump_sum(text: str, doc_type: str | None = None) -> DiagnosisLumpSumResult:
     """
     진단비 일시금만 추출 (일당/특약 금액 제외)
@@ -856,7 +920,8 @@ def extract_diagnosis_lump_sum(text: str, doc_type: str | None = None) -> Diagno
         )
 
     # 모든 금액 표현 찾기
-    amounts = _find_amounts_with_positions(text)
+    doc = AmountText(text)
+    amounts = doc.amounts
 
     if not amounts:
         return DiagnosisLumpSumResult(
@@ -870,8 +935,8 @@ def extract_diagnosis_lump_sum(text: str, doc_type: str | None = None) -> Diagno
     non_premium_amounts = [
         (pos, matched, unit, value)
         for pos, matched, unit, value in amounts
-        if not _has_negative_keyword_nearby(text, pos)
-        and not _has_close_negative_keyword(text, pos)
+        if not _has_negative_keyword_nearby(doc, pos)
+        and not _has_close_negative_keyword(doc, pos)
     ]
 
     if not non_premium_amounts:
@@ -888,8 +953,8 @@ def extract_diagnosis_lump_sum(text: str, doc_type: str | None = None) -> Diagno
     unclassified_candidates = []  # 키워드 없는 금액
 
     for pos, matched, unit, value in non_premium_amounts:
-        has_lump_sum_kw = _has_lump_sum_keyword_nearby(text, pos)
-        has_daily_kw = _has_daily_ancillary_keyword_nearby(text, pos)
+        has_lump_sum_kw = _has_lump_sum_keyword_nearby(doc, pos)
+        has_daily_kw = _has_daily_ancillary_keyword_nearby(doc, pos)
 
         if has_lump_sum_kw and not has_daily_kw:
             # 일시금 후보
@@ -965,7 +1030,7 @@ def extract_diagnosis_lump_sum(text: str, doc_type: str | None = None) -> Diagno
 # U-4.13: 수술비 추출 함수
 # =============================================================================
 
-@dataclass
+@dataclass(frozen=True)
 class SurgeryAmountResult:
     """수술비 추출 결과"""
     amount_value: int | None
@@ -975,60 +1040,35 @@ class SurgeryAmountResult:
     method: str = "regex"
 
 
-def _has_surgery_keyword_nearby(text: str, position: int, window: int = 60) -> bool:
+def _has_surgery_keyword_nearby(doc: AmountText, position: int, window: int = 60) -> bool:
     """
     금액 위치 주변(±window 자)에 SURGERY_POSITIVE 키워드가 있는지 확인
     """
-    start = max(0, position - window)
-    end = min(len(text), position + window)
-    context = text[start:end]
-
-    for keyword in SURGERY_POSITIVE_KEYWORDS:
-        if keyword in context:
-            return True
-    return False
+    start, end = doc.window(position, window)
+    return doc.contains_any(SURGERY_POSITIVE_KEYWORDS, start, end)
 
 
-def _has_surgery_negative_keyword_nearby(text: str, position: int, window: int = 30) -> bool:
+def _has_surgery_negative_keyword_nearby(doc: AmountText, position: int, window: int = 30) -> bool:
     """
     금액 위치 주변(±window 자)에 SURGERY_NEGATIVE 키워드가 있는지 확인
 
     NOTE: premium-negative 거리 비교 로직 재사용
     """
-    start = max(0, position - window)
-    end = min(len(text), position + window)
-    context = text[start:end]
-
-    # Find closest SURGERY_NEGATIVE keyword
-    closest_neg_dist = float('inf')
-    for keyword in SURGERY_NEGATIVE_KEYWORDS:
-        idx = context.find(keyword)
-        if idx != -1:
-            keyword_center = idx + len(keyword) // 2
-            amount_pos_in_context = position - start
-            dist = abs(keyword_center - amount_pos_in_context)
-            closest_neg_dist = min(closest_neg_dist, dist)
+    start, end = doc.window(position, window)
 
+    closest_neg_dist = doc.closest_distance(SURGERY_NEGATIVE_KEYWORDS, position, start, end)
     if closest_neg_dist == float('inf'):
         return False
 
-    # Find closest SURGERY_POSITIVE keyword
-    closest_pos_dist = float('inf')
-    for keyword in SURGERY_POSITIVE_KEYWORDS:
-        idx = context.find(keyword)
-        if idx != -1:
-            keyword_center = idx + len(keyword) // 2
-            amount_pos_in_context = position - start
-            dist = abs(keyword_center - amount_pos_in_context)
-            closest_pos_dist = min(closest_pos_dist, dist)
-
     # If SURGERY_POSITIVE is closer, this is not a negative match
+    closest_pos_dist = doc.closest_distance(SURGERY_POSITIVE_KEYWORDS, position, start, end)
     if closest_pos_dist < closest_neg_dist:
         return False
 
     return True
 
 
+@memoize_extractor("surgery_amount", version="1")
 def extract_surgery_amount(text: str, doc_type: str | None = None) -> SurgeryAmountResult:
     """
     수술비 금액 추출 (U-4.13)
@@ -1049,7 +1089,8 @@ def extract_surgery_amount(text: str, doc_type: str | None = None) -> SurgeryAmo
         )
 
     # 모든 금액 표현 찾기
-    amounts = _find_amounts_with_positions(text)
+    doc = AmountText(text)
+    amounts = doc.amounts
 
     if not amounts:
         return SurgeryAmountResult(
@@ -1063,8 +1104,8 @@ def extract_surgery_amount(text: str, doc_type: str | None = None) -> SurgeryAmo
     filtered_amounts = [
         (pos, matched, unit, value)
         for pos, matched, unit, value in amounts
-        if not _has_surgery_negative_keyword_nearby(text, pos)
-        and not _has_close_negative_keyword(text, pos)
+        if not _has_surgery_negative_keyword_nearby(doc, pos)
+        and not _has_close_negative_keyword(doc, pos)
     ]
 
     if not filtered_amounts:
@@ -1079,7 +1120,7 @@ def extract_surgery_amount(text: str, doc_type: str | None = None) -> SurgeryAmo
     surgery_amounts = [
         (pos, matched, unit, value)
         for pos, matched, unit, value in filtered_amounts
-        if _has_surgery_keyword_nearby(text, pos)
+        if _has_surgery_keyword_nearby(doc, pos)
     ]
 
     if surgery_amounts:
@@ -1113,7 +1154,7 @@ def extract_surgery_amount(text: str, doc_type: str | None = None) -> SurgeryAmo
     )
 
 
-@dataclass
+@dataclass(frozen=True)
 class SurgeryCountLimitResult:
     """수술 횟수 제한 추출 결과"""
     count_text: str | None  # "연 1회", "통산 10회", "회당" 등
@@ -1122,6 +1163,7 @@ class SurgeryCountLimitResult:
     reason: str | None
 
 
+@memoize_extractor("surgery_count_limit", version="1")
 def extract_surgery_count_limit(text: str) -> SurgeryCountLimitResult:
     """
     수술 횟수 제한 추출 (U-4.13)
@@ -1140,25 +1182,16 @@ def extract_surgery_count_limit(text: str) -> SurgeryCountLimitResult:
             reason="텍스트 없음",
         )
 
-    # 수술 관련 키워드 확인 (수술비 문맥인지)
-    has_surgery_context = any(kw in text for kw in SURGERY_POSITIVE_KEYWORDS)
-
-    results = []
-
-    for pattern in SURGERY_COUNT_PATTERNS:
-        for match in re.finditer(pattern, text):
-            matched_text = match.group(0).strip()
-            # 숫자 추출 시도
-            count_value = None
-            if match.lastindex and match.lastindex >= 1:
-                try:
-                    count_value = int(match.group(1))
-                except (ValueError, TypeError):
-                    pass
-
-            results.append((matched_text, count_value, match.start()))
+    # 가장 먼저 등장한 것 선택 (같은 위치면 패턴 순서) - 패턴별 첫 매칭만 비교
+    # 모든 패턴이 "회"를 포함하므로 없으면 스캔 생략
+    first_match = None
+    if "회" in text:
+        for pattern in _SURGERY_COUNT_RES:
+            match = pattern.search(text)
+            if match and (first_match is None or match.start() < first_match.start()):
+                first_match = match
 
-    if not results:
+    if first_match is None:
         return SurgeryCountLimitResult(
             count_text=None,
             count_value=None,
@@ -1166,10 +1199,17 @@ def extract_surgery_count_limit(text: str) -> SurgeryCountLimitResult:
             reason="횟수 제한 표현 미발견",
         )
 
-    # 가장 먼저 등장한 것 선택
-    results.sort(key=lambda x: x[2])
-    matched_text, count_value, _ = results[0]
+    matched_text = first_match.group(0).strip()
+    # 숫자 추출 시도
+    count_value = None
+    if first_match.lastindex and first_match.lastindex >= 1:
+        try:
+            count_value = int(first_match.group(1))
+        except (ValueError, TypeError):
+            pass
 
+    # 수술 관련 키워드 확인 (수술비 문맥인지)
+    has_surgery_context = any(kw in text for kw in SURGERY_POSITIVE_KEYWORDS)
     confidence = "high" if has_surgery_context else "medium"
 
     return SurgeryCountLimitResult(
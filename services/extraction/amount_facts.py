@@ -0,0 +1,208 @@
+"""
+STEP 4.24: 가입설계서 담보 표 금액 (coverage_amount_fact) 조회
+
+가입설계서 금액은 적재 시 표 행 단위로 coverage_amount_fact에 저장된다
+(services/ingestion/amount_table.py). 조회 경로는 preview regex 추출 대신
+(document_id, coverage_code)의 표 행 금액을 먼저 쓰고, 행이 없으면
+(표가 없는 문서 / 종별 금액 셀 / 담보 매핑 실패) 기존 regex 추출로 fallback한다.
+
+- get_compare_axis가 조회한 가입설계서 문서의 fact를 AmountFactIndex
+  (프로세스, document_id 기준 LRU)에 등록한다 (fact 없는 문서도 등록 → 재조회 안함)
+- run_amount_extractor(name, ...): fact가 있으면 해당 extractor 결과 형식
+  (confidence "high", method "table")으로 반환, 없으면 run_extractor (STEP 4.17)
+- 같은 문서에 같은 담보 행이 여러 개면 (page_no, row_index) 첫 행
+"""
+
+from __future__ import annotations
+
+import os
+import threading
+from collections import OrderedDict
+from dataclasses import asdict, dataclass
+from typing import Any, Iterable
+
+from .amount_extractor import AmountExtract, DiagnosisLumpSumResult, SurgeryAmountResult
+from .chunk_extraction import run_extractor
+
+
+# fact를 쓰는 문서 유형 (표 구조가 있는 문서)
+AMOUNT_FACT_DOC_TYPES = ("가입설계서",)
+
+
+@dataclass(frozen=True)
+class AmountFact:
+    """coverage_amount_fact 1행 (조회에 쓰는 컬럼)"""
+    document_id: int
+    coverage_code: str
+    coverage_name: str
+    benefit_amount: int
+    benefit_text: str
+    benefit_unit: str | None
+    premium_amount: int | None
+    premium_text: str | None
+    page_no: int
+    row_index: int
+
+
+def is_amount_fact_enabled() -> bool:
+    """AMOUNT_FACT_ENABLED 환경변수 확인 (기본: 사용)"""
+    return os.environ.get("AMOUNT_FACT_ENABLED", "1") == "1"
+
+
+def get_amount_fact_max_documents() -> int:
+    """인덱스 최대 문서 수 (기본: 1024)"""
+    return int(os.environ.get("AMOUNT_FACT_MAX_DOCUMENTS", "1024"))
+
+
+@dataclass
+class AmountFactStats:
+    """fact 사용 통계"""
+    documents: int = 0  # 등록한 문서 수
+    hits: int = 0       # fact 사용
+    misses: int = 0     # 등록 문서에 해당 담보 행 없음 → regex
+    evictions: int = 0
+
+
+class AmountFactIndex:
+    """document_id → {coverage_code: AmountFact} (LRU)"""
+
+    def __init__(self, max_documents: int = 1024):
+        self.max_documents = max_documents
+        self._documents: OrderedDict[int, dict[str, AmountFact]] = OrderedDict()
+        self._stats = AmountFactStats()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._documents)
+
+    def missing(self, document_ids: Iterable[int]) -> list[int]:
+        """아직 등록하지 않은 document_id (입력 순서, 중복 제거)"""
+        with self._lock:
+            return [doc_id for doc_id in dict.fromkeys(document_ids) if doc_id not in self._documents]
+
+    def register(self, document_id: int, facts: Iterable[AmountFact]) -> None:
+        """문서의 fact 등록 (빈 목록도 등록)"""
+        by_code: dict[str, AmountFact] = {}
+        for fact in sorted(facts, key=lambda f: (f.page_no, f.row_index)):
+            by_code.setdefault(fact.coverage_code, fact)
+        with self._lock:
+            self._documents[document_id] = by_code
+            self._documents.move_to_end(document_id)
+            self._stats.documents += 1
+            while len(self._documents) > self.max_documents:
+                self._documents.popitem(last=False)
+                self._stats.evictions += 1
+
+    def lookup(self, document_id: int | None, coverage_code: str | None) -> AmountFact | None:
+        """(document_id, coverage_code) 첫 행 (미등록 문서 / 행 없음이면 None)"""
+        if document_id is None or not coverage_code:
+            return None
+        with self._lock:
+            facts = self._documents.get(document_id)
+            if facts is None:
+                return None
+            fact = facts.get(coverage_code)
+            if fact is None:
+                self._stats.misses += 1
+            else:
+                self._stats.hits += 1
+            return fact
+
+    def clear(self) -> None:
+        """엔트리 전체 삭제 (통계는 유지)"""
+        with self._lock:
+            self._documents.clear()
+
+    def stats(self) -> dict[str, Any]:
+        """통계 + 문서 수"""
+        with self._lock:
+            return {**asdict(self._stats), "entries": len(self._documents)}
+
+
+_amount_fact_index: AmountFactIndex | None = None
+
+
+def get_amount_fact_index() -> AmountFactIndex | None:
+    """프로세스 단위 인덱스 (AMOUNT_FACT_ENABLED=0이면 None)"""
+    global _amount_fact_index
+
+    if not is_amount_fact_enabled():
+        return None
+
+    if _amount_fact_index is None:
+        _amount_fact_index = AmountFactIndex(max_documents=get_amount_fact_max_documents())
+    return _amount_fact_index
+
+
+def clear_amount_fact_index() -> None:
+    """프로세스 인덱스 초기화 (엔트리 + 통계)"""
+    global _amount_fact_index
+    _amount_fact_index = None
+
+
+# =============================================================================
+# 조회 경로: fact → extractor 결과 형식
+# =============================================================================
+
+def _fact_result(name: str, fact: AmountFact) -> Any | None:
+    if name == "amount":
+        return AmountExtract(
+            amount_value=fact.benefit_amount,
+            amount_text=fact.benefit_text,
+            currency="KRW",
+            unit=fact.benefit_unit,
+            confidence="high",
+            method="table",
+            matched_span=f"{fact.coverage_name} {fact.benefit_text}",
+        )
+    if name == "diagnosis_lump_sum":
+        return DiagnosisLumpSumResult(
+            amount_value=fact.benefit_amount,
+            amount_text=fact.benefit_text,
+            confidence="high",
+            reason=None,
+            method="table",
+        )
+    if name == "surgery_amount":
+        return SurgeryAmountResult(
+            amount_value=fact.benefit_amount,
+            amount_text=fact.benefit_text,
+            confidence="high",
+            reason=None,
+            method="table",
+        )
+    return None
+
+
+def lookup_amount_fact(
+    document_id: int | None,
+    coverage_code: str | None,
+    doc_type: str | None,
+) -> AmountFact | None:
+    """가입설계서 evidence의 담보 표 행 (인덱스 비활성 / 미등록이면 None)"""
+    if doc_type not in AMOUNT_FACT_DOC_TYPES:
+        return None
+    index = _amount_fact_index if _amount_fact_index is not None else get_amount_fact_index()
+    if index is None:
+        return None
+    return index.lookup(document_id, coverage_code)
+
+
+def run_amount_extractor(
+    name: str,
+    text: str,
+    doc_type: str | None,
+    document_id: int | None = None,
+    coverage_code: str | None = None,
+) -> Any:
+    """
+    금액 extractor ("amount" / "diagnosis_lump_sum" / "surgery_amount") 실행
+
+    가입설계서 evidence에 담보 표 행이 있으면 그 금액, 없으면 run_extractor (regex)
+    """
+    fact = lookup_amount_fact(document_id, coverage_code, doc_type)
+    if fact is not None:
+        result = _fact_result(name, fact)
+        if result is not None:
+            return result
+    return run_extractor(name, text, doc_type)
@@ -0,0 +1,189 @@
+"""
+STEP 4.21: corpus 단위 batch 추출 (프로세스 풀)
+
+audit / backfill 도구는 chunk마다 extractor를 한 번씩 단일 프로세스에서 호출했다.
+(chunk_id, text, doc_type) iterable을 받아 chunk_size개씩 작업 단위로 묶어
+프로세스 풀에서 병렬 추출하고, 결과는 입력 순서대로 스트리밍한다.
+
+- extract_amount_batch: extract_amount(text, doc_type)
+- extract_condition_batch: extract_condition_snippet(text)
+- extract_slots_batch: chunk 1개를 보험사 1곳의 evidence 1건으로 보고 extract_slots
+  (coverage_type별 슬롯 규칙, 약관은 policy evidence)
+- 입력은 한 번에 읽지 않는다: 작업 단위를 workers × EXTRACTION_BATCH_INFLIGHT개까지만
+  제출하고, 앞 단위 결과를 내보낸 만큼 다음 단위를 읽는다 (메모리 = in-flight 단위 수)
+- workers <= 1이거나 입력이 1단위 이하면 풀 없이 현재 프로세스에서 실행
+
+rule extractor는 텍스트와 인자에만 의존하므로 (STEP 4.18) 워커마다 메모가 따로
+쌓여도 결과는 단일 프로세스 실행과 같다.
+"""
+
+from __future__ import annotations
+
+import functools
+import os
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from dataclasses import dataclass
+from itertools import chain, islice
+from typing import Any, Callable, Iterable, Iterator
+
+from .amount_extractor import AmountExtract, extract_amount
+from .condition_extractor import ConditionExtract, extract_condition_snippet
+from .slot_extractor import ComparisonSlot, extract_slots
+
+
+# (chunk_id, text, doc_type)
+BatchItem = tuple[int, str, str | None]
+
+
+def get_extraction_batch_workers() -> int:
+    """batch 추출 프로세스 수 (기본: CPU 수)"""
+    return int(os.environ.get("EXTRACTION_BATCH_WORKERS", str(os.cpu_count() or 1)))
+
+
+def get_extraction_batch_chunk_size() -> int:
+    """작업 단위당 chunk 수 (기본: 256)"""
+    return int(os.environ.get("EXTRACTION_BATCH_CHUNK_SIZE", "256"))
+
+
+def get_extraction_batch_inflight() -> int:
+    """워커당 동시에 제출해 두는 작업 단위 수 (기본: 2)"""
+    return int(os.environ.get("EXTRACTION_BATCH_INFLIGHT", "2"))
+
+
+def _work_units(items: Iterable[BatchItem], chunk_size: int) -> Iterator[list[BatchItem]]:
+    iterator = iter(items)
+    while unit := list(islice(iterator, chunk_size)):
+        yield unit
+
+
+def run_batch(
+    unit_func: Callable[[list[BatchItem]], list[tuple[int, Any]]],
+    items: Iterable[BatchItem],
+    workers: int | None = None,
+    chunk_size: int | None = None,
+) -> Iterator[tuple[int, Any]]:
+    """
+    작업 단위별 unit_func를 프로세스 풀에서 실행, (chunk_id, 결과)를 입력 순서대로 반환
+
+    Args:
+        unit_func: 작업 단위(list[BatchItem]) → [(chunk_id, 결과)], pickle 가능해야 함
+            (모듈 수준 함수 또는 그 functools.partial)
+        items: (chunk_id, text, doc_type) iterable
+        workers: 프로세스 수 (기본: EXTRACTION_BATCH_WORKERS)
+        chunk_size: 작업 단위 크기 (기본: EXTRACTION_BATCH_CHUNK_SIZE)
+    """
+    workers = workers if workers is not None else get_extraction_batch_workers()
+    chunk_size = max(1, chunk_size if chunk_size is not None else get_extraction_batch_chunk_size())
+    units = _work_units(items, chunk_size)
+
+    # 1단위 이하면 프로세스 기동 비용만 든다
+    first = next(units, None)
+    second = next(units, None) if workers > 1 else None
+    if second is None:
+        for unit in chain(filter(None, [first]), units):
+            yield from unit_func(unit)
+        return
+
+    max_inflight = workers * max(1, get_extraction_batch_inflight())
+    pool = ProcessPoolExecutor(max_workers=workers)
+    pending: deque[Future] = deque()
+    try:
+        for unit in chain([first, second], units):
+            pending.append(pool.submit(unit_func, unit))
+            if len(pending) >= max_inflight:
+                yield from pending.popleft().result()
+        while pending:
+            yield from pending.popleft().result()
+    finally:
+        # 소비자가 중간에 멈추면 (generator close) 남은 단위는 취소
+        pool.shutdown(wait=True, cancel_futures=True)
+
+
+# =============================================================================
+# Work unit functions (워커 프로세스에서 실행, pickle 가능한 모듈 수준 함수)
+# =============================================================================
+
+def _amount_unit(unit: list[BatchItem]) -> list[tuple[int, AmountExtract]]:
+    return [(chunk_id, extract_amount(text, doc_type=doc_type)) for chunk_id, text, doc_type in unit]
+
+
+def _condition_unit(unit: list[BatchItem]) -> list[tuple[int, ConditionExtract]]:
+    return [(chunk_id, extract_condition_snippet(text)) for chunk_id, text, _ in unit]
+
+
+@dataclass
+class BatchEvidence:
+    """extract_slots 입력용 chunk evidence (compare / policy axis evidence와 같은 속성)"""
+    chunk_id: int
+    doc_type: str | None
+    preview: str
+    document_id: int | None = None
+    page_start: int | None = None
+
+
+@dataclass
+class _BatchAxisItem:
+    insurer_code: str
+    evidence: list[BatchEvidence]
+
+
+def _slots_unit(
+    unit: list[BatchItem],
+    coverage_codes: list[str],
+    query: str,
+    insurer_code: str,
+) -> list[tuple[int, list[ComparisonSlot]]]:
+    results = []
+    for chunk_id, text, doc_type in unit:
+        axis = [_BatchAxisItem(insurer_code, [BatchEvidence(chunk_id, doc_type, text)])]
+        # A2 정책: 약관은 policy evidence, 나머지는 compare evidence
+        compare_axis, policy_axis = ([], axis) if doc_type == "약관" else (axis, [])
+        results.append((
+            chunk_id,
+            extract_slots([insurer_code], compare_axis, policy_axis, coverage_codes, query=query),
+        ))
+    return results
+
+
+# =============================================================================
+# Batch APIs
+# =============================================================================
+
+def extract_amount_batch(
+    items: Iterable[BatchItem],
+    workers: int | None = None,
+    chunk_size: int | None = None,
+) -> Iterator[tuple[int, AmountExtract]]:
+    """(chunk_id, text, doc_type) → (chunk_id, extract_amount 결과), 입력 순서"""
+    return run_batch(_amount_unit, items, workers=workers, chunk_size=chunk_size)
+
+
+def extract_condition_batch(
+    items: Iterable[BatchItem],
+    workers: int | None = None,
+    chunk_size: int | None = None,
+) -> Iterator[tuple[int, ConditionExtract]]:
+    """(chunk_id, text, doc_type) → (chunk_id, extract_condition_snippet 결과), 입력 순서"""
+    return run_batch(_condition_unit, items, workers=workers, chunk_size=chunk_size)
+
+
+def extract_slots_batch(
+    items: Iterable[BatchItem],
+    coverage_codes: list[str],
+    query: str = "",
+    insurer_code: str = "CHUNK",
+    workers: int | None = None,
+    chunk_size: int | None = None,
+) -> Iterator[tuple[int, list[ComparisonSlot]]]:
+    """
+    (chunk_id, text, doc_type) → (chunk_id, list[ComparisonSlot]), 입력 순서
+
+    chunk마다 insurer_code 1곳의 evidence 1건으로 extract_slots를 실행한다
+    (chunk별 슬롯 채움 여부 audit용). text는 compare_axis evidence preview와
+    같은 형태(chunk_extraction.compare_preview)로 넘기면 조회 경로와 같은 결과가 된다.
+    """
+    unit_func = functools.partial(
+        _slots_unit, coverage_codes=list(coverage_codes), query=query, insurer_code=insurer_code,
+    )
+    return run_batch(unit_func, items, workers=workers, chunk_size=chunk_size)
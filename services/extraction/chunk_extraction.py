@@ -0,0 +1,287 @@
+"""
+STEP 4.17: chunk 단위 rule 추출 결과 저장 (적재 시 1회)
+
+compare 요청마다 같은 chunk preview에 extract_amount / extract_condition_snippet
+(비교표 셀)와 진단비 일시금 / 수술비 / 수술 횟수 추출(슬롯)을 다시 실행했다.
+적재 시 chunk마다 한 번 추출해 chunk.meta["extraction"]에 저장하고,
+조회 경로는 저장된 결과를 읽는다.
+
+- 입력: compare_axis evidence preview와 같은 텍스트
+  (LEFT(content, COMPARE_PREVIEW_LEN) → 줄바꿈 공백 치환 → strip)
+- preview_hash: evidence preview가 같은 텍스트일 때만 저장 결과 사용
+  (2-pass target_keyword 잘라내기 등 다른 preview는 on-the-fly 추출)
+- versions: extractor별 규칙 버전. 규칙을 바꾸면 해당 버전을 올리고
+  (@memoize_extractor의 version, STEP 4.18) tools/backfill_chunk_extraction.py로
+  버전이 다른 extractor만 재추출한다
+- chunk.meta에 두므로 corpus 세대 전환(STEP 4.8) / shard(STEP 4.10)에도 그대로 따라간다
+
+조회 경로: get_compare_axis가 조회한 chunk의 저장 결과를 StoredExtractionIndex
+(프로세스, preview_hash 기준 LRU)에 등록하고, 셀 / 슬롯 추출은 run_extractor()로
+저장 결과를 먼저 찾는다. 버전이 다르거나 없으면 on-the-fly 추출 (결과 동일).
+"""
+
+from __future__ import annotations
+
+import hashlib
+import os
+import threading
+from collections import OrderedDict
+from dataclasses import asdict, dataclass
+from typing import Any, Callable
+
+from .amount_extractor import (
+    AmountExtract,
+    AmountToken,
+    DiagnosisLumpSumResult,
+    SurgeryAmountResult,
+    SurgeryCountLimitResult,
+    extract_amount,
+    extract_diagnosis_lump_sum,
+    extract_surgery_amount,
+    extract_surgery_count_limit,
+    tokenize_amounts,
+)
+from .condition_extractor import ConditionExtract, extract_condition_snippet
+
+
+# get_compare_axis의 LEFT(c.content, ...) 길이
+COMPARE_PREVIEW_LEN = 1000
+
+# A2 정책: 약관은 금액/조건 추출 대상이 아님
+NON_EXTRACTION_DOC_TYPES = ("약관",)
+
+
+@dataclass(frozen=True)
+class RuleExtractor:
+    """저장 대상 rule extractor"""
+    name: str
+    version: str  # 규칙 변경 시 올린다 → backfill이 이 extractor만 재추출 (메모 키와 동일)
+    run: Callable[[str, str | None], Any]
+    load: Callable[[Any], Any]  # 저장된 JSON → 결과 객체
+
+
+def _load_tokens(value: list[dict[str, Any]]) -> list[AmountToken]:
+    return [AmountToken(**token) for token in value]
+
+
+EXTRACTORS: dict[str, RuleExtractor] = {
+    extractor.name: extractor
+    for extractor in (
+        RuleExtractor(
+            "amount_candidates", "1",
+            lambda text, doc_type: tokenize_amounts(text),
+            _load_tokens,
+        ),
+        RuleExtractor(
+            "amount", extract_amount.extractor_version,
+            lambda text, doc_type: extract_amount(text, doc_type=doc_type),
+            lambda value: AmountExtract(**value),
+        ),
+        RuleExtractor(
+            "condition", extract_condition_snippet.extractor_version,
+            lambda text, doc_type: extract_condition_snippet(text),
+            lambda value: ConditionExtract(value["snippet"], tuple(value["matched_terms"])),
+        ),
+        RuleExtractor(
+            "diagnosis_lump_sum", extract_diagnosis_lump_sum.extractor_version,
+            lambda text, doc_type: extract_diagnosis_lump_sum(text, doc_type=doc_type),
+            lambda value: DiagnosisLumpSumResult(**value),
+        ),
+        RuleExtractor(
+            "surgery_amount", extract_surgery_amount.extractor_version,
+            lambda text, doc_type: extract_surgery_amount(text, doc_type=doc_type),
+            lambda value: SurgeryAmountResult(**value),
+        ),
+        RuleExtractor(
+            "surgery_count_limit", extract_surgery_count_limit.extractor_version,
+            lambda text, doc_type: extract_surgery_count_limit(text),
+            lambda value: SurgeryCountLimitResult(**value),
+        ),
+    )
+}
+
+
+def current_versions() -> dict[str, str]:
+    """extractor별 현재 규칙 버전"""
+    return {name: extractor.version for name, extractor in EXTRACTORS.items()}
+
+
+def compare_preview(content: str) -> str:
+    """get_compare_axis evidence preview와 같은 텍스트"""
+    return content[:COMPARE_PREVIEW_LEN].replace("\n", " ").strip()
+
+
+def preview_hash(text: str) -> str:
+    """추출 입력 텍스트 해시"""
+    return hashlib.blake2b(text.encode("utf-8"), digest_size=16).hexdigest()
+
+
+def _json_fields(items: list[tuple[str, Any]]) -> dict[str, Any]:
+    # 저장(jsonb) 왕복과 같은 형태: tuple 필드는 list
+    return {key: list(value) if isinstance(value, tuple) else value for key, value in items}
+
+
+def _dump(result: Any) -> Any:
+    if isinstance(result, list):
+        return [asdict(item, dict_factory=_json_fields) for item in result]
+    return asdict(result, dict_factory=_json_fields)
+
+
+def stale_extractors(stored: dict[str, Any] | None, text_hash: str) -> list[str]:
+    """저장 결과 중 다시 추출해야 하는 extractor (입력이 바뀌면 전체)"""
+    if not stored or stored.get("preview_hash") != text_hash:
+        return list(EXTRACTORS)
+
+    versions = stored.get("versions") or {}
+    results = stored.get("results") or {}
+    return [
+        name for name, extractor in EXTRACTORS.items()
+        if versions.get(name) != extractor.version or name not in results
+    ]
+
+
+def extract_chunk(
+    content: str,
+    doc_type: str,
+    previous: dict[str, Any] | None = None,
+) -> dict[str, Any] | None:
+    """
+    chunk 1개의 rule 추출 결과 (chunk.meta["extraction"] 값)
+
+    previous(기존 저장 결과)가 있으면 버전이 같은 extractor 결과는 그대로 두고
+    나머지만 다시 추출한다. 추출 대상 doc_type이 아니면 None.
+    """
+    if doc_type in NON_EXTRACTION_DOC_TYPES:
+        return None
+
+    text = compare_preview(content)
+    text_hash = preview_hash(text)
+    stale = set(stale_extractors(previous, text_hash))
+
+    results: dict[str, Any] = {}
+    for name, extractor in EXTRACTORS.items():
+        if name in stale:
+            results[name] = _dump(extractor.run(text, doc_type))
+        else:
+            results[name] = previous["results"][name]
+
+    return {
+        "preview_hash": text_hash,
+        "preview_len": COMPARE_PREVIEW_LEN,
+        "doc_type": doc_type,
+        "versions": current_versions(),
+        "results": results,
+    }
+
+
+# =============================================================================
+# 조회 경로: preview_hash → 저장 결과
+# =============================================================================
+
+def is_stored_extraction_enabled() -> bool:
+    """STORED_EXTRACTION_ENABLED 환경변수 확인 (기본: 사용)"""
+    return os.environ.get("STORED_EXTRACTION_ENABLED", "1") == "1"
+
+
+def get_stored_extraction_max_entries() -> int:
+    """인덱스 최대 엔트리 수 (기본: 4096 chunk)"""
+    return int(os.environ.get("STORED_EXTRACTION_MAX_ENTRIES", "4096"))
+
+
+@dataclass
+class StoredExtractionStats:
+    """저장 결과 사용 통계"""
+    registered: int = 0
+    hits: int = 0
+    misses: int = 0     # 같은 preview의 저장 결과 없음 → on-the-fly
+    stale: int = 0      # 저장 결과 버전이 현재 규칙과 다름 → on-the-fly
+    evictions: int = 0
+
+
+class StoredExtractionIndex:
+    """preview_hash → chunk.meta["extraction"] (LRU)"""
+
+    def __init__(self, max_entries: int = 4096):
+        self.max_entries = max_entries
+        self._entries: OrderedDict[str, dict[str, Any]] = OrderedDict()
+        self._stats = StoredExtractionStats()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def register(self, stored: dict[str, Any] | None) -> None:
+        """조회한 chunk의 저장 결과 등록"""
+        if not stored or "preview_hash" not in stored:
+            return
+        with self._lock:
+            self._entries[stored["preview_hash"]] = stored
+            self._entries.move_to_end(stored["preview_hash"])
+            self._stats.registered += 1
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self._stats.evictions += 1
+
+    def lookup(self, name: str, text: str, doc_type: str | None) -> Any | None:
+        """text / doc_type / 버전이 모두 같은 저장 결과 (없으면 None)"""
+        if not self._entries:
+            return None
+
+        extractor = EXTRACTORS[name]
+        text_hash = preview_hash(text)
+        with self._lock:
+            stored = self._entries.get(text_hash)
+            if stored is None or stored.get("doc_type") != doc_type:
+                self._stats.misses += 1
+                return None
+            if (stored.get("versions") or {}).get(name) != extractor.version:
+                self._stats.stale += 1
+                return None
+            self._stats.hits += 1
+
+        # 호출 측 변경이 저장 결과에 남지 않도록 매번 새 객체
+        return extractor.load(stored["results"][name])
+
+    def clear(self) -> None:
+        """엔트리 전체 삭제 (통계는 유지)"""
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> dict[str, Any]:
+        """통계 + 엔트리 수"""
+        with self._lock:
+            return {**asdict(self._stats), "entries": len(self._entries)}
+
+
+_stored_extraction_index: StoredExtractionIndex | None = None
+
+
+def get_stored_extraction_index() -> StoredExtractionIndex | None:
+    """프로세스 단위 인덱스 (STORED_EXTRACTION_ENABLED=0이면 None)"""
+    global _stored_extraction_index
+
+    if not is_stored_extraction_enabled():
+        return None
+
+    if _stored_extraction_index is None:
+        _stored_extraction_index = StoredExtractionIndex(
+            max_entries=get_stored_extraction_max_entries(),
+        )
+    return _stored_extraction_index
+
+
+def clear_stored_extraction_index() -> None:
+    """프로세스 인덱스 초기화 (엔트리 + 통계)"""
+    global _stored_extraction_index
+    _stored_extraction_index = None
+
+
+def run_extractor(name: str, text: str, doc_type: str | None = None) -> Any:
+    """저장 결과가 있으면 사용, 없으면 on-the-fly 추출"""
+    # 슬롯 추출에서 evidence마다 호출되므로 생성된 인덱스는 환경변수를 다시 읽지 않는다
+    index = _stored_extraction_index if _stored_extraction_index is not None else get_stored_extraction_index()
+    if index is not None:
+        stored = index.lookup(name, text, doc_type)
+        if stored is not None:
+            return stored
+    return EXTRACTORS[name].run(text, doc_type)
@@ -2,12 +2,21 @@
 Condition Extractor - Rule-based extraction of insurance payment conditions
 
 지급조건 관련 스니펫을 규칙 기반으로 추출
+
+STEP 4.22: 키워드 automaton 1-pass 스캔
+- 문장마다 키워드 20개를 substring 검색하던 방식 대신, CONDITION_KEYWORDS를
+  trie 정규식 1개로 컴파일하여 텍스트 전체를 1번 스캔하고, 키워드 hit 위치를
+  구분자 위치 index(bisect)로 문장 번호에 매핑한다
+- 문장 선택 (키워드 수 최대인 첫 문장) / matched_terms 순서 / 자르기는 그대로
 """
 
 from __future__ import annotations
 
 import re
-from dataclasses import dataclass, field
+from bisect import bisect_right
+from dataclasses import dataclass
+
+from .extraction_memo import memoize_extractor
 
 
 # 지급조건 관련 키워드
@@ -36,40 +45,83 @@ CONDITION_KEYWORDS = [
 
 # 문장 분리 패턴
 SENTENCE_DELIMITERS = r"[.\n;]"
+SENTENCE_DELIMITER_PATTERN = re.compile(SENTENCE_DELIMITERS)
+
+# 너무 짧은 문장은 제외 (strip 후 길이 기준)
+MIN_SENTENCE_LENGTH = 5
 
 # 최대 스니펫 길이
 MAX_SNIPPET_LENGTH = 120
 
 
-@dataclass
+@dataclass(frozen=True)
 class ConditionExtract:
-    """지급조건 추출 결과"""
+    """지급조건 추출 결과 (STEP 4.18: 메모 결과 공유 → matched_terms도 tuple)"""
     snippet: str | None
-    matched_terms: list[str] = field(default_factory=list)
+    matched_terms: tuple[str, ...] = ()
 
 
-def _split_sentences(text: str) -> list[str]:
-    """텍스트를 문장 단위로 분리"""
-    # 기본 분리
-    sentences = re.split(SENTENCE_DELIMITERS, text)
+def _overlap_closure(keywords: list[str]) -> set[str]:
+    """
+    키워드끼리 겹쳐 이어지는 문자열 (A 접미사 = B 접두사, 예: 대기 + 기타피부암 → 대기타피부암)
 
-    # 빈 문장 제거 및 정리
-    result = []
-    for s in sentences:
-        s = s.strip()
-        if s and len(s) > 5:  # 너무 짧은 건 제외
-            result.append(s)
+    정규식 스캔은 겹치지 않는 매치만 돌려주므로, 앞 매치 안에서 시작해 밖으로
+    이어지는 키워드를 놓치지 않도록 합친 문자열도 후보에 넣는다 (더 없을 때까지 반복).
+    """
+    candidates = set(keywords)
+    pending = list(candidates)
+    while pending:
+        merged = set()
+        for a in pending:
+            for b in keywords:
+                if b in a:
+                    continue
+                for k in range(min(len(a), len(b)) - 1, 0, -1):
+                    if a.endswith(b[:k]):
+                        merged.add(a + b[k:])
+        pending = [m for m in merged if m not in candidates]
+        candidates.update(pending)
+    return candidates
+
+
+def _trie_pattern(words: set[str]) -> str:
+    """문자열 집합 → trie 정규식 (같은 위치에서는 가장 긴 문자열이 매치)"""
+    trie: dict = {}
+    for word in words:
+        node = trie
+        for ch in word:
+            node = node.setdefault(ch, {})
+        node[""] = {}
+
+    def _node(node: dict) -> str:
+        end = "" in node
+        branches = [re.escape(ch) + _node(child) for ch, child in sorted(node.items()) if ch]
+        if not branches:
+            return ""
+        body = branches[0] if len(branches) == 1 else "(?:" + "|".join(branches) + ")"
+        if end:
+            # 더 긴 문자열을 먼저 시도 (greedy optional)
+            return body + "?" if len(branches) == 1 and len(body) == 1 else "(?:" + body + ")?"
+        return body
+
+    return _node(trie)
+
+
+def _build_keyword_automaton(keywords: list[str]) -> tuple[re.Pattern, dict[str, tuple[int, ...]]]:
+    """
+    키워드 목록 → (스캔 정규식, 매치 문자열 → 포함된 키워드 index)
 
-    return result
+    매치 하나가 여러 키워드를 포함할 수 있다 (진단확정 → 진단 / 진단확정 / 확정).
+    """
+    candidates = _overlap_closure(keywords)
+    contained = {
+        word: tuple(i for i, kw in enumerate(keywords) if kw in word)
+        for word in candidates
+    }
+    return re.compile(_trie_pattern(candidates)), contained
 
 
-def _count_keywords(sentence: str) -> tuple[int, list[str]]:
-    """문장에 포함된 키워드 수와 목록 반환"""
-    matched = []
-    for keyword in CONDITION_KEYWORDS:
-        if keyword in sentence:
-            matched.append(keyword)
-    return len(matched), matched
+_KEYWORD_PATTERN, _KEYWORD_INDEX = _build_keyword_automaton(CONDITION_KEYWORDS)
 
 
 def _truncate_snippet(text: str, max_length: int = MAX_SNIPPET_LENGTH) -> str:
@@ -86,6 +138,7 @@ def _truncate_snippet(text: str, max_length: int = MAX_SNIPPET_LENGTH) -> str:
     return truncated + "..."
 
 
+@memoize_extractor("condition", version="1")
 def extract_condition_snippet(text: str) -> ConditionExtract:
     """
     지급조건 관련 1줄 스니펫을 추출
@@ -102,33 +155,44 @@ def extract_condition_snippet(text: str) -> ConditionExtract:
         ConditionExtract: snippet과 matched_terms
     """
     if not text or len(text.strip()) == 0:
-        return ConditionExtract(snippet=None, matched_terms=[])
-
-    # 문장 분리
-    sentences = _split_sentences(text)
-
-    if not sentences:
-        return ConditionExtract(snippet=None, matched_terms=[])
+        return ConditionExtract(snippet=None, matched_terms=())
 
-    # 각 문장별 키워드 카운트
-    scored_sentences: list[tuple[int, list[str], str]] = []
-    for sentence in sentences:
-        count, matched = _count_keywords(sentence)
-        if count > 0:
-            scored_sentences.append((count, matched, sentence))
-
-    if not scored_sentences:
+    # 키워드 hit → 문장 번호 (문장 i = i번째 구분자 앞, 키워드에는 구분자가 없다)
+    matches = _KEYWORD_PATTERN.finditer(text)
+    first = next(matches, None)
+    if first is None:
         # 키워드 없으면 None 반환
-        return ConditionExtract(snippet=None, matched_terms=[])
-
-    # 키워드 가장 많이 포함한 문장 선택
-    scored_sentences.sort(key=lambda x: x[0], reverse=True)
-    best_count, best_matched, best_sentence = scored_sentences[0]
+        return ConditionExtract(snippet=None, matched_terms=())
+
+    boundaries = [m.start() for m in SENTENCE_DELIMITER_PATTERN.finditer(text)]
+    sentence_hits: dict[int, set[int]] = {}
+    for m in (first, *matches):
+        index = bisect_right(boundaries, m.start())
+        hits = sentence_hits.get(index)
+        if hits is None:
+            hits = sentence_hits[index] = set()
+        hits.update(_KEYWORD_INDEX[m.group()])
+
+    # 키워드 가장 많이 포함한 문장 선택 (동점이면 앞 문장)
+    best_hits: set[int] | None = None
+    best_sentence = ""
+    for index in sorted(sentence_hits):
+        hits = sentence_hits[index]
+        if best_hits is not None and len(hits) <= len(best_hits):
+            continue
+        start = boundaries[index - 1] + 1 if index else 0
+        end = boundaries[index] if index < len(boundaries) else len(text)
+        sentence = text[start:end].strip()
+        if len(sentence) > MIN_SENTENCE_LENGTH:
+            best_hits, best_sentence = hits, sentence
+
+    if best_hits is None:
+        return ConditionExtract(snippet=None, matched_terms=())
 
     # 스니펫 길이 제한
     snippet = _truncate_snippet(best_sentence)
 
     return ConditionExtract(
         snippet=snippet,
-        matched_terms=best_matched,
+        matched_terms=tuple(CONDITION_KEYWORDS[i] for i in sorted(best_hits)),
     )
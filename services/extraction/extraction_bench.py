@@ -0,0 +1,299 @@
+"""
+STEP 4.23: rule extractor 마이크로 벤치마크 (고정 corpus 샘플)
+
+요청마다 실행되는 CPU 추출 경로의 처리량을 고정 입력으로 측정하고
+baseline(artifacts/bench/extraction_baseline.json)과 비교한다.
+
+- 케이스: extract_amount (가입설계서 strict / default), extract_diagnosis_lump_sum,
+  extract_surgery_amount, extract_condition_snippet, mask_pii, extract_slots,
+  CoverageExtractor.extract (ontology, DB 미사용)
+- mask_pii[long] (STEP 4.25): chunk를 이어 붙여 LLM 1회 입력 한도
+  (LLM_MAX_CHARS_PER_CALL) 길이로 만든 텍스트 + PII 샘플 줄
+- 입력: tests/fixtures/extraction_bench_corpus.yaml (chunk 샘플 + slots 질의)
+- 측정: 호출별 시간 → ops/sec, p50 / p99 (us)
+- 메모(STEP 4.18)는 끄고 측정한다 (반복 입력이 메모 hit이 되지 않도록)
+- 판정: baseline 대비 ops/sec가 max_slowdown배 넘게 떨어지거나
+  p99가 max_p99_ratio배 넘게 늘면 위반
+
+시간 baseline은 측정한 머신에 종속된다. 머신이 바뀌면 --update-baseline으로 다시 저장한다.
+"""
+
+from __future__ import annotations
+
+import os
+import statistics
+import time
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Iterator
+
+import yaml
+
+from .amount_extractor import extract_amount, extract_diagnosis_lump_sum, extract_surgery_amount
+from .batch_extraction import BatchEvidence
+from .condition_extractor import extract_condition_snippet
+from .extraction_memo import clear_extraction_memo
+from .llm_client import get_llm_max_chars_per_call
+from .pii_masker import mask_pii
+from .slot_extractor import extract_slots
+
+
+DEFAULT_CORPUS_PATH = Path(__file__).parent.parent.parent / "tests" / "fixtures" / "extraction_bench_corpus.yaml"
+
+DEFAULT_THRESHOLDS: dict[str, float] = {
+    "max_slowdown": 1.5,     # baseline 대비 ops/sec 하락 배수
+    "max_p99_ratio": 3.0,    # baseline 대비 p99 증가 배수 (꼬리 지연은 스케줄링 노이즈가 크다)
+    "min_p99_us_for_ratio": 50.0,  # 이보다 빠르면 p99 회귀 판정 안함
+}
+
+
+def get_extraction_bench_max_slowdown() -> float:
+    """허용 ops/sec 하락 배수 (기본: 1.5)"""
+    return float(os.environ.get("EXTRACTION_BENCH_MAX_SLOWDOWN", str(DEFAULT_THRESHOLDS["max_slowdown"])))
+
+
+# =============================================================================
+# Corpus
+# =============================================================================
+
+@dataclass
+class BenchChunk:
+    """벤치마크 입력 chunk"""
+    insurer: str
+    doc_type: str
+    text: str
+    page: int | None = None
+
+
+@dataclass
+class BenchCorpus:
+    """고정 corpus 샘플 (chunk + extract_slots 질의)"""
+    chunks: list[BenchChunk] = field(default_factory=list)
+    requests: list[dict[str, Any]] = field(default_factory=list)
+
+
+def load_bench_corpus(path: Path | str = DEFAULT_CORPUS_PATH) -> BenchCorpus:
+    with open(path, encoding="utf-8") as f:
+        data = yaml.safe_load(f) or {}
+    return BenchCorpus(
+        chunks=[
+            BenchChunk(insurer=c["insurer"], doc_type=c["doc_type"], text=c["text"], page=c.get("page"))
+            for c in data.get("chunks") or []
+        ],
+        requests=list(data.get("requests") or []),
+    )
+
+
+@dataclass
+class _BenchAxisItem:
+    insurer_code: str
+    evidence: list[BatchEvidence]
+
+
+def _slot_inputs(corpus: BenchCorpus) -> list[dict[str, Any]]:
+    """질의별 extract_slots 입력 (보험사별 compare / policy evidence, 약관은 policy)"""
+    insurers = list(dict.fromkeys(chunk.insurer for chunk in corpus.chunks))
+    compare_axis: list[_BenchAxisItem] = []
+    policy_axis: list[_BenchAxisItem] = []
+    for insurer in insurers:
+        compare, policy = [], []
+        for chunk_id, chunk in enumerate(corpus.chunks, start=1):
+            if chunk.insurer != insurer:
+                continue
+            ev = BatchEvidence(chunk_id, chunk.doc_type, chunk.text, document_id=chunk_id, page_start=chunk.page)
+            (policy if chunk.doc_type == "약관" else compare).append(ev)
+        compare_axis.append(_BenchAxisItem(insurer, compare))
+        policy_axis.append(_BenchAxisItem(insurer, policy))
+    return [
+        {
+            "insurers": insurers,
+            "compare_axis": compare_axis,
+            "policy_axis": policy_axis,
+            "coverage_codes": request.get("coverage_codes"),
+            "query": request.get("query", ""),
+        }
+        for request in corpus.requests
+    ]
+
+
+# =============================================================================
+# Cases
+# =============================================================================
+
+# 케이스 이름 → (함수, 호출 인자 목록)
+BenchCase = tuple[Callable[..., Any], list[tuple[tuple, dict[str, Any]]]]
+
+# mask_pii[long]에 chunk 사이마다 끼우는 PII 샘플 (유형별 1개씩)
+PII_SAMPLE_LINES = (
+    "계약자 주민등록번호 850101-1234567",
+    "담당자 이메일 agent@example.com",
+    "고객센터 연락처 010-1234-5678",
+    "환급 계좌 123-456-789012",
+)
+
+
+def _long_texts(texts: list[str], max_chars: int) -> list[str]:
+    """chunk마다 그 chunk부터 순환으로 이어 붙인 max_chars 길이 텍스트 (PII 샘플 줄 포함)"""
+    if not texts:
+        return []
+    long_texts: list[str] = []
+    for start in range(len(texts)):
+        parts: list[str] = []
+        length = 0
+        i = start
+        while length < max_chars:
+            part = f"{texts[i % len(texts)]}\n{PII_SAMPLE_LINES[i % len(PII_SAMPLE_LINES)]}\n"
+            parts.append(part)
+            length += len(part)
+            i += 1
+        long_texts.append("".join(parts)[:max_chars])
+    return long_texts
+
+
+def build_bench_cases(corpus: BenchCorpus) -> dict[str, BenchCase]:
+    """corpus → 케이스별 호출 목록 (이름 순서 = 보고 순서)"""
+    from services.ingestion.coverage_extractor import CoverageExtractor
+
+    texts = [chunk.text for chunk in corpus.chunks]
+    typed = [((chunk.text,), {"doc_type": chunk.doc_type}) for chunk in corpus.chunks]
+    coverage_extractor = CoverageExtractor(use_db=False)
+
+    return {
+        "extract_amount[strict]": (extract_amount, [((text,), {"doc_type": "가입설계서"}) for text in texts]),
+        "extract_amount[default]": (extract_amount, [((text,), {"doc_type": None}) for text in texts]),
+        "extract_diagnosis_lump_sum": (extract_diagnosis_lump_sum, typed),
+        "extract_surgery_amount": (extract_surgery_amount, typed),
+        "extract_condition_snippet": (extract_condition_snippet, [((text,), {}) for text in texts]),
+        "mask_pii": (mask_pii, [((text,), {}) for text in texts]),
+        "mask_pii[long]": (mask_pii, [((text,), {}) for text in _long_texts(texts, get_llm_max_chars_per_call())]),
+        "extract_slots": (extract_slots, [((), kwargs) for kwargs in _slot_inputs(corpus)]),
+        "CoverageExtractor.extract": (coverage_extractor.extract, typed),
+    }
+
+
+# =============================================================================
+# Measure
+# =============================================================================
+
+@dataclass
+class BenchResult:
+    """케이스 1개 측정 결과"""
+    name: str
+    calls: int
+    ops_per_sec: float
+    p50_us: float
+    p99_us: float
+
+    def to_dict(self) -> dict[str, Any]:
+        return asdict(self)
+
+
+@contextmanager
+def _memo_disabled() -> Iterator[None]:
+    previous = os.environ.get("EXTRACTION_MEMO_ENABLED")
+    os.environ["EXTRACTION_MEMO_ENABLED"] = "0"
+    clear_extraction_memo()
+    try:
+        yield
+    finally:
+        if previous is None:
+            os.environ.pop("EXTRACTION_MEMO_ENABLED", None)
+        else:
+            os.environ["EXTRACTION_MEMO_ENABLED"] = previous
+        clear_extraction_memo()
+
+
+def _percentile(sorted_samples: list[int], q: float) -> int:
+    return sorted_samples[min(len(sorted_samples) - 1, int(len(sorted_samples) * q))]
+
+
+def measure_case(name: str, case: BenchCase, rounds: int) -> BenchResult:
+    """
+    케이스 호출 목록을 rounds번 반복 측정 (첫 1회는 warm-up)
+
+    ops/sec = 전체 호출 수 / 호출 시간 합, p50 / p99 = 호출별 시간 분위수
+    """
+    func, calls = case
+    for args, kwargs in calls:
+        func(*args, **kwargs)
+
+    clock = time.perf_counter_ns
+    samples: list[int] = []
+    for _ in range(max(1, rounds)):
+        for args, kwargs in calls:
+            start = clock()
+            func(*args, **kwargs)
+            samples.append(clock() - start)
+
+    if not samples:
+        return BenchResult(name=name, calls=0, ops_per_sec=0.0, p50_us=0.0, p99_us=0.0)
+    samples.sort()
+    total_ns = sum(samples)
+    return BenchResult(
+        name=name,
+        calls=len(samples),
+        ops_per_sec=round(len(samples) / (total_ns / 1e9), 1) if total_ns else 0.0,
+        p50_us=round(statistics.median(samples) / 1000, 2),
+        p99_us=round(_percentile(samples, 0.99) / 1000, 2),
+    )
+
+
+def run_bench(
+    corpus: BenchCorpus,
+    rounds: int = 100,
+    names: list[str] | None = None,
+) -> list[BenchResult]:
+    """corpus 전체 케이스 측정 (names가 있으면 해당 케이스만)"""
+    cases = build_bench_cases(corpus)
+    if names:
+        cases = {name: case for name, case in cases.items() if name in names}
+    with _memo_disabled():
+        return [measure_case(name, case, rounds) for name, case in cases.items()]
+
+
+# =============================================================================
+# Check
+# =============================================================================
+
+def check_bench(
+    result: BenchResult,
+    baseline: dict[str, Any] | None = None,
+    thresholds: dict[str, float] | None = None,
+) -> list[str]:
+    """
+    측정 결과를 baseline과 비교
+
+    Args:
+        result: 현재 측정값
+        baseline: 이전 측정값 (BenchResult.to_dict 형식, 없으면 판정 생략)
+        thresholds: DEFAULT_THRESHOLDS override
+
+    Returns:
+        위반 메시지 리스트 (비어 있으면 통과)
+    """
+    limits = dict(DEFAULT_THRESHOLDS)
+    if thresholds:
+        limits.update(thresholds)
+
+    violations: list[str] = []
+    if not baseline:
+        return violations
+
+    base_ops = baseline.get("ops_per_sec", 0.0)
+    if base_ops and result.ops_per_sec * limits["max_slowdown"] < base_ops:
+        violations.append(
+            f"ops/sec {result.ops_per_sec} < baseline {base_ops} / {limits['max_slowdown']}"
+        )
+
+    base_p99 = baseline.get("p99_us", 0.0)
+    if (
+        base_p99
+        and max(result.p99_us, base_p99) >= limits["min_p99_us_for_ratio"]
+        and result.p99_us > base_p99 * limits["max_p99_ratio"]
+    ):
+        violations.append(
+            f"p99 {result.p99_us}us > {limits['max_p99_ratio']}x baseline {base_p99}us"
+        )
+
+    return violations
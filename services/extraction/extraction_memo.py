@@ -0,0 +1,232 @@
+"""
+STEP 4.18: rule extractor 결과 메모이제이션 (텍스트 해시 기준)
+
+적재 사이에는 같은 evidence preview가 여러 요청에서 extract_amount /
+extract_condition_snippet / extract_diagnosis_lump_sum / extract_surgery_amount /
+슬롯 추출기를 반복해서 거친다. rule extractor는 입력 텍스트와 인자에만 의존하므로
+(extractor 이름, 규칙 버전, doc_type 등 인자, 텍스트 해시)를 키로 결과를 재사용한다.
+
+- 결과는 frozen dataclass → 요청 간에 같은 객체를 공유해도 안전 (deepcopy 없음)
+  필드까지 불변(tuple 등)이어야 저장한다 (list 필드가 있으면 저장하지 않음)
+- 용량: 엔트리 수가 아니라 추정 바이트(EXTRACTION_MEMO_MAX_BYTES)로 제한, LRU 제거
+- 통계: extractor별 hit / miss / hit_rate (/metrics/cache)
+- 버전: 규칙을 바꾸면 @memoize_extractor의 version을 올린다
+  (STEP 4.17 chunk.meta 저장 결과도 같은 버전을 사용)
+
+corpus 데이터에 의존하지 않으므로 corpus 변경 시 무효화 대상이 아니다.
+"""
+
+from __future__ import annotations
+
+import functools
+import hashlib
+import inspect
+import os
+import sys
+import threading
+from collections import OrderedDict
+from dataclasses import asdict, dataclass, fields, is_dataclass
+from typing import Any, Callable, Hashable
+
+
+def is_extraction_memo_enabled() -> bool:
+    """EXTRACTION_MEMO_ENABLED 환경변수 확인 (기본: 사용)"""
+    return os.environ.get("EXTRACTION_MEMO_ENABLED", "1") == "1"
+
+
+def get_extraction_memo_max_bytes() -> int:
+    """메모 최대 용량 (기본: 8MB, 추정치)"""
+    return int(os.environ.get("EXTRACTION_MEMO_MAX_BYTES", str(8 * 1024 * 1024)))
+
+
+def text_digest(text: str) -> bytes:
+    """메모 키용 텍스트 해시 (원문 대신 16바이트만 보관)"""
+    # 프로세스 내부 키라 인코딩은 자유: 한글은 utf-16 인코딩이 utf-8보다 빠르다
+    return hashlib.blake2b(text.encode("utf-16-le"), digest_size=16).digest()
+
+
+def estimate_bytes(value: Any) -> int:
+    """결과 객체 메모리 추정 (sys.getsizeof 재귀)"""
+    size = sys.getsizeof(value)
+    if is_dataclass(value) and not isinstance(value, type):
+        return size + sum(estimate_bytes(getattr(value, f.name)) for f in fields(value))
+    if isinstance(value, (list, tuple)):
+        return size + sum(estimate_bytes(item) for item in value)
+    if isinstance(value, dict):
+        return size + sum(estimate_bytes(k) + estimate_bytes(v) for k, v in value.items())
+    return size
+
+
+def _is_frozen(value: Any) -> bool:
+    """공유해도 안전한 값인지 (frozen dataclass는 필드까지 확인)"""
+    if is_dataclass(value) and not isinstance(value, type):
+        return value.__dataclass_params__.frozen and all(
+            _is_frozen(getattr(value, f.name)) for f in fields(value)
+        )
+    if isinstance(value, tuple):
+        return all(_is_frozen(item) for item in value)
+    return isinstance(value, (str, bytes, int, float, bool, type(None)))
+
+
+@dataclass
+class MemoStats:
+    """extractor별 메모 통계"""
+    hits: int = 0
+    misses: int = 0
+    stores: int = 0
+    evictions: int = 0
+    skipped: int = 0  # 용량 초과 / frozen이 아닌 결과 → 저장하지 않음
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.hits + self.misses
+        return round(self.hits / total, 4) if total else 0.0
+
+
+_MISSING = object()
+
+
+class ExtractionMemo:
+    """바이트 상한 LRU (extractor별 통계)"""
+
+    def __init__(self, max_bytes: int = 8 * 1024 * 1024):
+        self.max_bytes = max_bytes
+        self._entries: OrderedDict[Hashable, tuple[Any, int]] = OrderedDict()
+        self._bytes = 0
+        self._stats: dict[str, MemoStats] = {}
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @property
+    def bytes(self) -> int:
+        return self._bytes
+
+    def _stats_for(self, name: str) -> MemoStats:
+        stats = self._stats.get(name)
+        if stats is None:
+            stats = self._stats[name] = MemoStats()
+        return stats
+
+    def get(self, key: tuple) -> Any:
+        """조회 (없으면 _MISSING). key[0]은 extractor 이름"""
+        with self._lock:
+            entry = self._entries.get(key)
+            stats = self._stats_for(key[0])
+            if entry is None:
+                stats.misses += 1
+                return _MISSING
+            self._entries.move_to_end(key)
+            stats.hits += 1
+            return entry[0]
+
+    def put(self, key: tuple, value: Any) -> None:
+        """저장, 용량 초과 시 오래된 엔트리부터 제거"""
+        size = estimate_bytes(key) + estimate_bytes(value)
+        with self._lock:
+            stats = self._stats_for(key[0])
+            if size > self.max_bytes or not _is_frozen(value):
+                stats.skipped += 1
+                return
+
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._bytes -= previous[1]
+            self._entries[key] = (value, size)
+            self._bytes += size
+            stats.stores += 1
+            while self._bytes > self.max_bytes:
+                (evicted_name, *_), (_, evicted_size) = self._entries.popitem(last=False)
+                self._bytes -= evicted_size
+                self._stats_for(evicted_name).evictions += 1
+
+    def clear(self) -> None:
+        """엔트리 전체 삭제 (통계는 유지)"""
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def stats(self) -> dict[str, Any]:
+        """extractor별 통계 + 엔트리 수 / 사용 바이트"""
+        with self._lock:
+            entries: dict[str, int] = {}
+            for name, *_ in self._entries:
+                entries[name] = entries.get(name, 0) + 1
+            return {
+                "bytes": self._bytes,
+                "max_bytes": self.max_bytes,
+                "entries": len(self._entries),
+                "extractors": {
+                    name: {
+                        **asdict(stats),
+                        "hit_rate": stats.hit_rate,
+                        "entries": entries.get(name, 0),
+                    }
+                    for name, stats in sorted(self._stats.items())
+                },
+            }
+
+
+_extraction_memo: ExtractionMemo | None = None
+
+
+def get_extraction_memo() -> ExtractionMemo | None:
+    """프로세스 단위 메모 (EXTRACTION_MEMO_ENABLED=0이면 None)"""
+    global _extraction_memo
+
+    if not is_extraction_memo_enabled():
+        return None
+
+    if _extraction_memo is None:
+        _extraction_memo = ExtractionMemo(max_bytes=get_extraction_memo_max_bytes())
+    return _extraction_memo
+
+
+def clear_extraction_memo() -> None:
+    """프로세스 메모 초기화 (엔트리 + 통계, EXTRACTION_MEMO_* 변경도 이후 반영)"""
+    global _extraction_memo
+    _extraction_memo = None
+
+
+def memoize_extractor(name: str, version: str) -> Callable[[Callable], Callable]:
+    """
+    rule extractor 메모이제이션 데코레이터
+
+    첫 인자는 텍스트, 나머지 인자(doc_type 등)는 기본값까지 채워 키에 포함한다.
+    원본 함수는 __wrapped__, 이름 / 버전은 extractor_name / extractor_version.
+    """
+    def decorator(func: Callable) -> Callable:
+        params = list(inspect.signature(func).parameters.values())[1:]
+        names = tuple(p.name for p in params)
+        defaults = tuple(p.default for p in params)
+
+        @functools.wraps(func)
+        def wrapper(text, *args, **kwargs):
+            # 호출마다 환경변수를 읽지 않도록 생성된 메모를 바로 사용
+            memo = _extraction_memo if _extraction_memo is not None else get_extraction_memo()
+            # 메모 대상이 아닌 호출 (잘못된 인자는 원본 호출에서 TypeError)
+            if (
+                memo is None
+                or not isinstance(text, str)
+                or len(args) > len(names)
+                or not kwargs.keys() <= set(names[len(args):])
+            ):
+                return func(text, *args, **kwargs)
+
+            values = (*args, *(
+                kwargs.get(param, default)
+                for param, default in zip(names[len(args):], defaults[len(args):])
+            ))
+            key = (name, version, *values, text_digest(text))
+            result = memo.get(key)
+            if result is _MISSING:
+                result = func(text, *values)
+                memo.put(key, result)
+            return result
+
+        wrapper.extractor_name = name
+        wrapper.extractor_version = version
+        return wrapper
+
+    return decorator
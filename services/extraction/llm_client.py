@@ -5,6 +5,7 @@ Step H-2: LLM 호출 클라이언트 (추상화)
 기본은 Disabled 상태로 테스트가 깨지지 않음
 
 Step H-2.1: OpenAI 클라이언트 + PII 마스킹 + 메트릭
+STEP 4.25: span 검증은 마스킹된 chunk 기준, 원문 위치는 MaskResult.original_span
 """
 
 from __future__ import annotations
@@ -13,13 +14,14 @@ import asyncio
 import json
 import logging
 import os
+import re
 import time
 from dataclasses import dataclass, field
 from typing import Protocol, runtime_checkable
 
 from .llm_schemas import LLMExtractResult
 from .llm_prompts import SYSTEM_PROMPT
-from .pii_masker import mask_pii
+from .pii_masker import MaskResult, mask_pii
 
 
 logger = logging.getLogger(__name__)
@@ -412,22 +414,46 @@ def get_llm_client() -> LLMClient:
         return DisabledLLMClient()
 
 
+def _span_pattern(span_text: str | None) -> re.Pattern[str] | None:
+    """span 단어 사이 공백 연속을 허용하는 검색 패턴 (단어가 없으면 None)"""
+    words = span_text.split() if span_text else []
+    if not words:
+        return None
+    return re.compile(r"\s+".join(map(re.escape, words)))
+
+
+def find_span_in_text(span_text: str | None, chunk_text: str) -> tuple[int, int] | None:
+    """span.text의 chunk_text 내 구간 (공백 정규화 비교와 동일, 없으면 None)"""
+    pattern = _span_pattern(span_text)
+    match = pattern.search(chunk_text) if pattern is not None else None
+    if match is None:
+        return None
+    return match.start(), match.end()
+
+
+def find_masked_span(span_text: str | None, mask_result: MaskResult) -> tuple[int, int] | None:
+    """
+    STEP 4.25: LLM span의 원문 구간
+
+    LLM은 마스킹된 chunk만 보므로 span은 masked_text에서 찾고
+    (예: "[전화번호]" 포함), MaskResult.original_span으로 원문 위치로 되돌린다.
+    """
+    located = find_span_in_text(span_text, mask_result.masked_text)
+    if located is None:
+        return None
+    return mask_result.original_span(*located)
+
+
 def validate_span_in_text(span_text: str | None, chunk_text: str) -> bool:
     """
     span.text가 chunk_text에 실제로 포함되어 있는지 검증 (환각 방지)
 
     Args:
         span_text: LLM이 반환한 span 텍스트
-        chunk_text: 원본 chunk 텍스트
+        chunk_text: LLM에 전달된 chunk 텍스트 (마스킹 후)
 
     Returns:
         포함 여부
     """
-    if not span_text:
-        return False
-
     # 공백 정규화 후 비교
-    normalized_span = " ".join(span_text.split())
-    normalized_chunk = " ".join(chunk_text.split())
-
-    return normalized_span in normalized_chunk
+    return find_span_in_text(span_text, chunk_text) is not None
@@ -6,12 +6,22 @@ LLM 호출 전 개인정보 마스킹
 - 전화번호
 - 계좌번호
 - 이메일
+
+STEP 4.25: mask_pii는 유형별 패턴을 하나로 합친 PII_SCANNER로 텍스트를 1회 스캔한다
+(유형마다 문자열을 다시 만드는 4회 치환 대신). 결과에 마스킹 구간(spans)을 남겨
+마스킹 텍스트 위치 → 원문 위치를 바꿀 수 있다 (MaskResult.original_span).
+
+- 결과는 기존 순차 치환(rrn → email → phone → account)과 같다. 유형 간 후보가
+  겹치거나 맞닿는 드문 경우만 유형 순서 스캔으로 처리한다 (scan_pii)
+- 스캐너 패턴은 후보 첫 글자 문자 클래스로 시작한다 (정규식 엔진이 한글 본문을 건너뜀)
+- mask_rrn / mask_phone / mask_account / mask_email: 유형 1개만 마스킹 (기존 동작)
 """
 
 from __future__ import annotations
 
 import re
-from dataclasses import dataclass
+from bisect import bisect_right
+from dataclasses import dataclass, field
 
 
 # 마스킹 패턴 정의
@@ -43,12 +53,87 @@ MASK_TOKENS = {
 }
 
 
+# 단일 스캔 순서 (같은 위치에서는 앞 유형 우선)
+SCAN_ORDER = ("rrn", "email", "phone", "account")
+
+# 유형별 (첫 글자 클래스 내용, 나머지): \b[첫 글자]나머지 = PATTERNS[kind] (rrn은 mask_rrn 조건 포함)
+#
+# 스캐너 패턴을 문자 클래스로 시작하게 만들어(\b는 첫 글자 뒤 lookbehind로 확인)
+# 정규식 엔진이 후보 첫 글자가 아닌 문자(한글 본문 대부분)를 건너뛰게 한다.
+_SCAN_PARTS = {
+    # 성별 코드(1-4)를 패턴에 포함 (mask_rrn의 사후 검사와 같은 조건)
+    "rrn": (r"\d", r"\d{5}[-\s]?[1-4]\d{6}\b"),
+    "email": (r"A-Za-z0-9._%+\-", r"[A-Za-z0-9._%+-]*@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b"),
+    "phone": (r"0", r"(?:1[016789]|2|[3-9]\d)[-.\s]?\d{3,4}[-.\s]?\d{4}\b"),
+    "account": (r"\d", r"\d{1,5}[-\s]?\d{2,6}[-\s]?\d{2,6}[-\s]?\d{0,6}\b"),
+}
+
+
+def _alternation(kinds: tuple[str, ...]) -> re.Pattern:
+    """첫 글자 클래스 + 단어 경계 확인 + 유형별 named group (같은 위치는 kinds 순서 우선)"""
+    first = "[" + "".join(dict.fromkeys(_SCAN_PARTS[kind][0] for kind in kinds)) + "]"
+    branches = "|".join(
+        f"(?<=[{_SCAN_PARTS[kind][0]}])(?P<{kind}>{_SCAN_PARTS[kind][1]})" for kind in kinds
+    )
+    return re.compile(f"{first}(?<=\\b.)(?:{branches})")
+
+
+PII_SCANNER = _alternation(SCAN_ORDER)
+_KIND_SCANNERS = {kind: _alternation((kind,)) for kind in SCAN_ORDER}
+_SCAN_RANK = {kind: idx for idx, kind in enumerate(SCAN_ORDER)}
+
+# 유형별 상위 우선순위 유형 패턴 (하위 유형 후보 안에서 시작하는 상위 유형 확인)
+_HIGHER_SCANNERS = {kind: _alternation(SCAN_ORDER[:idx]) for idx, kind in enumerate(SCAN_ORDER) if idx}
+# 상위 유형이 시작할 수 있는 위치 (첫 글자 + 단어 경계)
+_HIGHER_STARTS = {
+    kind: re.compile("[" + "".join(_SCAN_PARTS[higher][0] for higher in SCAN_ORDER[:idx]) + "](?<=\\b.)")
+    for idx, kind in enumerate(SCAN_ORDER)
+    if idx
+}
+
+# 상위 유형 확인 범위 (후보 끝 이후, 경계 판단용 여유)
+_HIGHER_LOOKAHEAD = 256
+
+_ACCOUNT_SEPARATORS = re.compile(r"[-\s]")
+
+
+@dataclass(frozen=True)
+class MaskSpan:
+    """마스킹 구간 (원문 / 마스킹 텍스트 위치)"""
+    kind: str
+    start: int
+    end: int
+    masked_start: int
+    masked_end: int
+
+
 @dataclass
 class MaskResult:
     """마스킹 결과"""
     masked_text: str
     mask_count: int
     mask_details: dict[str, int]  # 타입별 마스킹 횟수
+    spans: list[MaskSpan] = field(default_factory=list)  # STEP 4.25: 위치 순서
+
+    def original_offset(self, offset: int, end: bool = False) -> int:
+        """
+        masked_text 위치 → 원문 위치
+
+        마스크 토큰 내부 위치는 원문 PII 시작 (end=True면 끝)으로 보낸다.
+        """
+        idx = bisect_right([span.masked_start for span in self.spans], offset) - 1
+        if idx < 0:
+            return offset
+        span = self.spans[idx]
+        if offset >= span.masked_end:
+            return span.end + (offset - span.masked_end)
+        if offset == span.masked_start:
+            return span.start
+        return span.end if end else span.start
+
+    def original_span(self, start: int, end: int) -> tuple[int, int]:
+        """masked_text[start:end] → 원문 구간 (마스크 토큰에 걸치면 PII 전체 포함)"""
+        return self.original_offset(start), self.original_offset(end, end=True)
 
 
 def mask_rrn(text: str) -> tuple[str, int]:
@@ -114,15 +199,89 @@ def mask_email(text: str) -> tuple[str, int]:
     return masked, count
 
 
+def _is_account(text: str) -> bool:
+    """계좌번호 자릿수 조건 (mask_account와 같음: 10~16자리)"""
+    return 10 <= len(_ACCOUNT_SEPARATORS.sub("", text)) <= 16
+
+
+def _scan_by_kind(text: str) -> list[tuple[str, int, int]]:
+    """
+    유형 순서대로 스캔 (기존 순차 치환과 같은 결과, 문자열 재생성 없음)
+
+    앞 유형이 잡은 구간 사이의 남은 구간만 잘라서 스캔한다. 잘라낸 구간의 양 끝은
+    문자열 끝으로 취급되므로 순차 치환에서 마스크 토큰("[...]") 옆의 단어 경계와 같다.
+    """
+    accepted: list[tuple[int, int, str]] = []
+    for kind in SCAN_ORDER:
+        pattern = _KIND_SCANNERS[kind]
+        found: list[tuple[int, int, str]] = []
+        gap_start = 0
+        for span_start, span_end, _ in [*accepted, (len(text), len(text), "")]:
+            if span_start > gap_start:
+                for match in pattern.finditer(text[gap_start:span_start]):
+                    if kind == "account" and not _is_account(match.group()):
+                        continue
+                    found.append((gap_start + match.start(), gap_start + match.end(), kind))
+            gap_start = span_end
+        if found:
+            accepted = sorted(accepted + found)
+    return [(kind, start, end) for start, end, kind in accepted]
+
+
+def _higher_within(kind: str, text: str, start: int, end: int) -> bool:
+    """text[start:end] 후보 안(또는 끝)에서 상위 유형 매치가 시작하는지"""
+    starts = _HIGHER_STARTS[kind]
+    scanner = _HIGHER_SCANNERS[kind]
+    pos = start + 1
+    while (candidate := starts.search(text, pos, end + 1)) is not None:
+        if scanner.match(text, candidate.start(), end + _HIGHER_LOOKAHEAD) is not None:
+            return True
+        pos = candidate.end()
+    return False
+
+
+def scan_pii(text: str) -> list[tuple[str, int, int]]:
+    """
+    STEP 4.25: 텍스트 1회 스캔 → (유형, 시작, 끝) 목록 (위치 순서, 겹치지 않음)
+
+    같은 위치의 후보는 SCAN_ORDER 순서로 선택한다 (정규식 alternation).
+    유형 간 후보가 겹치거나 맞닿는 경우(주민번호 앞 숫자가 계좌번호 후보로 묶이는 등)는
+    단일 스캔과 순차 치환의 결과가 다를 수 있으므로 유형 순서 스캔(_scan_by_kind)으로 넘긴다.
+    """
+    found: list[tuple[str, int, int]] = []
+    search = PII_SCANNER.search
+    pos = 0
+    prev_end, prev_rank = -1, -1
+    while (match := search(text, pos)) is not None:
+        kind = match.lastgroup
+        start, end = match.span()
+        rank = _SCAN_RANK[kind]
+
+        # 앞 유형의 마스크 토큰 바로 뒤: 순차 치환에서는 단어 경계가 달라진다
+        if start == prev_end and rank > prev_rank:
+            return _scan_by_kind(text)
+        # 후보 안(또는 끝)에서 상위 유형이 시작: 순차 치환에서는 상위 유형이 먼저 잡힌다
+        if rank and _higher_within(kind, text, start, end):
+            return _scan_by_kind(text)
+
+        pos = end
+        # 자릿수 조건에 맞지 않는 계좌번호 후보는 건너뛴다 (mask_account와 같이 후보 끝부터)
+        if kind == "account" and not _is_account(match.group()):
+            continue
+        found.append((kind, start, end))
+        prev_end, prev_rank = end, rank
+    return found
+
+
 def mask_pii(text: str) -> MaskResult:
     """
-    모든 PII 마스킹 적용
+    모든 PII 마스킹 적용 (STEP 4.25: 단일 스캔)
 
     Args:
         text: 원본 텍스트
 
     Returns:
-        MaskResult: 마스킹된 텍스트와 통계
+        MaskResult: 마스킹된 텍스트, 통계, 마스킹 구간
     """
     if not text:
         return MaskResult(
@@ -131,36 +290,29 @@ def mask_pii(text: str) -> MaskResult:
             mask_details={},
         )
 
-    masked = text
+    found = scan_pii(text)
+    if not found:
+        return MaskResult(masked_text=text, mask_count=0, mask_details={})
+
+    pieces: list[str] = []
+    spans: list[MaskSpan] = []
     details: dict[str, int] = {}
-    total_count = 0
-
-    # 주민번호 마스킹 (가장 먼저 - 전화번호와 겹칠 수 있음)
-    masked, rrn_count = mask_rrn(masked)
-    if rrn_count > 0:
-        details["rrn"] = rrn_count
-        total_count += rrn_count
-
-    # 이메일 마스킹
-    masked, email_count = mask_email(masked)
-    if email_count > 0:
-        details["email"] = email_count
-        total_count += email_count
-
-    # 전화번호 마스킹
-    masked, phone_count = mask_phone(masked)
-    if phone_count > 0:
-        details["phone"] = phone_count
-        total_count += phone_count
-
-    # 계좌번호 마스킹 (가장 마지막 - 금액과 혼동 가능)
-    masked, account_count = mask_account(masked)
-    if account_count > 0:
-        details["account"] = account_count
-        total_count += account_count
+    prev = 0
+    masked_len = 0
+    for kind, start, end in found:
+        token = MASK_TOKENS[kind]
+        pieces.append(text[prev:start])
+        masked_len += start - prev
+        pieces.append(token)
+        spans.append(MaskSpan(kind, start, end, masked_len, masked_len + len(token)))
+        masked_len += len(token)
+        details[kind] = details.get(kind, 0) + 1
+        prev = end
+    pieces.append(text[prev:])
 
     return MaskResult(
-        masked_text=masked,
-        mask_count=total_count,
-        mask_details=details,
+        masked_text="".join(pieces),
+        mask_count=len(found),
+        mask_details={kind: details[kind] for kind in SCAN_ORDER if kind in details},
+        spans=spans,
     )
@@ -11,19 +11,25 @@ A2 정책 유지:
 from __future__ import annotations
 
 import re
+import time
 from dataclasses import dataclass, field
-from typing import Literal
+from functools import lru_cache
+from typing import Any, Literal
 
 import yaml
 from pathlib import Path
 
 from .llm_trace import LLMTrace
 from api.config_loader import get_coverage_code_to_type, get_coverage_code_groups
-from .amount_extractor import (
-    extract_amount,
-    extract_diagnosis_lump_sum,
-    extract_surgery_amount,
-    extract_surgery_count_limit,
+from .amount_facts import run_amount_extractor
+from .chunk_extraction import run_extractor
+from .slot_rules import (
+    COMPARE_DOC_PRIORITY,
+    CompiledSlotRules,
+    EvidenceFeatureCache,
+    KeywordSet,
+    SlotVocabulary,
+    compile_slot_rules,
 )
 
 
@@ -68,38 +74,88 @@ class ComparisonSlot:
 # Slot Definition Registry (coverage_type별 슬롯 정의)
 # =============================================================================
 
-# 암진단비 슬롯 정의
+# U-4.16/U-4.18: 조건부 슬롯 트리거 키워드 (query.lower()에 포함되면 추가 슬롯 추출)
+SUBTYPE_QUERY_KEYWORDS = ["제자리암", "상피내암", "경계성종양", "경계성 종양", "유사암"]
+SURGERY_METHOD_QUERY_KEYWORDS = ["다빈치", "로봇", "da vinci", "robot", "내시경"]
+HOSPITAL_TIER_QUERY_KEYWORDS = ["상급종합", "종합병원", "병원급", "의원"]
+MINOR_EXCLUSION_QUERY_KEYWORDS = ["경증", "백내장", "치질", "탈장", "제외"]
+SURGERY_GRADE_QUERY_KEYWORDS = ["종수", "1종", "5종", "8종", "분류"]
+
+# 암진단비 슬롯 정의 (YAML fallback, STEP 4.19: slot_definitions.yaml과 같은 규칙)
 CANCER_DIAGNOSIS_SLOTS = [
     {
         "slot_key": "diagnosis_lump_sum_amount",  # 범용화: 진단비 일시금 전용 슬롯
+        "response_slot_key": "payout_amount",  # 하위 호환성 유지
         "label": "진단비 지급금액(일시금)",
         "comparable": True,
         "source_doc_types": ["가입설계서", "상품요약서", "사업방법서"],
         "extractor": "diagnosis_lump_sum",  # 추출기 지정
+        "function": "extract_diagnosis_lump_sum_slot",
     },
     {
         "slot_key": "existence_status",
         "label": "담보 존재 여부",
         "comparable": True,
         "source_doc_types": ["가입설계서", "상품요약서", "사업방법서"],
+        "function": "extract_existence_status",
     },
     {
         "slot_key": "payout_condition_summary",
         "label": "지급조건 요약",
         "comparable": True,
         "source_doc_types": ["상품요약서", "사업방법서", "가입설계서"],
+        "function": "extract_payout_condition_summary",
     },
     {
         "slot_key": "diagnosis_scope_definition",
         "label": "진단 범위 정의",
         "comparable": False,
         "source_doc_types": ["약관"],
+        "function": "extract_diagnosis_scope",
+        "evidence": "policy",
     },
     {
         "slot_key": "waiting_period",
         "label": "대기기간",
         "comparable": False,
         "source_doc_types": ["약관"],
+        "function": "extract_waiting_period",
+        "evidence": "policy",
+    },
+    *(
+        {
+            "slot_key": f"subtype_{subtype}_covered",
+            "label": label,
+            "comparable": True,
+            "source_doc_types": ["약관", "사업방법서", "상품요약서"],
+            "function": "extract_subtype_coverage_slot",
+            "evidence": "all",
+            "query_trigger": SUBTYPE_QUERY_KEYWORDS,
+            "params": {"subtype": subtype},
+        }
+        for subtype, label in (
+            ("in_situ", "제자리암 보장 여부"),
+            ("borderline", "경계성종양 보장 여부"),
+            ("similar_cancer", "유사암 보장 여부"),
+        )
+    ),
+    {
+        "slot_key": "subtype_definition_excerpt",
+        "label": "암 유형 정의/조건 발췌",
+        "comparable": False,
+        "source_doc_types": ["약관", "사업방법서", "상품요약서"],
+        "function": "extract_subtype_definition_slot",
+        "evidence": "all",
+        "query_trigger": SUBTYPE_QUERY_KEYWORDS,
+    },
+    {
+        "slot_key": "partial_payment_rule",
+        "label": "감액/지급률 규정",
+        "comparable": True,
+        "source_doc_types": ["약관", "사업방법서", "상품요약서"],
+        "function": "extract_partial_payment_slot",
+        "evidence": "all",
+        "query_trigger": SUBTYPE_QUERY_KEYWORDS,
     },
 ]
 
@@ -121,18 +177,22 @@ CEREBRO_CARDIOVASCULAR_SLOTS = [
         "comparable": True,
         "source_doc_types": ["가입설계서", "상품요약서", "사업방법서"],
         "extractor": "diagnosis_lump_sum",
+        "function": "extract_diagnosis_lump_sum_slot",
     },
     {
         "slot_key": "existence_status",
         "label": "담보 존재 여부",
         "comparable": True,
         "source_doc_types": ["가입설계서", "상품요약서", "사업방법서"],
+        "function": "extract_existence_status",
     },
     {
         "slot_key": "waiting_period",
         "label": "대기기간",
         "comparable": False,
         "source_doc_types": ["약관"],
+        "function": "extract_waiting_period",
+        "evidence": "policy",
     },
 ]
 
@@ -146,20 +206,68 @@ SURGERY_BENEFIT_SLOTS = [
         "label": "수술비 지급금액",
         "comparable": True,
         "source_doc_types": ["가입설계서", "상품요약서", "사업방법서"],
-        "extractor": "surgery_amount",  # stub
+        "extractor": "surgery_amount",
+        "function": "extract_surgery_amount_slot",
     },
     {
         "slot_key": "surgery_count_limit",
         "label": "수술 횟수 제한",
         "comparable": True,
         "source_doc_types": ["상품요약서", "사업방법서"],
-        "extractor": "count_limit",  # stub
+        "extractor": "count_limit",
+        "function": "extract_surgery_count_limit_slot",
     },
     {
         "slot_key": "existence_status",
         "label": "담보 존재 여부",
         "comparable": True,
         "source_doc_types": ["가입설계서", "상품요약서", "사업방법서"],
+        "function": "extract_existence_status",
+    },
+    {
+        "slot_key": "surgery_method",
+        "label": "수술 방식 조건",
+        "comparable": True,
+        "source_doc_types": ["약관", "사업방법서", "상품요약서"],
+        "function": "extract_surgery_method_slot",
+        "evidence": "all",
+        "query_trigger": SURGERY_METHOD_QUERY_KEYWORDS,
+    },
+    {
+        "slot_key": "method_condition",
+        "label": "수술방식 적용조건",
+        "comparable": False,
+        "source_doc_types": ["약관", "사업방법서", "상품요약서"],
+        "function": "extract_method_condition_slot",
+        "evidence": "all",
+        "query_trigger": SURGERY_METHOD_QUERY_KEYWORDS,
+    },
+    {
+        "slot_key": "hospital_tier_condition",
+        "label": "병원급 조건",
+        "comparable": True,
+        "source_doc_types": ["약관", "사업방법서", "상품요약서"],
+        "function": "extract_hospital_tier_slot",
+        "evidence": "all",
+        "query_trigger": HOSPITAL_TIER_QUERY_KEYWORDS,
+    },
+    {
+        "slot_key": "minor_exclusion_rule",
+        "label": "경증 제외/제한 조건",
+        "comparable": True,
+        "source_doc_types": ["약관", "사업방법서", "상품요약서"],
+        "function": "extract_minor_exclusion_slot",
+        "evidence": "all",
+        "query_trigger": MINOR_EXCLUSION_QUERY_KEYWORDS,
+    },
+    {
+        "slot_key": "surgery_grade_rule",
+        "label": "수술 분류(1~5종/1~8종/시술포함)",
+        "comparable": True,
+        "source_doc_types": ["약관", "사업방법서", "상품요약서"],
+        "function": "extract_surgery_grade_slot",
+        "evidence": "all",
+        "query_trigger": SURGERY_GRADE_QUERY_KEYWORDS,
     },
 ]
 
@@ -201,6 +309,8 @@ def load_slot_definitions_from_yaml(yaml_path: str | None = None) -> dict | None
     """
     YAML에서 슬롯 정의 로드 (U-4.12: 외부화)
 
+    STEP 4.19: 경로별로 1회만 파싱 (clear_slot_rules()로 초기화)
+
     Returns:
         YAML 데이터 dict 또는 None (파일 없거나 파싱 실패 시)
     """
@@ -214,14 +324,19 @@ def load_slot_definitions_from_yaml(yaml_path: str | None = None) -> dict | None
         path = project_root / yaml_path
 
     if path.exists():
-        try:
-            with open(path, "r", encoding="utf-8") as f:
-                return yaml.safe_load(f)
-        except yaml.YAMLError:
-            return None
+        return _load_yaml_file(str(path))
     return None
 
 
+@lru_cache(maxsize=None)
+def _load_yaml_file(path: str) -> dict | None:
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return yaml.safe_load(f)
+    except yaml.YAMLError:
+        return None
+
+
 def get_slots_for_coverage_type(coverage_type: str, yaml_path: str | None = None) -> list[dict]:
     """
     Coverage type에 해당하는 슬롯 정의 반환
@@ -252,11 +367,69 @@ def load_slot_definitions(yaml_path: str | None = None) -> list[dict]:
     return CANCER_DIAGNOSIS_SLOTS
 
 
+# =============================================================================
+# STEP 4.19: 컴파일된 슬롯 규칙
+# =============================================================================
+
+_compiled_slot_rules: CompiledSlotRules | None = None
+
+
+def _slot_functions() -> dict[str, Any]:
+    """슬롯 정의의 function 이름 → 추출 함수"""
+    return {
+        name: value
+        for name, value in globals().items()
+        if name.startswith("extract_") and callable(value)
+    }
+
+
+def get_slot_rules() -> CompiledSlotRules:
+    """
+    슬롯 규칙 (프로세스당 1회 컴파일)
+
+    YAML이 없거나 coverage_types가 없으면 코드 내 정의로 컴파일한다.
+    """
+    global _compiled_slot_rules
+
+    if _compiled_slot_rules is None:
+        yaml_data = load_slot_definitions_from_yaml()
+        if not yaml_data or "coverage_types" not in yaml_data:
+            yaml_data = {
+                "version": None,
+                "coverage_types": {
+                    coverage_type: {"slots": slots}
+                    for coverage_type, slots in SLOT_DEFINITIONS_BY_COVERAGE_TYPE.items()
+                },
+            }
+        _compiled_slot_rules = compile_slot_rules(yaml_data, _slot_functions())
+    return _compiled_slot_rules
+
+
+def clear_slot_rules() -> None:
+    """YAML 파싱 결과 + 컴파일된 규칙 초기화"""
+    global _compiled_slot_rules
+    _compiled_slot_rules = None
+    _load_yaml_file.cache_clear()
+
+
 # =============================================================================
 # Slot Extraction Functions
 # =============================================================================
 
-def extract_diagnosis_lump_sum_slot(evidence_list: list, insurer_code: str) -> SlotInsurerValue:
+def _outranks(doc_priority: int, page_order: float, best_doc_priority: int, best_page_order: float) -> bool:
+    """U-4.16 tie-breaker: doc_priority > best, 또는 동일 시 page_start 비교"""
+    return doc_priority > best_doc_priority or (doc_priority == best_doc_priority and page_order < best_page_order)
+
+
+# STEP 4.20: 횟수 추출기 사전 필터 ("회"가 없으면 추출 결과는 not_found, 메모 조회 생략)
+COUNT_LIMIT_HINT_KEYWORDS = KeywordSet(["회"])
+
+
+def extract_diagnosis_lump_sum_slot(
+    evidence_list: list,
+    insurer_code: str,
+    features: EvidenceFeatureCache | None = None,
+) -> SlotInsurerValue:
     """
     진단비 지급금액(일시금) 슬롯 추출 (범용화된 추출기)
 
@@ -266,11 +439,12 @@ def extract_diagnosis_lump_sum_slot(evidence_list: list, insurer_code: str) -> S
       2. confidence: high > medium (within same doc_type)
 
     Note: compare_axis evidence doesn't have pre-populated amount field.
-    We call extract_diagnosis_lump_sum() directly on each evidence preview.
+    We call extract_diagnosis_lump_sum() on each evidence preview
+    (STEP 4.17: stored per-chunk result when the preview matches).
 
     This extractor can be used for any coverage type that requires lump-sum diagnosis amount.
     """
-    doc_type_priority = {"상품요약서": 3, "사업방법서": 2, "가입설계서": 1}
+    features = features or EvidenceFeatureCache()
     confidence_priority = {"high": 2, "medium": 1, "low": 0, "not_found": -1}
     trace = LLMTrace.from_llm_flag()  # Track LLM usage based on flag
 
@@ -280,24 +454,29 @@ def extract_diagnosis_lump_sum_slot(evidence_list: list, insurer_code: str) -> S
     best_refs = []
     found_daily_only = False  # 일당/특약 금액만 발견했는지 추적
 
-    for ev in evidence_list:
+    for view in features.views(evidence_list):
+        ev = view.evidence
         # A2 정책: 약관 제외
         if ev.doc_type == "약관":
             continue
 
-        doc_priority = doc_type_priority.get(ev.doc_type, 0)
+        doc_priority = view.compare_priority
 
         # Skip if doc_type priority is lower
         if doc_priority < best_doc_priority:
             continue
 
         # Get preview text
-        preview = getattr(ev, 'preview', '') or ''
+        preview = view.text
         if not preview:
             continue
 
         # U-4.10: Extract diagnosis lump-sum amount only
-        lump_sum_result = extract_diagnosis_lump_sum(preview, doc_type=ev.doc_type)
+        # STEP 4.24: 가입설계서는 담보 표 행(coverage_amount_fact) 금액 우선
+        lump_sum_result = run_amount_extractor(
+            "diagnosis_lump_sum", preview, ev.doc_type,
+            document_id=getattr(ev, "document_id", None), coverage_code=view.coverage_code,
+        )
 
         if lump_sum_result.amount_text and lump_sum_result.confidence not in ("low", "not_found"):
             conf_priority = confidence_priority.get(lump_sum_result.confidence, 0)
@@ -352,7 +531,11 @@ extract_payout_amount = extract_diagnosis_lump_sum_slot
 # U-4.13: Surgery Benefit Slot Extractors
 # =============================================================================
 
-def extract_surgery_amount_slot(evidence_list: list, insurer_code: str) -> SlotInsurerValue:
+def extract_surgery_amount_slot(
+    evidence_list: list,
+    insurer_code: str,
+    features: EvidenceFeatureCache | None = None,
+) -> SlotInsurerValue:
     """
     수술비 지급금액 슬롯 추출 (U-4.13)
 
@@ -361,7 +544,7 @@ def extract_surgery_amount_slot(evidence_list: list, insurer_code: str) -> SlotI
       1. doc_type: 상품요약서 > 사업방법서 > 가입설계서
       2. confidence: high > medium (within same doc_type)
     """
-    doc_type_priority = {"상품요약서": 3, "사업방법서": 2, "가입설계서": 1}
+    features = features or EvidenceFeatureCache()
     confidence_priority = {"high": 2, "medium": 1, "low": 0, "not_found": -1}
     trace = LLMTrace.from_llm_flag()
 
@@ -370,24 +553,29 @@ def extract_surgery_amount_slot(evidence_list: list, insurer_code: str) -> SlotI
     best_conf_priority = -1
     best_refs = []
 
-    for ev in evidence_list:
+    for view in features.views(evidence_list):
+        ev = view.evidence
         # A2 정책: 약관 제외
         if ev.doc_type == "약관":
             continue
 
-        doc_priority = doc_type_priority.get(ev.doc_type, 0)
+        doc_priority = view.compare_priority
 
         # Skip if doc_type priority is lower
         if doc_priority < best_doc_priority:
             continue
 
         # Get preview text
-        preview = getattr(ev, 'preview', '') or ''
+        preview = view.text
         if not preview:
             continue
 
         # Extract surgery amount
-        surgery_result = extract_surgery_amount(preview, doc_type=ev.doc_type)
+        # STEP 4.24: 가입설계서는 담보 표 행(coverage_amount_fact) 금액 우선
+        surgery_result = run_amount_extractor(
+            "surgery_amount", preview, ev.doc_type,
+            document_id=getattr(ev, "document_id", None), coverage_code=view.coverage_code,
+        )
 
         if surgery_result.amount_text and surgery_result.confidence not in ("low", "not_found"):
             conf_priority = confidence_priority.get(surgery_result.confidence, 0)
@@ -421,37 +609,42 @@ def extract_surgery_amount_slot(evidence_list: list, insurer_code: str) -> SlotI
     )
 
 
-def extract_surgery_count_limit_slot(evidence_list: list, insurer_code: str) -> SlotInsurerValue:
+def extract_surgery_count_limit_slot(
+    evidence_list: list,
+    insurer_code: str,
+    features: EvidenceFeatureCache | None = None,
+) -> SlotInsurerValue:
     """
     수술 횟수 제한 슬롯 추출 (U-4.13)
 
     수술 횟수 제한 정보 추출 (연 N회, 통산 N회 등)
     """
-    doc_type_priority = {"상품요약서": 3, "사업방법서": 2, "가입설계서": 1}
+    features = features or EvidenceFeatureCache()
     trace = LLMTrace.from_llm_flag()
 
     best_count = None
     best_doc_priority = 0
     best_refs = []
 
-    for ev in evidence_list:
+    for view in features.views(evidence_list):
+        ev = view.evidence
         # A2 정책: 약관 제외
         if ev.doc_type == "약관":
             continue
 
-        doc_priority = doc_type_priority.get(ev.doc_type, 0)
+        doc_priority = view.compare_priority
 
         # Skip if doc_type priority is lower
         if doc_priority < best_doc_priority:
             continue
 
-        # Get preview text
-        preview = getattr(ev, 'preview', '') or ''
-        if not preview:
+        # Get preview text (모든 횟수 패턴은 "회"를 포함)
+        preview = view.text
+        if not preview or not COUNT_LIMIT_HINT_KEYWORDS.any_in(view):
             continue
 
         # Extract surgery count limit
-        count_result = extract_surgery_count_limit(preview)
+        count_result = run_extractor("surgery_count_limit", preview, ev.doc_type)
 
         if count_result.count_text and count_result.confidence not in ("low", "not_found"):
             if doc_priority > best_doc_priority:
@@ -520,10 +713,15 @@ def extract_existence_status(evidence_list: list, insurer_code: str) -> SlotInsu
     )
 
 
+# 지급조건 요약: 암 관련 evidence 판별 키워드
+PAYOUT_CANCER_KEYWORDS = KeywordSet(["암", "유사암", "악성신생물", "갑상선암", "기타피부암", "경계성종양", "제자리암"])
+
+
 def extract_payout_condition_summary(
     evidence_list: list,
     insurer_code: str,
     coverage_type: str = "cancer",
+    features: EvidenceFeatureCache | None = None,
 ) -> SlotInsurerValue:
     """
     지급조건 요약 슬롯 추출
@@ -531,7 +729,7 @@ def extract_payout_condition_summary(
     condition_snippet이 있으면 사용, 없으면 preview에서 추출.
     암진단비의 경우, 암 관련 키워드가 포함된 evidence를 우선 선택.
     """
-    doc_type_priority = {"상품요약서": 3, "사업방법서": 2, "가입설계서": 1}
+    features = features or EvidenceFeatureCache()
     trace = LLMTrace.from_llm_flag()  # Track LLM usage based on flag
 
     # Compare evidence only (exclude 약관)
@@ -548,25 +746,23 @@ def extract_payout_condition_summary(
     best_refs = []
 
     # Pass 1: 암 관련 키워드가 포함된 evidence에서 추출 (cancer-specific)
-    cancer_keywords = ["암", "유사암", "악성신생물", "갑상선암", "기타피부암", "경계성종양", "제자리암"]
-
     for ev in compare_evidence:
         preview = getattr(ev, 'preview', '') or ''
         if not preview:
             continue
 
         # Check if evidence contains cancer-related keywords
-        has_cancer_keyword = any(kw in preview for kw in cancer_keywords)
-        if not has_cancer_keyword:
+        view = features.get(ev)
+        if not PAYOUT_CANCER_KEYWORDS.any_in(view):
             continue
 
-        priority = doc_type_priority.get(ev.doc_type, 0)
+        priority = view.compare_priority
 
         # condition_snippet 우선
         if hasattr(ev, 'condition_snippet') and ev.condition_snippet and ev.condition_snippet.snippet:
             snippet = ev.condition_snippet.snippet
             # Verify snippet is cancer-related
-            if any(kw in snippet for kw in cancer_keywords):
+            if PAYOUT_CANCER_KEYWORDS.search(snippet):
                 if priority > best_priority:
                     best_snippet = snippet[:200]
                     best_priority = priority
@@ -594,7 +790,7 @@ def extract_payout_condition_summary(
             if not preview:
                 continue
 
-            priority = doc_type_priority.get(ev.doc_type, 0)
+            priority = features.get(ev).compare_priority
             if priority <= best_priority:
                 continue
 
@@ -634,7 +830,7 @@ def extract_payout_condition_summary(
 
     # If we have evidence but couldn't extract condition, still provide refs
     if compare_evidence:
-        best_ev = max(compare_evidence, key=lambda e: doc_type_priority.get(e.doc_type, 0))
+        best_ev = max(compare_evidence, key=lambda e: features.get(e).compare_priority)
         return SlotInsurerValue(
             insurer_code=insurer_code,
             value=placeholder,
@@ -708,12 +904,27 @@ def _extract_condition_from_preview(preview: str, cancer_specific: bool = False)
     return None
 
 
-def extract_diagnosis_scope(policy_evidence: list, insurer_code: str) -> SlotInsurerValue:
+# 진단 범위 정의: 암 정의 관련 키워드
+DIAGNOSIS_SCOPE_KEYWORDS = KeywordSet(["암의 정의", "악성신생물", "유사암", "경계성종양"])
+
+# 대기기간 패턴 (면책/대기가 없는 preview는 정규식 스캔 생략)
+WAITING_PERIOD_PATTERN = re.compile(r'(\d+)\s*(일|개월)\s*(면책|대기)')
+WAITING_PERIOD_VOCABULARY = SlotVocabulary("waiting_period", ["면책", "대기", "암보장개시일"])
+WAITING_PERIOD_HINT_KEYWORDS = WAITING_PERIOD_VOCABULARY.subset(["면책", "대기"])
+WAITING_PERIOD_START_KEYWORDS = WAITING_PERIOD_VOCABULARY.subset(["암보장개시일"])
+
+
+def extract_diagnosis_scope(
+    policy_evidence: list,
+    insurer_code: str,
+    features: EvidenceFeatureCache | None = None,
+) -> SlotInsurerValue:
     """
     진단 범위 정의 슬롯 추출 (약관에서)
 
     A2 정책: 이 슬롯은 비교 계산에 사용하지 않음
     """
+    features = features or EvidenceFeatureCache()
     trace = LLMTrace.rule_only(reason="not_needed")  # Definition lookup is rule-based
     policy_only = [ev for ev in policy_evidence if ev.doc_type == "약관"]
 
@@ -721,7 +932,7 @@ def extract_diagnosis_scope(policy_evidence: list, insurer_code: str) -> SlotIns
         # 암 정의 관련 키워드 검색
         for ev in policy_only:
             preview = getattr(ev, 'preview', '') or ''
-            if any(kw in preview for kw in ["암의 정의", "악성신생물", "유사암", "경계성종양"]):
+            if DIAGNOSIS_SCOPE_KEYWORDS.any_in(features.get(ev)):
                 return SlotInsurerValue(
                     insurer_code=insurer_code,
                     value=preview[:300],
@@ -743,19 +954,24 @@ def extract_diagnosis_scope(policy_evidence: list, insurer_code: str) -> SlotIns
     )
 
 
-def extract_waiting_period(policy_evidence: list, insurer_code: str) -> SlotInsurerValue:
+def extract_waiting_period(
+    policy_evidence: list,
+    insurer_code: str,
+    features: EvidenceFeatureCache | None = None,
+) -> SlotInsurerValue:
     """
     대기기간 슬롯 추출 (약관에서)
 
     A2 정책: 이 슬롯은 비교 계산에 사용하지 않음
     """
+    features = features or EvidenceFeatureCache()
     trace = LLMTrace.rule_only(reason="not_needed")  # Pattern matching is rule-based
     policy_only = [ev for ev in policy_evidence if ev.doc_type == "약관"]
 
     for ev in policy_only:
-        preview = getattr(ev, 'preview', '') or ''
+        view = features.get(ev)
         # 대기기간 패턴 매칭
-        match = re.search(r'(\d+)\s*(일|개월)\s*(면책|대기)', preview)
+        match = WAITING_PERIOD_HINT_KEYWORDS.any_in(view) and WAITING_PERIOD_PATTERN.search(view.text)
         if match:
             period = f"{match.group(1)}{match.group(2)}"
             return SlotInsurerValue(
@@ -771,7 +987,7 @@ def extract_waiting_period(policy_evidence: list, insurer_code: str) -> SlotInsu
             )
 
         # 암보장개시일 키워드
-        if "암보장개시일" in preview:
+        if WAITING_PERIOD_START_KEYWORDS.any_in(view):
             return SlotInsurerValue(
                 insurer_code=insurer_code,
                 value="암보장개시일 적용",
@@ -826,22 +1042,41 @@ def _determine_coverage_type(coverage_codes: list[str] | None) -> str | None:
     return None
 
 
+def get_slot_query_conditions(query: str) -> tuple[str, ...]:
+    """
+    STEP 4.6: extract_slots 결과에 영향을 주는 query 조건 (포함된 트리거 키워드)
+
+    슬롯 추출은 query 원문이 아니라 트리거 키워드 포함 여부로만 달라지므로,
+    같은 조건이면 다른 표현의 query라도 같은 슬롯이 추출된다.
+    (슬롯별 세부 키워드는 모두 트리거 키워드의 부분집합)
+    STEP 4.19: 트리거 키워드는 컴파일된 슬롯 규칙의 query_trigger 합집합
+    """
+    query_lower = query.lower()
+    return tuple(kw for kw in get_slot_rules().query_triggers if kw in query_lower)
+
+
 def extract_slots(
     insurers: list[str],
     compare_axis: list,
     policy_axis: list,
     coverage_codes: list[str] | None = None,
     query: str = "",  # U-4.16: 쿼리 전달하여 조건부 슬롯 추출
+    slot_timings: dict[str, float] | None = None,
 ) -> list[ComparisonSlot]:
     """
     슬롯 추출 메인 함수 (U-4.13: 다중 coverage_type 지원, U-4.16: 조건부 슬롯)
 
+    STEP 4.19: coverage_type별 슬롯 순서 / evidence 범위 / query 트리거는
+    컴파일된 슬롯 규칙(get_slot_rules)을 따른다.
+    STEP 4.20: evidence별 feature(EvidenceFeatures)는 모든 슬롯이 공유한다.
+
     Args:
         insurers: 보험사 코드 리스트
         compare_axis: compare_axis 결과 (가입설계서/상품요약서/사업방법서)
         policy_axis: policy_axis 결과 (약관)
         coverage_codes: 필터할 coverage_codes
         query: 원본 쿼리 (조건부 슬롯 추출용)
+        slot_timings: 주어지면 slot_key별 추출 시간(ms)을 기록
 
     Returns:
         추출된 슬롯 리스트
@@ -855,348 +1090,53 @@ def extract_slots(
     compare_by_insurer: dict[str, list] = {ic: [] for ic in insurers}
     policy_by_insurer: dict[str, list] = {ic: [] for ic in insurers}
 
+    features = EvidenceFeatureCache()
     for item in compare_axis:
         if item.insurer_code in compare_by_insurer:
             compare_by_insurer[item.insurer_code].extend(item.evidence)
+            # STEP 4.24: evidence별 담보 (가입설계서 금액 fact 조회 키)
+            coverage_code = getattr(item, "coverage_code", None)
+            if coverage_code:
+                for ev in item.evidence:
+                    features.get(ev).coverage_code = coverage_code
 
     for item in policy_axis:
         if item.insurer_code in policy_by_insurer:
             policy_by_insurer[item.insurer_code].extend(item.evidence)
 
-    # Coverage type별 슬롯 추출
-    if coverage_type == "surgery_benefit":
-        return _extract_surgery_benefit_slots(insurers, compare_by_insurer, policy_by_insurer, query)
-    elif coverage_type == "cerebro_cardiovascular_diagnosis":
-        return _extract_cerebro_cardiovascular_slots(insurers, compare_by_insurer, policy_by_insurer)
-    else:  # cancer_diagnosis (기본)
-        return _extract_cancer_diagnosis_slots(insurers, compare_by_insurer, policy_by_insurer, query)
-
-
-def _extract_cancer_diagnosis_slots(
-    insurers: list[str],
-    compare_by_insurer: dict[str, list],
-    policy_by_insurer: dict[str, list],
-    query: str = "",
-) -> list[ComparisonSlot]:
-    """암진단비 슬롯 추출 (U-4.16: subtype 슬롯 추가)"""
-    slots = []
-
-    # 1. diagnosis_lump_sum_amount (범용화: 진단비 일시금 전용)
-    lump_sum_slot = ComparisonSlot(
-        slot_key="payout_amount",  # 하위 호환성 유지
-        label="진단비 지급금액(일시금)",
-        comparable=True,
-        insurers=[
-            extract_diagnosis_lump_sum_slot(compare_by_insurer.get(ic, []), ic)
-            for ic in insurers
-        ],
-    )
-    lump_sum_slot.diff_summary = _generate_slot_diff_summary(lump_sum_slot)
-    slots.append(lump_sum_slot)
-
-    # 2. existence_status
-    existence_slot = ComparisonSlot(
-        slot_key="existence_status",
-        label="담보 존재 여부",
-        comparable=True,
-        insurers=[
-            extract_existence_status(compare_by_insurer.get(ic, []), ic)
-            for ic in insurers
-        ],
-    )
-    existence_slot.diff_summary = _generate_slot_diff_summary(existence_slot)
-    slots.append(existence_slot)
-
-    # 3. payout_condition_summary
-    condition_slot = ComparisonSlot(
-        slot_key="payout_condition_summary",
-        label="지급조건 요약",
-        comparable=True,
-        insurers=[
-            extract_payout_condition_summary(compare_by_insurer.get(ic, []), ic)
-            for ic in insurers
-        ],
-    )
-    condition_slot.diff_summary = _generate_slot_diff_summary(condition_slot)
-    slots.append(condition_slot)
-
-    # 4. diagnosis_scope_definition (약관 - comparable=False)
-    diagnosis_slot = ComparisonSlot(
-        slot_key="diagnosis_scope_definition",
-        label="진단 범위 정의",
-        comparable=False,
-        insurers=[
-            extract_diagnosis_scope(policy_by_insurer.get(ic, []), ic)
-            for ic in insurers
-        ],
-    )
-    slots.append(diagnosis_slot)
-
-    # 5. waiting_period (약관 - comparable=False)
-    waiting_slot = ComparisonSlot(
-        slot_key="waiting_period",
-        label="대기기간",
-        comparable=False,
-        insurers=[
-            extract_waiting_period(policy_by_insurer.get(ic, []), ic)
-            for ic in insurers
-        ],
-    )
-    slots.append(waiting_slot)
-
-    # U-4.16: 경계성종양/제자리암/유사암 관련 쿼리인 경우 subtype 슬롯 추출
-    subtype_keywords = ["제자리암", "상피내암", "경계성종양", "경계성 종양", "유사암"]
-    query_lower = query.lower()
-    if any(kw in query_lower for kw in subtype_keywords):
+    evidence_by_source = {
+        "compare": compare_by_insurer,
+        "policy": policy_by_insurer,
         # 모든 evidence 합쳐서 검색 (compare + policy)
-        all_evidence_by_insurer = {
+        "all": {
             ic: compare_by_insurer.get(ic, []) + policy_by_insurer.get(ic, [])
             for ic in insurers
-        }
-
-        # 6. subtype_in_situ_covered (제자리암 보장 여부)
-        in_situ_slot = ComparisonSlot(
-            slot_key="subtype_in_situ_covered",
-            label="제자리암 보장 여부",
-            comparable=True,
-            insurers=[
-                extract_subtype_coverage_slot(all_evidence_by_insurer.get(ic, []), ic, "in_situ", query)
-                for ic in insurers
-            ],
-        )
-        in_situ_slot.diff_summary = _generate_slot_diff_summary(in_situ_slot)
-        slots.append(in_situ_slot)
-
-        # 7. subtype_borderline_covered (경계성종양 보장 여부)
-        borderline_slot = ComparisonSlot(
-            slot_key="subtype_borderline_covered",
-            label="경계성종양 보장 여부",
-            comparable=True,
-            insurers=[
-                extract_subtype_coverage_slot(all_evidence_by_insurer.get(ic, []), ic, "borderline", query)
-                for ic in insurers
-            ],
-        )
-        borderline_slot.diff_summary = _generate_slot_diff_summary(borderline_slot)
-        slots.append(borderline_slot)
-
-        # 8. subtype_similar_cancer_covered (유사암 보장 여부)
-        similar_slot = ComparisonSlot(
-            slot_key="subtype_similar_cancer_covered",
-            label="유사암 보장 여부",
-            comparable=True,
-            insurers=[
-                extract_subtype_coverage_slot(all_evidence_by_insurer.get(ic, []), ic, "similar_cancer", query)
-                for ic in insurers
-            ],
-        )
-        similar_slot.diff_summary = _generate_slot_diff_summary(similar_slot)
-        slots.append(similar_slot)
-
-        # 9. subtype_definition_excerpt (정의/조건 발췌)
-        definition_slot = ComparisonSlot(
-            slot_key="subtype_definition_excerpt",
-            label="암 유형 정의/조건 발췌",
-            comparable=False,
-            insurers=[
-                extract_subtype_definition_slot(all_evidence_by_insurer.get(ic, []), ic, query)
-                for ic in insurers
-            ],
-        )
-        slots.append(definition_slot)
-
-        # 10. partial_payment_rule (U-4.17: 감액/지급률 규정)
-        partial_slot = ComparisonSlot(
-            slot_key="partial_payment_rule",
-            label="감액/지급률 규정",
-            comparable=True,
-            insurers=[
-                extract_partial_payment_slot(all_evidence_by_insurer.get(ic, []), ic, query)
-                for ic in insurers
-            ],
-        )
-        partial_slot.diff_summary = _generate_slot_diff_summary(partial_slot)
-        slots.append(partial_slot)
-
-    return slots
-
-
-def _extract_cerebro_cardiovascular_slots(
-    insurers: list[str],
-    compare_by_insurer: dict[str, list],
-    policy_by_insurer: dict[str, list],
-) -> list[ComparisonSlot]:
-    """뇌/심혈관 진단비 슬롯 추출 (U-4.13)"""
-    slots = []
-
-    # 1. diagnosis_lump_sum_amount (진단비 일시금 - 암진단비와 동일 추출기 사용)
-    lump_sum_slot = ComparisonSlot(
-        slot_key="diagnosis_lump_sum_amount",
-        label="진단비 지급금액(일시금)",
-        comparable=True,
-        insurers=[
-            extract_diagnosis_lump_sum_slot(compare_by_insurer.get(ic, []), ic)
-            for ic in insurers
-        ],
-    )
-    lump_sum_slot.diff_summary = _generate_slot_diff_summary(lump_sum_slot)
-    slots.append(lump_sum_slot)
-
-    # 2. existence_status
-    existence_slot = ComparisonSlot(
-        slot_key="existence_status",
-        label="담보 존재 여부",
-        comparable=True,
-        insurers=[
-            extract_existence_status(compare_by_insurer.get(ic, []), ic)
-            for ic in insurers
-        ],
-    )
-    existence_slot.diff_summary = _generate_slot_diff_summary(existence_slot)
-    slots.append(existence_slot)
-
-    # 3. waiting_period (약관 - comparable=False)
-    waiting_slot = ComparisonSlot(
-        slot_key="waiting_period",
-        label="대기기간",
-        comparable=False,
-        insurers=[
-            extract_waiting_period(policy_by_insurer.get(ic, []), ic)
-            for ic in insurers
-        ],
-    )
-    slots.append(waiting_slot)
-
-    return slots
-
-
-def _extract_surgery_benefit_slots(
-    insurers: list[str],
-    compare_by_insurer: dict[str, list],
-    policy_by_insurer: dict[str, list],
-    query: str = "",
-) -> list[ComparisonSlot]:
-    """수술비 슬롯 추출 (U-4.13 + U-4.16 + U-4.18)"""
-    slots = []
-
-    # 모든 evidence 합쳐서 검색 (compare + policy) - U-4.18에서 기본 사용
-    all_evidence_by_insurer = {
-        ic: compare_by_insurer.get(ic, []) + policy_by_insurer.get(ic, [])
-        for ic in insurers
+        },
     }
 
-    # 1. surgery_amount (수술비 지급금액)
-    surgery_amount_slot = ComparisonSlot(
-        slot_key="surgery_amount",
-        label="수술비 지급금액",
-        comparable=True,
-        insurers=[
-            extract_surgery_amount_slot(compare_by_insurer.get(ic, []), ic)
-            for ic in insurers
-        ],
-    )
-    surgery_amount_slot.diff_summary = _generate_slot_diff_summary(surgery_amount_slot)
-    slots.append(surgery_amount_slot)
-
-    # 2. surgery_count_limit (수술 횟수 제한)
-    count_limit_slot = ComparisonSlot(
-        slot_key="surgery_count_limit",
-        label="수술 횟수 제한",
-        comparable=True,
-        insurers=[
-            extract_surgery_count_limit_slot(compare_by_insurer.get(ic, []), ic)
-            for ic in insurers
-        ],
-    )
-    count_limit_slot.diff_summary = _generate_slot_diff_summary(count_limit_slot)
-    slots.append(count_limit_slot)
-
-    # 3. existence_status
-    existence_slot = ComparisonSlot(
-        slot_key="existence_status",
-        label="담보 존재 여부",
-        comparable=True,
-        insurers=[
-            extract_existence_status(compare_by_insurer.get(ic, []), ic)
-            for ic in insurers
-        ],
-    )
-    existence_slot.diff_summary = _generate_slot_diff_summary(existence_slot)
-    slots.append(existence_slot)
-
     query_lower = query.lower()
+    slots = []
+    for rule in get_slot_rules().for_coverage_type(coverage_type):
+        if not rule.is_triggered(query_lower):
+            continue
 
-    # U-4.16/U-4.18: 다빈치/로봇/내시경 수술 관련 쿼리인 경우 추가 슬롯 추출
-    if any(kw in query_lower for kw in ["다빈치", "로봇", "da vinci", "robot", "내시경"]):
-        # 4. surgery_method (수술 방식)
-        surgery_method_slot = ComparisonSlot(
-            slot_key="surgery_method",
-            label="수술 방식 조건",
-            comparable=True,
+        start = time.perf_counter()
+        by_insurer = evidence_by_source[rule.evidence]
+        slot = ComparisonSlot(
+            slot_key=rule.slot_key,
+            label=rule.label,
+            comparable=rule.comparable,
             insurers=[
-                extract_surgery_method_slot(all_evidence_by_insurer.get(ic, []), ic, query)
+                rule.extract(by_insurer.get(ic, []), ic, query, features)
                 for ic in insurers
             ],
         )
-        surgery_method_slot.diff_summary = _generate_slot_diff_summary(surgery_method_slot)
-        slots.append(surgery_method_slot)
-
-        # 5. method_condition (수술방식 적용조건)
-        method_condition_slot = ComparisonSlot(
-            slot_key="method_condition",
-            label="수술방식 적용조건",
-            comparable=False,
-            insurers=[
-                extract_method_condition_slot(all_evidence_by_insurer.get(ic, []), ic, query)
-                for ic in insurers
-            ],
-        )
-        slots.append(method_condition_slot)
+        slot.diff_summary = _generate_slot_diff_summary(slot)
+        slots.append(slot)
 
-    # U-4.18: 병원급 조건 쿼리인 경우 추가 슬롯 추출
-    if any(kw in query_lower for kw in ["상급종합", "종합병원", "병원급", "의원"]):
-        # 6. hospital_tier_condition (병원급 조건)
-        hospital_tier_slot = ComparisonSlot(
-            slot_key="hospital_tier_condition",
-            label="병원급 조건",
-            comparable=True,
-            insurers=[
-                extract_hospital_tier_slot(all_evidence_by_insurer.get(ic, []), ic, query)
-                for ic in insurers
-            ],
-        )
-        hospital_tier_slot.diff_summary = _generate_slot_diff_summary(hospital_tier_slot)
-        slots.append(hospital_tier_slot)
-
-    # U-4.18: 경증 제외 쿼리인 경우 추가 슬롯 추출
-    if any(kw in query_lower for kw in ["경증", "백내장", "치질", "탈장", "제외"]):
-        # 7. minor_exclusion_rule (경증 제외 조건)
-        minor_exclusion_slot = ComparisonSlot(
-            slot_key="minor_exclusion_rule",
-            label="경증 제외/제한 조건",
-            comparable=True,
-            insurers=[
-                extract_minor_exclusion_slot(all_evidence_by_insurer.get(ic, []), ic, query)
-                for ic in insurers
-            ],
-        )
-        minor_exclusion_slot.diff_summary = _generate_slot_diff_summary(minor_exclusion_slot)
-        slots.append(minor_exclusion_slot)
-
-    # U-4.18: 수술 분류(종수) 쿼리인 경우 추가 슬롯 추출
-    if any(kw in query_lower for kw in ["종수", "1종", "5종", "8종", "분류"]):
-        # 8. surgery_grade_rule (수술 분류)
-        surgery_grade_slot = ComparisonSlot(
-            slot_key="surgery_grade_rule",
-            label="수술 분류(1~5종/1~8종/시술포함)",
-            comparable=True,
-            insurers=[
-                extract_surgery_grade_slot(all_evidence_by_insurer.get(ic, []), ic, query)
-                for ic in insurers
-            ],
-        )
-        surgery_grade_slot.diff_summary = _generate_slot_diff_summary(surgery_grade_slot)
-        slots.append(surgery_grade_slot)
+        if slot_timings is not None:
+            elapsed_ms = (time.perf_counter() - start) * 1000
+            slot_timings[rule.slot_key] = round(slot_timings.get(rule.slot_key, 0.0) + elapsed_ms, 3)
 
     return slots
 
@@ -1248,16 +1188,44 @@ SURGERY_GRADE_PATTERNS = [
     r"제?\s*(\d+)\s*종",  # "제1종", "1종"
 ]
 
+# STEP 4.19: 컴파일된 matcher
+# STEP 4.20: 수술 방식 / 적용조건 슬롯은 한 어휘를 공유 (evidence당 1회 스캔)
+SURGERY_METHOD_VOCABULARY = SlotVocabulary(
+    "surgery_method",
+    ["다빈치", "da vinci", "davinci", "로봇수술", "로봇 수술", "robot", "내시경", "endoscopic"],
+    lower=True,
+)
+DAVINCI_KEYWORDS = SURGERY_METHOD_VOCABULARY.subset(["다빈치", "da vinci", "davinci"])
+ROBOT_KEYWORDS = SURGERY_METHOD_VOCABULARY.subset(["로봇수술", "로봇 수술", "robot"])
+ENDOSCOPIC_KEYWORDS = SURGERY_METHOD_VOCABULARY.subset(["내시경", "endoscopic"])
+METHOD_CONDITION_KEYWORDS = SURGERY_METHOD_VOCABULARY.subset(["다빈치", "da vinci", "davinci", "로봇수술", "로봇 수술"])
+METHOD_CONDITION_DOC_PRIORITY = {**COMPARE_DOC_PRIORITY, "약관": 1}
+METHOD_CONDITION_PATTERNS = [
+    re.compile(r'(다빈치|로봇수술|로봇\s*수술)[^。.]*?(시|경우|때)[^。.]{0,100}', re.IGNORECASE),
+    re.compile(r'[^。.]{0,50}(다빈치|로봇수술|로봇\s*수술)[^。.]{0,100}', re.IGNORECASE),
+]
+HOSPITAL_TIER_KEYWORD_SET = KeywordSet([keyword for keyword, _ in HOSPITAL_TIER_KEYWORDS])
+HOSPITAL_TIER_NORMALIZED = dict(HOSPITAL_TIER_KEYWORDS)
+MINOR_EXCLUSION_KEYWORD_SET = KeywordSet(MINOR_EXCLUSION_KEYWORDS, lower=True)
+EXCLUSION_CONTEXT_KEYWORDS = KeywordSet(["제외", "면책", "지급하지", "보장하지"])
+SURGERY_GRADE_RES = [re.compile(pattern) for pattern in SURGERY_GRADE_PATTERNS]
+SURGERY_GRADE_HINT_KEYWORDS = KeywordSet(["종"])  # 모든 종수 패턴에 포함된 문자
 
-def extract_surgery_method_slot(evidence_list: list, insurer_code: str, query: str = "") -> SlotInsurerValue:
+
+def extract_surgery_method_slot(
+    evidence_list: list,
+    insurer_code: str,
+    query: str = "",
+    features: EvidenceFeatureCache | None = None,
+) -> SlotInsurerValue:
     """
     수술 방식 슬롯 추출 (U-4.16/U-4.18)
 
     다빈치/로봇수술/내시경 키워드를 탐지하여 수술 방식 반환
     값: DAVINCI, ROBOT, ENDOSCOPIC, NONE, Unknown
     """
-    # U-4.18: 약관 우선 (doc_type_priority)
-    doc_type_priority = {"약관": 4, "사업방법서": 3, "상품요약서": 2, "가입설계서": 1}
+    features = features or EvidenceFeatureCache()
+    # U-4.18: 약관 우선 (EvidenceFeatures.policy_priority)
     trace = LLMTrace.rule_only(reason="not_needed")
 
     best_method = None
@@ -1268,29 +1236,21 @@ def extract_surgery_method_slot(evidence_list: list, insurer_code: str, query: s
     found_robot = False
     found_endoscopic = False
 
-    for ev in evidence_list:
+    for view in features.views(evidence_list):
+        ev = view.evidence
         # A2 정책: 약관도 포함 (정의 확인 필요)
-        doc_priority = doc_type_priority.get(ev.doc_type, 0)
-        page_start = getattr(ev, 'page_start', float('inf')) or float('inf')
-
-        preview = getattr(ev, 'preview', '') or ''
-        if not preview:
+        if not view.text:
             continue
 
-        preview_lower = preview.lower()
-
+        doc_priority = view.policy_priority
+        page_start = view.page_order
         # U-4.16: tie-breaker 안정화 - doc_priority > best, 또는 동일 시 page_start 비교
-        def _is_better(doc_pri, page_st):
-            if doc_pri > best_doc_priority:
-                return True
-            if doc_pri == best_doc_priority and page_st < best_page_start:
-                return True
-            return False
+        is_better = _outranks(doc_priority, page_start, best_doc_priority, best_page_start)
 
         # 다빈치 키워드 탐지
-        if any(kw in preview_lower for kw in ["다빈치", "da vinci", "davinci"]):
+        if DAVINCI_KEYWORDS.any_in(view):
             found_davinci = True
-            if _is_better(doc_priority, page_start):
+            if is_better:
                 best_method = "DAVINCI"
                 best_doc_priority = doc_priority
                 best_page_start = page_start
@@ -1301,9 +1261,9 @@ def extract_surgery_method_slot(evidence_list: list, insurer_code: str, query: s
                 )]
 
         # 로봇수술 키워드 탐지
-        elif any(kw in preview_lower for kw in ["로봇수술", "로봇 수술", "robot"]):
+        elif ROBOT_KEYWORDS.any_in(view):
             found_robot = True
-            if _is_better(doc_priority, page_start) and not found_davinci:
+            if is_better and not found_davinci:
                 best_method = "ROBOT"
                 best_doc_priority = doc_priority
                 best_page_start = page_start
@@ -1314,9 +1274,9 @@ def extract_surgery_method_slot(evidence_list: list, insurer_code: str, query: s
                 )]
 
         # U-4.18: 내시경 키워드 탐지
-        elif any(kw in preview_lower for kw in ["내시경", "endoscopic"]):
+        elif ENDOSCOPIC_KEYWORDS.any_in(view):
             found_endoscopic = True
-            if _is_better(doc_priority, page_start) and not found_davinci and not found_robot:
+            if is_better and not found_davinci and not found_robot:
                 best_method = "ENDOSCOPIC"
                 best_doc_priority = doc_priority
                 best_page_start = page_start
@@ -1365,43 +1325,42 @@ def extract_surgery_method_slot(evidence_list: list, insurer_code: str, query: s
     )
 
 
-def extract_method_condition_slot(evidence_list: list, insurer_code: str, query: str = "") -> SlotInsurerValue:
+def extract_method_condition_slot(
+    evidence_list: list,
+    insurer_code: str,
+    query: str = "",
+    features: EvidenceFeatureCache | None = None,
+) -> SlotInsurerValue:
     """
     수술방식 적용조건 슬롯 추출 (U-4.16)
 
     다빈치/로봇수술 키워드 주변에서 조건 문구 추출
     """
-    doc_type_priority = {"상품요약서": 3, "사업방법서": 2, "가입설계서": 1, "약관": 1}
+    features = features or EvidenceFeatureCache()
     trace = LLMTrace.rule_only(reason="not_needed")
 
     best_condition = None
     best_doc_priority = 0
     best_refs = []
 
-    surgery_keywords = ["다빈치", "da vinci", "davinci", "로봇수술", "로봇 수술"]
-    condition_patterns = [
-        r'(다빈치|로봇수술|로봇\s*수술)[^。.]*?(시|경우|때)[^。.]{0,100}',
-        r'[^。.]{0,50}(다빈치|로봇수술|로봇\s*수술)[^。.]{0,100}',
-    ]
-
-    for ev in evidence_list:
+    for view in features.views(evidence_list):
+        ev = view.evidence
         preview = getattr(ev, 'preview', '') or ''
         if not preview:
             continue
 
-        preview_lower = preview.lower()
 
         # 수술 키워드 포함 여부 확인
-        if not any(kw in preview_lower for kw in surgery_keywords):
+        if not METHOD_CONDITION_KEYWORDS.any_in(view):
             continue
 
-        doc_priority = doc_type_priority.get(ev.doc_type, 0)
+        doc_priority = METHOD_CONDITION_DOC_PRIORITY.get(ev.doc_type, 0)
         if doc_priority < best_doc_priority:
             continue
 
         # 조건 문구 추출 시도
-        for pattern in condition_patterns:
-            match = re.search(pattern, preview, re.IGNORECASE)
+        for pattern in METHOD_CONDITION_PATTERNS:
+            match = pattern.search(preview)
             if match:
                 condition_text = match.group(0).strip()
                 # 너무 짧거나 긴 경우 필터링
@@ -1418,21 +1377,20 @@ def extract_method_condition_slot(evidence_list: list, insurer_code: str, query:
 
         # 패턴 매칭 실패 시 키워드 주변 텍스트 추출
         if not best_condition and doc_priority >= best_doc_priority:
-            for kw in surgery_keywords:
-                if kw in preview_lower:
-                    idx = preview_lower.find(kw)
-                    start = max(0, idx - 30)
-                    end = min(len(preview), idx + len(kw) + 100)
-                    snippet = preview[start:end].strip()
-                    if len(snippet) >= 20:
-                        best_condition = snippet
-                        best_doc_priority = doc_priority
-                        best_refs = [SlotEvidenceRef(
-                            document_id=ev.document_id,
-                            page_start=ev.page_start,
-                            chunk_id=getattr(ev, 'chunk_id', None),
-                        )]
-                    break
+            kw = METHOD_CONDITION_KEYWORDS.first_in(view)
+            if kw:
+                idx = view.find(kw, lower=True)
+                start = max(0, idx - 30)
+                end = min(len(preview), idx + len(kw) + 100)
+                snippet = preview[start:end].strip()
+                if len(snippet) >= 20:
+                    best_condition = snippet
+                    best_doc_priority = doc_priority
+                    best_refs = [SlotEvidenceRef(
+                        document_id=ev.document_id,
+                        page_start=ev.page_start,
+                        chunk_id=getattr(ev, 'chunk_id', None),
+                    )]
 
     if best_condition:
         return SlotInsurerValue(
@@ -1470,24 +1428,41 @@ COVERAGE_NEGATIVE_KEYWORDS = ["제외", "면책", "지급하지", "해당하지"
 # U-4.16: 감액/부분지급 키워드 (Unknown + reason으로 처리)
 PARTIAL_PAYMENT_KEYWORDS = ["감액", "50%", "20%", "10%", "지급률", "일부지급", "부분지급"]
 
+# STEP 4.19: 컴파일된 subtype matcher (lowercase 기준)
+# STEP 4.20: subtype 보장 / 정의 슬롯은 한 어휘를 공유
+CANCER_SUBTYPE_VOCABULARY = SlotVocabulary(
+    "cancer_subtype",
+    [kw for keywords in CANCER_SUBTYPE_KEYWORDS.values() for kw in keywords],
+    lower=True,
+)
+CANCER_SUBTYPE_KEYWORD_SETS = {
+    subtype: CANCER_SUBTYPE_VOCABULARY.subset(keywords)
+    for subtype, keywords in CANCER_SUBTYPE_KEYWORDS.items()
+}
+ALL_SUBTYPE_KEYWORDS = CANCER_SUBTYPE_VOCABULARY.subset(CANCER_SUBTYPE_VOCABULARY.keywords)
+COVERAGE_POSITIVE_KEYWORD_SET = KeywordSet(COVERAGE_POSITIVE_KEYWORDS, lower=True)
+COVERAGE_NEGATIVE_KEYWORD_SET = KeywordSet(COVERAGE_NEGATIVE_KEYWORDS, lower=True)
+PARTIAL_PAYMENT_KEYWORD_SET = KeywordSet(PARTIAL_PAYMENT_KEYWORDS, lower=True)
+
 
 def extract_subtype_coverage_slot(
     evidence_list: list,
     insurer_code: str,
     subtype: str,  # "in_situ", "borderline", "similar_cancer"
-    query: str = ""
+    query: str = "",
+    features: EvidenceFeatureCache | None = None,
 ) -> SlotInsurerValue:
     """
     암 subtype 보장 여부 슬롯 추출 (U-4.16)
 
     제자리암/경계성종양/유사암의 보장 여부를 Y/N/Unknown으로 반환
     """
-    # U-4.17: 약관 우선 (subtype 정의/조건은 약관이 원천)
-    doc_type_priority = {"약관": 4, "사업방법서": 3, "상품요약서": 2, "가입설계서": 1}
+    features = features or EvidenceFeatureCache()
+    # U-4.17: 약관 우선 (subtype 정의/조건은 약관이 원천, EvidenceFeatures.policy_priority)
     trace = LLMTrace.rule_only(reason="not_needed")
 
-    subtype_keywords = CANCER_SUBTYPE_KEYWORDS.get(subtype, [])
-    if not subtype_keywords:
+    subtype_keywords = CANCER_SUBTYPE_KEYWORD_SETS.get(subtype)
+    if subtype_keywords is None:
         return SlotInsurerValue(
             insurer_code=insurer_code,
             value="Unknown",
@@ -1500,40 +1475,32 @@ def extract_subtype_coverage_slot(
     best_confidence = 0  # higher is better
     best_reason = None  # U-4.16: 감액/부분지급 등 reason
     best_refs = []
-    found_subtype = False
 
-    for ev in evidence_list:
+    for view in features.views(evidence_list):
+        ev = view.evidence
         preview = getattr(ev, 'preview', '') or ''
         if not preview:
             continue
 
-        preview_lower = preview.lower()
-
-        # Subtype 키워드 포함 여부 확인
-        found_keyword = None
-        for kw in subtype_keywords:
-            if kw.lower() in preview_lower:
-                found_keyword = kw
-                found_subtype = True
-                break
-
+        # Subtype 키워드 포함 여부 확인 (목록 순서상 첫 키워드)
+        found_keyword = subtype_keywords.first_in(view)
         if not found_keyword:
             continue
 
-        doc_priority = doc_type_priority.get(ev.doc_type, 0)
+        doc_priority = view.policy_priority
 
         # 키워드 주변 텍스트 분석 (300자 윈도우)
-        idx = preview_lower.find(found_keyword.lower())
+        idx = view.find(found_keyword, lower=True)
         start = max(0, idx - 100)
         end = min(len(preview), idx + len(found_keyword) + 200)
         context = preview[start:end]
         context_lower = context.lower()  # U-4.16: 대소문자 통일
 
         # 포함/제외 키워드 탐지 (lowercase 기반)
-        has_positive = any(pk.lower() in context_lower for pk in COVERAGE_POSITIVE_KEYWORDS)
-        has_negative = any(nk.lower() in context_lower for nk in COVERAGE_NEGATIVE_KEYWORDS)
+        has_positive = COVERAGE_POSITIVE_KEYWORD_SET.search(context_lower)
+        has_negative = COVERAGE_NEGATIVE_KEYWORD_SET.search(context_lower)
         # U-4.16: 감액/부분지급 키워드 탐지
-        has_partial = any(pp.lower() in context_lower for pp in PARTIAL_PAYMENT_KEYWORDS)
+        has_partial = PARTIAL_PAYMENT_KEYWORD_SET.search(context_lower)
 
         # 판단
         reason = None
@@ -1588,47 +1555,42 @@ def extract_subtype_coverage_slot(
     )
 
 
-def extract_subtype_definition_slot(evidence_list: list, insurer_code: str, query: str = "") -> SlotInsurerValue:
+def extract_subtype_definition_slot(
+    evidence_list: list,
+    insurer_code: str,
+    query: str = "",
+    features: EvidenceFeatureCache | None = None,
+) -> SlotInsurerValue:
     """
     암 유형 정의/조건 발췌 슬롯 추출 (U-4.16/U-4.17)
 
     제자리암/경계성종양/유사암 관련 정의나 조건 문구 추출
     """
-    # U-4.17: 약관 우선 (subtype 정의/조건은 약관이 원천)
-    doc_type_priority = {"약관": 4, "사업방법서": 3, "상품요약서": 2, "가입설계서": 1}
+    features = features or EvidenceFeatureCache()
+    # U-4.17: 약관 우선 (subtype 정의/조건은 약관이 원천, EvidenceFeatures.policy_priority)
     trace = LLMTrace.rule_only(reason="not_needed")
 
-    all_subtype_keywords = []
-    for keywords in CANCER_SUBTYPE_KEYWORDS.values():
-        all_subtype_keywords.extend(keywords)
-
     best_excerpt = None
     best_doc_priority = 0
     best_refs = []
 
-    for ev in evidence_list:
+    for view in features.views(evidence_list):
+        ev = view.evidence
         preview = getattr(ev, 'preview', '') or ''
         if not preview:
             continue
 
-        preview_lower = preview.lower()
-
         # Subtype 키워드 포함 여부 확인
-        found_keyword = None
-        for kw in all_subtype_keywords:
-            if kw.lower() in preview_lower:
-                found_keyword = kw
-                break
-
+        found_keyword = ALL_SUBTYPE_KEYWORDS.first_in(view)
         if not found_keyword:
             continue
 
-        doc_priority = doc_type_priority.get(ev.doc_type, 0)
+        doc_priority = view.policy_priority
         if doc_priority < best_doc_priority:
             continue
 
         # 키워드 주변 텍스트 추출 (정의 문구 포함)
-        idx = preview_lower.find(found_keyword.lower())
+        idx = view.find(found_keyword, lower=True)
         start = max(0, idx - 50)
         end = min(len(preview), idx + len(found_keyword) + 150)
         excerpt = preview[start:end].strip()
@@ -1672,17 +1634,24 @@ PARTIAL_PAYMENT_PATTERNS = [
     r"(\d+)\s*[일년개월]\s*[경과미].*?(\d+)\s*%",  # "1년 경과 전 50%"
     r"지급률\s*(\d+)\s*%",  # "지급률 50%"
 ]
+PARTIAL_PAYMENT_RES = [re.compile(pattern) for pattern in PARTIAL_PAYMENT_PATTERNS]
+PARTIAL_PAYMENT_HINT_KEYWORDS = KeywordSet(["감액", "지급률", "%", "백분"], lower=True)
 
 
-def extract_partial_payment_slot(evidence_list: list, insurer_code: str, query: str = "") -> SlotInsurerValue:
+def extract_partial_payment_slot(
+    evidence_list: list,
+    insurer_code: str,
+    query: str = "",
+    features: EvidenceFeatureCache | None = None,
+) -> SlotInsurerValue:
     """
     감액/지급률 규정 슬롯 추출 (U-4.17)
 
     암 진단비의 감액 기간/비율 추출
     값 예시: "1년 50%", "90일 이내 50%", "해당없음", Unknown
     """
-    # U-4.17: 약관 우선 (감액 규정은 약관이 원천)
-    doc_type_priority = {"약관": 4, "사업방법서": 3, "상품요약서": 2, "가입설계서": 1}
+    features = features or EvidenceFeatureCache()
+    # U-4.17: 약관 우선 (감액 규정은 약관이 원천, EvidenceFeatures.policy_priority)
     trace = LLMTrace.rule_only(reason="not_needed")
 
     best_rule = None
@@ -1691,22 +1660,19 @@ def extract_partial_payment_slot(evidence_list: list, insurer_code: str, query:
     best_refs = []
     found_partial = False
 
-    for ev in evidence_list:
+    for view in features.views(evidence_list):
+        ev = view.evidence
         preview = getattr(ev, 'preview', '') or ''
         if not preview:
             continue
 
-        doc_priority = doc_type_priority.get(ev.doc_type, 0)
-        page_start = getattr(ev, 'page_start', float('inf')) or float('inf')
-
         # 감액 관련 키워드 확인
-        preview_lower = preview.lower()
-        if not any(kw in preview_lower for kw in ["감액", "지급률", "%", "백분"]):
+        if not PARTIAL_PAYMENT_HINT_KEYWORDS.any_in(view):
             continue
 
         # 패턴 매칭
-        for pattern in PARTIAL_PAYMENT_PATTERNS:
-            match = re.search(pattern, preview)
+        for pattern in PARTIAL_PAYMENT_RES:
+            match = pattern.search(preview)
             if match:
                 found_partial = True
 
@@ -1716,10 +1682,10 @@ def extract_partial_payment_slot(evidence_list: list, insurer_code: str, query:
                 context = preview[start:end].strip()
 
                 # tie-breaker: doc_priority > page_start
-                if doc_priority > best_doc_priority or (doc_priority == best_doc_priority and page_start < best_page_start):
+                if _outranks(view.policy_priority, view.page_order, best_doc_priority, best_page_start):
                     best_rule = context
-                    best_doc_priority = doc_priority
-                    best_page_start = page_start
+                    best_doc_priority = view.policy_priority
+                    best_page_start = view.page_order
                     best_refs = [SlotEvidenceRef(
                         document_id=ev.document_id,
                         page_start=ev.page_start,
@@ -1760,15 +1726,20 @@ def extract_partial_payment_slot(evidence_list: list, insurer_code: str, query:
 # U-4.18: 병원급/경증/종수 슬롯 추출
 # =============================================================================
 
-def extract_hospital_tier_slot(evidence_list: list, insurer_code: str, query: str = "") -> SlotInsurerValue:
+def extract_hospital_tier_slot(
+    evidence_list: list,
+    insurer_code: str,
+    query: str = "",
+    features: EvidenceFeatureCache | None = None,
+) -> SlotInsurerValue:
     """
     병원급 조건 슬롯 추출 (U-4.18)
 
     상급종합병원/종합병원/병원급/의원급 조건 추출
     값: 상급종합병원, 종합병원, 병원급, 의원급, Unknown
     """
-    # U-4.18: 약관 우선
-    doc_type_priority = {"약관": 4, "사업방법서": 3, "상품요약서": 2, "가입설계서": 1}
+    features = features or EvidenceFeatureCache()
+    # U-4.18: 약관 우선 (EvidenceFeatures.policy_priority)
     trace = LLMTrace.rule_only(reason="not_needed")
 
     best_tier = None
@@ -1777,29 +1748,25 @@ def extract_hospital_tier_slot(evidence_list: list, insurer_code: str, query: st
     best_refs = []
     found_tier = False
 
-    for ev in evidence_list:
-        doc_priority = doc_type_priority.get(ev.doc_type, 0)
-        page_start = getattr(ev, 'page_start', float('inf')) or float('inf')
-
-        preview = getattr(ev, 'preview', '') or ''
-        if not preview:
+    for view in features.views(evidence_list):
+        ev = view.evidence
+        if not view.text:
             continue
 
-        # 병원급 키워드 탐지 (우선순위 순)
-        for keyword, normalized in HOSPITAL_TIER_KEYWORDS:
-            if keyword in preview:
-                found_tier = True
-                # tie-breaker: doc_priority > page_start
-                if doc_priority > best_doc_priority or (doc_priority == best_doc_priority and page_start < best_page_start):
-                    best_tier = normalized
-                    best_doc_priority = doc_priority
-                    best_page_start = page_start
-                    best_refs = [SlotEvidenceRef(
-                        document_id=ev.document_id,
-                        page_start=ev.page_start,
-                        chunk_id=getattr(ev, 'chunk_id', None),
-                    )]
-                break  # 첫 번째 매칭 사용 (우선순위 순)
+        # 병원급 키워드 탐지 (우선순위 순, 첫 번째 매칭 사용)
+        keyword = HOSPITAL_TIER_KEYWORD_SET.first_in(view)
+        if keyword:
+            found_tier = True
+            # tie-breaker: doc_priority > page_start
+            if _outranks(view.policy_priority, view.page_order, best_doc_priority, best_page_start):
+                best_tier = HOSPITAL_TIER_NORMALIZED[keyword]
+                best_doc_priority = view.policy_priority
+                best_page_start = view.page_order
+                best_refs = [SlotEvidenceRef(
+                    document_id=ev.document_id,
+                    page_start=ev.page_start,
+                    chunk_id=getattr(ev, 'chunk_id', None),
+                )]
 
     if best_tier:
         return SlotInsurerValue(
@@ -1830,15 +1797,20 @@ def extract_hospital_tier_slot(evidence_list: list, insurer_code: str, query: st
     )
 
 
-def extract_minor_exclusion_slot(evidence_list: list, insurer_code: str, query: str = "") -> SlotInsurerValue:
+def extract_minor_exclusion_slot(
+    evidence_list: list,
+    insurer_code: str,
+    query: str = "",
+    features: EvidenceFeatureCache | None = None,
+) -> SlotInsurerValue:
     """
     경증 제외/제한 조건 슬롯 추출 (U-4.18)
 
     경증상해/질병 제외 조건 추출
     값: 경증상해 제외, 경증질병 제외, 백내장/대장양성종양 제외, 해당없음, Unknown
     """
-    # U-4.18: 약관 우선
-    doc_type_priority = {"약관": 4, "사업방법서": 3, "상품요약서": 2, "가입설계서": 1}
+    features = features or EvidenceFeatureCache()
+    # U-4.18: 약관 우선 (EvidenceFeatures.policy_priority)
     trace = LLMTrace.rule_only(reason="not_needed")
 
     best_exclusion = None
@@ -1848,39 +1820,34 @@ def extract_minor_exclusion_slot(evidence_list: list, insurer_code: str, query:
     found_exclusion = False
     exclusions_found = []
 
-    for ev in evidence_list:
-        doc_priority = doc_type_priority.get(ev.doc_type, 0)
-        page_start = getattr(ev, 'page_start', float('inf')) or float('inf')
-
-        preview = getattr(ev, 'preview', '') or ''
+    for view in features.views(evidence_list):
+        ev = view.evidence
+        preview = view.text
         if not preview:
             continue
 
-        preview_lower = preview.lower()
-
         # 경증 키워드 탐지
-        for keyword in MINOR_EXCLUSION_KEYWORDS:
-            if keyword in preview_lower:
-                # 제외/면책 문맥 확인
-                idx = preview_lower.find(keyword)
-                context_start = max(0, idx - 50)
-                context_end = min(len(preview), idx + len(keyword) + 50)
-                context = preview[context_start:context_end].lower()
-
-                if any(excl in context for excl in ["제외", "면책", "지급하지", "보장하지"]):
-                    found_exclusion = True
-                    exclusions_found.append(keyword)
-
-                    # tie-breaker: doc_priority > page_start
-                    if doc_priority > best_doc_priority or (doc_priority == best_doc_priority and page_start < best_page_start):
-                        best_exclusion = f"{keyword} 제외"
-                        best_doc_priority = doc_priority
-                        best_page_start = page_start
-                        best_refs = [SlotEvidenceRef(
-                            document_id=ev.document_id,
-                            page_start=ev.page_start,
-                            chunk_id=getattr(ev, 'chunk_id', None),
-                        )]
+        for keyword in MINOR_EXCLUSION_KEYWORD_SET.all_in(view):
+            # 제외/면책 문맥 확인
+            idx = view.find(keyword, lower=True)
+            context_start = max(0, idx - 50)
+            context_end = min(len(preview), idx + len(keyword) + 50)
+            context = preview[context_start:context_end].lower()
+
+            if EXCLUSION_CONTEXT_KEYWORDS.search(context):
+                found_exclusion = True
+                exclusions_found.append(keyword)
+
+                # tie-breaker: doc_priority > page_start
+                if _outranks(view.policy_priority, view.page_order, best_doc_priority, best_page_start):
+                    best_exclusion = f"{keyword} 제외"
+                    best_doc_priority = view.policy_priority
+                    best_page_start = view.page_order
+                    best_refs = [SlotEvidenceRef(
+                        document_id=ev.document_id,
+                        page_start=ev.page_start,
+                        chunk_id=getattr(ev, 'chunk_id', None),
+                    )]
 
     if best_exclusion:
         # 여러 개 발견 시 합쳐서 표시
@@ -1916,15 +1883,20 @@ def extract_minor_exclusion_slot(evidence_list: list, insurer_code: str, query:
     )
 
 
-def extract_surgery_grade_slot(evidence_list: list, insurer_code: str, query: str = "") -> SlotInsurerValue:
+def extract_surgery_grade_slot(
+    evidence_list: list,
+    insurer_code: str,
+    query: str = "",
+    features: EvidenceFeatureCache | None = None,
+) -> SlotInsurerValue:
     """
     수술 분류(종수) 슬롯 추출 (U-4.18)
 
     1~5종, 1~8종 등 수술 분류 추출
     값: 1~5종, 1~8종(시술포함), Unknown
     """
-    # U-4.18: 약관 우선
-    doc_type_priority = {"약관": 4, "사업방법서": 3, "상품요약서": 2, "가입설계서": 1}
+    features = features or EvidenceFeatureCache()
+    # U-4.18: 약관 우선 (EvidenceFeatures.policy_priority)
     trace = LLMTrace.rule_only(reason="not_needed")
 
     best_grade = None
@@ -1933,17 +1905,17 @@ def extract_surgery_grade_slot(evidence_list: list, insurer_code: str, query: st
     best_refs = []
     found_grade = False
 
-    for ev in evidence_list:
-        doc_priority = doc_type_priority.get(ev.doc_type, 0)
-        page_start = getattr(ev, 'page_start', float('inf')) or float('inf')
-
-        preview = getattr(ev, 'preview', '') or ''
+    for view in features.views(evidence_list):
+        ev = view.evidence
+        preview = view.text
         if not preview:
             continue
 
         # 종수 패턴 탐지
-        for pattern in SURGERY_GRADE_PATTERNS:
-            match = re.search(pattern, preview)
+        if not SURGERY_GRADE_HINT_KEYWORDS.any_in(view):
+            continue
+        for pattern in SURGERY_GRADE_RES:
+            match = pattern.search(preview)
             if match:
                 found_grade = True
 
@@ -1958,10 +1930,10 @@ def extract_surgery_grade_slot(evidence_list: list, insurer_code: str, query: st
                     grade_text += "(시술포함)"
 
                 # tie-breaker: doc_priority > page_start
-                if doc_priority > best_doc_priority or (doc_priority == best_doc_priority and page_start < best_page_start):
+                if _outranks(view.policy_priority, view.page_order, best_doc_priority, best_page_start):
                     best_grade = grade_text
-                    best_doc_priority = doc_priority
-                    best_page_start = page_start
+                    best_doc_priority = view.policy_priority
+                    best_page_start = view.page_order
                     best_refs = [SlotEvidenceRef(
                         document_id=ev.document_id,
                         page_start=ev.page_start,
@@ -2024,3 +1996,47 @@ def _generate_slot_diff_summary(slot: ComparisonSlot) -> str | None:
         return f"동일: {values[0][1]}"
 
     return ", ".join(f"{ic}: {v}" for ic, v in values)
+
+
+def merge_slots(
+    parts: list[tuple[list[str], list[ComparisonSlot]]],
+    insurers: list[str],
+) -> list[ComparisonSlot]:
+    """
+    STEP 4.13: 보험사 집합별로 추출한 슬롯을 하나로 병합
+
+    같은 입력(coverage_codes, query)으로 추출한 슬롯이면 보험사별 값은
+    다른 보험사와 무관하므로, 값은 그대로 두고 diff_summary만 다시 만든다.
+
+    Args:
+        parts: (해당 결과가 담당하는 보험사, 슬롯 리스트) - 앞쪽 결과 우선
+        insurers: 응답 보험사 순서
+
+    Returns:
+        insurers 순서로 병합된 슬롯 리스트 (슬롯 순서는 처음 등장한 순서)
+    """
+    slot_order: list[str] = []
+    templates: dict[str, ComparisonSlot] = {}
+    values: dict[tuple[str, str], SlotInsurerValue] = {}
+
+    for part_insurers, slots in parts:
+        for slot in slots:
+            if slot.slot_key not in templates:
+                slot_order.append(slot.slot_key)
+                templates[slot.slot_key] = slot
+            for iv in slot.insurers:
+                if iv.insurer_code in part_insurers:
+                    values.setdefault((slot.slot_key, iv.insurer_code), iv)
+
+    merged: list[ComparisonSlot] = []
+    for slot_key in slot_order:
+        template = templates[slot_key]
+        slot = ComparisonSlot(
+            slot_key=slot_key,
+            label=template.label,
+            comparable=template.comparable,
+            insurers=[values[(slot_key, ic)] for ic in insurers if (slot_key, ic) in values],
+        )
+        slot.diff_summary = _generate_slot_diff_summary(slot)
+        merged.append(slot)
+    return merged
@@ -0,0 +1,285 @@
+"""
+STEP 4.19: 슬롯 규칙 컴파일 (config/slot_definitions.yaml → 규칙 엔진)
+
+extract_slots가 coverage_type마다 손으로 나열하던 슬롯 순서 / 근거 범위 /
+query 트리거를 slot_definitions.yaml에서 1회 컴파일한 SlotRule 목록으로 실행한다.
+
+- SlotRule: 응답 slot_key, 추출 함수, evidence 범위(compare / policy / all),
+  query 트리거 키워드, 추가 인자(subtype 등)
+- KeywordSet: 슬롯별 키워드 목록 matcher (목록 순서 = 우선순위)
+- STEP 4.20: SlotVocabulary / EvidenceFeatures: evidence별 feature
+  (정규화 텍스트, 어휘별 키워드 hit set, doc_type 우선순위 / page 순서)를
+  extract_slots 1회 동안 1번만 계산하고 모든 슬롯이 공유한다
+
+우선순위 / tie-break / 값 매핑은 슬롯 추출 함수에 그대로 두고 (결과 동일),
+키워드 탐색만 이 모듈의 matcher를 사용한다.
+"""
+
+from __future__ import annotations
+
+import inspect
+from dataclasses import dataclass, field
+from typing import Any, Callable
+
+
+EVIDENCE_SOURCES = ("compare", "policy", "all")
+
+
+# =============================================================================
+# Slot vocabulary / evidence features
+# =============================================================================
+
+# 슬롯 추출기 doc_type 우선순위 (compare 문서 우선 / 약관 우선)
+COMPARE_DOC_PRIORITY = {"상품요약서": 3, "사업방법서": 2, "가입설계서": 1}
+POLICY_DOC_PRIORITY = {"약관": 4, "사업방법서": 3, "상품요약서": 2, "가입설계서": 1}
+
+
+class SlotVocabulary:
+    """
+    슬롯 키워드 어휘 (evidence별 hit set 계산 단위)
+
+    여러 슬롯이 같은 어휘의 부분집합(KeywordSet)을 쓰면 evidence마다
+    어휘 전체를 1회만 스캔하고 hit set을 공유한다.
+    lower=True면 키워드를 소문자로 보관하고 preview.lower()에 매칭한다.
+    """
+
+    __slots__ = ("name", "keywords", "lower")
+
+    def __init__(self, name: str, keywords: list[str] | tuple[str, ...], lower: bool = False):
+        self.name = name
+        self.keywords = tuple(dict.fromkeys(kw.lower() if lower else kw for kw in keywords))
+        self.lower = lower
+
+    def hits_in(self, text: str) -> frozenset[str]:
+        """text에 포함된 어휘 키워드"""
+        return frozenset(filter(text.__contains__, self.keywords))
+
+    def subset(self, keywords: list[str] | tuple[str, ...]) -> KeywordSet:
+        return KeywordSet(keywords, vocabulary=self)
+
+
+class KeywordSet:
+    """
+    다중 키워드 matcher (목록 순서 = 우선순위)
+
+    vocabulary를 주면 그 어휘의 evidence별 hit set으로 판정하고,
+    주지 않으면 (한 슬롯만 쓰는 목록) evidence 텍스트를 바로 스캔한다.
+    search()는 evidence가 아닌 임의 텍스트(문맥 윈도우 등)용.
+    """
+
+    __slots__ = ("keywords", "lower", "vocabulary")
+
+    def __init__(
+        self,
+        keywords: list[str] | tuple[str, ...],
+        lower: bool = False,
+        vocabulary: SlotVocabulary | None = None,
+    ):
+        if vocabulary is not None:
+            lower = vocabulary.lower
+            missing = set(kw.lower() if lower else kw for kw in keywords) - set(vocabulary.keywords)
+            if missing:
+                raise ValueError(f"어휘 {vocabulary.name}에 없는 키워드: {sorted(missing)}")
+        self.keywords = tuple(kw.lower() for kw in keywords) if lower else tuple(keywords)
+        self.lower = lower
+        self.vocabulary = vocabulary
+
+    def search(self, text: str) -> bool:
+        """임의 텍스트에 키워드가 하나라도 있는지 (lower=True면 text도 소문자여야 함)"""
+        # 정규식 alternation보다 키워드별 substring 검색(C 루프)이 빠르다
+        return any(map(text.__contains__, self.keywords))
+
+    def any_in(self, features: EvidenceFeatures) -> bool:
+        """evidence preview에 키워드가 하나라도 있는지"""
+        if self.vocabulary is None:
+            return any(map(features.view(self.lower).__contains__, self.keywords))
+        return not features.hits(self.vocabulary).isdisjoint(self.keywords)
+
+    def first_in(self, features: EvidenceFeatures) -> str | None:
+        """목록 순서상 첫 번째로 포함된 키워드"""
+        if self.vocabulary is None:
+            text = features.view(self.lower)
+            return next(filter(text.__contains__, self.keywords), None)
+        hits = features.hits(self.vocabulary)
+        if hits:
+            for keyword in self.keywords:
+                if keyword in hits:
+                    return keyword
+        return None
+
+    def all_in(self, features: EvidenceFeatures) -> list[str]:
+        """포함된 키워드 전체 (목록 순서)"""
+        if self.vocabulary is None:
+            return list(filter(features.view(self.lower).__contains__, self.keywords))
+        hits = features.hits(self.vocabulary)
+        return [kw for kw in self.keywords if kw in hits] if hits else []
+
+
+class EvidenceFeatures:
+    """
+    STEP 4.20: evidence 1개의 슬롯 추출 feature
+
+    - text / lower: preview 원문 / 소문자 (lower는 처음 쓸 때 1회)
+    - hits(vocabulary): 어휘별 키워드 hit set (어휘당 1회)
+    - compare_priority / policy_priority / page_order: tie-break 키
+    - coverage_code: evidence가 속한 compare_axis 항목의 담보 (STEP 4.24, 금액 fact 조회용)
+    """
+
+    __slots__ = (
+        "evidence", "text", "doc_type", "compare_priority", "policy_priority", "page_order",
+        "coverage_code", "_lower", "_hits",
+    )
+
+    def __init__(self, evidence: Any):
+        self.evidence = evidence
+        self.text: str = getattr(evidence, "preview", "") or ""
+        self.doc_type: str | None = getattr(evidence, "doc_type", None)
+        self.compare_priority = COMPARE_DOC_PRIORITY.get(self.doc_type, 0)
+        self.policy_priority = POLICY_DOC_PRIORITY.get(self.doc_type, 0)
+        self.page_order: float = getattr(evidence, "page_start", float("inf")) or float("inf")
+        self.coverage_code: str | None = getattr(evidence, "coverage_code", None)
+        self._lower: str | None = None
+        self._hits: dict[str, frozenset[str]] = {}
+
+    @property
+    def lower(self) -> str:
+        if self._lower is None:
+            self._lower = self.text.lower()
+        return self._lower
+
+    def view(self, lower: bool) -> str:
+        return self.lower if lower else self.text
+
+    def find(self, keyword: str, lower: bool = False) -> int:
+        """keyword 첫 위치 (없으면 -1)"""
+        return self.view(lower).find(keyword)
+
+    def hits(self, vocabulary: SlotVocabulary) -> frozenset[str]:
+        hits = self._hits.get(vocabulary.name)
+        if hits is None:
+            hits = self._hits[vocabulary.name] = vocabulary.hits_in(self.view(vocabulary.lower))
+        return hits
+
+
+class EvidenceFeatureCache:
+    """extract_slots 1회 동안의 evidence → EvidenceFeatures (evidence 객체 id 기준)"""
+
+    __slots__ = ("_features", "_lists")
+
+    def __init__(self):
+        self._features: dict[int, EvidenceFeatures] = {}
+        self._lists: dict[int, tuple[list, list[EvidenceFeatures]]] = {}
+
+    def get(self, ev: Any) -> EvidenceFeatures:
+        features = self._features.get(id(ev))
+        # EvidenceFeatures가 evidence 참조를 보관하므로 호출 중 id가 재사용되지 않는다
+        if features is None or features.evidence is not ev:
+            features = self._features[id(ev)] = EvidenceFeatures(ev)
+        return features
+
+    def views(self, evidence_list: list) -> list[EvidenceFeatures]:
+        """evidence 목록 → EvidenceFeatures 목록 (같은 목록 객체를 받는 슬롯끼리 공유)"""
+        entry = self._lists.get(id(evidence_list))
+        if entry is None or entry[0] is not evidence_list:
+            entry = self._lists[id(evidence_list)] = (evidence_list, [self.get(ev) for ev in evidence_list])
+        return entry[1]
+
+
+# =============================================================================
+# Slot rules
+# =============================================================================
+
+@dataclass(frozen=True)
+class SlotRule:
+    """컴파일된 슬롯 규칙"""
+    slot_key: str  # 응답 slot_key
+    label: str
+    comparable: bool
+    extractor: Callable[..., Any]
+    evidence: str = "compare"  # "compare" | "policy" | "all"
+    query_trigger: tuple[str, ...] = ()  # 비어 있으면 항상 추출
+    params: tuple[tuple[str, Any], ...] = ()
+    pass_query: bool = False
+    pass_features: bool = False
+
+    def is_triggered(self, query_lower: str) -> bool:
+        return not self.query_trigger or any(kw in query_lower for kw in self.query_trigger)
+
+    def extract(self, evidence_list: list, insurer_code: str, query: str, features: EvidenceFeatureCache) -> Any:
+        kwargs = dict(self.params)
+        if self.pass_query:
+            kwargs["query"] = query
+        if self.pass_features:
+            kwargs["features"] = features
+        return self.extractor(evidence_list, insurer_code, **kwargs)
+
+
+@dataclass(frozen=True)
+class CompiledSlotRules:
+    """coverage_type별 슬롯 규칙"""
+    version: str | None
+    coverage_types: dict[str, tuple[SlotRule, ...]] = field(default_factory=dict)
+
+    @property
+    def query_triggers(self) -> tuple[str, ...]:
+        """슬롯 결과에 영향을 주는 query 키워드 전체 (정렬)"""
+        return tuple(sorted({
+            kw
+            for rules in self.coverage_types.values()
+            for rule in rules
+            for kw in rule.query_trigger
+        }))
+
+    def for_coverage_type(self, coverage_type: str) -> tuple[SlotRule, ...]:
+        return self.coverage_types.get(coverage_type, ())
+
+
+def compile_slot_rules(
+    definitions: dict[str, Any],
+    functions: dict[str, Callable[..., Any]],
+) -> CompiledSlotRules:
+    """
+    슬롯 정의(slot_definitions.yaml 구조) 컴파일
+
+    Args:
+        definitions: {"version", "coverage_types": {ct: {"slots": [...]}}, "extractors": {...}}
+        functions: 추출 함수 이름 → 함수
+
+    Raises:
+        ValueError: 존재하지 않는 추출 함수 / evidence 범위
+    """
+    extractors = definitions.get("extractors") or {}
+    coverage_types: dict[str, tuple[SlotRule, ...]] = {}
+
+    for coverage_type, ct_data in (definitions.get("coverage_types") or {}).items():
+        rules = []
+        for slot in (ct_data or {}).get("slots") or []:
+            function_name = slot.get("function") or (extractors.get(slot.get("extractor")) or {}).get("function")
+            if not function_name:
+                continue  # stub 추출기 (구현 전)
+            if function_name not in functions:
+                raise ValueError(f"{coverage_type}.{slot['slot_key']}: 알 수 없는 추출 함수 {function_name}")
+
+            evidence = slot.get("evidence", "compare")
+            if evidence not in EVIDENCE_SOURCES:
+                raise ValueError(f"{coverage_type}.{slot['slot_key']}: 알 수 없는 evidence 범위 {evidence}")
+
+            extractor = functions[function_name]
+            parameters = inspect.signature(extractor).parameters
+            rules.append(SlotRule(
+                slot_key=slot.get("response_slot_key") or slot["slot_key"],
+                label=slot["label"],
+                comparable=bool(slot.get("comparable", False)),
+                extractor=extractor,
+                evidence=evidence,
+                query_trigger=tuple(slot.get("query_trigger") or ()),
+                params=tuple((slot.get("params") or {}).items()),
+                pass_query="query" in parameters,
+                pass_features="features" in parameters,
+            ))
+        if rules:
+            coverage_types[coverage_type] = tuple(rules)
+
+    version = definitions.get("version")
+    return CompiledSlotRules(version=str(version) if version is not None else None, coverage_types=coverage_types)
+
@@ -0,0 +1,319 @@
+"""
+STEP 4.24: 가입설계서 담보 표 파싱 (coverage_amount_fact 적재용)
+
+가입설계서의 금액은 표 행(담보명 / 가입금액 / 보험료)인데, load_pdf는 페이지를
+텍스트로 평탄화하므로 조회 시 보험료 / 가입금액 구분을 휴리스틱
+(_find_premium_block_lines, _is_premium_line 등)으로 다시 추정해야 했다.
+적재 시 PyMuPDF 표 / 단어 좌표로 행 단위 구조를 그대로 읽는다.
+
+- 표 추출: page.find_tables() (괘선 있는 표)
+- 단어 좌표 fallback: 괘선 없는 표는 get_text("words")를 y 좌표로 행, 헤더 단어
+  x 좌표로 열을 나눈다
+- 헤더 행: 담보 열 + 가입금액 열 필수, 보험료 열 선택
+  (헤더 단위 "(만원)" / "(원)"이 있으면 숫자만 있는 셀에 적용, 보험료 기본 단위는 원)
+- 가입금액 셀에 금액이 2개 이상이면 (1종 10만원 2종 30만원 등) 행을 만들지 않는다
+  (조회 시 regex 추출 fallback)
+- 담보명 → coverage_code: chunk와 같은 extract_coverage (coverage_alias 우선, ontology)
+"""
+
+from __future__ import annotations
+
+import re
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+import fitz  # PyMuPDF
+
+from services.extraction.amount_extractor import tokenize_amounts
+from services.ingestion.coverage_extractor import extract_coverage
+
+
+# 헤더 열 키워드 (셀 텍스트 공백 제거 후 포함 여부)
+COVERAGE_HEADER_KEYWORDS = ("담보", "보장명", "특약명", "보장내용")
+AMOUNT_HEADER_KEYWORDS = ("가입금액", "보장금액", "보험금액")
+PREMIUM_HEADER_KEYWORDS = ("보험료",)
+
+# 합계 / 소계 행 (담보 셀 기준)
+TOTAL_ROW_PATTERN = re.compile(r"^(합\s*계|소\s*계|총\s*계|계)\b")
+
+HEADER_UNIT_PATTERN = re.compile(r"\((억원|천만원|만원|천원|원)\)")
+UNIT_MULTIPLIERS = {"억원": 100_000_000, "천만원": 10_000_000, "만원": 10_000, "천원": 1_000, "원": 1}
+BARE_NUMBER_PATTERN = re.compile(r"^\d{1,3}(,\d{3})+$|^\d+$")
+
+# 단어 좌표 fallback: 같은 행으로 볼 y 중심 차이 (글자 높이 대비)
+ROW_TOLERANCE_RATIO = 0.5
+
+# (x0, y0, x1, y1), PDF 좌표 (pt)
+BBox = tuple[float, float, float, float]
+
+
+@dataclass
+class TableCell:
+    """표 셀 (텍스트 + 좌표)"""
+    text: str
+    bbox: BBox
+
+
+@dataclass
+class AmountTableRow:
+    """가입설계서 담보 표 1행"""
+    coverage_name: str  # 담보 셀 원문
+    benefit_amount: int  # 가입금액 (원)
+    benefit_text: str
+    benefit_unit: str | None
+    premium_amount: int | None  # 보험료 (원)
+    premium_text: str | None
+    page_no: int  # 1-indexed
+    row_index: int  # 페이지 내 행 순서
+    bbox: BBox
+    source: str  # "table" | "words"
+
+
+# =============================================================================
+# 셀 값 파싱
+# =============================================================================
+
+def _normalize_cell(text: str | None) -> str:
+    return " ".join((text or "").split())
+
+
+def _header_unit(header_text: str) -> str | None:
+    match = HEADER_UNIT_PATTERN.search(header_text.replace(" ", ""))
+    return match.group(1) if match else None
+
+
+def parse_amount_cell(text: str, header_unit: str | None = None) -> tuple[int, str, str | None] | None:
+    """
+    금액 셀 → (원 단위 값, 표시 텍스트, 단위)
+
+    - 금액 표현이 1개면 그 값 (3,000만원 / 3천만원 / 1억원)
+    - 숫자만 있으면 헤더 단위 적용 (없으면 None)
+    - 금액이 2개 이상이면 None (종별 금액 등 단일 가입금액이 아님)
+    """
+    text = _normalize_cell(text)
+    if not text:
+        return None
+
+    tokens = [token for token in tokenize_amounts(text) if token.value is not None]
+    if len(tokens) == 1:
+        return tokens[0].value, tokens[0].text, tokens[0].unit
+    if tokens:
+        return None
+
+    if header_unit and BARE_NUMBER_PATTERN.match(text):
+        return int(text.replace(",", "")) * UNIT_MULTIPLIERS[header_unit], f"{text}{header_unit}", header_unit
+    return None
+
+
+def _union_bbox(cells: list[TableCell]) -> BBox:
+    return (
+        round(min(c.bbox[0] for c in cells), 1),
+        round(min(c.bbox[1] for c in cells), 1),
+        round(max(c.bbox[2] for c in cells), 1),
+        round(max(c.bbox[3] for c in cells), 1),
+    )
+
+
+def _find_column(header: list[str], keywords: tuple[str, ...], exclude: set[int]) -> int | None:
+    for idx, text in enumerate(header):
+        if idx not in exclude and any(kw in text.replace(" ", "") for kw in keywords):
+            return idx
+    return None
+
+
+def parse_amount_rows(
+    rows: list[list[TableCell]],
+    page_no: int,
+    source: str,
+    first_row_index: int = 0,
+) -> list[AmountTableRow]:
+    """
+    표 행 목록(첫 헤더 행부터) → 담보 금액 행
+
+    헤더 행 = 담보 열과 가입금액 열이 모두 있는 첫 행. 헤더가 없으면 빈 목록.
+    row_index는 first_row_index부터 (같은 페이지의 앞선 표 행 수, 페이지 내 유일).
+    """
+    for header_idx, row in enumerate(rows):
+        header = [_normalize_cell(cell.text) for cell in row]
+        amount_col = _find_column(header, AMOUNT_HEADER_KEYWORDS, set())
+        if amount_col is None:
+            continue
+        coverage_col = _find_column(header, COVERAGE_HEADER_KEYWORDS, {amount_col})
+        if coverage_col is None:
+            continue
+        premium_col = _find_column(header, PREMIUM_HEADER_KEYWORDS, {amount_col, coverage_col})
+        break
+    else:
+        return []
+
+    amount_unit = _header_unit(header[amount_col])
+    premium_unit = (_header_unit(header[premium_col]) or "원") if premium_col is not None else None
+
+    results: list[AmountTableRow] = []
+    for row in rows[header_idx + 1:]:
+        if len(row) <= max(amount_col, coverage_col):
+            continue
+        coverage_name = _normalize_cell(row[coverage_col].text)
+        if not coverage_name or TOTAL_ROW_PATTERN.match(coverage_name):
+            continue
+
+        amount = parse_amount_cell(row[amount_col].text, amount_unit)
+        if amount is None:
+            continue
+
+        premium = None
+        if premium_col is not None and premium_col < len(row):
+            premium = parse_amount_cell(row[premium_col].text, premium_unit)
+
+        results.append(AmountTableRow(
+            coverage_name=coverage_name,
+            benefit_amount=amount[0],
+            benefit_text=amount[1],
+            benefit_unit=amount[2],
+            premium_amount=premium[0] if premium else None,
+            premium_text=premium[1] if premium else None,
+            page_no=page_no,
+            row_index=first_row_index + len(results),
+            bbox=_union_bbox([cell for cell in row if cell.text]),
+            source=source,
+        ))
+    return results
+
+
+# =============================================================================
+# PyMuPDF 표 / 단어 좌표 → 행
+# =============================================================================
+
+def table_rows(table) -> list[list[TableCell]]:
+    """find_tables() 표 → 셀 행 (병합 셀은 빈 셀)"""
+    rows: list[list[TableCell]] = []
+    for texts, row in zip(table.extract(), table.rows):
+        rows.append([
+            TableCell(text=_normalize_cell(text), bbox=tuple(bbox) if bbox else tuple(row.bbox))
+            for text, bbox in zip(texts, row.cells)
+        ])
+    return rows
+
+
+def _group_lines(words: list[tuple]) -> list[list[TableCell]]:
+    """단어 → y 중심 기준 줄 (x 순서)"""
+    lines: list[tuple[float, float, list[TableCell]]] = []  # (y 중심, 높이, 단어)
+    for x0, y0, x1, y1, text, *_ in sorted(words, key=lambda w: ((w[1] + w[3]) / 2, w[0])):
+        center, height = (y0 + y1) / 2, y1 - y0
+        if lines and abs(center - lines[-1][0]) <= max(height, lines[-1][1]) * ROW_TOLERANCE_RATIO:
+            lines[-1][2].append(TableCell(text, (x0, y0, x1, y1)))
+        else:
+            lines.append((center, height, [TableCell(text, (x0, y0, x1, y1))]))
+    return [sorted(cells, key=lambda c: c.bbox[0]) for _, _, cells in lines]
+
+
+def _merge_words(cells: list[TableCell]) -> list[TableCell]:
+    """띄어쓰기로 나뉜 헤더 단어 병합 (간격이 글자 높이보다 좁으면 같은 열)"""
+    merged: list[TableCell] = []
+    for cell in cells:
+        if merged:
+            prev = merged[-1]
+            if cell.bbox[0] - prev.bbox[2] < (cell.bbox[3] - cell.bbox[1]):
+                merged[-1] = TableCell(f"{prev.text} {cell.text}", _union_bbox([prev, cell]))
+                continue
+        merged.append(cell)
+    return merged
+
+
+def word_rows(words: list[tuple]) -> list[list[TableCell]]:
+    """
+    괘선 없는 표: 단어 좌표 → 셀 행
+
+    헤더 줄(담보 + 가입금액)의 헤더 셀 사이 간격 중간점을 열 경계로 쓰고,
+    이후 줄의 단어를 시작 x로 열에 배정한다 (왼쪽 정렬된 긴 담보명이 다음 열
+    헤더 중심을 넘어가도 같은 열).
+    """
+    lines = _group_lines(words)
+    for idx, line in enumerate(lines):
+        header = _merge_words(line)
+        texts = [cell.text for cell in header]
+        amount_col = _find_column(texts, AMOUNT_HEADER_KEYWORDS, set())
+        if amount_col is not None and _find_column(texts, COVERAGE_HEADER_KEYWORDS, {amount_col}) is not None:
+            break
+    else:
+        return []
+
+    bounds = [(left.bbox[2] + right.bbox[0]) / 2 for left, right in zip(header, header[1:])]
+
+    rows: list[list[TableCell]] = [header]
+    for line in lines[idx + 1:]:
+        columns: list[list[TableCell]] = [[] for _ in header]
+        for cell in line:
+            columns[sum(1 for b in bounds if cell.bbox[0] > b)].append(cell)
+        rows.append([
+            TableCell(" ".join(c.text for c in col), _union_bbox(col)) if col
+            else TableCell("", header[i].bbox)
+            for i, col in enumerate(columns)
+        ])
+    return rows
+
+
+def extract_page_amount_rows(page: fitz.Page, page_no: int) -> list[AmountTableRow]:
+    """페이지 1개: 표 추출 (row_index는 페이지 내 모든 표에 걸쳐 연번) → 없으면 단어 좌표 fallback"""
+    results: list[AmountTableRow] = []
+    for table in page.find_tables().tables:
+        # 주계약 / 특약처럼 한 페이지에 표가 여러 개여도 (page_no, row_index)는 유일
+        results.extend(parse_amount_rows(table_rows(table), page_no, "table", len(results)))
+    if results:
+        return results
+    return parse_amount_rows(word_rows(page.get_text("words")), page_no, "words")
+
+
+def extract_amount_tables(pdf_path: Path) -> list[AmountTableRow]:
+    """
+    가입설계서 PDF 전체의 담보 금액 행
+
+    Raises:
+        FileNotFoundError: 파일이 없을 때
+        RuntimeError: PDF 처리 실패
+    """
+    if not pdf_path.exists():
+        raise FileNotFoundError(f"PDF 파일이 없습니다: {pdf_path}")
+
+    try:
+        doc = fitz.open(pdf_path)
+    except Exception as e:
+        raise RuntimeError(f"PDF 열기 실패: {pdf_path} - {e}")
+
+    try:
+        results: list[AmountTableRow] = []
+        for page_idx in range(len(doc)):
+            results.extend(extract_page_amount_rows(doc[page_idx], page_idx + 1))
+        return results
+    finally:
+        doc.close()
+
+
+def amount_fact_records(
+    rows: list[AmountTableRow],
+    insurer_id: int | None,
+    product_id: int | None,
+    plan_id: int | None,
+) -> list[dict[str, Any]]:
+    """담보 행 → coverage_amount_fact 레코드 (DBWriter.replace_amount_facts 입력)"""
+    records: list[dict[str, Any]] = []
+    for row in rows:
+        entities = extract_coverage(row.coverage_name, insurer_id=insurer_id, doc_type="가입설계서")
+        records.append({
+            "insurer_id": insurer_id,
+            "product_id": product_id,
+            "plan_id": plan_id,
+            "coverage_code": entities.get("coverage_code") or None,
+            "coverage_name": row.coverage_name,
+            "benefit_amount": row.benefit_amount,
+            "benefit_text": row.benefit_text,
+            "benefit_unit": row.benefit_unit,
+            "premium_amount": row.premium_amount,
+            "premium_text": row.premium_text,
+            "page_no": row.page_no,
+            "row_index": row.row_index,
+            "bbox": list(row.bbox),
+            "source": row.source,
+        })
+    return records
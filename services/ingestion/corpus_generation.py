@@ -0,0 +1,496 @@
+"""
+STEP 4.8: Blue/Green corpus generation (staged ingestion)
+
+run_ingestion은 기본적으로 서빙 중인 document/chunk에 바로 적재한다.
+staged 모드는 새 세대를 corpus_staging 스키마에 적재하고, 인덱스 빌드 + ANALYZE를
+마친 뒤 한 트랜잭션에서 서빙 세대를 교체한다.
+
+    stage   : corpus_staging.document/chunk 생성 (PK/UNIQUE/FK, 전용 시퀀스)
+              copy_live=True면 서빙 세대를 복사해 두고 증분 적재
+    ingest  : ingest.py --staged (DBWriter search_path = corpus_staging, public)
+    build   : 서빙 세대와 같은 보조 인덱스(btree/trgm/HNSW) 생성 + ANALYZE
+    switch  : public → corpus_previous, corpus_staging → public (ALTER TABLE SET SCHEMA)
+              뷰 재생성 + corpus_version bump를 같은 트랜잭션에서 commit
+    rollback: public ↔ corpus_previous 교체 (다시 실행하면 roll-forward)
+
+적재/인덱스 빌드 동안 서빙 테이블은 건드리지 않는다. 전환 트랜잭션만
+ACCESS EXCLUSIVE lock을 잡으며, lock_timeout으로 대기를 제한하고 재시도한다.
+직전 세대는 1개만 보관한다 (다음 switch에서 삭제).
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+import re
+import time
+from dataclasses import dataclass
+from typing import Any, Callable
+
+import psycopg
+from psycopg import sql
+
+
+logger = logging.getLogger(__name__)
+
+LIVE_SCHEMA = "public"
+STAGING_SCHEMA = "corpus_staging"
+PREVIOUS_SCHEMA = "corpus_previous"
+SWAP_SCHEMA = "corpus_swap"
+
+# 부모 → 자식 순서 (chunk.document_id → document)
+GENERATION_TABLES = ("document", "chunk")
+
+_INDEX_DEF_PATTERN = re.compile(
+    r"^CREATE (UNIQUE )?INDEX (\S+) ON (?:ONLY )?(?:public\.)?(\w+) "
+)
+_REFERENCES_PATTERN = re.compile(
+    r"REFERENCES (?:public\.)?(" + "|".join(GENERATION_TABLES) + r")\("
+)
+
+
+def get_corpus_switch_lock_timeout_ms() -> int:
+    """전환 시 lock 대기 한도 (기본: 2000ms, 초과하면 재시도)"""
+    return int(os.environ.get("CORPUS_SWITCH_LOCK_TIMEOUT_MS", "2000"))
+
+
+def get_corpus_switch_retries() -> int:
+    """전환 lock 획득 재시도 횟수 (기본: 5)"""
+    return int(os.environ.get("CORPUS_SWITCH_RETRIES", "5"))
+
+
+@dataclass
+class StagingBuildResult:
+    """build 결과"""
+    index_count: int
+    document_count: int
+    chunk_count: int
+    elapsed_ms: float
+
+
+# =============================================================================
+# DDL helpers
+# =============================================================================
+
+def staging_index_ddl(definition: str) -> str:
+    """서빙 세대 인덱스 정의(pg_get_indexdef) → staging 테이블용 DDL"""
+    match = _INDEX_DEF_PATTERN.match(definition)
+    if match is None:
+        raise ValueError(f"unexpected index definition: {definition}")
+    unique, name, table = match.groups()
+    return (
+        f"CREATE {unique or ''}INDEX IF NOT EXISTS {name} ON {STAGING_SCHEMA}.{table} "
+        + definition[match.end():]
+    )
+
+
+def staging_constraint_ddl(definition: str) -> str:
+    """제약 정의(pg_get_constraintdef) → 세대 테이블 FK는 staging을 참조하도록"""
+    return _REFERENCES_PATTERN.sub(rf"REFERENCES {STAGING_SCHEMA}.\1(", definition)
+
+
+def _tables_exist(cur: psycopg.Cursor, schema: str) -> bool:
+    cur.execute(
+        "SELECT to_regclass(%s) IS NOT NULL AS exists",
+        (f"{schema}.{GENERATION_TABLES[-1]}",),
+    )
+    return cur.fetchone()["exists"]
+
+
+def staging_exists(conn: psycopg.Connection) -> bool:
+    """staging 세대 테이블 존재 여부"""
+    with conn.cursor() as cur:
+        return _tables_exist(cur, STAGING_SCHEMA)
+
+
+def _copy_sequences(cur: psycopg.Cursor, table: str) -> None:
+    """serial 컬럼마다 staging 전용 시퀀스 생성 (서빙 시퀀스 다음 값부터)"""
+    cur.execute(
+        """
+        SELECT a.attname, pg_get_serial_sequence(%s, a.attname) AS live_sequence
+        FROM pg_attribute a
+        WHERE a.attrelid = %s::regclass AND a.attnum > 0 AND NOT a.attisdropped
+        """,
+        (f"{LIVE_SCHEMA}.{table}", f"{LIVE_SCHEMA}.{table}"),
+    )
+    for row in cur.fetchall():
+        if row["live_sequence"] is None:
+            continue
+        column = row["attname"]
+        sequence = f"{STAGING_SCHEMA}.{table}_{column}_seq"
+        cur.execute(f"CREATE SEQUENCE {sequence} OWNED BY {STAGING_SCHEMA}.{table}.{column}")
+        cur.execute(
+            f"ALTER TABLE {STAGING_SCHEMA}.{table} "
+            f"ALTER COLUMN {column} SET DEFAULT nextval('{sequence}'::regclass)"
+        )
+        # 세대가 바뀌어도 id가 계속 증가하도록 (corpus 지문 = 건수:최대 chunk_id)
+        cur.execute(
+            "SELECT setval(%s::regclass, nextval(%s::regclass))",
+            (sequence, row["live_sequence"]),
+        )
+
+
+def _copy_constraints(cur: psycopg.Cursor, table: str, contypes: tuple[str, ...]) -> None:
+    cur.execute(
+        """
+        SELECT conname, pg_get_constraintdef(oid) AS definition
+        FROM pg_constraint
+        WHERE conrelid = %s::regclass AND contype = ANY(%s)
+        ORDER BY conname
+        """,
+        (f"{LIVE_SCHEMA}.{table}", list(contypes)),
+    )
+    for row in cur.fetchall():
+        cur.execute(
+            f'ALTER TABLE {STAGING_SCHEMA}.{table} ADD CONSTRAINT "{row["conname"]}" '
+            + staging_constraint_ddl(row["definition"])
+        )
+
+
+def _secondary_index_ddls(cur: psycopg.Cursor, table: str) -> list[str]:
+    """서빙 세대의 제약 외 인덱스 (btree / trgm / HNSW 등)"""
+    cur.execute(
+        """
+        SELECT pg_get_indexdef(i.indexrelid) AS definition
+        FROM pg_index i
+        WHERE i.indrelid = %s::regclass
+          AND NOT EXISTS (
+              SELECT 1 FROM pg_constraint c
+              WHERE c.conindid = i.indexrelid AND c.conrelid = i.indrelid
+          )
+        ORDER BY i.indexrelid
+        """,
+        (f"{LIVE_SCHEMA}.{table}",),
+    )
+    return [staging_index_ddl(row["definition"]) for row in cur.fetchall()]
+
+
+def _dependent_views(cur: psycopg.Cursor) -> list[tuple[str, str]]:
+    """서빙 세대 테이블을 참조하는 뷰 (이름, 정의)"""
+    # 정의를 public 기준 비한정 이름으로 받아야 전환 후 새 세대를 참조한다
+    cur.execute("SELECT set_config('search_path', %s, true)", (LIVE_SCHEMA,))
+    cur.execute(
+        """
+        SELECT DISTINCT v.oid::regclass::text AS view_name, pg_get_viewdef(v.oid) AS definition
+        FROM pg_depend d
+        JOIN pg_rewrite r ON r.oid = d.objid
+        JOIN pg_class v ON v.oid = r.ev_class
+        WHERE d.classid = 'pg_rewrite'::regclass
+          AND d.refobjid = ANY(%s::regclass[])
+          AND v.relkind = 'v'
+        ORDER BY 1
+        """,
+        ([f"{LIVE_SCHEMA}.{table}" for table in GENERATION_TABLES],),
+    )
+    return [(row["view_name"], row["definition"]) for row in cur.fetchall()]
+
+
+def _move_tables(cur: psycopg.Cursor, source: str, target: str) -> None:
+    """세대 테이블 스키마 이동 (인덱스 / 제약 / 소유 시퀀스 포함)"""
+    cur.execute(f"CREATE SCHEMA IF NOT EXISTS {target}")
+    for table in GENERATION_TABLES:
+        cur.execute(f"ALTER TABLE {source}.{table} SET SCHEMA {target}")
+
+
+def _get_generation(cur: psycopg.Cursor, state: str) -> dict[str, Any] | None:
+    cur.execute("SELECT * FROM corpus_generation WHERE state = %s", (state,))
+    return cur.fetchone()
+
+
+# =============================================================================
+# Stage / Build
+# =============================================================================
+
+def prepare_staging(
+    conn: psycopg.Connection,
+    copy_live: bool = False,
+    note: str | None = None,
+) -> int:
+    """
+    staging 세대 생성
+
+    Args:
+        conn: DB 연결
+        copy_live: 서빙 세대 document/chunk를 복사 (증분 적재용)
+        note: 세대 설명
+
+    Returns:
+        generation_id
+    """
+    with conn.cursor() as cur:
+        if _tables_exist(cur, STAGING_SCHEMA):
+            raise RuntimeError(
+                "staging generation already exists (switch or discard it first)"
+            )
+
+        cur.execute(f"CREATE SCHEMA IF NOT EXISTS {STAGING_SCHEMA}")
+        for table in GENERATION_TABLES:
+            cur.execute(
+                f"""
+                CREATE TABLE {STAGING_SCHEMA}.{table} (
+                    LIKE {LIVE_SCHEMA}.{table}
+                    INCLUDING DEFAULTS INCLUDING CONSTRAINTS INCLUDING GENERATED
+                    INCLUDING STORAGE INCLUDING COMMENTS
+                )
+                """
+            )
+            cur.execute(
+                "SELECT obj_description(%s::regclass, 'pg_class') AS comment",
+                (f"{LIVE_SCHEMA}.{table}",),
+            )
+            comment = cur.fetchone()["comment"]
+            if comment:
+                cur.execute(
+                    sql.SQL("COMMENT ON TABLE {} IS {}").format(
+                        sql.Identifier(STAGING_SCHEMA, table), sql.Literal(comment)
+                    )
+                )
+            _copy_sequences(cur, table)
+            # PK / UNIQUE는 적재 중에도 필요 (ON CONFLICT (sha256))
+            _copy_constraints(cur, table, ("p", "u"))
+
+        if copy_live:
+            for table in GENERATION_TABLES:
+                cur.execute(
+                    f"INSERT INTO {STAGING_SCHEMA}.{table} SELECT * FROM {LIVE_SCHEMA}.{table}"
+                )
+
+        for table in GENERATION_TABLES:
+            _copy_constraints(cur, table, ("f",))
+
+        cur.execute(
+            """
+            INSERT INTO corpus_generation (state, note, copied_from_live)
+            VALUES ('staging', %s, %s)
+            RETURNING generation_id
+            """,
+            (note, copy_live),
+        )
+        generation_id = cur.fetchone()["generation_id"]
+
+    conn.commit()
+    logger.info(f"staging generation {generation_id} prepared (copy_live={copy_live})")
+    return generation_id
+
+
+def build_staging(
+    conn: psycopg.Connection,
+    maintenance_work_mem: str | None = None,
+) -> StagingBuildResult:
+    """staging 세대 보조 인덱스 생성 + ANALYZE"""
+    start = time.perf_counter()
+    index_count = 0
+
+    with conn.cursor() as cur:
+        if not _tables_exist(cur, STAGING_SCHEMA):
+            raise RuntimeError("no staging generation (run stage first)")
+
+        if maintenance_work_mem:
+            cur.execute(
+                "SELECT set_config('maintenance_work_mem', %s, true)",
+                (maintenance_work_mem,),
+            )
+
+        for table in GENERATION_TABLES:
+            for ddl in _secondary_index_ddls(cur, table):
+                logger.info(ddl)
+                cur.execute(ddl)
+                index_count += 1
+
+        counts = {}
+        for table in GENERATION_TABLES:
+            cur.execute(f"ANALYZE {STAGING_SCHEMA}.{table}")
+            cur.execute(f"SELECT COUNT(*) AS count FROM {STAGING_SCHEMA}.{table}")
+            counts[table] = cur.fetchone()["count"]
+
+        cur.execute(
+            """
+            UPDATE corpus_generation
+            SET built_at = NOW(), document_count = %s, chunk_count = %s
+            WHERE state = 'staging'
+            """,
+            (counts["document"], counts["chunk"]),
+        )
+
+    conn.commit()
+    return StagingBuildResult(
+        index_count=index_count,
+        document_count=counts["document"],
+        chunk_count=counts["chunk"],
+        elapsed_ms=round((time.perf_counter() - start) * 1000, 1),
+    )
+
+
+# =============================================================================
+# Switch / Rollback / Discard
+# =============================================================================
+
+def _run_swap(
+    conn: psycopg.Connection,
+    lock_schemas: tuple[str, ...],
+    swap: Callable[[psycopg.Cursor], None],
+    source: str,
+    lock_timeout_ms: int | None = None,
+    retries: int | None = None,
+) -> None:
+    """lock_timeout + 재시도로 세대 교체 트랜잭션 실행 (commit 시 NOTIFY)"""
+    lock_timeout_ms = lock_timeout_ms or get_corpus_switch_lock_timeout_ms()
+    retries = retries or get_corpus_switch_retries()
+    tables = ", ".join(
+        f"{schema}.{table}" for schema in lock_schemas for table in GENERATION_TABLES
+    )
+
+    for attempt in range(1, retries + 1):
+        try:
+            with conn.cursor() as cur:
+                cur.execute(
+                    "SELECT set_config('lock_timeout', %s, true)",
+                    (f"{lock_timeout_ms}ms",),
+                )
+                cur.execute(f"LOCK TABLE {tables} IN ACCESS EXCLUSIVE MODE")
+                swap(cur)
+
+                # STEP 4.7: 전환과 같은 트랜잭션에서 NOTIFY (migration 미적용이면 생략)
+                cur.execute(
+                    "SELECT to_regprocedure('bump_corpus_version(text)') IS NOT NULL AS exists"
+                )
+                if cur.fetchone()["exists"]:
+                    cur.execute("SELECT bump_corpus_version(%s)", (source,))
+            conn.commit()
+            return
+        except psycopg.errors.LockNotAvailable:
+            conn.rollback()
+            logger.warning(f"{source}: lock timeout (attempt {attempt}/{retries})")
+            time.sleep(min(0.5 * attempt, 5.0))
+
+    raise RuntimeError(f"{source}: could not acquire locks after {retries} attempts")
+
+
+def switch_generation(
+    conn: psycopg.Connection,
+    lock_timeout_ms: int | None = None,
+    retries: int | None = None,
+) -> int:
+    """
+    staging 세대를 서빙 세대로 전환
+
+    Returns:
+        새 서빙 세대 generation_id
+    """
+    with conn.cursor() as cur:
+        if not _tables_exist(cur, STAGING_SCHEMA):
+            raise RuntimeError("no staging generation (run stage first)")
+        staging = _get_generation(cur, "staging")
+    conn.rollback()
+
+    if staging is None or staging["built_at"] is None:
+        raise RuntimeError("staging generation is not built (run build first)")
+    if not staging["chunk_count"]:
+        raise RuntimeError("staging generation has no chunks")
+
+    def swap(cur: psycopg.Cursor) -> None:
+        views = _dependent_views(cur)
+        cur.execute(
+            f"DROP TABLE IF EXISTS {PREVIOUS_SCHEMA}.chunk, {PREVIOUS_SCHEMA}.document"
+        )
+        _move_tables(cur, LIVE_SCHEMA, PREVIOUS_SCHEMA)
+        _move_tables(cur, STAGING_SCHEMA, LIVE_SCHEMA)
+        for view_name, definition in views:
+            cur.execute(f"CREATE OR REPLACE VIEW {view_name} AS {definition}")
+
+        cur.execute("UPDATE corpus_generation SET state = 'retired' WHERE state = 'previous'")
+        cur.execute("UPDATE corpus_generation SET state = 'previous' WHERE state = 'live'")
+        if cur.rowcount == 0:
+            # staged 모드 도입 전부터 서빙하던 세대
+            cur.execute(
+                "INSERT INTO corpus_generation (state, note) VALUES ('previous', 'baseline')"
+            )
+        cur.execute(
+            """
+            UPDATE corpus_generation SET state = 'live', switched_at = NOW()
+            WHERE generation_id = %s
+            """,
+            (staging["generation_id"],),
+        )
+
+    _run_swap(
+        conn, (LIVE_SCHEMA, STAGING_SCHEMA), swap, "corpus_switch",
+        lock_timeout_ms=lock_timeout_ms, retries=retries,
+    )
+    logger.info(f"corpus generation {staging['generation_id']} is live")
+    return staging["generation_id"]
+
+
+def rollback_generation(
+    conn: psycopg.Connection,
+    lock_timeout_ms: int | None = None,
+    retries: int | None = None,
+) -> int | None:
+    """
+    직전 세대로 되돌림 (현재 서빙 세대는 corpus_previous로 보관)
+
+    Returns:
+        새 서빙 세대 generation_id (이력이 없으면 None)
+    """
+    with conn.cursor() as cur:
+        if not _tables_exist(cur, PREVIOUS_SCHEMA):
+            raise RuntimeError("no previous generation to roll back to")
+        previous = _get_generation(cur, "previous")
+        live = _get_generation(cur, "live")
+    conn.rollback()
+
+    def swap(cur: psycopg.Cursor) -> None:
+        views = _dependent_views(cur)
+        _move_tables(cur, PREVIOUS_SCHEMA, SWAP_SCHEMA)
+        _move_tables(cur, LIVE_SCHEMA, PREVIOUS_SCHEMA)
+        _move_tables(cur, SWAP_SCHEMA, LIVE_SCHEMA)
+        for view_name, definition in views:
+            cur.execute(f"CREATE OR REPLACE VIEW {view_name} AS {definition}")
+
+        # 상태별 유니크 인덱스 때문에 한 행씩 교체
+        if live is not None:
+            cur.execute(
+                "UPDATE corpus_generation SET state = 'retired' WHERE generation_id = %s",
+                (live["generation_id"],),
+            )
+        if previous is not None:
+            cur.execute(
+                """
+                UPDATE corpus_generation SET state = 'live', switched_at = NOW()
+                WHERE generation_id = %s
+                """,
+                (previous["generation_id"],),
+            )
+        if live is not None:
+            cur.execute(
+                "UPDATE corpus_generation SET state = 'previous' WHERE generation_id = %s",
+                (live["generation_id"],),
+            )
+
+    _run_swap(
+        conn, (LIVE_SCHEMA, PREVIOUS_SCHEMA), swap, "corpus_rollback",
+        lock_timeout_ms=lock_timeout_ms, retries=retries,
+    )
+    generation_id = previous["generation_id"] if previous else None
+    logger.info(f"rolled back to corpus generation {generation_id}")
+    return generation_id
+
+
+def discard_staging(conn: psycopg.Connection) -> None:
+    """staging 세대 삭제 (전환하지 않음)"""
+    with conn.cursor() as cur:
+        cur.execute(
+            f"DROP TABLE IF EXISTS {STAGING_SCHEMA}.chunk, {STAGING_SCHEMA}.document"
+        )
+        cur.execute("UPDATE corpus_generation SET state = 'discarded' WHERE state = 'staging'")
+    conn.commit()
+
+
+def list_generations(conn: psycopg.Connection, limit: int = 20) -> list[dict[str, Any]]:
+    """세대 이력 (최신순)"""
+    with conn.cursor() as cur:
+        cur.execute(
+            "SELECT * FROM corpus_generation ORDER BY generation_id DESC LIMIT %s",
+            (limit,),
+        )
+        return cur.fetchall()
@@ -16,6 +16,7 @@ from typing import Any
 
 import psycopg
 from psycopg.rows import dict_row
+from psycopg.types.json import Jsonb
 
 from .chunker import Chunk
 from .manifest import ManifestData
@@ -64,20 +65,49 @@ class ChunkRecord:
 class DBWriter:
     """데이터베이스 쓰기 담당"""
 
-    def __init__(self, db_url: str | None = None):
+    def __init__(
+        self,
+        db_url: str | None = None,
+        schema: str | None = None,
+        catalog_db_url: str | None = None,
+    ):
+        """
+        Args:
+            db_url: DB URL (None이면 환경변수 사용)
+            schema: document/chunk를 적재할 스키마 (STEP 4.8 staged 모드: corpus_staging)
+            catalog_db_url: 카탈로그(insurer/product/plan) 원본 DB (STEP 4.10 shard 적재 시 home)
+        """
         self._db_url = db_url or get_db_url()
+        self._schema = schema
+        self._catalog_db_url = catalog_db_url
         self._conn: psycopg.Connection | None = None
+        self._catalog_conn: psycopg.Connection | None = None
+        self._ensured_catalog: set[tuple[str, int]] = set()
+
+    def _open(self, db_url: str) -> psycopg.Connection:
+        conn = psycopg.connect(db_url, row_factory=dict_row)
+        if self._schema:
+            # document/chunk는 schema 쪽, insurer/product/plan은 public
+            conn.execute(
+                "SELECT set_config('search_path', %s, false)",
+                (f"{self._schema}, public",),
+            )
+            conn.commit()
+        return conn
 
     def connect(self) -> None:
         """DB 연결"""
         if self._conn is None:
-            self._conn = psycopg.connect(self._db_url, row_factory=dict_row)
+            self._conn = self._open(self._db_url)
 
     def close(self) -> None:
         """DB 연결 종료"""
         if self._conn:
             self._conn.close()
             self._conn = None
+        if self._catalog_conn:
+            self._catalog_conn.close()
+            self._catalog_conn = None
 
     def __enter__(self) -> "DBWriter":
         self.connect()
@@ -92,12 +122,26 @@ class DBWriter:
             self.connect()
         return self._conn  # type: ignore
 
+    @property
+    def is_shard(self) -> bool:
+        """카탈로그가 다른 DB에 있는 shard writer 여부 (STEP 4.10)"""
+        return self._catalog_db_url is not None
+
+    @property
+    def catalog_conn(self) -> psycopg.Connection:
+        """insurer/product/plan 조회·생성 연결 (shard writer가 아니면 conn과 동일)"""
+        if not self.is_shard:
+            return self.conn
+        if self._catalog_conn is None:
+            self._catalog_conn = self._open(self._catalog_db_url)  # type: ignore[arg-type]
+        return self._catalog_conn
+
     # =========================================================================
     # Insurer
     # =========================================================================
     def get_or_create_insurer(self, insurer_code: str) -> int:
         """insurer 조회 또는 생성, insurer_id 반환"""
-        with self.conn.cursor() as cur:
+        with self.catalog_conn.cursor() as cur:
             # 조회
             cur.execute(
                 "SELECT insurer_id FROM insurer WHERE insurer_code = %s",
@@ -117,7 +161,7 @@ class DBWriter:
                 """,
                 (insurer_code.upper(), insurer_code),
             )
-            self.conn.commit()
+            self.catalog_conn.commit()
             row = cur.fetchone()
             if row:
                 return row["insurer_id"]
@@ -140,7 +184,7 @@ class DBWriter:
         product_version: str | None = None,
     ) -> int:
         """product 조회 또는 생성, product_id 반환"""
-        with self.conn.cursor() as cur:
+        with self.catalog_conn.cursor() as cur:
             # 조회
             if product_version:
                 cur.execute(
@@ -171,7 +215,7 @@ class DBWriter:
                 """,
                 (insurer_id, product_name, product_version),
             )
-            self.conn.commit()
+            self.catalog_conn.commit()
             row = cur.fetchone()
             if row:
                 return row["product_id"]
@@ -212,7 +256,7 @@ class DBWriter:
         if not plan_name:
             return None
 
-        with self.conn.cursor() as cur:
+        with self.catalog_conn.cursor() as cur:
             # 조회
             cur.execute(
                 """
@@ -241,7 +285,7 @@ class DBWriter:
                     json.dumps(meta or {}),
                 ),
             )
-            self.conn.commit()
+            self.catalog_conn.commit()
             row = cur.fetchone()
             if row:
                 return row["plan_id"]
@@ -276,7 +320,7 @@ class DBWriter:
         if gender == "U" and age_min is None and age_max is None:
             return None
 
-        with self.conn.cursor() as cur:
+        with self.catalog_conn.cursor() as cur:
             # gender 조건
             gender_condition = ""
             gender_params: list = []
@@ -354,15 +398,21 @@ class DBWriter:
         meta: dict[str, Any] | None = None,
     ) -> int:
         """document 삽입, document_id 반환"""
+        # STEP 4.10: shard에는 home에서 해결한 카탈로그 행을 같은 id로 복사, id는 home 시퀀스에서 발급
+        self.ensure_catalog_rows(insurer_id, product_id, plan_id)
+        document_ids = self._allocate_ids("document", "document_id", 1)
+
         with self.conn.cursor() as cur:
             cur.execute(
                 """
-                INSERT INTO document (sha256, insurer_id, product_id, plan_id, doc_type, source_path, meta)
-                VALUES (%s, %s, %s, %s, %s, %s, %s)
+                INSERT INTO document (document_id, sha256, insurer_id, product_id, plan_id, doc_type, source_path, meta)
+                VALUES (COALESCE(%s, nextval(pg_get_serial_sequence('document', 'document_id'))),
+                        %s, %s, %s, %s, %s, %s, %s)
                 ON CONFLICT (sha256) DO NOTHING
                 RETURNING document_id
                 """,
                 (
+                    document_ids[0] if document_ids else None,
                     sha256,
                     insurer_id,
                     product_id,
@@ -403,18 +453,24 @@ class DBWriter:
         meta: dict[str, Any] | None = None,
     ) -> int:
         """chunk 삽입, chunk_id 반환"""
+        chunk_ids = self._allocate_ids("chunk", "chunk_id", 1)
+
         with self.conn.cursor() as cur:
             cur.execute(
                 """
                 INSERT INTO chunk (
-                    document_id, insurer_id, product_id, plan_id,
+                    chunk_id, document_id, insurer_id, product_id, plan_id,
                     doc_type, content, embedding, page_start, page_end,
                     chunk_index, meta
                 )
-                VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
+                VALUES (
+                    COALESCE(%s, nextval(pg_get_serial_sequence('chunk', 'chunk_id'))),
+                    %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s
+                )
                 RETURNING chunk_id
                 """,
                 (
+                    chunk_ids[0] if chunk_ids else None,
                     document_id,
                     insurer_id,
                     product_id,
@@ -457,15 +513,22 @@ class DBWriter:
         if not chunks:
             return 0
 
+        chunk_ids = self._allocate_ids("chunk", "chunk_id", len(chunks))
+        if chunk_ids:
+            chunks = [{**chunk, "chunk_id": chunk_id} for chunk, chunk_id in zip(chunks, chunk_ids)]
+        else:
+            chunks = [{**chunk, "chunk_id": None} for chunk in chunks]
+
         with self.conn.cursor() as cur:
             cur.executemany(
                 """
                 INSERT INTO chunk (
-                    document_id, insurer_id, product_id, plan_id,
+                    chunk_id, document_id, insurer_id, product_id, plan_id,
                     doc_type, content, embedding, page_start, page_end,
                     chunk_index, meta
                 )
                 VALUES (
+                    COALESCE(%(chunk_id)s, nextval(pg_get_serial_sequence('chunk', 'chunk_id'))),
                     %(document_id)s, %(insurer_id)s, %(product_id)s, %(plan_id)s,
                     %(doc_type)s, %(content)s, %(embedding)s, %(page_start)s, %(page_end)s,
                     %(chunk_index)s, %(meta)s
@@ -486,6 +549,112 @@ class DBWriter:
             self.conn.commit()
             return cur.rowcount
 
+    # =========================================================================
+    # STEP 4.24: 가입설계서 담보 표 금액
+    # =========================================================================
+    def replace_amount_facts(self, document_id: int, facts: list[dict[str, Any]]) -> int:
+        """
+        문서의 coverage_amount_fact를 facts로 교체, 삽입된 수 반환
+
+        facts format (services.ingestion.amount_table.amount_fact_records):
+        {
+            "insurer_id", "product_id", "plan_id", "coverage_code", "coverage_name",
+            "benefit_amount", "benefit_text", "benefit_unit", "premium_amount", "premium_text",
+            "page_no", "row_index", "bbox", "source",
+        }
+        """
+        with self.conn.cursor() as cur:
+            cur.execute("DELETE FROM coverage_amount_fact WHERE document_id = %s", (document_id,))
+            if facts:
+                cur.executemany(
+                    """
+                    INSERT INTO coverage_amount_fact (
+                        document_id, insurer_id, product_id, plan_id,
+                        coverage_code, coverage_name,
+                        benefit_amount, benefit_text, benefit_unit,
+                        premium_amount, premium_text,
+                        page_no, row_index, bbox, source
+                    )
+                    VALUES (
+                        %(document_id)s, %(insurer_id)s, %(product_id)s, %(plan_id)s,
+                        %(coverage_code)s, %(coverage_name)s,
+                        %(benefit_amount)s, %(benefit_text)s, %(benefit_unit)s,
+                        %(premium_amount)s, %(premium_text)s,
+                        %(page_no)s, %(row_index)s, %(bbox)s, %(source)s
+                    )
+                    """,
+                    [{**fact, "document_id": document_id} for fact in facts],
+                )
+            self.conn.commit()
+        return len(facts)
+
+    # =========================================================================
+    # STEP 4.10: shard 적재
+    # =========================================================================
+    def _allocate_ids(self, table: str, id_column: str, count: int) -> list[int] | None:
+        """
+        shard writer면 home 시퀀스에서 id 발급 (shard 간 document_id/chunk_id 중복 방지)
+
+        shard writer가 아니면 None (각 테이블 기본값 사용)
+        """
+        if not self.is_shard or count <= 0:
+            return None
+
+        with self.catalog_conn.cursor() as cur:
+            cur.execute(
+                "SELECT nextval(pg_get_serial_sequence(%s, %s)) AS id FROM generate_series(1, %s)",
+                (table, id_column, count),
+            )
+            ids = [row["id"] for row in cur.fetchall()]
+        self.catalog_conn.commit()
+        return ids
+
+    def ensure_catalog_rows(
+        self,
+        insurer_id: int | None,
+        product_id: int | None,
+        plan_id: int | None,
+    ) -> None:
+        """home 카탈로그 행(insurer → product → product_plan)을 같은 id로 shard에 복사"""
+        if not self.is_shard:
+            return
+
+        for table, id_column, row_id in (
+            ("insurer", "insurer_id", insurer_id),
+            ("product", "product_id", product_id),
+            ("product_plan", "plan_id", plan_id),
+        ):
+            if row_id is None or (table, row_id) in self._ensured_catalog:
+                continue
+
+            with self.catalog_conn.cursor() as cur:
+                cur.execute(f"SELECT * FROM {table} WHERE {id_column} = %s", (row_id,))
+                row = cur.fetchone()
+            self.catalog_conn.commit()
+            if row is None:
+                continue
+
+            columns = list(row.keys())
+            values = [Jsonb(v) if isinstance(v, (dict, list)) else v for v in row.values()]
+            with self.conn.cursor() as cur:
+                cur.execute(
+                    f"INSERT INTO {table} ({', '.join(columns)}) "
+                    f"VALUES ({', '.join(['%s'] * len(columns))}) ON CONFLICT DO NOTHING",
+                    values,
+                )
+            self.conn.commit()
+            self._ensured_catalog.add((table, row_id))
+
+    # =========================================================================
+    # STEP 4.7: corpus_version
+    # =========================================================================
+    def bump_corpus_version(self, source: str = "ingest") -> int | None:
+        """corpus_version 증가 + NOTIFY (API 워커 캐시 무효화), 새 버전 반환"""
+        from services.retrieval.corpus_version import bump_corpus_version
+
+        # STEP 4.10: listener는 home에 연결하므로 shard writer도 home 버전을 올린다
+        return bump_corpus_version(self.catalog_conn, source)
+
     # =========================================================================
     # Helper
     # =========================================================================
@@ -8,6 +8,7 @@ Usage:
     python services/ingestion/ingest.py --root data --insurer SAMSUNG
     python services/ingestion/ingest.py --root data --insurer SAMSUNG --dry-run
     python services/ingestion/ingest.py --root data --insurer SAMSUNG --doc-type 약관 --limit 5
+    python services/ingestion/ingest.py --root data --staged
 """
 
 from __future__ import annotations
@@ -23,9 +24,13 @@ from typing import Any
 # 모듈 경로 설정
 sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 
+from services.extraction.amount_facts import AMOUNT_FACT_DOC_TYPES
+from services.extraction.chunk_extraction import extract_chunk
+from services.ingestion.amount_table import amount_fact_records, extract_amount_tables
 from services.ingestion.chunker import Chunk, PageAwareChunker
+from services.ingestion.corpus_generation import STAGING_SCHEMA, staging_exists
 from services.ingestion.coverage_extractor import extract_coverage, get_extractor
-from services.ingestion.db_writer import DBWriter
+from services.ingestion.db_writer import DBWriter, get_db_url
 from services.ingestion.embedding import embed_text, get_embedding_provider
 from services.ingestion.manifest import ManifestData, resolve_manifest
 from services.ingestion.pdf_loader import PDFContent, load_pdf
@@ -39,6 +44,7 @@ from services.ingestion.utils import (
     sha256_file,
     truncate_text,
 )
+from services.retrieval.sharding import get_shard_map
 
 
 def process_single_document(
@@ -97,7 +103,7 @@ def process_single_document(
             if plan_id is None and manifest.insurer_code:
                 try:
                     detector_result = detect_plan_id(
-                        conn=db_writer.conn,
+                        conn=db_writer.catalog_conn,
                         insurer_code=manifest.insurer_code,
                         source_path=str(pdf_path),
                         doc_title=manifest.document.title,
@@ -151,6 +157,24 @@ def process_single_document(
 
         stats.documents_inserted += 1
 
+        # 7-1. STEP 4.24: 가입설계서 담보 표 금액 (coverage_amount_fact)
+        if doc_type in AMOUNT_FACT_DOC_TYPES:
+            try:
+                amount_rows = extract_amount_tables(pdf_path)
+                if db_writer and not dry_run:
+                    records = amount_fact_records(amount_rows, insurer_id, product_id, plan_id)
+                    inserted = db_writer.replace_amount_facts(doc_id, records)
+                    mapped = sum(1 for record in records if record["coverage_code"])
+                    logger.info(f"  Amount facts inserted: {inserted} (coverage mapped: {mapped})")
+                else:
+                    logger.info(f"  [DRY-RUN] {len(amount_rows)} amount facts would be inserted")
+                stats.amount_facts_created += len(amount_rows)
+            except Exception as e:
+                # 표 파싱 실패는 문서 적재를 막지 않는다 (조회 시 regex 추출 fallback)
+                logger.warning(f"  Amount table extraction failed: {e}")
+                if db_writer and not dry_run:
+                    db_writer.conn.rollback()
+
         # 8. Chunk 처리 및 삽입
         chunk_records: list[dict[str, Any]] = []
 
@@ -177,6 +201,11 @@ def process_single_document(
             if chunk.section:
                 chunk_meta["section"] = chunk.section
 
+            # STEP 4.17: rule 추출 결과 저장 (조회 시 재추출 생략)
+            extraction = extract_chunk(chunk.content, doc_type)
+            if extraction:
+                chunk_meta["extraction"] = extraction
+
             # Embedding
             embedding = embed_text(chunk.content)
 
@@ -222,6 +251,7 @@ def run_ingestion(
     default_product_name: str = "UNKNOWN_PRODUCT",
     chunk_tokens: int = 1000,
     db_url: str | None = None,
+    staged: bool = False,
 ) -> IngestionStats:
     """
     Ingestion 실행
@@ -235,6 +265,7 @@ def run_ingestion(
         default_product_name: product_name이 없을 때 기본값
         chunk_tokens: 청크 목표 토큰 수
         db_url: DB 연결 URL
+        staged: corpus_staging 세대에 적재 (서빙 세대 미변경, STEP 4.8)
 
     Returns:
         IngestionStats
@@ -274,7 +305,7 @@ def run_ingestion(
     db_writer: DBWriter | None = None
     if not dry_run:
         try:
-            db_writer = DBWriter(db_url)
+            db_writer = DBWriter(db_url, schema=STAGING_SCHEMA if staged else None)
             db_writer.connect()
             logger.info("Database connected")
         except Exception as e:
@@ -282,6 +313,38 @@ def run_ingestion(
             logger.info("Continuing in dry-run mode")
             dry_run = True
 
+    # staged 모드: staging 세대가 없으면 서빙 세대에 쓰지 않도록 중단
+    if staged and db_writer and not staging_exists(db_writer.conn):
+        db_writer.close()
+        stats.add_error("no staging generation (run: python tools/corpus_generation.py stage)")
+        logger.error(stats.errors[-1])
+        return stats
+
+    # STEP 4.10: INSURER_SHARD_MAP이 있으면 보험사 shard DB에 document/chunk 적재
+    # (카탈로그 / corpus_version은 home = db_writer)
+    shard_map = get_shard_map()
+    shard_writers: dict[str, DBWriter] = {}
+
+    def writer_for(insurer: str | None) -> DBWriter | None:
+        if db_writer is None or not insurer:
+            return db_writer
+        shard_dsn = shard_map.dsn_for(insurer)
+        if shard_dsn is None:
+            return db_writer
+        if shard_dsn not in shard_writers:
+            shard_writer = DBWriter(
+                shard_dsn,
+                schema=STAGING_SCHEMA if staged else None,
+                catalog_db_url=db_url or get_db_url(),
+            )
+            if staged and not staging_exists(shard_writer.conn):
+                shard_writer.close()
+                raise RuntimeError(
+                    f"no staging generation on shard '{shard_map.shard_for(insurer)}'"
+                )
+            shard_writers[shard_dsn] = shard_writer
+        return shard_writers[shard_dsn]
+
     try:
         for pdf_path in pdfs:
             stats.documents_processed += 1
@@ -290,6 +353,13 @@ def run_ingestion(
             detected_insurer = extract_insurer_code(pdf_path, root)
             detected_doc_type = extract_doc_type_from_path(pdf_path, root)
 
+            try:
+                document_writer = writer_for(detected_insurer)
+            except Exception as e:
+                stats.add_error(f"Shard connection failed for {pdf_path}: {e}")
+                logger.error(stats.errors[-1])
+                continue
+
             manifest = resolve_manifest(
                 pdf_path=pdf_path,
                 root=root,
@@ -303,7 +373,7 @@ def run_ingestion(
                 root=root,
                 manifest=manifest,
                 chunker=chunker,
-                db_writer=db_writer,
+                db_writer=document_writer,
                 stats=stats,
                 logger=logger,
                 dry_run=dry_run,
@@ -311,7 +381,13 @@ def run_ingestion(
             )
 
     finally:
+        for shard_writer in shard_writers.values():
+            shard_writer.close()
         if db_writer:
+            # STEP 4.7: 적재된 문서가 있으면 API 워커 캐시 무효화 (부분 실패 포함)
+            # staged 모드는 switch 시점에 무효화
+            if stats.documents_inserted > 0 and not staged:
+                db_writer.bump_corpus_version("ingest")
             db_writer.close()
             logger.info("Database connection closed")
 
@@ -340,6 +416,12 @@ def main() -> int:
 
   # 전체 보험사 처리
   python services/ingestion/ingest.py --root data
+
+  # Blue/Green: staging 세대에 적재 후 build → switch
+  python tools/corpus_generation.py stage --copy-live
+  python services/ingestion/ingest.py --root data --staged
+  python tools/corpus_generation.py build
+  python tools/corpus_generation.py switch
         """,
     )
 
@@ -399,6 +481,12 @@ def main() -> int:
         help="Database URL (기본: DATABASE_URL 환경변수)",
     )
 
+    parser.add_argument(
+        "--staged",
+        action="store_true",
+        help="서빙 세대 대신 corpus_staging 세대에 적재 (tools/corpus_generation.py)",
+    )
+
     parser.add_argument(
         "-v", "--verbose",
         action="store_true",
@@ -427,6 +515,7 @@ def main() -> int:
         default_product_name=args.default_product,
         chunk_tokens=args.chunk_tokens,
         db_url=args.db_url,
+        staged=args.staged,
     )
 
     # 에러가 있으면 비정상 종료
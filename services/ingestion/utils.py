@@ -126,6 +126,7 @@ class IngestionStats:
         self.documents_inserted = 0
         self.documents_skipped = 0
         self.chunks_created = 0
+        self.amount_facts_created = 0  # STEP 4.24: 가입설계서 담보 표 행
         self.total_pages = 0
         self.coverage_hits: dict[str, int] = {}
         self.errors: list[str] = []
@@ -146,6 +147,7 @@ class IngestionStats:
             f"  문서 skip (중복): {self.documents_skipped}",
             f"  총 페이지 수: {self.total_pages}",
             f"  생성 chunk 수: {self.chunks_created}",
+            f"  담보 표 금액 행: {self.amount_facts_created}",
         ]
 
         if self.coverage_hits:
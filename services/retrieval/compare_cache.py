@@ -0,0 +1,211 @@
+"""
+STEP 4.6: compare() 결과 캐시 (raw 요청 키 + resolved intent 키 2단계)
+
+compare() 결과는 질의 원문이 아니라 resolve된 입력에만 의존한다:
+보험사, coverage_codes(추천 포함), policy_keywords, plan, doc_types, top_k,
+슬롯 조건(트리거 키워드), 2-pass target_keyword, corpus 지문.
+
+- raw 키: 요청 파라미터 그대로 (같은 요청 반복 시 plan 선택/coverage 추천도 생략)
+- intent 키: resolve 이후 입력 (표현이 다른 질의도 같은 엔트리 적중)
+
+key_type("raw" / "intent")별로 hit/miss를 집계한다.
+엔트리는 TTL + LRU로 관리하며, 저장/조회 시 deepcopy로 호출 측 변경을 격리한다.
+"""
+
+from __future__ import annotations
+
+import copy
+import os
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import asdict, dataclass
+from typing import Any, Hashable
+
+
+KEY_TYPES = ("raw", "intent")
+
+
+def is_compare_cache_enabled() -> bool:
+    """COMPARE_CACHE_ENABLED 환경변수 확인"""
+    return os.environ.get("COMPARE_CACHE_ENABLED", "0") == "1"
+
+
+def get_compare_cache_ttl_sec() -> float:
+    """캐시 엔트리 TTL (기본: 300초)"""
+    return float(os.environ.get("COMPARE_CACHE_TTL_SEC", "300"))
+
+
+def get_compare_cache_max_entries() -> int:
+    """캐시 최대 엔트리 수 (기본: 512, key_type 합산)"""
+    return int(os.environ.get("COMPARE_CACHE_MAX_ENTRIES", "512"))
+
+
+@dataclass
+class CacheStats:
+    """key_type별 캐시 통계"""
+    hits: int = 0
+    misses: int = 0
+    stores: int = 0
+    evictions: int = 0
+    expirations: int = 0
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.hits + self.misses
+        return round(self.hits / total, 4) if total else 0.0
+
+
+def _freeze(value: Any) -> Hashable:
+    """list/dict를 해시 가능한 tuple로 변환 (키 구성용)"""
+    if isinstance(value, dict):
+        return tuple(sorted((k, _freeze(v)) for k, v in value.items()))
+    if isinstance(value, (list, tuple)):
+        return tuple(_freeze(v) for v in value)
+    return value
+
+
+def build_raw_key(
+    query: str,
+    insurers: list[str],
+    coverage_codes: list[str] | None,
+    top_k_per_insurer: int,
+    compare_doc_types: list[str],
+    policy_doc_types: list[str],
+    policy_keywords: list[str] | None,
+    coverage_top_n_per_insurer: int,
+    age: int | None,
+    gender: str | None,
+    corpus_fingerprint: str | None,
+) -> Hashable:
+    """요청 파라미터 그대로의 캐시 키"""
+    return _freeze((
+        query,
+        insurers,
+        coverage_codes or None,
+        top_k_per_insurer,
+        compare_doc_types,
+        policy_doc_types,
+        policy_keywords or None,
+        coverage_top_n_per_insurer,
+        age,
+        gender,
+        corpus_fingerprint,
+    ))
+
+
+def build_intent_key(
+    insurers: list[str],
+    resolved_coverage_codes: list[str] | None,
+    resolved_policy_keywords: list[str],
+    plan_ids: dict[str, int | None],
+    top_k_per_insurer: int,
+    compare_doc_types: list[str],
+    policy_doc_types: list[str],
+    slot_query_conditions: tuple[str, ...],
+    amount_target_keyword: str | None,
+    corpus_fingerprint: str | None,
+) -> Hashable:
+    """resolve된 입력 기반 캐시 키 (순서가 결과에 영향을 주는 값은 순서 유지)"""
+    return _freeze((
+        insurers,
+        resolved_coverage_codes or None,
+        resolved_policy_keywords,
+        plan_ids or {},
+        top_k_per_insurer,
+        compare_doc_types,
+        policy_doc_types,
+        slot_query_conditions,
+        amount_target_keyword,
+        corpus_fingerprint,
+    ))
+
+
+class CompareCache:
+    """TTL + LRU 캐시 (key_type별 통계)"""
+
+    def __init__(self, max_entries: int = 512, ttl_sec: float = 300.0):
+        self.max_entries = max_entries
+        self.ttl_sec = ttl_sec
+        self._entries: OrderedDict[tuple[str, Hashable], tuple[float, Any]] = OrderedDict()
+        self._stats = {key_type: CacheStats() for key_type in KEY_TYPES}
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key_type: str, key: Hashable) -> Any | None:
+        """조회 (만료 시 제거 후 None), 결과는 deepcopy"""
+        stats = self._stats[key_type]
+        with self._lock:
+            entry = self._entries.get((key_type, key))
+            if entry is not None and time.monotonic() - entry[0] > self.ttl_sec:
+                del self._entries[(key_type, key)]
+                stats.expirations += 1
+                entry = None
+
+            if entry is None:
+                stats.misses += 1
+                return None
+
+            self._entries.move_to_end((key_type, key))
+            stats.hits += 1
+            value = entry[1]
+
+        return copy.deepcopy(value)
+
+    def put(self, key_type: str, key: Hashable, value: Any) -> None:
+        """저장 (deepcopy), 최대 엔트리 초과 시 LRU 제거"""
+        value = copy.deepcopy(value)
+        stats = self._stats[key_type]
+        with self._lock:
+            self._entries[(key_type, key)] = (time.monotonic(), value)
+            self._entries.move_to_end((key_type, key))
+            stats.stores += 1
+            while len(self._entries) > self.max_entries:
+                (evicted_type, _), _ = self._entries.popitem(last=False)
+                self._stats[evicted_type].evictions += 1
+
+    def clear(self) -> None:
+        """엔트리 전체 삭제 (통계는 유지)"""
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> dict[str, Any]:
+        """key_type별 통계 + 엔트리 수"""
+        with self._lock:
+            entries = {key_type: 0 for key_type in KEY_TYPES}
+            for key_type, _ in self._entries:
+                entries[key_type] += 1
+            return {
+                key_type: {
+                    **asdict(stats),
+                    "hit_rate": stats.hit_rate,
+                    "entries": entries[key_type],
+                }
+                for key_type, stats in self._stats.items()
+            }
+
+
+_compare_cache: CompareCache | None = None
+
+
+def get_compare_cache() -> CompareCache | None:
+    """프로세스 단위 캐시 (COMPARE_CACHE_ENABLED=0이면 None)"""
+    global _compare_cache
+
+    if not is_compare_cache_enabled():
+        return None
+
+    if _compare_cache is None:
+        _compare_cache = CompareCache(
+            max_entries=get_compare_cache_max_entries(),
+            ttl_sec=get_compare_cache_ttl_sec(),
+        )
+    return _compare_cache
+
+
+def clear_compare_cache() -> None:
+    """프로세스 캐시 초기화 (엔트리 + 통계)"""
+    global _compare_cache
+    _compare_cache = None
@@ -0,0 +1,486 @@
+"""
+STEP 4.1: Comparison Cube (사전계산 비교표)
+
+build_coverage_compare_result는 요청마다 (보험사, coverage_code) 단위로
+best_evidence 선택 → extract_amount / extract_condition_snippet → resolved_amount
+선택을 반복한다. 입력(chunk)은 ingestion 사이에 변하지 않으므로
+(insurer_code, coverage_code, plan_id) 단위 셀을 미리 계산해 둔다.
+
+- 저장: comparison_cube_build / comparison_cube 테이블
+  (db/migrations/20251220_add_comparison_cube.sql)
+- 빌드: tools/build_compare_cube.py
+- 조회: compare()에서 COMPARE_CUBE_ENABLED=1일 때 메모리 cube lookup
+  (cube에 없는 셀, 2-pass/hybrid로 근거가 보강된 보험사는 on-the-fly 계산)
+
+plan_id 규칙은 get_compare_axis와 동일:
+- plan_id=None: 공통 문서(c.plan_id IS NULL)만
+- plan_id=N: (c.plan_id = N OR c.plan_id IS NULL)
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import os
+from dataclasses import asdict, dataclass, field
+from typing import Any
+
+import psycopg
+
+from services.retrieval.compare_service import (
+    AmountInfo,
+    CompareAxisResult,
+    ConditionInfo,
+    Evidence,
+    InsurerCompareCell,
+    ResolvedAmount,
+    build_insurer_compare_cell,
+    get_compare_axis,
+)
+
+
+logger = logging.getLogger(__name__)
+
+
+# 빌드 로직(best_evidence 선택/추출 규칙)이 바뀌면 올려서 기존 cube를 무효화
+CUBE_BUILD_VERSION = 2  # STEP 4.24: 가입설계서 금액은 담보 표 fact 우선
+
+DEFAULT_CUBE_DOC_TYPES = ["가입설계서", "상품요약서", "사업방법서"]
+
+
+def is_compare_cube_enabled() -> bool:
+    """COMPARE_CUBE_ENABLED 환경변수 확인"""
+    return os.environ.get("COMPARE_CUBE_ENABLED", "0") == "1"
+
+
+def get_compare_cube_top_k() -> int:
+    """cube 빌드 시 사용할 top_k_per_insurer (기본: 10, /compare 기본값과 동일)"""
+    return int(os.environ.get("COMPARE_CUBE_TOP_K", "10"))
+
+
+CubeKey = tuple[str, str, int | None]
+
+
+@dataclass
+class CubeCell:
+    """사전계산된 비교표 셀 (insurer_code, coverage_code, plan_id)"""
+    insurer_code: str
+    coverage_code: str
+    plan_id: int | None
+    coverage_name: str | None
+    doc_type_counts: dict[str, int] = field(default_factory=dict)
+    best_evidence: list[Evidence] = field(default_factory=list)
+    resolved_amount: ResolvedAmount | None = None
+
+    @property
+    def key(self) -> CubeKey:
+        return (self.insurer_code, self.coverage_code, self.plan_id)
+
+    def to_compare_cell(self) -> InsurerCompareCell:
+        """
+        InsurerCompareCell로 변환
+
+        LLM refinement 등 후속 단계가 셀을 교체/수정해도 cube가 오염되지 않도록
+        컨테이너는 매번 새로 만든다.
+        """
+        return InsurerCompareCell(
+            insurer_code=self.insurer_code,
+            doc_type_counts=self.doc_type_counts.copy(),
+            best_evidence=[
+                Evidence(
+                    document_id=ev.document_id,
+                    doc_type=ev.doc_type,
+                    page_start=ev.page_start,
+                    preview=ev.preview,
+                    score=ev.score,
+                    amount=ev.amount,
+                    condition_snippet=ev.condition_snippet,
+                )
+                for ev in self.best_evidence
+            ],
+            resolved_amount=self.resolved_amount,
+        )
+
+    def to_db_params(self) -> dict[str, Any]:
+        """comparison_cube INSERT 파라미터"""
+        return {
+            "insurer_code": self.insurer_code,
+            "coverage_code": self.coverage_code,
+            "plan_id": self.plan_id,
+            "coverage_name": self.coverage_name,
+            "doc_type_counts": json.dumps(self.doc_type_counts, ensure_ascii=False),
+            "best_evidence": json.dumps(
+                [asdict(ev) for ev in self.best_evidence], ensure_ascii=False
+            ),
+            "resolved_amount": (
+                json.dumps(asdict(self.resolved_amount), ensure_ascii=False)
+                if self.resolved_amount is not None
+                else None
+            ),
+        }
+
+    @classmethod
+    def from_db_row(cls, row: dict[str, Any]) -> "CubeCell":
+        """comparison_cube row → CubeCell"""
+        best_evidence: list[Evidence] = []
+        for ev in row.get("best_evidence") or []:
+            amount = ev.get("amount")
+            condition = ev.get("condition_snippet")
+            best_evidence.append(
+                Evidence(
+                    document_id=ev["document_id"],
+                    doc_type=ev["doc_type"],
+                    page_start=ev.get("page_start"),
+                    preview=ev.get("preview") or "",
+                    score=ev.get("score", 0.0),
+                    amount=AmountInfo(**amount) if amount else None,
+                    condition_snippet=ConditionInfo(**condition) if condition else None,
+                )
+            )
+
+        resolved = row.get("resolved_amount")
+        return cls(
+            insurer_code=row["insurer_code"],
+            coverage_code=row["coverage_code"],
+            plan_id=row.get("plan_id"),
+            coverage_name=row.get("coverage_name"),
+            doc_type_counts=dict(row.get("doc_type_counts") or {}),
+            best_evidence=best_evidence,
+            resolved_amount=ResolvedAmount(**resolved) if resolved else None,
+        )
+
+
+class CompareCube:
+    """
+    메모리 comparison cube
+
+    (insurer_code, coverage_code, plan_id) → CubeCell dict.
+    빌드 파라미터(compare_doc_types, top_k)가 요청과 같을 때만 사용한다.
+    """
+
+    def __init__(
+        self,
+        cells: list[CubeCell],
+        compare_doc_types: list[str],
+        top_k: int,
+        build_version: int = CUBE_BUILD_VERSION,
+        corpus_fingerprint: str | None = None,
+    ):
+        self._cells: dict[CubeKey, CubeCell] = {cell.key: cell for cell in cells}
+        self.compare_doc_types = list(compare_doc_types)
+        self.top_k = top_k
+        self.build_version = build_version
+        self.corpus_fingerprint = corpus_fingerprint
+
+    def __len__(self) -> int:
+        return len(self._cells)
+
+    def cells(self) -> list[CubeCell]:
+        return list(self._cells.values())
+
+    def supports(self, compare_doc_types: list[str], top_k: int) -> bool:
+        """요청 파라미터로 cube를 그대로 쓸 수 있는지"""
+        return (
+            self.build_version == CUBE_BUILD_VERSION
+            and sorted(compare_doc_types) == sorted(self.compare_doc_types)
+            and top_k == self.top_k
+        )
+
+    def get(
+        self,
+        insurer_code: str,
+        coverage_code: str,
+        plan_id: int | None = None,
+    ) -> CubeCell | None:
+        return self._cells.get((insurer_code, coverage_code, plan_id))
+
+    def lookup(
+        self,
+        insurer_code: str,
+        coverage_code: str,
+        plan_id: int | None = None,
+    ) -> InsurerCompareCell | None:
+        """비교표 셀 조회 (없으면 None → 호출측에서 on-the-fly 계산)"""
+        cell = self.get(insurer_code, coverage_code, plan_id)
+        if cell is None:
+            return None
+        return cell.to_compare_cell()
+
+
+# =============================================================================
+# Build
+# =============================================================================
+
+def cells_from_compare_axis(
+    compare_axis: list[CompareAxisResult],
+    plan_id: int | None = None,
+) -> list[CubeCell]:
+    """
+    compare_axis 결과를 cube 셀로 변환 (build_coverage_compare_result와 동일 규칙)
+
+    Args:
+        compare_axis: get_compare_axis 결과
+        plan_id: 이 compare_axis를 조회할 때 사용한 plan_id
+
+    Returns:
+        CubeCell 리스트
+    """
+    cells: list[CubeCell] = []
+    for item in compare_axis:
+        cell = build_insurer_compare_cell(item.insurer_code, item)
+        cells.append(
+            CubeCell(
+                insurer_code=item.insurer_code,
+                coverage_code=item.coverage_code,
+                plan_id=plan_id,
+                coverage_name=item.coverage_name,
+                doc_type_counts=cell.doc_type_counts,
+                best_evidence=cell.best_evidence,
+                resolved_amount=cell.resolved_amount,
+            )
+        )
+    return cells
+
+
+def get_corpus_fingerprint(conn: psycopg.Connection) -> str:
+    """chunk 테이블 상태 지문 (건수:최대 chunk_id) - cube stale 판정용"""
+    with conn.cursor() as cur:
+        cur.execute(
+            "SELECT COUNT(*) AS n, COALESCE(MAX(chunk_id), 0) AS max_id FROM chunk"
+        )
+        row = cur.fetchone()
+    return f"{row['n']}:{row['max_id']}"
+
+
+def _list_cube_partitions(
+    conn: psycopg.Connection,
+    compare_doc_types: list[str],
+    insurers: list[str] | None = None,
+) -> dict[str, list[int | None]]:
+    """
+    보험사별 plan_id 파티션 목록
+
+    공통 문서(plan_id=None) 파티션은 항상 포함한다.
+    """
+    with conn.cursor() as cur:
+        cur.execute(
+            """
+            SELECT DISTINCT i.insurer_code, c.plan_id
+            FROM chunk c
+            JOIN insurer i ON c.insurer_id = i.insurer_id
+            WHERE c.doc_type = ANY(%s::text[])
+              AND c.meta->'entities'->>'coverage_code' IS NOT NULL
+            ORDER BY i.insurer_code, c.plan_id NULLS FIRST
+            """,
+            (compare_doc_types,),
+        )
+        rows = cur.fetchall()
+
+    partitions: dict[str, list[int | None]] = {}
+    for row in rows:
+        insurer_code = row["insurer_code"]
+        if insurers and insurer_code not in insurers:
+            continue
+        plans = partitions.setdefault(insurer_code, [None])
+        if row["plan_id"] is not None and row["plan_id"] not in plans:
+            plans.append(row["plan_id"])
+
+    return partitions
+
+
+def build_compare_cube(
+    conn: psycopg.Connection,
+    insurers: list[str] | None = None,
+    compare_doc_types: list[str] | None = None,
+    top_k: int | None = None,
+) -> CompareCube:
+    """
+    DB에서 comparison cube 빌드
+
+    Args:
+        conn: DB 연결 (dict_row)
+        insurers: 대상 보험사 (None이면 전체)
+        compare_doc_types: 대상 doc_type (기본: 가입설계서/상품요약서/사업방법서)
+        top_k: top_k_per_insurer (기본: COMPARE_CUBE_TOP_K)
+
+    Returns:
+        CompareCube
+    """
+    if compare_doc_types is None:
+        compare_doc_types = DEFAULT_CUBE_DOC_TYPES
+    if top_k is None:
+        top_k = get_compare_cube_top_k()
+
+    fingerprint = get_corpus_fingerprint(conn)
+    partitions = _list_cube_partitions(conn, compare_doc_types, insurers)
+
+    cells: list[CubeCell] = []
+    for insurer_code, plan_list in partitions.items():
+        for plan_id in plan_list:
+            # coverage_codes=None: 보험사/plan의 모든 coverage_code를 한 번에 조회
+            # (coverage_code별 ROW_NUMBER이므로 코드 필터 조회와 동일한 근거 집합)
+            compare_axis, _ = get_compare_axis(
+                conn,
+                [insurer_code],
+                compare_doc_types,
+                None,
+                top_k,
+                plan_ids={insurer_code: plan_id} if plan_id is not None else None,
+            )
+            cells.extend(cells_from_compare_axis(compare_axis, plan_id))
+
+    return CompareCube(
+        cells=cells,
+        compare_doc_types=compare_doc_types,
+        top_k=top_k,
+        corpus_fingerprint=fingerprint,
+    )
+
+
+# =============================================================================
+# Persist / Load
+# =============================================================================
+
+def save_compare_cube(conn: psycopg.Connection, cube: CompareCube) -> int:
+    """
+    cube를 DB에 저장 (새 build_id로 적재 후 이전 build 삭제, 단일 트랜잭션)
+
+    Returns:
+        build_id
+    """
+    with conn.cursor() as cur:
+        cur.execute(
+            """
+            INSERT INTO comparison_cube_build (
+                build_version, compare_doc_types, top_k, corpus_fingerprint, cell_count
+            )
+            VALUES (%s, %s, %s, %s, %s)
+            RETURNING build_id
+            """,
+            (
+                cube.build_version,
+                cube.compare_doc_types,
+                cube.top_k,
+                cube.corpus_fingerprint,
+                len(cube),
+            ),
+        )
+        build_id = cur.fetchone()["build_id"]
+
+        params = []
+        for cell in cube.cells():
+            p = cell.to_db_params()
+            p["build_id"] = build_id
+            params.append(p)
+
+        if params:
+            cur.executemany(
+                """
+                INSERT INTO comparison_cube (
+                    build_id, insurer_code, coverage_code, plan_id, coverage_name,
+                    doc_type_counts, best_evidence, resolved_amount
+                )
+                VALUES (
+                    %(build_id)s, %(insurer_code)s, %(coverage_code)s, %(plan_id)s,
+                    %(coverage_name)s, %(doc_type_counts)s, %(best_evidence)s,
+                    %(resolved_amount)s
+                )
+                """,
+                params,
+            )
+
+        # 이전 build 정리 (comparison_cube는 ON DELETE CASCADE)
+        cur.execute(
+            "DELETE FROM comparison_cube_build WHERE build_id <> %s",
+            (build_id,),
+        )
+
+    conn.commit()
+    return build_id
+
+
+def load_compare_cube(conn: psycopg.Connection) -> CompareCube | None:
+    """최신 build의 cube 로드 (없으면 None)"""
+    with conn.cursor() as cur:
+        cur.execute(
+            """
+            SELECT build_id, build_version, compare_doc_types, top_k, corpus_fingerprint
+            FROM comparison_cube_build
+            ORDER BY build_id DESC
+            LIMIT 1
+            """
+        )
+        build = cur.fetchone()
+        if build is None:
+            return None
+
+        cur.execute(
+            """
+            SELECT insurer_code, coverage_code, plan_id, coverage_name,
+                   doc_type_counts, best_evidence, resolved_amount
+            FROM comparison_cube
+            WHERE build_id = %s
+            """,
+            (build["build_id"],),
+        )
+        cells = [CubeCell.from_db_row(row) for row in cur.fetchall()]
+
+    return CompareCube(
+        cells=cells,
+        compare_doc_types=list(build["compare_doc_types"]),
+        top_k=build["top_k"],
+        build_version=build["build_version"],
+        corpus_fingerprint=build["corpus_fingerprint"],
+    )
+
+
+# =============================================================================
+# Process-level cache
+# =============================================================================
+
+_cube_cache: CompareCube | None = None
+_cube_loaded = False
+
+
+def get_compare_cube(conn: psycopg.Connection) -> CompareCube | None:
+    """
+    프로세스 단위 cube 조회 (최초 1회 DB 로드)
+
+    - COMPARE_CUBE_ENABLED=0이면 None
+    - build_version 또는 corpus 지문이 현재와 다르면 stale로 보고 None
+    """
+    global _cube_cache, _cube_loaded
+
+    if not is_compare_cube_enabled():
+        return None
+
+    if not _cube_loaded:
+        _cube_loaded = True
+        try:
+            cube = load_compare_cube(conn)
+            if cube is None:
+                logger.info("comparison cube not built; using on-the-fly compare")
+            elif cube.build_version != CUBE_BUILD_VERSION:
+                logger.warning(
+                    f"comparison cube version mismatch "
+                    f"({cube.build_version} != {CUBE_BUILD_VERSION}); ignoring"
+                )
+                cube = None
+            elif cube.corpus_fingerprint != get_corpus_fingerprint(conn):
+                logger.warning("comparison cube is stale (corpus changed); ignoring")
+                cube = None
+            _cube_cache = cube
+        except Exception as e:
+            # 테이블 미생성 등: cube 없이 동작
+            logger.warning(f"comparison cube load failed: {e}")
+            conn.rollback()
+            _cube_cache = None
+
+    return _cube_cache
+
+
+def clear_compare_cube() -> None:
+    """프로세스 cube 캐시 초기화 (다음 조회 시 재로드)"""
+    global _cube_cache, _cube_loaded
+    _cube_cache = None
+    _cube_loaded = False
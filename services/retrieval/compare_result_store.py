@@ -0,0 +1,196 @@
+"""
+STEP 4.13: 후속 질의용 compare 결과 저장소 (result token)
+
+STEP 2.9 insurer-only 후속 질의("메리츠는?")는 anchor.coverage_code를 복원한 뒤
+요청 보험사 전체에 대해 compare()를 다시 실행했다.
+이미 계산한 보험사의 셀은 그대로이므로, 응답마다 result token을 발급해
+보험사별 결과를 서버에 보관하고 후속 질의에서는 새로 추가된 보험사만 조회/추출한다.
+
+- 엔트리: compare() 입력(보험사 제외) + 보험사 목록 + CompareResponse
+- 후속 질의 결과는 기존 보험사 + 추가 보험사 합집합으로 새 token에 저장
+  (보험사를 다시 빼거나 바꿔도 재사용)
+- TTL + LRU, 용량은 엔트리 수와 추정 바이트(COMPARE_RESULT_STORE_MAX_BYTES)로 제한
+  (상한보다 큰 응답은 저장하지 않음 → token 없음)
+- 저장/조회 시 deepcopy로 호출 측 변경을 격리
+- 기본 비활성 (COMPARE_CACHE_ENABLED와 같이): 켜면 모든 /compare 응답이 저장 비용을 낸다
+- reuse_ratio: 응답한 보험사 중 저장된 결과를 재사용한 비율
+
+corpus 변경 시 STEP 4.7 invalidator로 전체 삭제한다.
+"""
+
+from __future__ import annotations
+
+import copy
+import os
+import secrets
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import asdict, dataclass, field
+from typing import Any
+
+from services.extraction.extraction_memo import estimate_bytes
+
+
+def is_compare_result_store_enabled() -> bool:
+    """COMPARE_RESULT_STORE_ENABLED 환경변수 확인 (기본: 미사용)"""
+    return os.environ.get("COMPARE_RESULT_STORE_ENABLED", "0") == "1"
+
+
+def get_compare_result_store_ttl_sec() -> float:
+    """엔트리 TTL (기본: 900초, 대화 세션 단위)"""
+    return float(os.environ.get("COMPARE_RESULT_STORE_TTL_SEC", "900"))
+
+
+def get_compare_result_store_max_entries() -> int:
+    """최대 엔트리 수 (기본: 256)"""
+    return int(os.environ.get("COMPARE_RESULT_STORE_MAX_ENTRIES", "256"))
+
+
+def get_compare_result_store_max_bytes() -> int:
+    """최대 용량 (기본: 32MB, 추정치)"""
+    return int(os.environ.get("COMPARE_RESULT_STORE_MAX_BYTES", str(32 * 1024 * 1024)))
+
+
+@dataclass
+class StoredCompareResult:
+    """저장된 compare 결과"""
+    params: dict[str, Any]              # compare() 입력 (insurers 제외)
+    insurers: list[str]
+    response: Any                       # CompareResponse
+    size: int = 0                       # 추정 바이트
+    stored_at: float = field(default_factory=time.monotonic)
+
+
+@dataclass
+class ResultStoreStats:
+    """저장소 통계"""
+    stores: int = 0
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+    expirations: int = 0
+    skipped: int = 0                    # 용량 상한보다 큰 응답 → 저장하지 않음
+    reused_insurers: int = 0            # 저장된 결과에서 가져온 보험사 수
+    computed_insurers: int = 0          # 새로 조회/추출한 보험사 수
+
+    @property
+    def reuse_ratio(self) -> float:
+        total = self.reused_insurers + self.computed_insurers
+        return round(self.reused_insurers / total, 4) if total else 0.0
+
+
+class CompareResultStore:
+    """result token → StoredCompareResult (TTL + LRU)"""
+
+    def __init__(self, max_entries: int = 256, ttl_sec: float = 900.0, max_bytes: int = 32 * 1024 * 1024):
+        self.max_entries = max_entries
+        self.ttl_sec = ttl_sec
+        self.max_bytes = max_bytes
+        self._entries: OrderedDict[str, StoredCompareResult] = OrderedDict()
+        self._bytes = 0
+        self._stats = ResultStoreStats()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @property
+    def bytes(self) -> int:
+        return self._bytes
+
+    def put(self, params: dict[str, Any], insurers: list[str], response: Any) -> str | None:
+        """
+        저장 후 새 result token 반환
+
+        최대 엔트리 수 / 용량 초과 시 LRU 제거, 응답 1건이 용량보다 크면 저장하지 않고 None
+        """
+        size = estimate_bytes(params) + estimate_bytes(response)
+        if size > self.max_bytes:
+            with self._lock:
+                self._stats.skipped += 1
+            return None
+
+        entry = StoredCompareResult(
+            params=copy.deepcopy(params),
+            insurers=list(insurers),
+            response=copy.deepcopy(response),
+            size=size,
+        )
+        token = secrets.token_urlsafe(16)
+        with self._lock:
+            self._entries[token] = entry
+            self._bytes += size
+            self._stats.stores += 1
+            while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self._bytes -= evicted.size
+                self._stats.evictions += 1
+        return token
+
+    def get(self, token: str | None) -> StoredCompareResult | None:
+        """조회 (만료 시 제거 후 None), 결과는 deepcopy"""
+        with self._lock:
+            entry = self._entries.get(token) if token else None
+            if entry is not None and time.monotonic() - entry.stored_at > self.ttl_sec:
+                del self._entries[token]
+                self._bytes -= entry.size
+                self._stats.expirations += 1
+                entry = None
+
+            if entry is None:
+                self._stats.misses += 1
+                return None
+
+            self._entries.move_to_end(token)
+            self._stats.hits += 1
+
+        return copy.deepcopy(entry)
+
+    def record_reuse(self, reused: int, computed: int) -> None:
+        """응답 1건의 보험사 재사용 / 신규 계산 수 집계"""
+        with self._lock:
+            self._stats.reused_insurers += reused
+            self._stats.computed_insurers += computed
+
+    def clear(self) -> None:
+        """엔트리 전체 삭제 (통계는 유지)"""
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def stats(self) -> dict[str, Any]:
+        """통계 + 엔트리 수"""
+        with self._lock:
+            return {
+                **asdict(self._stats),
+                "reuse_ratio": self._stats.reuse_ratio,
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "max_bytes": self.max_bytes,
+            }
+
+
+_result_store: CompareResultStore | None = None
+
+
+def get_compare_result_store() -> CompareResultStore | None:
+    """프로세스 단위 저장소 (COMPARE_RESULT_STORE_ENABLED=0이면 None)"""
+    global _result_store
+
+    if not is_compare_result_store_enabled():
+        return None
+
+    if _result_store is None:
+        _result_store = CompareResultStore(
+            max_entries=get_compare_result_store_max_entries(),
+            ttl_sec=get_compare_result_store_ttl_sec(),
+            max_bytes=get_compare_result_store_max_bytes(),
+        )
+    return _result_store
+
+
+def clear_compare_result_store() -> None:
+    """프로세스 저장소 초기화 (엔트리 + 통계)"""
+    global _result_store
+    _result_store = None
@@ -7,23 +7,35 @@ policy_axis: 약관에서 키워드 기반 검색 (A2 정책: 약관은 비교
 
 from __future__ import annotations
 
+import logging
 import os
 import re
 import time
 from dataclasses import dataclass, field
-from typing import Any, Literal
+from typing import Any, Callable, Literal
 
 import psycopg
 from psycopg.rows import dict_row
 
-from services.extraction.amount_extractor import extract_amount, AmountExtract
-from services.extraction.condition_extractor import extract_condition_snippet, ConditionExtract
+from services.extraction.amount_extractor import AmountExtract
+from services.extraction.amount_facts import (
+    AMOUNT_FACT_DOC_TYPES,
+    AmountFact,
+    get_amount_fact_index,
+    run_amount_extractor,
+)
+from services.extraction.chunk_extraction import (
+    COMPARE_PREVIEW_LEN,
+    get_stored_extraction_index,
+    run_extractor,
+)
+from services.extraction.condition_extractor import ConditionExtract
 from services.extraction.llm_client import (
     LLMClient,
     DisabledLLMClient,
     is_llm_enabled,
     get_llm_max_calls_per_request,
-    validate_span_in_text,
+    find_masked_span,
 )
 from services.extraction.llm_prompts import (
     SYSTEM_PROMPT,
@@ -31,12 +43,21 @@ from services.extraction.llm_prompts import (
     has_amount_intent,
 )
 from services.extraction.llm_schemas import LLMExtractResult
-from services.extraction.slot_extractor import extract_slots
+from services.extraction.pii_masker import mask_pii
+from services.extraction.slot_extractor import extract_slots, get_slot_query_conditions, merge_slots
+from services.retrieval.compare_cache import (
+    CompareCache,
+    build_intent_key,
+    build_raw_key,
+    get_compare_cache,
+)
+from services.retrieval.db_router import connect_read
 from services.retrieval.plan_selector import (
     select_plans_for_insurers,
     get_plan_ids_for_retrieval,
     SelectedPlan,
 )
+from services.retrieval.sharding import HOME_SHARD, ShardConnections, get_shard_map, scatter
 from api.config_loader import (
     get_policy_keyword_patterns,
     get_default_policy_keywords,
@@ -46,6 +67,9 @@ from api.config_loader import (
 )
 
 
+logger = logging.getLogger(__name__)
+
+
 # =============================================================================
 # STEP 2.8: P0 하드코딩 외부화
 # 아래 상수들은 config 파일로 이전됨:
@@ -408,11 +432,14 @@ def get_compare_axis_vector(
     query_embedding: list[float],
     top_k_per_insurer: int = 10,
     plan_ids: dict[str, int | None] | None = None,
-    ef_search: int = 40,
+    ef_search: int | None = None,
 ) -> tuple[list[CompareAxisResult], dict[str, int]]:
     """
     Step K: 벡터 검색 기반 Compare Axis 검색 (Hybrid fallback용)
 
+    STEP 4.4: ef_search를 지정하지 않으면 보험사별로 hnsw_ef_search_tuning의
+    (insurer_code, doc_type) 파티션 값을 적용 (미튜닝 파티션은 COMPARE_AXIS_EF_SEARCH)
+
     Args:
         conn: DB 연결
         insurers: 보험사 코드 리스트
@@ -420,19 +447,27 @@ def get_compare_axis_vector(
         query_embedding: 질의 임베딩 벡터
         top_k_per_insurer: 보험사별 최대 결과 수
         plan_ids: 보험사별 plan_id 매핑
-        ef_search: HNSW ef_search 파라미터
+        ef_search: HNSW ef_search 파라미터 (None이면 파티션별 튜닝값)
 
     Returns:
         (결과 리스트, 보험사별 건수)
     """
+    from services.retrieval.ef_search_tuning import get_ef_search_table, resolve_ef_search
+
     results: dict[str, CompareAxisResult] = {}
     insurer_counts: dict[str, int] = {}
 
-    with conn.cursor() as cur:
-        # HNSW ef_search 설정
-        cur.execute(f"SET LOCAL hnsw.ef_search = {ef_search}")
+    ef_table = get_ef_search_table(conn) if ef_search is None else {}
+    default_ef_search = get_hybrid_ef_search()
 
+    with conn.cursor() as cur:
         for insurer_code in insurers:
+            # HNSW ef_search 설정 (STEP 4.4: 보험사 × doc_type 파티션별)
+            insurer_ef_search = ef_search if ef_search is not None else resolve_ef_search(
+                ef_table, insurer_code, compare_doc_types, default_ef_search
+            )
+            cur.execute(f"SET LOCAL hnsw.ef_search = {int(insurer_ef_search)}")
+
             # plan_id 조건 생성
             plan_id = plan_ids.get(insurer_code) if plan_ids else None
             if plan_id is not None:
@@ -625,6 +660,42 @@ def determine_slot_type_from_codes(coverage_codes: list[str] | None) -> str:
     return "diagnosis_lump_sum"
 
 
+def _get_amount_search_keywords(slot_type: str) -> list[str]:
+    """2-pass retrieval용 slot_type별 ILIKE 키워드 목록"""
+    # STEP 2.8: slot_type에 따른 키워드 선택 (config에서 로드)
+    slot_search_keywords = get_slot_search_keywords()
+    search_keywords = slot_search_keywords.get(slot_type, [])
+    lump_sum_keywords = slot_search_keywords.get("diagnosis_lump_sum", [])
+
+    # U-4.15: cerebro_cardiovascular는 복합 키워드만 사용 (이미 "진단비" 포함)
+    # "뇌졸중진단비", "급성심근경색증진단비" 등 구체적 키워드로 정밀 검색
+    if slot_type == "cerebro_cardiovascular":
+        # 복합 키워드만 사용 (diagnosis_lump_sum 추가 불필요)
+        return list(search_keywords)
+    if slot_type == "cancer_diagnosis":
+        # 암은 기존대로 OR 결합
+        return list(search_keywords) + list(lump_sum_keywords)
+    # 기타 slot_type
+    if not search_keywords:
+        search_keywords = LUMP_SUM_SEARCH_KEYWORDS
+    return list(search_keywords)
+
+
+def _trim_preview_to_target(preview: str, target_keyword: str | None) -> str:
+    """2-pass evidence preview 정리 (U-4.15 target_keyword 기준 잘라내기 포함)"""
+    preview = preview.replace("\n", " ").strip()
+
+    # U-4.15: target_keyword가 있으면 해당 키워드부터 시작하는 텍스트만 추출
+    # 이렇게 하면 추출기가 target_keyword 앞의 관련 없는 금액(암진단비 등)을 선택하는 것을 방지
+    if target_keyword and target_keyword in preview:
+        idx = preview.find(target_keyword)
+        # target_keyword부터 시작, 뒤 150자까지 (keyword + amount + context)
+        end = min(len(preview), idx + len(target_keyword) + 150)
+        preview = preview[idx:end]
+
+    return preview
+
+
 def get_amount_bearing_evidence(
     conn: psycopg.Connection,
     insurer_code: str,
@@ -660,24 +731,7 @@ def get_amount_bearing_evidence(
 
     preview_len = RETRIEVAL_CONFIG["preview_len"]
 
-    # STEP 2.8: slot_type에 따른 키워드 선택 (config에서 로드)
-    slot_search_keywords = get_slot_search_keywords()
-    search_keywords = slot_search_keywords.get(slot_type, [])
-    lump_sum_keywords = slot_search_keywords.get("diagnosis_lump_sum", [])
-
-    # U-4.15: cerebro_cardiovascular는 복합 키워드만 사용 (이미 "진단비" 포함)
-    # "뇌졸중진단비", "급성심근경색증진단비" 등 구체적 키워드로 정밀 검색
-    if slot_type == "cerebro_cardiovascular":
-        # 복합 키워드만 사용 (diagnosis_lump_sum 추가 불필요)
-        primary_keywords = search_keywords
-    elif slot_type == "cancer_diagnosis":
-        # 암은 기존대로 OR 결합
-        primary_keywords = search_keywords + lump_sum_keywords
-    else:
-        # 기타 slot_type
-        if not search_keywords:
-            search_keywords = LUMP_SUM_SEARCH_KEYWORDS
-        primary_keywords = search_keywords
+    primary_keywords = _get_amount_search_keywords(slot_type)
 
     # Plan condition
     if plan_id is not None:
@@ -752,23 +806,12 @@ def get_amount_bearing_evidence(
         rows = cur.fetchall()
 
         for row in rows:
-            preview = row["preview"].replace("\n", " ").strip()
-
-            # U-4.15: target_keyword가 있으면 해당 키워드부터 시작하는 텍스트만 추출
-            # 이렇게 하면 추출기가 target_keyword 앞의 관련 없는 금액(암진단비 등)을 선택하는 것을 방지
-            if target_keyword and target_keyword in preview:
-                idx = preview.find(target_keyword)
-                # target_keyword부터 시작, 뒤 150자까지 (keyword + amount + context)
-                start = idx
-                end = min(len(preview), idx + len(target_keyword) + 150)
-                preview = preview[start:end]
-
             results.append(
                 Evidence(
                     document_id=row["document_id"],
                     doc_type=row["doc_type"],
                     page_start=row["page_start"],
-                    preview=preview,
+                    preview=_trim_preview_to_target(row["preview"], target_keyword),
                     score=0.0,
                 )
             )
@@ -776,6 +819,161 @@ def get_amount_bearing_evidence(
     return results
 
 
+@dataclass
+class AmountEvidenceRequest:
+    """STEP 4.2: 2-pass retrieval 대상 보험사 (보험사별 plan_id/target_keyword)"""
+    insurer_code: str
+    plan_id: int | None = None
+    target_keyword: str | None = None
+
+
+def get_amount_bearing_evidence_many(
+    conn: psycopg.Connection,
+    requests: list[AmountEvidenceRequest],
+    compare_doc_types: list[str],
+    top_k: int | None = None,
+    slot_type: str = "diagnosis_lump_sum",
+) -> tuple[dict[str, list[Evidence]], dict[str, float]]:
+    """
+    STEP 4.2: 2-Pass Retrieval 배치 버전
+
+    금액이 없는 보험사 전체를 LATERAL top-k 단일 쿼리로 조회한다.
+    보험사별 필터/정렬 규칙은 get_amount_bearing_evidence와 동일.
+
+    Args:
+        conn: DB 연결
+        requests: 보험사별 요청 (plan_id, target_keyword)
+        compare_doc_types: 검색 대상 doc_type 리스트
+        top_k: 보험사별 최대 결과 수 (None이면 RETRIEVAL_CONFIG 사용)
+        slot_type: 검색할 슬롯 타입
+
+    Returns:
+        (보험사별 Evidence 리스트, 보험사별 소요시간 ms)
+        소요시간은 DB 내 clock_timestamp() 차이로 계산한 근사치
+    """
+    if not requests:
+        return {}, {}
+
+    if top_k is None:
+        top_k = RETRIEVAL_CONFIG["top_k_pass2"]
+
+    preview_len = RETRIEVAL_CONFIG["preview_len"]
+    primary_keywords = _get_amount_search_keywords(slot_type)
+
+    keyword_conditions = " OR ".join("c.content ILIKE %s" for _ in primary_keywords)
+    keyword_params = tuple(f"%{kw}%" for kw in primary_keywords)
+    amount_pattern = r'[0-9][0-9,]*\s*만\s*원'
+
+    insurer_codes = [r.insurer_code for r in requests]
+    plan_id_list = [r.plan_id for r in requests]
+    # U-4.15: target_keyword 우선순위 패턴 (없으면 NULL → 모든 청크 동일 우선순위)
+    target_regexes = [
+        f"{r.target_keyword}.{{0,50}}[0-9][0-9,]*\\s*[천백]?\\s*만\\s*원"
+        if r.target_keyword else None
+        for r in requests
+    ]
+    target_likes = [f"%{r.target_keyword}%" if r.target_keyword else None for r in requests]
+
+    # LEFT JOIN LATERAL: 결과가 없는 보험사도 1행(NULL)을 내보내 타이밍 경계로 사용
+    query = f"""
+        SELECT
+            r.ord,
+            r.insurer_code,
+            t.chunk_id,
+            t.document_id,
+            t.doc_type,
+            t.page_start,
+            t.preview,
+            clock_timestamp() AS emitted_at,
+            statement_timestamp() AS started_at
+        FROM unnest(%s::text[], %s::bigint[], %s::text[], %s::text[])
+            WITH ORDINALITY AS r(insurer_code, plan_id, target_regex, target_like, ord)
+        JOIN insurer i ON i.insurer_code = r.insurer_code
+        LEFT JOIN LATERAL (
+            SELECT
+                c.chunk_id,
+                c.document_id,
+                c.doc_type,
+                c.page_start,
+                LEFT(c.content, %s) AS preview,
+                CASE
+                    WHEN r.target_regex IS NULL THEN 0
+                    WHEN LEFT(c.content, {preview_len}) ~ r.target_regex THEN 0
+                    WHEN LEFT(c.content, {preview_len}) ILIKE r.target_like THEN 1
+                    ELSE 2
+                END AS target_rank,
+                CASE c.doc_type
+                    WHEN '상품요약서' THEN 1
+                    WHEN '사업방법서' THEN 2
+                    WHEN '가입설계서' THEN 3
+                    ELSE 4
+                END AS doc_rank
+            FROM chunk c
+            WHERE c.insurer_id = i.insurer_id
+              AND c.doc_type = ANY(%s::text[])
+              AND ({keyword_conditions})
+              AND c.content ~ %s
+              AND (c.plan_id IS NULL OR c.plan_id = r.plan_id)
+            ORDER BY target_rank, doc_rank, c.page_start
+            LIMIT %s
+        ) t ON TRUE
+        ORDER BY r.ord, t.target_rank, t.doc_rank, t.page_start
+    """
+
+    params = (
+        insurer_codes,
+        plan_id_list,
+        target_regexes,
+        target_likes,
+        preview_len,
+        compare_doc_types,
+    ) + keyword_params + (amount_pattern, top_k)
+
+    target_by_insurer = {r.insurer_code: r.target_keyword for r in requests}
+    results: dict[str, list[Evidence]] = {}
+    last_emitted: dict[str, Any] = {}
+    started_at = None
+
+    with conn.cursor() as cur:
+        cur.execute(query, params)
+        rows = cur.fetchall()
+
+    for row in rows:
+        insurer_code = row["insurer_code"]
+        started_at = row["started_at"]
+        emitted = row["emitted_at"]
+        if insurer_code not in last_emitted or emitted > last_emitted[insurer_code]:
+            last_emitted[insurer_code] = emitted
+
+        if row["document_id"] is None:
+            continue
+
+        results.setdefault(insurer_code, []).append(
+            Evidence(
+                document_id=row["document_id"],
+                doc_type=row["doc_type"],
+                page_start=row["page_start"],
+                preview=_trim_preview_to_target(
+                    row["preview"], target_by_insurer.get(insurer_code)
+                ),
+                score=0.0,
+            )
+        )
+
+    # 보험사별 소요시간: 이전 보험사 마지막 행 ~ 해당 보험사 마지막 행 (요청 순서)
+    timings: dict[str, float] = {}
+    boundary = started_at
+    for insurer_code in insurer_codes:
+        if insurer_code not in last_emitted or boundary is None:
+            continue
+        timings[insurer_code] = round(
+            (last_emitted[insurer_code] - boundary).total_seconds() * 1000, 2
+        )
+        boundary = last_emitted[insurer_code]
+
+    return results, timings
+
+
 def get_compare_axis(
     conn: psycopg.Connection,
     insurers: list[str],
@@ -802,6 +1000,7 @@ def get_compare_axis(
     """
     results: dict[tuple[str, str], CompareAxisResult] = {}
     insurer_counts: dict[str, int] = {}
+    extraction_index = get_stored_extraction_index()
 
     with conn.cursor() as cur:
         # 보험사별로 쿼리 실행 (쏠림 방지)
@@ -823,9 +1022,10 @@ def get_compare_axis(
                             c.document_id,
                             c.doc_type,
                             c.page_start,
-                            LEFT(c.content, 1000) AS preview,
+                            LEFT(c.content, {COMPARE_PREVIEW_LEN}) AS preview,
                             c.meta->'entities'->>'coverage_code' AS coverage_code,
                             c.meta->'entities'->>'coverage_name' AS coverage_name,
+                            c.meta->'extraction' AS extraction,
                             i.insurer_code,
                             ROW_NUMBER() OVER (
                                 PARTITION BY c.meta->'entities'->>'coverage_code'
@@ -854,9 +1054,10 @@ def get_compare_axis(
                             c.document_id,
                             c.doc_type,
                             c.page_start,
-                            LEFT(c.content, 1000) AS preview,
+                            LEFT(c.content, {COMPARE_PREVIEW_LEN}) AS preview,
                             c.meta->'entities'->>'coverage_code' AS coverage_code,
                             c.meta->'entities'->>'coverage_name' AS coverage_name,
+                            c.meta->'extraction' AS extraction,
                             i.insurer_code,
                             ROW_NUMBER() OVER (
                                 PARTITION BY c.meta->'entities'->>'coverage_code'
@@ -881,6 +1082,10 @@ def get_compare_axis(
             insurer_counts[insurer_code] = len(rows)
 
             for row in rows:
+                # STEP 4.17: 적재 시 저장된 추출 결과 등록 (셀 / 슬롯 추출에서 사용)
+                if extraction_index is not None:
+                    extraction_index.register(row.get("extraction"))
+
                 key = (row["insurer_code"], row["coverage_code"])
 
                 if key not in results:
@@ -909,9 +1114,73 @@ def get_compare_axis(
                     )
                 )
 
+    # STEP 4.24: 가입설계서 담보 표 금액 등록 (같은 conn → shard별)
+    register_amount_facts(conn, results.values())
+
     return list(results.values()), insurer_counts
 
 
+def load_amount_facts(conn: psycopg.Connection, document_ids: list[int]) -> dict[int, list[AmountFact]]:
+    """
+    STEP 4.24: 문서별 coverage_amount_fact 행 (coverage_code 매핑된 행만)
+
+    호출 측 트랜잭션(SET LOCAL hnsw.ef_search 등)을 유지하도록 savepoint 안에서 조회한다.
+    테이블이 없으면 (마이그레이션 전) 모든 문서를 fact 없음으로 반환, 그 외 DB 오류는 전파.
+    """
+    facts: dict[int, list[AmountFact]] = {doc_id: [] for doc_id in document_ids}
+    try:
+        with conn.transaction():
+            with conn.cursor(row_factory=dict_row) as cur:
+                cur.execute(
+                    """
+                    SELECT document_id, coverage_code, coverage_name,
+                           benefit_amount, benefit_text, benefit_unit,
+                           premium_amount, premium_text, page_no, row_index
+                    FROM coverage_amount_fact
+                    WHERE document_id = ANY(%s)
+                      AND coverage_code IS NOT NULL
+                    """,
+                    (document_ids,),
+                )
+                for row in cur.fetchall():
+                    facts[row["document_id"]].append(AmountFact(**row))
+    except psycopg.errors.UndefinedTable:
+        pass
+    return facts
+
+
+def register_amount_facts(conn: psycopg.Connection, axis_results: Any) -> None:
+    """
+    STEP 4.24: compare_axis 가입설계서 문서의 coverage_amount_fact를 AmountFactIndex에 등록
+
+    이미 등록한 문서는 다시 조회하지 않는다. 테이블이 없으면 (마이그레이션 전)
+    조회한 문서를 fact 없음으로 등록해 regex 추출로 fallback한다.
+    조회 실패는 savepoint만 되돌리므로 같은 conn의 이후 조회에 영향이 없다.
+    """
+    index = get_amount_fact_index()
+    if index is None:
+        return
+
+    document_ids = index.missing(
+        ev.document_id
+        for item in axis_results
+        for ev in item.evidence
+        if ev.doc_type in AMOUNT_FACT_DOC_TYPES
+    )
+    if not document_ids:
+        return
+
+    try:
+        facts = load_amount_facts(conn, document_ids)
+    except psycopg.Error as e:
+        # 등록하지 않음 → 다음 요청에서 재조회
+        logger.warning(f"coverage_amount_fact load failed: {e}")
+        return
+
+    for doc_id, doc_facts in facts.items():
+        index.register(doc_id, doc_facts)
+
+
 def get_policy_axis(
     conn: psycopg.Connection,
     insurers: list[str],
@@ -1045,9 +1314,93 @@ def _resolve_amount_from_evidence(
     return None
 
 
+def build_insurer_compare_cell(
+    insurer_code: str,
+    item: CompareAxisResult,
+) -> InsurerCompareCell:
+    """
+    단일 (보험사, coverage_code) compare_axis 결과를 비교표 셀로 변환
+
+    build_coverage_compare_result와 comparison cube 사전계산(STEP 4.1)이 공유한다.
+
+    Args:
+        insurer_code: 보험사 코드
+        item: 해당 보험사/담보의 CompareAxisResult
+
+    Returns:
+        InsurerCompareCell (best_evidence + resolved_amount)
+    """
+    # doc_type 우선순위 (best_evidence 선택용)
+    doc_type_priority_order = ["가입설계서", "상품요약서", "사업방법서"]
+
+    # best_evidence 선택: doc_type 우선순위로 최대 2개
+    best_evidence: list[Evidence] = []
+    evidence_by_doc_type: dict[str, list[Evidence]] = {}
+
+    for ev in item.evidence:
+        if ev.doc_type not in evidence_by_doc_type:
+            evidence_by_doc_type[ev.doc_type] = []
+        evidence_by_doc_type[ev.doc_type].append(ev)
+
+    # 우선순위 순서로 각 doc_type에서 1개씩 선택 (최대 2개)
+    for doc_type in doc_type_priority_order:
+        if doc_type in evidence_by_doc_type and len(best_evidence) < 2:
+            # score가 가장 높은 1개 선택 (현재 score=0이면 첫 번째)
+            ev_list = evidence_by_doc_type[doc_type]
+            best_ev = max(ev_list, key=lambda x: x.score)
+
+            # 금액/조건 추출 (약관 제외 - A2 정책)
+            if best_ev.doc_type != "약관":
+                # 금액 추출 (doc_type 전달하여 가입설계서는 엄격 모드)
+                # STEP 4.17: 적재 시 저장된 결과가 있으면 사용
+                # STEP 4.24: 가입설계서는 담보 표 행(coverage_amount_fact) 금액 우선
+                amount_result = run_amount_extractor(
+                    "amount", best_ev.preview, best_ev.doc_type,
+                    document_id=best_ev.document_id, coverage_code=item.coverage_code,
+                )
+                amount_info = AmountInfo(
+                    amount_value=amount_result.amount_value,
+                    amount_text=amount_result.amount_text,
+                    unit=amount_result.unit,
+                    confidence=amount_result.confidence,
+                    method=amount_result.method,
+                )
+
+                # 조건 추출
+                condition_result = run_extractor("condition", best_ev.preview, best_ev.doc_type)
+                condition_info = ConditionInfo(
+                    snippet=condition_result.snippet,
+                    matched_terms=list(condition_result.matched_terms),
+                )
+
+                # Evidence에 추가
+                best_ev = Evidence(
+                    document_id=best_ev.document_id,
+                    doc_type=best_ev.doc_type,
+                    page_start=best_ev.page_start,
+                    preview=best_ev.preview,
+                    score=best_ev.score,
+                    amount=amount_info,
+                    condition_snippet=condition_info,
+                )
+
+            best_evidence.append(best_ev)
+
+    # H-1.8: resolved_amount 선택
+    resolved_amount = _resolve_amount_from_evidence(best_evidence)
+
+    return InsurerCompareCell(
+        insurer_code=insurer_code,
+        doc_type_counts=item.doc_type_counts.copy(),
+        best_evidence=best_evidence,
+        resolved_amount=resolved_amount,
+    )
+
+
 def build_coverage_compare_result(
     compare_axis: list[CompareAxisResult],
     insurers: list[str],
+    cell_lookup: Callable[[str, str], InsurerCompareCell | None] | None = None,
 ) -> list[CoverageCompareRow]:
     """
     compare_axis를 표 형태로 집계
@@ -1055,13 +1408,12 @@ def build_coverage_compare_result(
     Args:
         compare_axis: CompareAxisResult 리스트
         insurers: 요청된 보험사 순서
+        cell_lookup: (insurer_code, coverage_code) → 사전계산된 셀 (STEP 4.1 cube)
+                     None을 반환하면 on-the-fly로 계산
 
     Returns:
         coverage_code별로 집계된 비교표
     """
-    # doc_type 우선순위 (best_evidence 선택용)
-    doc_type_priority_order = ["가입설계서", "상품요약서", "사업방법서"]
-
     # coverage_code별로 그룹화
     coverage_groups: dict[str, dict[str, CompareAxisResult]] = {}
     coverage_names: dict[str, str | None] = {}
@@ -1082,67 +1434,10 @@ def build_coverage_compare_result(
         # insurers 순서 유지
         for insurer_code in insurers:
             if insurer_code in insurer_map:
-                item = insurer_map[insurer_code]
-
-                # best_evidence 선택: doc_type 우선순위로 최대 2개
-                best_evidence: list[Evidence] = []
-                evidence_by_doc_type: dict[str, list[Evidence]] = {}
-
-                for ev in item.evidence:
-                    if ev.doc_type not in evidence_by_doc_type:
-                        evidence_by_doc_type[ev.doc_type] = []
-                    evidence_by_doc_type[ev.doc_type].append(ev)
-
-                # 우선순위 순서로 각 doc_type에서 1개씩 선택 (최대 2개)
-                for doc_type in doc_type_priority_order:
-                    if doc_type in evidence_by_doc_type and len(best_evidence) < 2:
-                        # score가 가장 높은 1개 선택 (현재 score=0이면 첫 번째)
-                        ev_list = evidence_by_doc_type[doc_type]
-                        best_ev = max(ev_list, key=lambda x: x.score)
-
-                        # 금액/조건 추출 (약관 제외 - A2 정책)
-                        if best_ev.doc_type != "약관":
-                            # 금액 추출 (doc_type 전달하여 가입설계서는 엄격 모드)
-                            amount_result = extract_amount(best_ev.preview, doc_type=best_ev.doc_type)
-                            amount_info = AmountInfo(
-                                amount_value=amount_result.amount_value,
-                                amount_text=amount_result.amount_text,
-                                unit=amount_result.unit,
-                                confidence=amount_result.confidence,
-                                method=amount_result.method,
-                            )
-
-                            # 조건 추출
-                            condition_result = extract_condition_snippet(best_ev.preview)
-                            condition_info = ConditionInfo(
-                                snippet=condition_result.snippet,
-                                matched_terms=condition_result.matched_terms,
-                            )
-
-                            # Evidence에 추가
-                            best_ev = Evidence(
-                                document_id=best_ev.document_id,
-                                doc_type=best_ev.doc_type,
-                                page_start=best_ev.page_start,
-                                preview=best_ev.preview,
-                                score=best_ev.score,
-                                amount=amount_info,
-                                condition_snippet=condition_info,
-                            )
-
-                        best_evidence.append(best_ev)
-
-                # H-1.8: resolved_amount 선택
-                resolved_amount = _resolve_amount_from_evidence(best_evidence)
-
-                cells.append(
-                    InsurerCompareCell(
-                        insurer_code=insurer_code,
-                        doc_type_counts=item.doc_type_counts.copy(),
-                        best_evidence=best_evidence,
-                        resolved_amount=resolved_amount,
-                    )
-                )
+                cell = cell_lookup(insurer_code, coverage_code) if cell_lookup else None
+                if cell is None:
+                    cell = build_insurer_compare_cell(insurer_code, insurer_map[insurer_code])
+                cells.append(cell)
             else:
                 # 해당 보험사에 데이터 없음
                 cells.append(
@@ -1310,6 +1605,8 @@ async def refine_amount_with_llm_if_needed(
         # chunk_text가 없으면 evidence.preview 사용
         text_to_analyze = chunk_text or target_evidence.preview
         actual_chunk_id = chunk_id or 0
+        # STEP 4.25: LLM은 마스킹된 chunk만 본다 (span 검증도 같은 텍스트 기준)
+        mask_result = mask_pii(text_to_analyze)
 
         user_prompt = build_user_prompt(
             insurer_code=insurer_code,
@@ -1317,7 +1614,7 @@ async def refine_amount_with_llm_if_needed(
             document_id=target_evidence.document_id,
             page_start=target_evidence.page_start,
             chunk_id=actual_chunk_id,
-            chunk_text=text_to_analyze,
+            chunk_text=mask_result.masked_text,
         )
 
         context = {
@@ -1364,9 +1661,12 @@ async def refine_amount_with_llm_if_needed(
 
         # span 검증 (환각 방지)
         if amount.span is not None and amount.span.text:
-            if not validate_span_in_text(amount.span.text, text_to_analyze):
+            span_range = find_masked_span(amount.span.text, mask_result)
+            if span_range is None:
                 debug_info["reason"] = "span text not found in chunk (hallucination)"
                 return cell, debug_info
+            # 원문 chunk 기준 위치 (PII 원문은 debug에 남기지 않음)
+            debug_info["span_original"] = {"start": span_range[0], "end": span_range[1]}
 
         # 업그레이드!
         new_resolved_amount = ResolvedAmount(
@@ -1599,6 +1899,152 @@ def build_diff_summary(
     return results
 
 
+def _resolve_amount_target_keyword(query: str, slot_type: str) -> str | None:
+    """
+    U-4.15: cerebro 쿼리 시 2-pass 정밀 검색 target_keyword 결정
+    예: "뇌졸중진단비" 쿼리 → "뇌졸중진단비" 키워드 포함 청크 우선
+    """
+    if slot_type != "cerebro_cardiovascular":
+        return None
+
+    # STEP 2.8: query에서 진단비 패턴 추출 (config에서 로드)
+    cerebro_kws = get_slot_search_keywords().get("cerebro_cardiovascular", [])
+    for kw in cerebro_kws:
+        if kw in query:
+            return kw
+
+    # 없으면 query + "진단비" 조합 시도
+    if "진단비" not in query:
+        return query + "진단비" if query else None
+    return None
+
+
+# STEP 4.6: 캐시 적중 시에도 현재 요청 값으로 채우는 debug 항목
+_REQUEST_SCOPED_DEBUG_KEYS = (
+    "query",
+    "age",
+    "gender",
+    "timing_ms",
+    "selected_plan",
+    "recommended_coverage_codes",
+    "recommended_coverage_details",
+)
+
+
+def _with_request_debug(
+    cached: CompareResponse,
+    debug: dict[str, Any],
+    key_type: str,
+    result_cache: CompareCache,
+) -> CompareResponse:
+    """STEP 4.6: 캐시된 응답의 debug를 현재 요청 기준으로 갱신"""
+    cached_timing = cached.debug.get("timing_ms", {})
+    for key in _REQUEST_SCOPED_DEBUG_KEYS:
+        if key in debug:
+            cached.debug[key] = debug[key]
+    cached.debug["compare_cache"] = {
+        "hit": True,
+        "key_type": key_type,
+        "cached_timing_ms": cached_timing,
+        "stats": result_cache.stats(),
+    }
+    return cached
+
+
+def _gather_shard_results(
+    by_shard: dict[str, tuple[Any, dict[str, Any]]],
+    insurers: list[str],
+) -> tuple[Any, dict[str, Any]]:
+    """
+    STEP 4.10: shard별 (결과, 보험사별 dict) 병합
+
+    결과가 리스트면 보험사 입력 순서로 정렬 (단일 DB 조회와 같은 순서), dict면 합친다.
+    """
+    order = {insurer_code: i for i, insurer_code in enumerate(insurers)}
+    merged: Any = None
+    merged_by_insurer: dict[str, Any] = {}
+
+    for results, by_insurer in by_shard.values():
+        if isinstance(results, list):
+            merged = (merged or []) + results
+        else:
+            merged = {**(merged or {}), **results}
+        merged_by_insurer.update(by_insurer)
+
+    if isinstance(merged, list):
+        merged.sort(key=lambda r: order.get(r.insurer_code, len(order)))
+    return merged, merged_by_insurer
+
+
+def merge_compare_responses(
+    parts: list[tuple[list[str], CompareResponse]],
+    insurers: list[str],
+) -> CompareResponse:
+    """
+    STEP 4.13: 보험사 집합별 compare() 결과를 insurers 기준 응답 하나로 병합
+
+    coverage_codes가 고정된 compare()는 보험사별 결과가 서로 독립이므로
+    (hybrid fallback 제외) 보험사별 근거 / 비교표 셀 / 슬롯 값은 그대로 옮기고
+    보험사 간 비교인 diff_summary / 슬롯 diff_summary만 다시 만든다.
+
+    Args:
+        parts: (해당 결과가 담당하는 보험사, CompareResponse) - 같은 보험사는 앞쪽 결과 우선
+        insurers: 응답 보험사 (parts에 없는 보험사는 근거 없음으로 표시)
+    """
+    owner: dict[str, int] = {}
+    for i, (part_insurers, _) in enumerate(parts):
+        for insurer_code in part_insurers:
+            owner.setdefault(insurer_code, i)
+
+    def owned(i: int, items: list) -> dict[str, list]:
+        by_insurer: dict[str, list] = {}
+        for item in items:
+            if owner.get(item.insurer_code) == i:
+                by_insurer.setdefault(item.insurer_code, []).append(item)
+        return by_insurer
+
+    compare_by_insurer: dict[str, list[CompareAxisResult]] = {}
+    policy_by_insurer: dict[str, list[PolicyAxisResult]] = {}
+    known_cells: dict[tuple[str, str], InsurerCompareCell] = {}
+    for i, (_, response) in enumerate(parts):
+        compare_by_insurer.update(owned(i, response.compare_axis))
+        policy_by_insurer.update(owned(i, response.policy_axis))
+        for row in response.coverage_compare_result:
+            for cell in row.insurers:
+                if owner.get(cell.insurer_code) == i:
+                    known_cells[(cell.insurer_code, row.coverage_code)] = cell
+
+    compare_axis = [item for ic in insurers for item in compare_by_insurer.get(ic, [])]
+    policy_axis = [item for ic in insurers for item in policy_by_insurer.get(ic, [])]
+    coverage_compare_result = build_coverage_compare_result(
+        compare_axis,
+        insurers,
+        cell_lookup=lambda insurer_code, coverage_code: known_cells.get((insurer_code, coverage_code)),
+    )
+
+    # debug는 마지막(가장 최근) 결과 기준, 보험사별 건수만 담당 결과에서 모음
+    debug = dict(parts[-1][1].debug)
+    debug["insurers"] = insurers
+    debug["insurer_counts"] = {
+        stage: {
+            ic: parts[owner[ic]][1].debug.get("insurer_counts", {}).get(stage, {}).get(ic, 0)
+            for ic in insurers
+            if ic in owner
+        }
+        for stage in debug.get("insurer_counts", {})
+    }
+
+    return CompareResponse(
+        compare_axis=compare_axis,
+        policy_axis=policy_axis,
+        coverage_compare_result=coverage_compare_result,
+        diff_summary=build_diff_summary(coverage_compare_result),
+        slots=merge_slots([(part_insurers, r.slots) for part_insurers, r in parts], insurers),
+        resolved_coverage_codes=parts[0][1].resolved_coverage_codes,
+        debug=debug,
+    )
+
+
 def compare(
     insurers: list[str],
     query: str,
@@ -1624,7 +2070,7 @@ def compare(
         policy_doc_types: Policy Axis 대상 doc_type
         policy_keywords: 약관 검색 키워드
         coverage_top_n_per_insurer: coverage_codes 자동추천 시 보험사별 추천 개수
-        db_url: DB URL
+        db_url: DB URL (None이면 STEP 4.9 읽기 라우팅: replica 또는 primary)
         age: 피보험자 나이 (plan 자동 선택용)
         gender: 피보험자 성별 (M/F)
 
@@ -1652,9 +2098,38 @@ def compare(
         "gender": gender,
     }
 
-    conn = psycopg.connect(db_url or get_db_url(), row_factory=dict_row)
+    # STEP 4.9: 조회는 읽기 replica로 (plan 선택도 같은 DB)
+    conn, read_url = connect_read(db_url, row_factory=dict_row)
+    shard_conns: ShardConnections | None = None
 
     try:
+        # STEP 4.5: Coverage availability (corpus 지문은 STEP 4.6 캐시 키에도 사용)
+        from services.retrieval.coverage_availability import get_coverage_availability
+
+        availability = get_coverage_availability(conn)
+        corpus_fingerprint = availability.corpus_fingerprint if availability else None
+
+        # STEP 4.6: compare 결과 캐시 - raw 요청 키 (hybrid는 query 임베딩에 의존하므로 제외)
+        result_cache = get_compare_cache() if not is_hybrid_enabled() else None
+        raw_key = None
+        if result_cache is not None:
+            raw_key = build_raw_key(
+                query,
+                insurers,
+                coverage_codes,
+                top_k_per_insurer,
+                compare_doc_types,
+                policy_doc_types,
+                policy_keywords,
+                coverage_top_n_per_insurer,
+                age,
+                gender,
+                corpus_fingerprint,
+            )
+            cached = result_cache.get("raw", raw_key)
+            if cached is not None:
+                return _with_request_debug(cached, debug, "raw", result_cache)
+
         # Step I: Plan 자동 선택
         selected_plans: dict[str, SelectedPlan] = {}
         plan_ids: dict[str, int | None] = {}
@@ -1663,7 +2138,7 @@ def compare(
             # psycopg2 커넥션 필요 (plan_selector는 psycopg2 사용)
             import psycopg2
             from psycopg2.extras import RealDictCursor
-            conn2 = psycopg2.connect(db_url or get_db_url())
+            conn2 = psycopg2.connect(read_url)
             try:
                 selected_plans = select_plans_for_insurers(conn2, insurers, age, gender)
                 plan_ids = get_plan_ids_for_retrieval(selected_plans)
@@ -1718,16 +2193,110 @@ def compare(
         debug["recommended_coverage_details"] = recommended_coverage_details
         debug["resolved_coverage_codes"] = resolved_coverage_codes
 
+        # STEP 4.6: compare 결과 캐시 - resolved intent 키
+        # (표현이 달라도 resolve 결과가 같으면 같은 엔트리)
+        slot_type_for_retrieval = determine_slot_type_from_codes(resolved_coverage_codes)
+        target_kw = _resolve_amount_target_keyword(query, slot_type_for_retrieval)
+        intent_key = None
+        if result_cache is not None:
+            intent_key = build_intent_key(
+                insurers,
+                resolved_coverage_codes,
+                resolved_policy_keywords,
+                plan_ids,
+                top_k_per_insurer,
+                compare_doc_types,
+                policy_doc_types,
+                get_slot_query_conditions(query),
+                target_kw,
+                corpus_fingerprint,
+            )
+            cached = result_cache.get("intent", intent_key)
+            if cached is not None:
+                result_cache.put("raw", raw_key, cached)
+                return _with_request_debug(cached, debug, "intent", result_cache)
+
+        # STEP 4.10: 보험사 shard별 scatter-gather (shard map이 없으면 home 연결로 직접 조회)
+        shard_map = get_shard_map()
+        if shard_map.is_sharded:
+            shard_conns = ShardConnections(shard_map, conn, row_factory=dict_row)
+            debug["shards"] = shard_map.group(insurers)
+            debug["shard_timing_ms"] = {}
+
+        def _run_stage(
+            stage: str,
+            stage_insurers: list[str],
+            run: Callable[[psycopg.Connection, list[str]], tuple[Any, dict[str, Any]]],
+        ) -> tuple[Any, dict[str, Any]]:
+            if shard_conns is None or not stage_insurers:
+                return run(conn, stage_insurers)
+            by_shard, shard_timings = scatter(shard_conns, stage_insurers, run)
+            debug["shard_timing_ms"][stage] = shard_timings
+            return _gather_shard_results(by_shard, stage_insurers)
+
+        # STEP 4.5: Coverage availability - 결과가 비어 있을 것이 확실한 조회 생략
+        def _plan_id_of(insurer_code: str) -> int | None:
+            return plan_ids.get(insurer_code) if plan_ids else None
+
+        # 가용성 인덱스는 home chunk 기준 (다른 shard 보험사는 항상 조회)
+        def _skippable(insurer_code: str) -> bool:
+            return shard_map.shard_for(insurer_code) == HOME_SHARD
+
+        compare_insurers = insurers
+        policy_insurers = insurers
+        amount_insurers = insurers
+        if availability is not None:
+            compare_insurers = [
+                ic for ic in insurers
+                if not _skippable(ic) or availability.has_coverage(
+                    ic, resolved_coverage_codes, compare_doc_types, _plan_id_of(ic)
+                )
+            ]
+            amount_insurers = [
+                ic for ic in insurers
+                if not _skippable(ic)
+                or availability.has_documents(ic, compare_doc_types, _plan_id_of(ic))
+            ]
+            policy_insurers = [
+                ic for ic in insurers
+                # get_policy_axis는 plan 조건 없이 전체 약관 chunk 검색
+                if not _skippable(ic) or availability.has_documents_any_plan(ic, policy_doc_types)
+            ]
+            debug["coverage_availability"] = {
+                "used": True,
+                "corpus_fingerprint": availability.corpus_fingerprint,
+                "skipped": {
+                    "compare_axis": [ic for ic in insurers if ic not in compare_insurers],
+                    "amount_retrieval_2pass": [ic for ic in insurers if ic not in amount_insurers],
+                    "policy_axis": [ic for ic in insurers if ic not in policy_insurers],
+                },
+                "covering_insurers": {
+                    code: availability.insurers_covering(code, compare_doc_types)
+                    for code in (resolved_coverage_codes or [])
+                },
+            }
+        else:
+            debug["coverage_availability"] = {"used": False}
+
         # Compare Axis (Step I: plan_ids 전달)
         start = time.time()
-        compare_axis, compare_counts = get_compare_axis(
-            conn,
-            insurers,
-            compare_doc_types,
-            resolved_coverage_codes,
-            top_k_per_insurer,
-            plan_ids=plan_ids if plan_ids else None,
-        )
+        compare_axis: list[CompareAxisResult] = []
+        compare_counts: dict[str, int] = {}
+        if compare_insurers:
+            compare_axis, compare_counts = _run_stage(
+                "compare_axis",
+                compare_insurers,
+                lambda c, ics: get_compare_axis(
+                    c,
+                    ics,
+                    compare_doc_types,
+                    resolved_coverage_codes,
+                    top_k_per_insurer,
+                    plan_ids=plan_ids if plan_ids else None,
+                ),
+            )
+        # 조회를 생략한 보험사는 0건 (기존 debug 형태 유지)
+        compare_counts = {ic: compare_counts.get(ic, 0) for ic in insurers}
         debug["timing_ms"]["compare_axis"] = round((time.time() - start) * 1000, 2)
         debug["insurer_counts"]["compare_axis"] = compare_counts
 
@@ -1747,16 +2316,23 @@ def compare(
                 embedding_provider = DummyEmbeddingProvider()
                 query_embedding = embedding_provider.embed_text(query)
 
-                # 벡터 검색 실행
+                # 벡터 검색 실행 (STEP 4.10: ef_search 튜닝 테이블은 home 기준으로 로드)
+                if shard_conns is not None:
+                    from services.retrieval.ef_search_tuning import get_ef_search_table
+
+                    get_ef_search_table(conn)
                 start_vector = time.time()
-                vector_results, vector_counts = get_compare_axis_vector(
-                    conn,
+                vector_results, vector_counts = _run_stage(
+                    "compare_axis_vector",
                     insurers,
-                    compare_doc_types,
-                    query_embedding,
-                    top_k_per_insurer,
-                    plan_ids=plan_ids if plan_ids else None,
-                    ef_search=get_hybrid_ef_search(),
+                    lambda c, ics: get_compare_axis_vector(
+                        c,
+                        ics,
+                        compare_doc_types,
+                        query_embedding,
+                        top_k_per_insurer,
+                        plan_ids=plan_ids if plan_ids else None,
+                    ),
                 )
                 debug["timing_ms"]["compare_axis_vector"] = round(
                     (time.time() - start_vector) * 1000, 2
@@ -1794,100 +2370,128 @@ def compare(
         amount_pattern = re.compile(r'\d[\d,]*\s*만\s*원')
         amount_retrieval_used = {}
 
-        # U-4.15: coverage_codes에서 slot_type 결정
-        slot_type_for_retrieval = determine_slot_type_from_codes(resolved_coverage_codes)
+        # U-4.15: coverage_codes에서 slot_type 결정 (target_keyword는 STEP 4.6 캐시 키 계산 시 결정)
         debug["slot_type_for_retrieval"] = slot_type_for_retrieval
 
-        for insurer_code in insurers:
-            # Find insurer's compare_axis entries
-            insurer_evidence = []
-            for result in compare_axis:
-                if result.insurer_code == insurer_code:
-                    insurer_evidence.extend(result.evidence)
+        # STEP 4.2: compare_axis를 1회 순회하여 보험사별 인덱스 구성
+        axis_by_insurer: dict[str, list[CompareAxisResult]] = {}
+        for result in compare_axis:
+            axis_by_insurer.setdefault(result.insurer_code, []).append(result)
 
-            # Check if any evidence has amount
+        # Check each insurer's evidence for amounts
+        amount_requests: list[AmountEvidenceRequest] = []
+        for insurer_code in amount_insurers:
             has_amount = any(
-                amount_pattern.search(ev.preview) for ev in insurer_evidence
+                amount_pattern.search(ev.preview)
+                for result in axis_by_insurer.get(insurer_code, [])
+                for ev in result.evidence
             )
-
             if not has_amount:
-                # 2nd pass: fetch amount-bearing chunks (U-4.15: slot_type 전달)
-                plan_id = plan_ids.get(insurer_code) if plan_ids else None
-
-                # U-4.15: cerebro 쿼리 시 target_keyword 전달하여 정밀 검색
-                # 예: "뇌졸중진단비" 쿼리 → "뇌졸중진단비" 키워드 포함 청크 우선
-                target_kw = None
-                if slot_type_for_retrieval == "cerebro_cardiovascular":
-                    # STEP 2.8: query에서 진단비 패턴 추출 (config에서 로드)
-                    cerebro_kws = get_slot_search_keywords().get("cerebro_cardiovascular", [])
-                    for kw in cerebro_kws:
-                        if kw in query:
-                            target_kw = kw
-                            break
-                    # 없으면 query + "진단비" 조합 시도
-                    if not target_kw and "진단비" not in query:
-                        target_kw = query + "진단비" if query else None
-
-                amount_evidence = get_amount_bearing_evidence(
-                    conn,
-                    insurer_code,
-                    compare_doc_types,
-                    plan_id=plan_id,
-                    top_k=3,
-                    slot_type=slot_type_for_retrieval,
-                    target_keyword=target_kw,
+                amount_requests.append(
+                    AmountEvidenceRequest(
+                        insurer_code=insurer_code,
+                        plan_id=_plan_id_of(insurer_code),
+                        target_keyword=target_kw,
+                    )
                 )
 
-                if amount_evidence:
-                    amount_retrieval_used[insurer_code] = len(amount_evidence)
+        # 2nd pass: 금액 없는 보험사 전체를 단일 쿼리로 조회 (U-4.15: slot_type 전달)
+        amount_evidence_map, amount_timings = _run_stage(
+            "amount_retrieval_2pass",
+            [req.insurer_code for req in amount_requests],
+            lambda c, ics: get_amount_bearing_evidence_many(
+                c,
+                [req for req in amount_requests if req.insurer_code in ics],
+                compare_doc_types,
+                top_k=3,
+                slot_type=slot_type_for_retrieval,
+            ),
+        )
+        debug["amount_retrieval_2pass_timing_ms"] = amount_timings
 
-                    # Add to compare_axis (create new entry if needed)
-                    existing_result = next(
-                        (r for r in compare_axis if r.insurer_code == insurer_code),
-                        None
-                    )
-                    if existing_result is None:
-                        # Create new CompareAxisResult for this insurer
-                        compare_axis.append(
-                            CompareAxisResult(
-                                insurer_code=insurer_code,
-                                coverage_code="__amount_fallback__",
-                                coverage_name=None,
-                                doc_type_counts={},
-                                evidence=amount_evidence,
-                            )
+        for req in amount_requests:
+            insurer_code = req.insurer_code
+            amount_evidence = amount_evidence_map.get(insurer_code)
+            if not amount_evidence:
+                continue
+
+            amount_retrieval_used[insurer_code] = len(amount_evidence)
+
+            # Add to compare_axis (create new entry if needed)
+            existing_results = axis_by_insurer.get(insurer_code)
+            if not existing_results:
+                # Create new CompareAxisResult for this insurer
+                new_result = CompareAxisResult(
+                    insurer_code=insurer_code,
+                    coverage_code="__amount_fallback__",
+                    coverage_name=None,
+                    doc_type_counts={},
+                    evidence=amount_evidence,
+                )
+                compare_axis.append(new_result)
+                axis_by_insurer[insurer_code] = [new_result]
+            else:
+                # Add evidence to existing result (avoid duplicates)
+                existing_result = existing_results[0]
+                existing_doc_ids = {ev.document_id for ev in existing_result.evidence}
+                for ev in amount_evidence:
+                    if ev.document_id not in existing_doc_ids:
+                        existing_result.evidence.append(ev)
+                        existing_doc_ids.add(ev.document_id)
+                        # Update doc_type counts
+                        existing_result.doc_type_counts[ev.doc_type] = (
+                            existing_result.doc_type_counts.get(ev.doc_type, 0) + 1
                         )
-                    else:
-                        # Add evidence to existing result (avoid duplicates)
-                        existing_doc_ids = {ev.document_id for ev in existing_result.evidence}
-                        for ev in amount_evidence:
-                            if ev.document_id not in existing_doc_ids:
-                                existing_result.evidence.append(ev)
-                                existing_doc_ids.add(ev.document_id)
-                                # Update doc_type counts
-                                existing_result.doc_type_counts[ev.doc_type] = (
-                                    existing_result.doc_type_counts.get(ev.doc_type, 0) + 1
-                                )
 
         debug["timing_ms"]["amount_retrieval_2pass"] = round((time.time() - start) * 1000, 2)
         debug["amount_retrieval_used"] = amount_retrieval_used
 
         # Policy Axis (resolved_policy_keywords 사용)
         start = time.time()
-        policy_axis, policy_counts = get_policy_axis(
-            conn,
-            insurers,
-            policy_doc_types,
-            resolved_policy_keywords,
-            top_k_per_insurer,
+        policy_axis, policy_counts = _run_stage(
+            "policy_axis",
+            policy_insurers,
+            lambda c, ics: get_policy_axis(
+                c,
+                ics,
+                policy_doc_types,
+                resolved_policy_keywords,
+                top_k_per_insurer,
+            ),
         )
         debug["timing_ms"]["policy_axis"] = round((time.time() - start) * 1000, 2)
         debug["insurer_counts"]["policy_axis"] = policy_counts
 
+        # STEP 4.1: Comparison cube lookup
+        # 2-pass/hybrid로 근거가 보강된 보험사는 cube와 입력이 달라지므로 on-the-fly 계산
+        cell_lookup = None
+        cube_stats = {"used": False, "hits": 0, "misses": 0}
+        from services.retrieval.compare_cube import get_compare_cube
+
+        cube = get_compare_cube(conn)
+        if (
+            cube is not None
+            and not debug["hybrid_used"]
+            and cube.supports(compare_doc_types, top_k_per_insurer)
+        ):
+            cube_stats["used"] = True
+            live_insurers = set(amount_retrieval_used)
+
+            def cell_lookup(insurer_code: str, coverage_code: str) -> InsurerCompareCell | None:
+                cell = None
+                if insurer_code not in live_insurers:
+                    plan_id = plan_ids.get(insurer_code) if plan_ids else None
+                    cell = cube.lookup(insurer_code, coverage_code, plan_id)
+                cube_stats["hits" if cell is not None else "misses"] += 1
+                return cell
+
         # Coverage Compare Result (비교표) 생성
         start = time.time()
-        coverage_compare_result = build_coverage_compare_result(compare_axis, insurers)
+        coverage_compare_result = build_coverage_compare_result(
+            compare_axis, insurers, cell_lookup=cell_lookup
+        )
         debug["timing_ms"]["coverage_compare_result"] = round((time.time() - start) * 1000, 2)
+        debug["compare_cube"] = cube_stats
 
         # Diff Summary (차이점 요약) 생성
         start = time.time()
@@ -1896,25 +2500,39 @@ def compare(
 
         # U-4.8: Comparison Slots 추출 (U-4.16: query 전달하여 조건부 슬롯 지원)
         start = time.time()
+        slot_timings: dict[str, float] = {}
         slots = extract_slots(
             insurers=insurers,
             compare_axis=compare_axis,
             policy_axis=policy_axis,
             coverage_codes=resolved_coverage_codes,
             query=query,  # U-4.16: 다빈치/경계성종양 쿼리 시 조건부 슬롯 추출
+            slot_timings=slot_timings,  # STEP 4.19: slot_key별 추출 시간
         )
         debug["timing_ms"]["slots"] = round((time.time() - start) * 1000, 2)
+        debug["slot_timing_ms"] = slot_timings
         debug["slots_count"] = len(slots)
 
+        response = CompareResponse(
+            compare_axis=compare_axis,
+            policy_axis=policy_axis,
+            coverage_compare_result=coverage_compare_result,
+            diff_summary=diff_summary,
+            slots=slots,
+            resolved_coverage_codes=resolved_coverage_codes,
+            debug=debug,
+        )
+
+        # STEP 4.6: 두 키로 저장 (다음 동일 요청은 raw, 표현만 다른 요청은 intent로 적중)
+        if result_cache is not None:
+            debug["compare_cache"] = {"hit": False, "key_type": None}
+            result_cache.put("raw", raw_key, response)
+            result_cache.put("intent", intent_key, response)
+            debug["compare_cache"]["stats"] = result_cache.stats()
+
     finally:
+        if shard_conns is not None:
+            shard_conns.close()
         conn.close()
 
-    return CompareResponse(
-        compare_axis=compare_axis,
-        policy_axis=policy_axis,
-        coverage_compare_result=coverage_compare_result,
-        diff_summary=diff_summary,
-        slots=slots,
-        resolved_coverage_codes=resolved_coverage_codes,
-        debug=debug,
-    )
+    return response
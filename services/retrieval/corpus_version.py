@@ -0,0 +1,293 @@
+"""
+STEP 4.7: corpus_version + LISTEN/NOTIFY 기반 프로세스 캐시 무효화
+
+데이터를 바꾸는 쪽(ingestion, 매핑 적재, backfill 도구)은 bump_corpus_version()으로
+corpus_version을 올리고 'corpus_changed' 채널에 NOTIFY한다.
+
+API 워커(uvicorn worker / replica마다 1개)는 CorpusChangeListener 스레드로
+채널을 LISTEN하다가 새 버전을 받으면 등록된 캐시 무효화 함수를 모두 호출한다.
+연결이 끊겼다가 재연결되면 corpus_version을 다시 읽어 놓친 변경도 반영한다.
+
+무효화 지연(lag) = NOTIFY payload의 bump 시각 → 워커가 무효화를 끝낸 시각
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import os
+import threading
+import time
+from dataclasses import asdict, dataclass
+from typing import Any, Callable
+
+import psycopg
+from psycopg.rows import dict_row
+
+
+logger = logging.getLogger(__name__)
+
+CORPUS_CHANGED_CHANNEL = "corpus_changed"
+
+
+def is_corpus_listener_enabled() -> bool:
+    """CORPUS_LISTENER_ENABLED 환경변수 확인 (기본: 사용)"""
+    return os.environ.get("CORPUS_LISTENER_ENABLED", "1") == "1"
+
+
+def get_corpus_listener_reconnect_sec() -> float:
+    """LISTEN 연결 실패 시 재시도 간격 (기본: 5초)"""
+    return float(os.environ.get("CORPUS_LISTENER_RECONNECT_SEC", "5"))
+
+
+# =============================================================================
+# Producer
+# =============================================================================
+
+def bump_corpus_version(conn: psycopg.Connection, source: str) -> int | None:
+    """
+    corpus_version 증가 + NOTIFY 후 commit
+
+    Args:
+        conn: DB 연결 (데이터 변경을 commit한 뒤 호출)
+        source: 변경 출처 (ingest, load_coverage_mapping, backfill_plan_ids 등)
+
+    Returns:
+        새 버전 (migration 미적용 등으로 실패하면 None)
+    """
+    try:
+        with conn.cursor() as cur:
+            cur.execute("SELECT bump_corpus_version(%s) AS version", (source,))
+            row = cur.fetchone()
+        conn.commit()
+    except psycopg.Error as e:
+        logger.warning(f"corpus_version bump failed ({source}): {e}")
+        conn.rollback()
+        return None
+
+    version = row["version"] if isinstance(row, dict) else row[0]
+    logger.info(f"corpus_version bumped to {version} ({source})")
+    return version
+
+
+def get_corpus_version(conn: psycopg.Connection) -> int | None:
+    """현재 corpus_version (테이블이 없으면 None)"""
+    try:
+        with conn.cursor() as cur:
+            cur.execute("SELECT version FROM corpus_version WHERE id = 1")
+            row = cur.fetchone()
+    except psycopg.Error:
+        conn.rollback()
+        return None
+
+    if row is None:
+        return None
+    return row["version"] if isinstance(row, dict) else row[0]
+
+
+# =============================================================================
+# Invalidation registry
+# =============================================================================
+
+_invalidators: dict[str, Callable[[], None]] = {}
+
+
+def register_cache_invalidator(name: str, invalidate: Callable[[], None]) -> None:
+    """corpus 변경 시 호출할 캐시 무효화 함수 등록 (같은 이름은 교체)"""
+    _invalidators[name] = invalidate
+
+
+def invalidate_caches() -> list[str]:
+    """등록된 캐시 전체 무효화, 실패한 캐시 이름 반환"""
+    failed: list[str] = []
+    for name, invalidate in list(_invalidators.items()):
+        try:
+            invalidate()
+        except Exception as e:
+            logger.warning(f"cache invalidation failed ({name}): {e}")
+            failed.append(name)
+    return failed
+
+
+# =============================================================================
+# Listener
+# =============================================================================
+
+@dataclass
+class InvalidationMetrics:
+    """워커 단위 무효화 메트릭"""
+    listening: bool = False
+    notifications: int = 0
+    invalidations: int = 0
+    stale_notifications: int = 0       # 이미 반영한 버전 (중복 NOTIFY)
+    failed_invalidations: int = 0
+    reconnects: int = 0
+    last_version: int | None = None
+    last_source: str | None = None
+    last_lag_ms: float | None = None
+    max_lag_ms: float = 0.0
+    total_lag_ms: float = 0.0
+
+    @property
+    def avg_lag_ms(self) -> float | None:
+        if not self.invalidations:
+            return None
+        return round(self.total_lag_ms / self.invalidations, 2)
+
+    def to_dict(self) -> dict[str, Any]:
+        data = asdict(self)
+        data["avg_lag_ms"] = self.avg_lag_ms
+        return data
+
+
+class CorpusChangeListener(threading.Thread):
+    """corpus_changed 채널 LISTEN 스레드 (daemon)"""
+
+    def __init__(
+        self,
+        db_url: str,
+        poll_timeout_sec: float = 1.0,
+        known_version: int | None = None,
+    ):
+        """
+        Args:
+            known_version: 프로세스 캐시가 반영한 corpus_version (STEP 4.11 pre-fork 스냅샷).
+                연결 시 DB 버전이 더 높으면 즉시 무효화한다
+        """
+        super().__init__(name="corpus-change-listener", daemon=True)
+        self.db_url = db_url
+        self.poll_timeout_sec = poll_timeout_sec
+        self.metrics = InvalidationMetrics(last_version=known_version)
+        self._stop_event = threading.Event()
+        self._lock = threading.Lock()
+
+    def stop(self) -> None:
+        self._stop_event.set()
+
+    def handle_notification(self, payload: str, received_at: float | None = None) -> bool:
+        """
+        NOTIFY payload 처리
+
+        Returns:
+            캐시를 무효화했으면 True (이미 반영한 버전이면 False)
+        """
+        received_at = received_at if received_at is not None else time.time()
+        try:
+            data = json.loads(payload)
+        except (TypeError, ValueError):
+            data = {}
+
+        version = data.get("version")
+        with self._lock:
+            self.metrics.notifications += 1
+            if (
+                version is not None
+                and self.metrics.last_version is not None
+                and version <= self.metrics.last_version
+            ):
+                self.metrics.stale_notifications += 1
+                return False
+
+            failed = invalidate_caches()
+            done_at = time.time()
+
+            self.metrics.invalidations += 1
+            self.metrics.failed_invalidations += len(failed)
+            if version is not None:
+                self.metrics.last_version = version
+            self.metrics.last_source = data.get("source")
+
+            bumped_at = data.get("at")
+            lag_ms = (done_at - float(bumped_at)) * 1000 if bumped_at else (done_at - received_at) * 1000
+            lag_ms = round(max(lag_ms, 0.0), 2)
+            self.metrics.last_lag_ms = lag_ms
+            self.metrics.max_lag_ms = max(self.metrics.max_lag_ms, lag_ms)
+            self.metrics.total_lag_ms += lag_ms
+
+        logger.info(
+            f"corpus changed (version={version}, source={data.get('source')}); "
+            f"caches invalidated in {lag_ms}ms"
+        )
+        return True
+
+    def _sync_version(self, conn: psycopg.Connection) -> None:
+        """(재)연결 시 놓친 변경 반영"""
+        version = get_corpus_version(conn)
+        if version is None:
+            return
+        with self._lock:
+            last_version = self.metrics.last_version
+            if last_version is None:
+                self.metrics.last_version = version
+                return
+        if version > last_version:
+            self.handle_notification(json.dumps({"version": version, "source": "resync"}))
+
+    def run(self) -> None:
+        while not self._stop_event.is_set():
+            try:
+                with psycopg.connect(self.db_url, autocommit=True, row_factory=dict_row) as conn:
+                    conn.execute(f"LISTEN {CORPUS_CHANGED_CHANNEL}")
+                    self._sync_version(conn)
+                    self.metrics.listening = True
+
+                    while not self._stop_event.is_set():
+                        for notify in conn.notifies(timeout=self.poll_timeout_sec):
+                            self.handle_notification(notify.payload)
+            except Exception as e:
+                self.metrics.listening = False
+                if self._stop_event.is_set():
+                    break
+                self.metrics.reconnects += 1
+                logger.warning(f"corpus listener disconnected: {e}")
+                self._stop_event.wait(get_corpus_listener_reconnect_sec())
+
+        self.metrics.listening = False
+
+
+_listener: CorpusChangeListener | None = None
+
+
+def start_corpus_listener(
+    db_url: str,
+    known_version: int | None = None,
+) -> CorpusChangeListener | None:
+    """프로세스 listener 시작 (이미 실행 중이면 그대로 반환)"""
+    global _listener
+
+    if not is_corpus_listener_enabled():
+        return None
+
+    if _listener is None or not _listener.is_alive():
+        _listener = CorpusChangeListener(db_url, known_version=known_version)
+        _listener.start()
+    return _listener
+
+
+def stop_corpus_listener() -> None:
+    """프로세스 listener 종료"""
+    global _listener
+
+    if _listener is not None:
+        _listener.stop()
+        _listener.join(timeout=5)
+        _listener = None
+
+
+def get_listened_corpus_version() -> int | None:
+    """listener가 primary에서 받은 최신 corpus_version (LISTEN 중이 아니면 None)"""
+    if _listener is None or not _listener.metrics.listening:
+        return None
+    return _listener.metrics.last_version
+
+
+def get_invalidation_metrics() -> dict[str, Any]:
+    """현재 워커의 무효화 메트릭 (listener 미실행이면 enabled=False)"""
+    if _listener is None:
+        return {"enabled": False}
+    return {
+        "enabled": True,
+        "worker_pid": os.getpid(),
+        "caches": sorted(_invalidators),
+        **_listener.metrics.to_dict(),
+    }
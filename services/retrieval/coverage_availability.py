@@ -0,0 +1,248 @@
+"""
+STEP 4.5: Coverage Availability Index (보험사 × coverage_code × doc_type × plan 비트셋)
+
+보험사가 특정 coverage_code / doc_type / plan의 chunk를 하나라도 갖고 있는지를
+메모리 비트셋으로 유지한다. 보험사 축을 비트로 두고
+(coverage_code, doc_type, plan_id) 조합마다 보험사 비트마스크를 저장한다.
+
+- compare(): 결과가 비어 있을 것이 확실한 보험사의 SQL 조회를 생략
+- insurers_covering(): "X 담보를 가진 보험사"를 DB 조회 없이 응답
+
+plan 조건은 retrieval SQL과 동일하다:
+- plan_id가 None이면: c.plan_id IS NULL
+- plan_id가 있으면: (c.plan_id = plan_id OR c.plan_id IS NULL)
+- plan 조건이 없는 조회(get_policy_axis)는 has_documents_any_plan()
+
+corpus 지문(chunk 건수:최대 chunk_id)이 바뀌면 다시 빌드한다.
+지문 확인은 COVERAGE_AVAILABILITY_REFRESH_SEC 간격으로만 수행한다.
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+import time
+from typing import Iterable
+
+import psycopg
+
+
+logger = logging.getLogger(__name__)
+
+
+def is_coverage_availability_enabled() -> bool:
+    """COVERAGE_AVAILABILITY_ENABLED 환경변수 확인 (기본: 사용)"""
+    return os.environ.get("COVERAGE_AVAILABILITY_ENABLED", "1") == "1"
+
+
+def get_coverage_availability_refresh_sec() -> float:
+    """corpus 지문 재확인 간격 (기본: 30초)"""
+    return float(os.environ.get("COVERAGE_AVAILABILITY_REFRESH_SEC", "30"))
+
+
+class CoverageAvailability:
+    """보험사 비트셋 기반 가용성 인덱스"""
+
+    def __init__(self, insurer_codes: list[str], corpus_fingerprint: str | None = None):
+        self.insurer_codes = list(insurer_codes)
+        self.corpus_fingerprint = corpus_fingerprint
+        self._insurer_bit = {code: 1 << i for i, code in enumerate(self.insurer_codes)}
+        # (coverage_code, doc_type, plan_id) → 보험사 비트마스크 (coverage 태깅 chunk)
+        self._coverage_bits: dict[tuple[str, str, int | None], int] = {}
+        # (doc_type, plan_id) → 보험사 비트마스크 (태깅 여부 무관 전체 chunk)
+        self._doc_bits: dict[tuple[str, int | None], int] = {}
+        # (doc_type, plan_id) → coverage 태깅 chunk가 있는 보험사 비트마스크
+        self._tagged_bits: dict[tuple[str, int | None], int] = {}
+        # coverage_code → 보험사 비트마스크 (doc_type/plan 무관)
+        self._coverage_any: dict[str, int] = {}
+        # doc_type → 보험사 비트마스크 (plan 무관)
+        self._doc_any: dict[str, int] = {}
+
+    def add(
+        self,
+        insurer_code: str,
+        doc_type: str,
+        plan_id: int | None,
+        coverage_code: str | None,
+    ) -> None:
+        """chunk 그룹 1건 등록"""
+        bit = self._insurer_bit.get(insurer_code)
+        if bit is None:
+            bit = 1 << len(self.insurer_codes)
+            self.insurer_codes.append(insurer_code)
+            self._insurer_bit[insurer_code] = bit
+
+        doc_key = (doc_type, plan_id)
+        self._doc_bits[doc_key] = self._doc_bits.get(doc_key, 0) | bit
+        self._doc_any[doc_type] = self._doc_any.get(doc_type, 0) | bit
+        if coverage_code:
+            cov_key = (coverage_code, doc_type, plan_id)
+            self._coverage_bits[cov_key] = self._coverage_bits.get(cov_key, 0) | bit
+            self._tagged_bits[doc_key] = self._tagged_bits.get(doc_key, 0) | bit
+            self._coverage_any[coverage_code] = self._coverage_any.get(coverage_code, 0) | bit
+
+    def _insurers(self, mask: int) -> list[str]:
+        return [code for code in self.insurer_codes if mask & self._insurer_bit[code]]
+
+    @staticmethod
+    def _plan_keys(plan_id: int | None) -> tuple[int | None, ...]:
+        return (None,) if plan_id is None else (None, plan_id)
+
+    def has_coverage(
+        self,
+        insurer_code: str,
+        coverage_codes: Iterable[str] | None,
+        doc_types: Iterable[str],
+        plan_id: int | None = None,
+    ) -> bool:
+        """
+        get_compare_axis 조회 결과가 1건 이상일 수 있는지
+
+        coverage_codes가 None이면 coverage 태깅된 chunk 존재 여부
+        """
+        bit = self._insurer_bit.get(insurer_code)
+        if bit is None:
+            return False
+
+        doc_types = list(doc_types)
+        for plan_key in self._plan_keys(plan_id):
+            if coverage_codes is None:
+                if any(self._tagged_bits.get((dt, plan_key), 0) & bit for dt in doc_types):
+                    return True
+                continue
+            for code in coverage_codes:
+                if any(
+                    self._coverage_bits.get((code, dt, plan_key), 0) & bit
+                    for dt in doc_types
+                ):
+                    return True
+        return False
+
+    def has_documents(
+        self,
+        insurer_code: str,
+        doc_types: Iterable[str],
+        plan_id: int | None = None,
+    ) -> bool:
+        """보험사에 해당 doc_type chunk가 있는지 (키워드 검색 조회 생략 판단용)"""
+        bit = self._insurer_bit.get(insurer_code)
+        if bit is None:
+            return False
+
+        doc_types = list(doc_types)
+        return any(
+            self._doc_bits.get((dt, plan_key), 0) & bit
+            for plan_key in self._plan_keys(plan_id)
+            for dt in doc_types
+        )
+
+    def has_documents_any_plan(self, insurer_code: str, doc_types: Iterable[str]) -> bool:
+        """보험사에 해당 doc_type chunk가 plan 무관하게 있는지 (plan 조건 없는 약관 조회용)"""
+        bit = self._insurer_bit.get(insurer_code)
+        if bit is None:
+            return False
+        return any(self._doc_any.get(dt, 0) & bit for dt in doc_types)
+
+    def insurers_covering(
+        self,
+        coverage_code: str,
+        doc_types: Iterable[str] | None = None,
+    ) -> list[str]:
+        """coverage_code chunk를 가진 보험사 (doc_types None이면 전체, plan 무관)"""
+        if doc_types is None:
+            return self._insurers(self._coverage_any.get(coverage_code, 0))
+
+        doc_types = set(doc_types)
+        mask = 0
+        for (code, dt, _plan_id), bits in self._coverage_bits.items():
+            if code == coverage_code and dt in doc_types:
+                mask |= bits
+        return self._insurers(mask)
+
+
+def build_coverage_availability(conn: psycopg.Connection) -> CoverageAvailability:
+    """chunk 테이블에서 가용성 인덱스 빌드 (GROUP BY 1회)"""
+    from services.retrieval.compare_cube import get_corpus_fingerprint
+
+    fingerprint = get_corpus_fingerprint(conn)
+
+    with conn.cursor() as cur:
+        cur.execute("SELECT insurer_code FROM insurer ORDER BY insurer_id")
+        availability = CoverageAvailability(
+            [row["insurer_code"] for row in cur.fetchall()],
+            corpus_fingerprint=fingerprint,
+        )
+
+        cur.execute(
+            """
+            SELECT
+                i.insurer_code,
+                c.doc_type,
+                c.plan_id,
+                c.meta->'entities'->>'coverage_code' AS coverage_code
+            FROM chunk c
+            JOIN insurer i ON c.insurer_id = i.insurer_id
+            GROUP BY 1, 2, 3, 4
+            """
+        )
+        for row in cur.fetchall():
+            availability.add(
+                row["insurer_code"],
+                row["doc_type"],
+                row["plan_id"],
+                row["coverage_code"],
+            )
+
+    return availability
+
+
+_availability_cache: CoverageAvailability | None = None
+_availability_checked_at = 0.0
+
+
+def get_coverage_availability(conn: psycopg.Connection) -> CoverageAvailability | None:
+    """
+    프로세스 단위 가용성 인덱스 조회
+
+    - COVERAGE_AVAILABILITY_ENABLED=0이면 None
+    - 최초 조회 시 빌드, 이후 refresh 간격마다 corpus 지문을 확인하여 바뀌었으면 재빌드
+    - 빌드 실패 시 None (호출 측은 기존처럼 SQL 조회)
+    """
+    global _availability_cache, _availability_checked_at
+
+    if not is_coverage_availability_enabled():
+        return None
+
+    now = time.monotonic()
+    if (
+        _availability_cache is not None
+        and now - _availability_checked_at < get_coverage_availability_refresh_sec()
+    ):
+        return _availability_cache
+
+    from services.retrieval.compare_cube import get_corpus_fingerprint
+
+    try:
+        if (
+            _availability_cache is None
+            or _availability_cache.corpus_fingerprint != get_corpus_fingerprint(conn)
+        ):
+            _availability_cache = build_coverage_availability(conn)
+            logger.info(
+                f"coverage availability built (corpus {_availability_cache.corpus_fingerprint})"
+            )
+        _availability_checked_at = now
+    except Exception as e:
+        logger.warning(f"coverage availability build failed: {e}")
+        conn.rollback()
+        _availability_cache = None
+        return None
+
+    return _availability_cache
+
+
+def clear_coverage_availability() -> None:
+    """프로세스 가용성 인덱스 초기화 (다음 조회 시 재빌드)"""
+    global _availability_cache, _availability_checked_at
+    _availability_cache = None
+    _availability_checked_at = 0.0
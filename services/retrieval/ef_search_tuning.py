@@ -0,0 +1,359 @@
+"""
+STEP 4.4: HNSW ef_search 파티션별 튜닝
+
+(insurer_code, doc_type) 파티션마다 HNSW 검색 결과를 정확 검색(순차 스캔)과
+비교하여 ef_search grid별 recall@k / 지연을 측정하고, recall 목표를 만족하는
+최소 지연 ef_search를 hnsw_ef_search_tuning 테이블에 저장한다.
+
+필터(insurer, doc_type)가 붙은 HNSW 검색은 ef_search 후보 중 필터를 통과한 것만
+남기므로, 작은 파티션일수록 같은 ef_search에서도 recall이 낮다.
+get_compare_axis_vector는 resolve_ef_search()로 파티션별 값을 적용한다.
+
+사용처:
+- tools/tune_ef_search.py (측정 + 저장)
+- services/retrieval/compare_service.get_compare_axis_vector (적용)
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import os
+import statistics
+import time
+from dataclasses import asdict, dataclass, field
+
+import psycopg
+
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_EF_SEARCH_GRID = [10, 20, 40, 64, 100, 200, 400]
+
+PartitionKey = tuple[str, str]  # (insurer_code, doc_type)
+
+
+def is_ef_search_tuning_enabled() -> bool:
+    """COMPARE_AXIS_EF_SEARCH_TUNED 환경변수 확인 (기본: 사용)"""
+    return os.environ.get("COMPARE_AXIS_EF_SEARCH_TUNED", "1") == "1"
+
+
+def get_ef_search_recall_target() -> float:
+    """튜닝 recall@k 목표 (기본: 0.95)"""
+    return float(os.environ.get("EF_SEARCH_RECALL_TARGET", "0.95"))
+
+
+@dataclass
+class EfSearchMeasurement:
+    """ef_search 1개 값의 측정 결과"""
+    ef_search: int
+    recall: float
+    latency_ms: float
+
+
+@dataclass
+class PartitionTuning:
+    """파티션 튜닝 결과"""
+    insurer_code: str
+    doc_type: str
+    ef_search: int
+    recall: float
+    latency_ms: float
+    recall_target: float
+    top_k: int
+    sample_queries: int
+    measurements: list[EfSearchMeasurement] = field(default_factory=list)
+
+    @property
+    def key(self) -> PartitionKey:
+        return (self.insurer_code, self.doc_type)
+
+
+# =============================================================================
+# Measurement
+# =============================================================================
+
+_PARTITION_KNN_QUERY = """
+    SELECT c.chunk_id
+    FROM chunk c
+    JOIN insurer i ON c.insurer_id = i.insurer_id
+    WHERE i.insurer_code = %s
+      AND c.doc_type = %s
+      AND c.embedding IS NOT NULL
+    ORDER BY c.embedding <=> %s::vector
+    LIMIT %s
+"""
+
+
+def list_vector_partitions(
+    conn: psycopg.Connection,
+    insurers: list[str] | None = None,
+) -> list[tuple[str, str, int]]:
+    """
+    임베딩이 있는 (insurer_code, doc_type, chunk 수) 파티션 목록
+
+    Args:
+        conn: DB 연결
+        insurers: 대상 보험사 (None이면 전체)
+    """
+    with conn.cursor() as cur:
+        cur.execute(
+            """
+            SELECT i.insurer_code, c.doc_type, COUNT(*) AS n
+            FROM chunk c
+            JOIN insurer i ON c.insurer_id = i.insurer_id
+            WHERE c.embedding IS NOT NULL
+              AND (%s::text[] IS NULL OR i.insurer_code = ANY(%s::text[]))
+            GROUP BY i.insurer_code, c.doc_type
+            ORDER BY i.insurer_code, c.doc_type
+            """,
+            (insurers, insurers),
+        )
+        return [(r["insurer_code"], r["doc_type"], r["n"]) for r in cur.fetchall()]
+
+
+def sample_query_embeddings(
+    conn: psycopg.Connection,
+    insurer_code: str,
+    doc_type: str,
+    sample_size: int,
+    seed: float = 0.42,
+) -> list[str]:
+    """
+    파티션 chunk 임베딩을 질의로 샘플링 (vector 텍스트 표현)
+
+    실제 질의 분포가 없으므로 corpus 자체를 질의로 사용한다 (seed 고정으로 재현).
+    """
+    with conn.cursor() as cur:
+        cur.execute("SELECT setseed(%s)", (seed,))
+        cur.execute(
+            """
+            SELECT c.embedding::text AS embedding
+            FROM chunk c
+            JOIN insurer i ON c.insurer_id = i.insurer_id
+            WHERE i.insurer_code = %s
+              AND c.doc_type = %s
+              AND c.embedding IS NOT NULL
+            ORDER BY random()
+            LIMIT %s
+            """,
+            (insurer_code, doc_type, sample_size),
+        )
+        return [r["embedding"] for r in cur.fetchall()]
+
+
+def _knn_chunk_ids(
+    cur: psycopg.Cursor,
+    insurer_code: str,
+    doc_type: str,
+    embedding: str,
+    top_k: int,
+) -> list[int]:
+    cur.execute(_PARTITION_KNN_QUERY, (insurer_code, doc_type, embedding, top_k))
+    return [r["chunk_id"] for r in cur.fetchall()]
+
+
+def exact_knn(
+    conn: psycopg.Connection,
+    insurer_code: str,
+    doc_type: str,
+    embeddings: list[str],
+    top_k: int,
+) -> list[list[int]]:
+    """정확 검색 (index scan 비활성화 → 순차 스캔 + 정렬) 결과 chunk_id"""
+    try:
+        with conn.cursor() as cur:
+            cur.execute("SET LOCAL enable_indexscan = off")
+            cur.execute("SET LOCAL enable_bitmapscan = off")
+            return [
+                _knn_chunk_ids(cur, insurer_code, doc_type, emb, top_k)
+                for emb in embeddings
+            ]
+    finally:
+        conn.rollback()
+
+
+def measure_ef_search(
+    conn: psycopg.Connection,
+    insurer_code: str,
+    doc_type: str,
+    embeddings: list[str],
+    truth: list[list[int]],
+    ef_search: int,
+    top_k: int,
+) -> EfSearchMeasurement:
+    """ef_search 1개 값에 대한 평균 recall@k / 중앙값 지연"""
+    recalls: list[float] = []
+    latencies: list[float] = []
+    try:
+        with conn.cursor() as cur:
+            cur.execute(f"SET LOCAL hnsw.ef_search = {int(ef_search)}")
+            for emb, expected in zip(embeddings, truth):
+                start = time.perf_counter()
+                found = _knn_chunk_ids(cur, insurer_code, doc_type, emb, top_k)
+                latencies.append((time.perf_counter() - start) * 1000)
+                if expected:
+                    recalls.append(len(set(found) & set(expected)) / len(expected))
+    finally:
+        conn.rollback()
+
+    return EfSearchMeasurement(
+        ef_search=ef_search,
+        recall=round(statistics.mean(recalls), 4) if recalls else 1.0,
+        latency_ms=round(statistics.median(latencies), 3) if latencies else 0.0,
+    )
+
+
+def choose_ef_search(
+    measurements: list[EfSearchMeasurement],
+    recall_target: float,
+) -> EfSearchMeasurement:
+    """
+    recall 목표를 만족하는 측정값 중 최소 지연 선택
+
+    - 지연이 같으면 작은 ef_search
+    - 목표를 만족하는 값이 없으면 recall 최대 (동률이면 작은 ef_search)
+    """
+    if not measurements:
+        raise ValueError("no measurements")
+
+    passing = [m for m in measurements if m.recall >= recall_target]
+    if passing:
+        return min(passing, key=lambda m: (m.latency_ms, m.ef_search))
+    return max(measurements, key=lambda m: (m.recall, -m.ef_search))
+
+
+def tune_partition(
+    conn: psycopg.Connection,
+    insurer_code: str,
+    doc_type: str,
+    ef_grid: list[int] | None = None,
+    top_k: int = 10,
+    sample_size: int = 50,
+    recall_target: float | None = None,
+) -> PartitionTuning | None:
+    """
+    파티션 1개 튜닝
+
+    Returns:
+        PartitionTuning (임베딩이 없으면 None)
+    """
+    target = recall_target if recall_target is not None else get_ef_search_recall_target()
+    embeddings = sample_query_embeddings(conn, insurer_code, doc_type, sample_size)
+    if not embeddings:
+        return None
+
+    truth = exact_knn(conn, insurer_code, doc_type, embeddings, top_k)
+    measurements = [
+        measure_ef_search(conn, insurer_code, doc_type, embeddings, truth, ef, top_k)
+        for ef in sorted(set(ef_grid or DEFAULT_EF_SEARCH_GRID))
+    ]
+    best = choose_ef_search(measurements, target)
+
+    return PartitionTuning(
+        insurer_code=insurer_code,
+        doc_type=doc_type,
+        ef_search=best.ef_search,
+        recall=best.recall,
+        latency_ms=best.latency_ms,
+        recall_target=target,
+        top_k=top_k,
+        sample_queries=len(embeddings),
+        measurements=measurements,
+    )
+
+
+# =============================================================================
+# Persistence
+# =============================================================================
+
+def save_ef_search_tuning(conn: psycopg.Connection, tunings: list[PartitionTuning]) -> int:
+    """튜닝 결과 upsert (파티션 단위), 저장 건수 반환"""
+    with conn.cursor() as cur:
+        for t in tunings:
+            cur.execute(
+                """
+                INSERT INTO hnsw_ef_search_tuning (
+                    insurer_code, doc_type, ef_search, recall, latency_ms,
+                    recall_target, top_k, sample_queries, measurements, tuned_at
+                ) VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, NOW())
+                ON CONFLICT (insurer_code, doc_type) DO UPDATE SET
+                    ef_search = EXCLUDED.ef_search,
+                    recall = EXCLUDED.recall,
+                    latency_ms = EXCLUDED.latency_ms,
+                    recall_target = EXCLUDED.recall_target,
+                    top_k = EXCLUDED.top_k,
+                    sample_queries = EXCLUDED.sample_queries,
+                    measurements = EXCLUDED.measurements,
+                    tuned_at = NOW()
+                """,
+                (
+                    t.insurer_code,
+                    t.doc_type,
+                    t.ef_search,
+                    t.recall,
+                    t.latency_ms,
+                    t.recall_target,
+                    t.top_k,
+                    t.sample_queries,
+                    json.dumps([asdict(m) for m in t.measurements]),
+                ),
+            )
+    conn.commit()
+    clear_ef_search_table()
+    return len(tunings)
+
+
+def load_ef_search_table(conn: psycopg.Connection) -> dict[PartitionKey, int]:
+    """hnsw_ef_search_tuning → {(insurer_code, doc_type): ef_search}"""
+    with conn.cursor() as cur:
+        cur.execute("SELECT insurer_code, doc_type, ef_search FROM hnsw_ef_search_tuning")
+        return {(r["insurer_code"], r["doc_type"]): r["ef_search"] for r in cur.fetchall()}
+
+
+_ef_table_cache: dict[PartitionKey, int] | None = None
+
+
+def get_ef_search_table(conn: psycopg.Connection) -> dict[PartitionKey, int]:
+    """
+    프로세스 단위 ef_search 테이블 조회 (최초 1회 DB 로드)
+
+    COMPARE_AXIS_EF_SEARCH_TUNED=0이거나 테이블이 없으면 빈 dict
+    """
+    global _ef_table_cache
+
+    if not is_ef_search_tuning_enabled():
+        return {}
+
+    if _ef_table_cache is None:
+        try:
+            _ef_table_cache = load_ef_search_table(conn)
+        except Exception as e:
+            # 테이블 미생성 등: 기본 ef_search로 동작
+            logger.warning(f"ef_search tuning table load failed: {e}")
+            conn.rollback()
+            _ef_table_cache = {}
+
+    return _ef_table_cache
+
+
+def clear_ef_search_table() -> None:
+    """프로세스 ef_search 캐시 초기화 (다음 조회 시 재로드)"""
+    global _ef_table_cache
+    _ef_table_cache = None
+
+
+def resolve_ef_search(
+    table: dict[PartitionKey, int],
+    insurer_code: str,
+    doc_types: list[str],
+    default: int,
+) -> int:
+    """
+    보험사 검색에 적용할 ef_search
+
+    한 쿼리가 여러 doc_type 파티션을 함께 검색하므로 파티션 값 중 최대값을 사용
+    (모든 파티션이 recall 목표를 만족). 튜닝되지 않은 파티션은 default.
+    """
+    values = [table.get((insurer_code, dt), default) for dt in doc_types]
+    return max(values) if values else default
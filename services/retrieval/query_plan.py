@@ -0,0 +1,519 @@
+"""
+STEP 4.3: Hot retrieval SQL 쿼리 플랜 회귀 가드
+
+get_compare_axis / get_policy_axis / get_amount_bearing_evidence 등이 실제로
+실행하는 SQL을 그대로 EXPLAIN (ANALYZE, BUFFERS, FORMAT JSON)으로 캡처하고,
+- 기대 인덱스 사용 / 금지된 Seq Scan
+- row 추정치 오차
+- baseline 대비 buffer/시간 회귀
+를 판정한다.
+
+SQL을 복제하지 않기 위해 ExplainCapture가 커넥션을 감싸서
+조회 쿼리마다 EXPLAIN을 먼저 실행한 뒤 원래 쿼리를 그대로 실행한다.
+
+사용처:
+- tools/query_plan_guard.py (합성 corpus 적재 + 리포트 + baseline 갱신)
+- tests/test_query_plans.py
+"""
+
+from __future__ import annotations
+
+import json
+from dataclasses import asdict, dataclass, field
+from typing import Any
+
+import psycopg
+
+
+EXPLAIN_PREFIX = "EXPLAIN (ANALYZE, BUFFERS, FORMAT JSON) "
+
+
+# =============================================================================
+# Capture
+# =============================================================================
+
+class _ExplainCursor:
+    """EXPLAIN 캡처 후 원래 쿼리를 실행하는 cursor 래퍼"""
+
+    def __init__(self, capture: "ExplainCapture", cursor: Any):
+        self._capture = capture
+        self._cursor = cursor
+
+    def __enter__(self) -> "_ExplainCursor":
+        self._cursor = self._cursor.__enter__()
+        return self
+
+    def __exit__(self, exc_type: Any, exc_val: Any, exc_tb: Any) -> Any:
+        return self._cursor.__exit__(exc_type, exc_val, exc_tb)
+
+    def execute(self, query: str, params: Any = None) -> Any:
+        head = query.lstrip().upper()
+        if head.startswith("SELECT") or head.startswith("WITH"):
+            self._cursor.execute(EXPLAIN_PREFIX + query, params)
+            row = self._cursor.fetchone()
+            plan = row["QUERY PLAN"] if isinstance(row, dict) else row[0]
+            if isinstance(plan, str):
+                plan = json.loads(plan)
+            self._capture.plans.append(plan[0])
+        return self._cursor.execute(query, params)
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._cursor, name)
+
+
+class ExplainCapture:
+    """
+    psycopg 커넥션 래퍼: cursor().execute()로 실행되는 SELECT/WITH 쿼리의
+    EXPLAIN ANALYZE 플랜을 self.plans에 순서대로 기록한다.
+    """
+
+    def __init__(self, conn: psycopg.Connection):
+        self._conn = conn
+        self.plans: list[dict[str, Any]] = []
+
+    def cursor(self, *args: Any, **kwargs: Any) -> _ExplainCursor:
+        return _ExplainCursor(self, self._conn.cursor(*args, **kwargs))
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._conn, name)
+
+
+# =============================================================================
+# Summary
+# =============================================================================
+
+@dataclass
+class PlanSummary:
+    """EXPLAIN 결과 요약 (한 케이스의 모든 statement 합산)"""
+    statements: int = 0
+    node_types: list[str] = field(default_factory=list)
+    seq_scan_relations: list[str] = field(default_factory=list)
+    index_names: list[str] = field(default_factory=list)
+    shared_hit_blocks: int = 0
+    shared_read_blocks: int = 0
+    execution_ms: float = 0.0
+    planning_ms: float = 0.0
+    max_row_estimate_error: float = 1.0  # max(추정, 실제) / max(min(추정, 실제), 1)
+
+    @property
+    def shared_blocks(self) -> int:
+        return self.shared_hit_blocks + self.shared_read_blocks
+
+    def to_dict(self) -> dict[str, Any]:
+        data = asdict(self)
+        data["shared_blocks"] = self.shared_blocks
+        return data
+
+
+def _walk_plan(node: dict[str, Any], summary: PlanSummary) -> None:
+    node_type = node.get("Node Type", "")
+    if node_type and node_type not in summary.node_types:
+        summary.node_types.append(node_type)
+
+    relation = node.get("Relation Name")
+    if node_type == "Seq Scan" and relation and relation not in summary.seq_scan_relations:
+        summary.seq_scan_relations.append(relation)
+
+    index_name = node.get("Index Name")
+    if index_name and index_name not in summary.index_names:
+        summary.index_names.append(index_name)
+
+    # 스캔 노드의 row 추정 오차 (loops 보정: Actual Rows는 loop당 평균)
+    if relation or index_name:
+        estimated = float(node.get("Plan Rows", 0))
+        actual = float(node.get("Actual Rows", 0))
+        error = max(estimated, actual) / max(min(estimated, actual), 1.0)
+        summary.max_row_estimate_error = max(summary.max_row_estimate_error, error)
+
+    for child in node.get("Plans", []) or []:
+        _walk_plan(child, summary)
+
+
+def summarize_plans(plans: list[dict[str, Any]]) -> PlanSummary:
+    """
+    EXPLAIN (FORMAT JSON) 결과 리스트를 요약
+
+    Args:
+        plans: [{"Plan": {...}, "Execution Time": .., "Planning Time": ..}, ...]
+
+    Returns:
+        PlanSummary
+    """
+    summary = PlanSummary()
+    for plan in plans:
+        root = plan.get("Plan", {})
+        summary.statements += 1
+        # 루트 노드의 buffer 수치는 하위 노드 누적값
+        summary.shared_hit_blocks += int(root.get("Shared Hit Blocks", 0))
+        summary.shared_read_blocks += int(root.get("Shared Read Blocks", 0))
+        summary.execution_ms += float(plan.get("Execution Time", 0.0))
+        summary.planning_ms += float(plan.get("Planning Time", 0.0))
+        _walk_plan(root, summary)
+
+    summary.execution_ms = round(summary.execution_ms, 3)
+    summary.planning_ms = round(summary.planning_ms, 3)
+    summary.max_row_estimate_error = round(summary.max_row_estimate_error, 2)
+    return summary
+
+
+# =============================================================================
+# Check
+# =============================================================================
+
+DEFAULT_THRESHOLDS: dict[str, float] = {
+    "max_buffer_ratio": 2.0,        # baseline 대비 shared blocks 배수
+    "max_time_ratio": 3.0,          # baseline 대비 execution_ms 배수
+    "min_time_ms_for_ratio": 5.0,   # 이보다 빠르면 시간 회귀 판정 안함 (노이즈)
+    "max_row_estimate_error": 100.0,
+}
+
+
+def check_plan(
+    summary: PlanSummary,
+    case: dict[str, Any],
+    baseline: dict[str, Any] | None = None,
+    thresholds: dict[str, float] | None = None,
+) -> list[str]:
+    """
+    플랜 요약을 케이스 기대치/baseline과 비교
+
+    Args:
+        summary: 현재 플랜 요약
+        case: 케이스 정의 (forbid_seq_scan, expect_index_any, max_row_estimate_error)
+        baseline: 이전 측정값 (PlanSummary.to_dict 형식, 없으면 회귀 판정 생략)
+        thresholds: DEFAULT_THRESHOLDS override
+
+    Returns:
+        위반 메시지 리스트 (비어 있으면 통과)
+    """
+    limits = dict(DEFAULT_THRESHOLDS)
+    if thresholds:
+        limits.update(thresholds)
+
+    violations: list[str] = []
+
+    for relation in case.get("forbid_seq_scan", []):
+        if relation in summary.seq_scan_relations:
+            violations.append(f"Seq Scan on {relation}")
+
+    expected_indexes = case.get("expect_index_any", [])
+    if expected_indexes and not set(expected_indexes) & set(summary.index_names):
+        violations.append(
+            f"none of expected indexes used {expected_indexes} (used: {summary.index_names})"
+        )
+
+    max_error = case.get("max_row_estimate_error", limits["max_row_estimate_error"])
+    if summary.max_row_estimate_error > max_error:
+        violations.append(
+            f"row estimate error {summary.max_row_estimate_error} > {max_error}"
+        )
+
+    if baseline:
+        base_blocks = baseline.get("shared_blocks", 0)
+        if base_blocks and summary.shared_blocks > base_blocks * limits["max_buffer_ratio"]:
+            violations.append(
+                f"shared blocks {summary.shared_blocks} > "
+                f"{limits['max_buffer_ratio']}x baseline {base_blocks}"
+            )
+
+        base_ms = baseline.get("execution_ms", 0.0)
+        if (
+            base_ms
+            and summary.execution_ms >= limits["min_time_ms_for_ratio"]
+            and summary.execution_ms > base_ms * limits["max_time_ratio"]
+        ):
+            violations.append(
+                f"execution {summary.execution_ms}ms > "
+                f"{limits['max_time_ratio']}x baseline {base_ms}ms"
+            )
+
+    return violations
+
+
+# =============================================================================
+# Case runner
+# =============================================================================
+
+def _get_hot_query_functions() -> dict[str, Any]:
+    """케이스 function 이름 → 실제 retrieval 함수"""
+    from services.retrieval import compare_service
+
+    return {
+        "get_compare_axis": compare_service.get_compare_axis,
+        "get_policy_axis": compare_service.get_policy_axis,
+        "get_amount_bearing_evidence": compare_service.get_amount_bearing_evidence,
+        "get_amount_bearing_evidence_many": compare_service.get_amount_bearing_evidence_many,
+        "load_amount_facts": compare_service.load_amount_facts,
+    }
+
+
+def _build_case_args(case: dict[str, Any]) -> dict[str, Any]:
+    from services.retrieval.compare_service import AmountEvidenceRequest
+
+    args = dict(case.get("args", {}))
+    if case["function"] == "get_amount_bearing_evidence_many":
+        args["requests"] = [AmountEvidenceRequest(**r) for r in args.get("requests", [])]
+    return args
+
+
+def run_plan_case(
+    conn: psycopg.Connection,
+    case: dict[str, Any],
+    planner_settings: dict[str, str] | None = None,
+    repeats: int = 3,
+) -> PlanSummary:
+    """
+    케이스 함수를 ExplainCapture로 실행하여 플랜 요약 반환
+
+    Args:
+        conn: DB 연결 (dict_row)
+        case: {"name", "function", "args", ...}
+        planner_settings: SET LOCAL로 적용할 planner 설정 (예: enable_seqscan=off)
+        repeats: 반복 횟수 (execution_ms가 가장 작은 측정값 사용, 캐시 워밍 포함)
+
+    Returns:
+        PlanSummary
+    """
+    from services.extraction.amount_facts import clear_amount_fact_index
+
+    fn = _get_hot_query_functions()[case["function"]]
+    args = _build_case_args(case)
+
+    best: PlanSummary | None = None
+    for _ in range(max(repeats, 1)):
+        # get_compare_axis의 coverage_amount_fact 조회가 매번 실행되도록 (STEP 4.24)
+        clear_amount_fact_index()
+        try:
+            with conn.cursor() as cur:
+                for key, value in (planner_settings or {}).items():
+                    cur.execute(f"SET LOCAL {key} = {value}")
+
+            capture = ExplainCapture(conn)
+            fn(capture, **args)
+            summary = summarize_plans(capture.plans)
+        finally:
+            conn.rollback()
+
+        if best is None or summary.execution_ms < best.execution_ms:
+            best = summary
+
+    return best  # type: ignore[return-value]
+
+
+# =============================================================================
+# Synthetic corpus
+# =============================================================================
+
+SYNTHETIC_SOURCE_PREFIX = "synthetic://"
+SYNTHETIC_PRODUCT_NAME = "__synthetic_query_plan__"
+
+_SYNTHETIC_COVERAGES = [
+    ("A4200_1", "암진단비(유사암제외)"),
+    ("A4210", "유사암진단비"),
+    ("A4209", "암진단비"),
+    ("A4103", "뇌졸중진단비"),
+    ("A4105", "허혈성심장질환진단비"),
+    ("A5100", "질병수술비"),
+    ("A5200", "암수술비(유사암제외)"),
+    ("A9630_1", "다빈치로봇암수술비"),
+]
+
+_SYNTHETIC_FILLER = (
+    "회사는 피보험자가 보험기간 중 약관에서 정한 사유가 발생한 경우 "
+    "보험수익자에게 아래의 보험금을 지급합니다. 보험료 납입기간 및 보험기간은 "
+    "계약 시 정한 바에 따르며 해지환급금은 납입기간에 따라 달라질 수 있습니다. "
+)
+
+_SYNTHETIC_POLICY_TERMS = ["경계성종양", "유사암", "제자리암", "갑상선암", "기타피부암"]
+
+
+def _synthetic_content(rng: Any, doc_type: str, coverage_name: str | None) -> str:
+    parts: list[str] = []
+    if coverage_name:
+        amount = rng.choice([500, 1000, 2000, 3000, 5000])
+        if doc_type == "가입설계서":
+            parts.append(
+                f"{coverage_name} 가입금액 {amount:,}만원 보험료 {rng.randint(1, 90) * 100:,}원"
+            )
+        else:
+            parts.append(
+                f"{coverage_name} 진단확정시 보험가입금액 {amount:,}만원 지급 (최초 1회한)"
+            )
+    if doc_type == "약관" and rng.random() < 0.15:
+        term = rng.choice(_SYNTHETIC_POLICY_TERMS)
+        parts.append(f"제{rng.randint(1, 60)}조({term}의 정의) {term}은 다음과 같습니다.")
+    parts.append(_SYNTHETIC_FILLER * rng.randint(2, 5))
+    return "\n".join(parts)
+
+
+def seed_synthetic_corpus(
+    conn: psycopg.Connection,
+    chunks_per_insurer: int = 2500,
+    seed: int = 42,
+) -> dict[str, int]:
+    """
+    쿼리 플랜 측정용 합성 corpus 적재 (기존 합성 데이터는 교체)
+
+    실데이터가 있는 DB는 보호를 위해 거부한다 (source_path가 synthetic://가 아닌 문서).
+
+    Args:
+        conn: DB 연결 (dict_row)
+        chunks_per_insurer: 보험사별 chunk 수
+        seed: 난수 시드 (재현성)
+
+    Returns:
+        {"documents": n, "chunks": n, "amount_facts": n}
+    """
+    import random
+
+    rng = random.Random(seed)
+    fact_rng = random.Random(seed + 1)  # chunk 내용은 기존 시드 순서 그대로
+    doc_type_weights = [("약관", 0.6), ("가입설계서", 0.15), ("상품요약서", 0.15), ("사업방법서", 0.1)]
+
+    with conn.cursor() as cur:
+        cur.execute(
+            "SELECT COUNT(*) AS n FROM document WHERE source_path NOT LIKE %s",
+            (SYNTHETIC_SOURCE_PREFIX + "%",),
+        )
+        if cur.fetchone()["n"] > 0:
+            raise RuntimeError(
+                "Database contains non-synthetic documents; refusing to seed. "
+                "Use a dedicated database for query plan checks."
+            )
+
+        # 모든 문서가 합성 데이터이므로 TRUNCATE (dead tuple 없이 매번 같은 heap/통계)
+        cur.execute("TRUNCATE chunk, document, coverage_amount_fact RESTART IDENTITY")
+        cur.execute("DELETE FROM product WHERE product_name = %s", (SYNTHETIC_PRODUCT_NAME,))
+
+        cur.execute("SELECT insurer_id, insurer_code FROM insurer ORDER BY insurer_id")
+        insurers = cur.fetchall()
+
+        doc_count = 0
+        chunk_count = 0
+        fact_count = 0
+        for ins in insurers:
+            insurer_id = ins["insurer_id"]
+            cur.execute(
+                "INSERT INTO product (insurer_id, product_name) VALUES (%s, %s) RETURNING product_id",
+                (insurer_id, SYNTHETIC_PRODUCT_NAME),
+            )
+            product_id = cur.fetchone()["product_id"]
+            plan_ids = []
+            for plan_name in ("1종", "2종"):
+                cur.execute(
+                    "INSERT INTO product_plan (product_id, plan_name) VALUES (%s, %s) RETURNING plan_id",
+                    (product_id, plan_name),
+                )
+                plan_ids.append(cur.fetchone()["plan_id"])
+
+            # doc_type별 문서 1개 + plan별 가입설계서
+            doc_ids: dict[tuple[str, int | None], int] = {}
+            for doc_type, _ in doc_type_weights:
+                for plan_id in [None] + (plan_ids if doc_type == "가입설계서" else []):
+                    cur.execute(
+                        """
+                        INSERT INTO document (sha256, insurer_id, product_id, plan_id, doc_type, source_path)
+                        VALUES (%s, %s, %s, %s, %s, %s)
+                        RETURNING document_id
+                        """,
+                        (
+                            f"synthetic-{ins['insurer_code']}-{doc_type}-{plan_id}",
+                            insurer_id,
+                            product_id,
+                            plan_id,
+                            doc_type,
+                            f"{SYNTHETIC_SOURCE_PREFIX}{ins['insurer_code']}/{doc_type}/{plan_id}",
+                        ),
+                    )
+                    doc_ids[(doc_type, plan_id)] = cur.fetchone()["document_id"]
+                    doc_count += 1
+
+            # STEP 4.24: 가입설계서별 담보 표 행 (담보 1개당 1행)
+            for (doc_type, plan_id), document_id in doc_ids.items():
+                if doc_type != "가입설계서":
+                    continue
+                for row_index, (coverage_code, coverage_name) in enumerate(_SYNTHETIC_COVERAGES):
+                    amount = fact_rng.choice([500, 1000, 2000, 3000, 5000])
+                    cur.execute(
+                        """
+                        INSERT INTO coverage_amount_fact (
+                            document_id, insurer_id, product_id, plan_id, coverage_code, coverage_name,
+                            benefit_amount, benefit_text, benefit_unit, page_no, row_index, source
+                        )
+                        VALUES (%s, %s, %s, %s, %s, %s, %s, %s, '만원', 1, %s, 'table')
+                        """,
+                        (
+                            document_id, insurer_id, product_id, plan_id, coverage_code, coverage_name,
+                            amount * 10_000, f"{amount:,}만원", row_index,
+                        ),
+                    )
+                    fact_count += 1
+
+            with cur.copy(
+                "COPY chunk (document_id, insurer_id, product_id, plan_id, doc_type, "
+                "content, page_start, page_end, chunk_index, meta) FROM STDIN"
+            ) as copy:
+                for idx in range(chunks_per_insurer):
+                    r = rng.random()
+                    acc = 0.0
+                    doc_type = doc_type_weights[-1][0]
+                    for dt, weight in doc_type_weights:
+                        acc += weight
+                        if r < acc:
+                            doc_type = dt
+                            break
+
+                    plan_id = None
+                    if doc_type == "가입설계서" and rng.random() < 0.5:
+                        plan_id = rng.choice(plan_ids)
+
+                    coverage = None
+                    meta: dict[str, Any] = {"synthetic": True}
+                    tag_rate = 0.1 if doc_type == "약관" else 0.5
+                    if rng.random() < tag_rate:
+                        coverage = rng.choice(_SYNTHETIC_COVERAGES)
+                        meta["entities"] = {
+                            "coverage_code": coverage[0],
+                            "coverage_name": coverage[1],
+                        }
+
+                    page = idx // 4 + 1
+                    copy.write_row((
+                        doc_ids[(doc_type, plan_id)],
+                        insurer_id,
+                        product_id,
+                        plan_id,
+                        doc_type,
+                        _synthetic_content(rng, doc_type, coverage[1] if coverage else None),
+                        page,
+                        page,
+                        idx,
+                        json.dumps(meta, ensure_ascii=False),
+                    ))
+                    chunk_count += 1
+
+    conn.commit()
+
+    with conn.cursor() as cur:
+        cur.execute("ANALYZE chunk")
+        cur.execute("ANALYZE document")
+        cur.execute("ANALYZE insurer")
+        cur.execute("ANALYZE coverage_amount_fact")
+    conn.commit()
+
+    return {"documents": doc_count, "chunks": chunk_count, "amount_facts": fact_count}
+
+
+def get_synthetic_chunk_count(conn: psycopg.Connection) -> int:
+    """현재 DB의 합성 chunk 수"""
+    with conn.cursor() as cur:
+        cur.execute(
+            """
+            SELECT COUNT(*) AS n
+            FROM chunk c
+            JOIN document d ON c.document_id = d.document_id
+            WHERE d.source_path LIKE %s
+            """,
+            (SYNTHETIC_SOURCE_PREFIX + "%",),
+        )
+        return cur.fetchone()["n"]
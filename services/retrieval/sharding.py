@@ -0,0 +1,242 @@
+"""
+STEP 4.10: 보험사 단위 shard + scatter-gather retrieval
+
+INSURER_SHARD_MAP(YAML 경로)에 보험사 → shard DSN을 지정하면
+document/chunk를 shard DB에 나눠 저장하고 retrieval 단계를 shard별로 동시에 조회한다.
+
+    shards:
+      shard_a:
+        dsn: ${SHARD_A_DATABASE_URL}        # 환경변수 치환
+        insurers: [SAMSUNG, LOTTE, DB]
+      shard_b:
+        dsn: postgresql://postgres@localhost:5434/inca_rag
+        insurers: [KB, MERITZ]
+
+- 매핑되지 않은 보험사는 home(DATABASE_URL, STEP 4.9 읽기 라우팅)에 남는다
+- 카탈로그(insurer / product / product_plan / coverage_alias 등)는 home이 원본이다.
+  plan 선택 / coverage 추천 / corpus_version NOTIFY는 home에서 수행하고,
+  ingestion은 home에서 해결한 id 그대로 shard에 카탈로그 행을 복사한다
+- 보험사별 조회 규칙은 shard와 무관하므로 병합 결과는 단일 DB 조회와 같다
+
+INSURER_SHARD_MAP이 없으면 모든 보험사가 home (기존 동작).
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable, TypeVar
+
+import psycopg
+import yaml
+
+
+logger = logging.getLogger(__name__)
+
+HOME_SHARD = "home"
+
+T = TypeVar("T")
+
+
+def get_shard_map_path() -> str | None:
+    """INSURER_SHARD_MAP 환경변수 (shard map YAML 경로, 기본: 없음)"""
+    return os.environ.get("INSURER_SHARD_MAP") or None
+
+
+def get_scatter_max_workers() -> int:
+    """scatter 동시 실행 스레드 수 (기본: 8)"""
+    return int(os.environ.get("SHARD_SCATTER_MAX_WORKERS", "8"))
+
+
+@dataclass
+class Shard:
+    """shard 1개 (DSN + 담당 보험사)"""
+    name: str
+    dsn: str
+    insurers: list[str] = field(default_factory=list)
+
+
+@dataclass
+class ShardMap:
+    """보험사 → shard 매핑"""
+    shards: dict[str, Shard] = field(default_factory=dict)
+
+    def __post_init__(self) -> None:
+        self._insurer_shard = {
+            insurer: shard.name
+            for shard in self.shards.values()
+            for insurer in shard.insurers
+        }
+
+    @property
+    def is_sharded(self) -> bool:
+        return bool(self.shards)
+
+    def shard_for(self, insurer_code: str) -> str:
+        """보험사 담당 shard 이름 (미지정이면 home)"""
+        return self._insurer_shard.get(insurer_code.upper(), HOME_SHARD)
+
+    def dsn_for(self, insurer_code: str) -> str | None:
+        """보험사 shard DSN (home이면 None)"""
+        shard = self.shards.get(self.shard_for(insurer_code))
+        return shard.dsn if shard else None
+
+    def group(self, insurers: list[str]) -> dict[str, list[str]]:
+        """보험사를 shard별로 묶음 (shard / 보험사 모두 입력 순서 유지)"""
+        groups: dict[str, list[str]] = {}
+        for insurer_code in insurers:
+            groups.setdefault(self.shard_for(insurer_code), []).append(insurer_code)
+        return groups
+
+
+def parse_shard_map(data: dict[str, Any]) -> ShardMap:
+    """YAML dict → ShardMap (보험사 중복 지정 / 예약 이름은 ValueError)"""
+    shards: dict[str, Shard] = {}
+    seen: dict[str, str] = {}
+
+    for name, spec in (data.get("shards") or {}).items():
+        if name == HOME_SHARD:
+            raise ValueError(f"shard name '{HOME_SHARD}' is reserved for DATABASE_URL")
+        dsn = os.path.expandvars(str(spec.get("dsn") or ""))
+        if not dsn or "$" in dsn:
+            raise ValueError(f"shard '{name}': dsn is missing or has unset variables")
+
+        insurers = [str(code).upper() for code in spec.get("insurers") or []]
+        for insurer_code in insurers:
+            if insurer_code in seen:
+                raise ValueError(
+                    f"insurer {insurer_code} mapped to both '{seen[insurer_code]}' and '{name}'"
+                )
+            seen[insurer_code] = name
+        shards[name] = Shard(name=name, dsn=dsn, insurers=insurers)
+
+    return ShardMap(shards=shards)
+
+
+def load_shard_map(path: str | Path) -> ShardMap:
+    with open(path, "r", encoding="utf-8") as f:
+        return parse_shard_map(yaml.safe_load(f) or {})
+
+
+_shard_map: ShardMap | None = None
+
+
+def get_shard_map() -> ShardMap:
+    """프로세스 단위 shard map (INSURER_SHARD_MAP 미설정이면 빈 map)"""
+    global _shard_map
+
+    if _shard_map is None:
+        path = get_shard_map_path()
+        _shard_map = load_shard_map(path) if path else ShardMap()
+        if _shard_map.is_sharded:
+            logger.info(
+                "insurer shards: "
+                + ", ".join(f"{s.name}={s.insurers}" for s in _shard_map.shards.values())
+            )
+    return _shard_map
+
+
+def clear_shard_map() -> None:
+    """shard map 초기화 (다음 조회 시 재로드)"""
+    global _shard_map
+    _shard_map = None
+
+
+# =============================================================================
+# Scatter-gather
+# =============================================================================
+
+class ShardConnections:
+    """
+    요청 단위 shard 연결
+
+    home은 호출 측 연결을 재사용하고, 나머지 shard는 처음 필요할 때 연결한다.
+    연결 하나를 여러 스레드가 동시에 쓰지 않도록 scatter는 shard당 1개 작업만 실행한다.
+    """
+
+    def __init__(self, shard_map: ShardMap, home_conn: psycopg.Connection, **connect_kwargs: Any):
+        self.shard_map = shard_map
+        self._conns: dict[str, psycopg.Connection] = {HOME_SHARD: home_conn}
+        self._connect_kwargs = connect_kwargs
+        self._lock = threading.Lock()
+
+    def get(self, shard_name: str) -> psycopg.Connection:
+        with self._lock:
+            conn = self._conns.get(shard_name)
+        if conn is not None:
+            return conn
+
+        conn = psycopg.connect(self.shard_map.shards[shard_name].dsn, **self._connect_kwargs)
+        with self._lock:
+            self._conns[shard_name] = conn
+        return conn
+
+    def close(self) -> None:
+        """home 외 shard 연결 종료"""
+        with self._lock:
+            conns = [conn for name, conn in self._conns.items() if name != HOME_SHARD]
+            self._conns = {HOME_SHARD: self._conns[HOME_SHARD]}
+        for conn in conns:
+            conn.close()
+
+    def __enter__(self) -> "ShardConnections":
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self.close()
+
+
+_executor: ThreadPoolExecutor | None = None
+_executor_lock = threading.Lock()
+
+
+def _get_executor() -> ThreadPoolExecutor:
+    global _executor
+
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(
+                max_workers=get_scatter_max_workers(),
+                thread_name_prefix="shard-scatter",
+            )
+    return _executor
+
+
+def scatter(
+    connections: ShardConnections,
+    insurers: list[str],
+    stage: Callable[[psycopg.Connection, list[str]], T],
+) -> tuple[dict[str, T], dict[str, float]]:
+    """
+    shard별로 stage(conn, 해당 shard 보험사) 동시 실행
+
+    Returns:
+        (shard별 결과, shard별 소요시간 ms) - 어느 shard든 실패하면 예외 전파
+    """
+    groups = connections.shard_map.group(insurers)
+
+    def run(shard_name: str, shard_insurers: list[str]) -> tuple[T, float]:
+        start = time.perf_counter()
+        result = stage(connections.get(shard_name), shard_insurers)
+        return result, round((time.perf_counter() - start) * 1000, 2)
+
+    if len(groups) <= 1:
+        outputs = {name: run(name, group) for name, group in groups.items()}
+    else:
+        futures = {
+            name: _get_executor().submit(run, name, group)
+            for name, group in groups.items()
+        }
+        # 실패한 shard가 있어도 나머지가 연결을 다 쓴 뒤에 예외 전파
+        wait(futures.values())
+        outputs = {name: future.result() for name, future in futures.items()}
+
+    return (
+        {name: output[0] for name, output in outputs.items()},
+        {name: output[1] for name, output in outputs.items()},
+    )
@@ -0,0 +1,113 @@
+"""
+STEP 4.2: 2-Pass amount retrieval 배치 조회 테스트
+
+get_amount_bearing_evidence_many (LATERAL top-k 단일 쿼리) 단위 테스트
+"""
+
+from datetime import datetime, timedelta
+from unittest.mock import MagicMock
+
+from services.retrieval.compare_service import (
+    AmountEvidenceRequest,
+    get_amount_bearing_evidence_many,
+)
+
+
+T0 = datetime(2025, 12, 20, 12, 0, 0)
+
+
+def _row(insurer_code, ord_, document_id, preview, emitted_ms, doc_type="상품요약서"):
+    return {
+        "ord": ord_,
+        "insurer_code": insurer_code,
+        "chunk_id": document_id * 10 if document_id else None,
+        "document_id": document_id,
+        "doc_type": doc_type if document_id else None,
+        "page_start": 1 if document_id else None,
+        "preview": preview,
+        "emitted_at": T0 + timedelta(milliseconds=emitted_ms),
+        "started_at": T0,
+    }
+
+
+def _make_mock_conn(rows):
+    cursor = MagicMock()
+    cursor.executed = []
+
+    def execute(query, params=None):
+        cursor.executed.append((query, params))
+
+    cursor.execute = execute
+    cursor.fetchall = lambda: rows
+
+    conn = MagicMock()
+    conn.cursor.return_value.__enter__ = MagicMock(return_value=cursor)
+    conn.cursor.return_value.__exit__ = MagicMock(return_value=False)
+    return conn, cursor
+
+
+class TestAmountBearingEvidenceMany:
+    """STEP 4.2: get_amount_bearing_evidence_many"""
+
+    def test_empty_requests_no_query(self):
+        """요청이 없으면 DB 조회 없음"""
+        conn, cursor = _make_mock_conn([])
+
+        results, timings = get_amount_bearing_evidence_many(conn, [], ["상품요약서"])
+
+        assert results == {}
+        assert timings == {}
+        assert cursor.executed == []
+
+    def test_single_statement_grouped_by_insurer(self):
+        """보험사 전체를 1회 쿼리로 조회하고 보험사별로 그룹화"""
+        rows = [
+            _row("SAMSUNG", 1, 1, "암진단비 3,000만원", 2),
+            _row("SAMSUNG", 1, 2, "암진단비 1,000만원", 3),
+            _row("MERITZ", 2, None, None, 5),  # 결과 없음 (LEFT JOIN LATERAL)
+            _row("DB", 3, 7, "암진단비 2,000만원", 9),
+        ]
+        conn, cursor = _make_mock_conn(rows)
+
+        results, timings = get_amount_bearing_evidence_many(
+            conn,
+            [
+                AmountEvidenceRequest("SAMSUNG"),
+                AmountEvidenceRequest("MERITZ", plan_id=5),
+                AmountEvidenceRequest("DB"),
+            ],
+            ["상품요약서", "사업방법서", "가입설계서"],
+            top_k=3,
+        )
+
+        assert len(cursor.executed) == 1
+        query, params = cursor.executed[0]
+        assert "LATERAL" in query
+        assert params[0] == ["SAMSUNG", "MERITZ", "DB"]
+        assert params[1] == [None, 5, None]
+
+        assert [ev.document_id for ev in results["SAMSUNG"]] == [1, 2]
+        assert "MERITZ" not in results
+        assert [ev.document_id for ev in results["DB"]] == [7]
+
+        # 요청 순서 기준 구간 시간
+        assert timings == {"SAMSUNG": 3.0, "MERITZ": 2.0, "DB": 4.0}
+
+    def test_target_keyword_preview_trim(self):
+        """U-4.15: target_keyword가 있으면 키워드부터 preview를 자름"""
+        rows = [
+            _row("SAMSUNG", 1, 1, "암진단비 3,000만원\n뇌졸중진단비 1,000만원", 1),
+        ]
+        conn, cursor = _make_mock_conn(rows)
+
+        results, _ = get_amount_bearing_evidence_many(
+            conn,
+            [AmountEvidenceRequest("SAMSUNG", target_keyword="뇌졸중진단비")],
+            ["상품요약서"],
+            slot_type="cerebro_cardiovascular",
+        )
+
+        assert results["SAMSUNG"][0].preview == "뇌졸중진단비 1,000만원"
+        _, params = cursor.executed[0]
+        assert params[2][0].startswith("뇌졸중진단비")
+        assert params[3] == ["%뇌졸중진단비%"]
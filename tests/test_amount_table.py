@@ -0,0 +1,315 @@
+"""
+STEP 4.24: 가입설계서 담보 표 금액 (coverage_amount_fact) 테스트
+
+- parse_amount_cell / parse_amount_rows: 헤더 열 / 헤더 단위 / 합계 행 / 종별 금액 셀
+- extract_amount_tables: 괘선 표(find_tables)와 괘선 없는 표(단어 좌표) 모두 같은 행, 페이지 내 row_index 유일
+- AmountFactIndex: (document_id, coverage_code) 첫 행, 미등록 문서는 None
+- run_amount_extractor / 비교표 셀 / 슬롯: fact 우선, 없으면 regex 추출 fallback
+"""
+
+from contextlib import contextmanager
+
+import fitz
+import psycopg
+import pytest
+
+from services.extraction.amount_facts import (
+    AmountFact,
+    AmountFactIndex,
+    clear_amount_fact_index,
+    get_amount_fact_index,
+    run_amount_extractor,
+)
+from services.extraction.chunk_extraction import run_extractor
+from services.extraction.slot_extractor import extract_surgery_amount_slot
+from services.extraction.slot_rules import EvidenceFeatureCache
+from services.ingestion.amount_table import (
+    TableCell,
+    extract_amount_tables,
+    parse_amount_cell,
+    parse_amount_rows,
+)
+from services.retrieval.compare_service import (
+    CompareAxisResult,
+    Evidence,
+    build_insurer_compare_cell,
+    register_amount_facts,
+)
+
+
+TABLE = [
+    ["담보명", "가입금액", "보험료(원)"],
+    ["암 진단비(유사암 제외)", "3,000만원", "32,400"],
+    ["유사암 진단비", "600만원", "1,980"],
+    ["1-5종수술비", "1종 10만원 2종 30만원", "5,120"],
+    ["합계", "", "43,910"],
+]
+
+PREVIEW = "암진단비(유사암제외) 가입금액 1,000만원 보험료 8,100원"
+
+
+@pytest.fixture(autouse=True)
+def _reset_index(monkeypatch):
+    monkeypatch.delenv("AMOUNT_FACT_ENABLED", raising=False)
+    clear_amount_fact_index()
+    yield
+    clear_amount_fact_index()
+
+
+def _grid(rows: list[list[str]]) -> list[list[TableCell]]:
+    return [
+        [TableCell(text, (100.0 * col, 20.0 * row, 100.0 * (col + 1), 20.0 * (row + 1))) for col, text in enumerate(cells)]
+        for row, cells in enumerate(rows)
+    ]
+
+
+def _make_pdf(path, *tables: list[list[str]], lines: bool) -> None:
+    doc = fitz.open()
+    page = doc.new_page()
+    xs = [40, 220, 400, 520]
+    y = 100
+    for rows in tables:
+        for cells in rows:
+            for col, text in enumerate(cells):
+                if lines:
+                    page.draw_rect(fitz.Rect(xs[col], y, xs[col + 1], y + 20))
+                page.insert_text((xs[col] + 3, y + 14), text, fontname="korea", fontsize=10)
+            y += 20
+        y += 60  # 표 사이 간격
+    doc.save(path)
+    doc.close()
+
+
+def _fact(document_id: int = 1, coverage_code: str = "A4200_1", amount: int = 20_000_000,
+          text: str = "2,000만원", page_no: int = 1, row_index: int = 0) -> AmountFact:
+    return AmountFact(
+        document_id=document_id,
+        coverage_code=coverage_code,
+        coverage_name="암진단비(유사암제외)",
+        benefit_amount=amount,
+        benefit_text=text,
+        benefit_unit="만원",
+        premium_amount=8_100,
+        premium_text="8,100원",
+        page_no=page_no,
+        row_index=row_index,
+    )
+
+
+class TestParseAmountCell:
+    """STEP 4.24: 금액 셀 파싱"""
+
+    def test_single_amount(self):
+        assert parse_amount_cell("3,000만원") == (30_000_000, "3,000만원", "만원")
+        assert parse_amount_cell("1억원") == (100_000_000, "1억원", "억원")
+
+    def test_bare_number_uses_header_unit(self):
+        assert parse_amount_cell("3,000", "만원") == (30_000_000, "3,000만원", "만원")
+        assert parse_amount_cell("3,000") is None
+
+    def test_multiple_amounts_rejected(self):
+        assert parse_amount_cell("1종 10만원 2종 30만원") is None
+
+
+class TestParseAmountRows:
+    """STEP 4.24: 헤더 행 기준 담보 행"""
+
+    def test_rows(self):
+        rows = parse_amount_rows(_grid(TABLE), page_no=3, source="table")
+
+        assert [(r.coverage_name, r.benefit_amount, r.premium_amount) for r in rows] == [
+            ("암 진단비(유사암 제외)", 30_000_000, 32_400),
+            ("유사암 진단비", 6_000_000, 1_980),
+        ]
+        assert [r.row_index for r in rows] == [0, 1]
+        assert rows[0].page_no == 3
+        assert rows[0].bbox == (0.0, 20.0, 300.0, 40.0)
+
+    def test_header_unit_and_no_premium_column(self):
+        rows = parse_amount_rows(_grid([
+            ["보장명", "가입금액(만원)", "비고"],
+            ["뇌졸중 진단비", "1,000", "갱신형"],
+        ]), page_no=1, source="words")
+
+        assert rows[0].benefit_amount == 10_000_000
+        assert rows[0].premium_amount is None
+
+    def test_no_header(self):
+        assert parse_amount_rows(_grid([["암진단비", "3,000만원"]]), page_no=1, source="table") == []
+
+
+class TestExtractAmountTables:
+    """STEP 4.24: PDF 표 / 단어 좌표"""
+
+    @pytest.mark.parametrize("lines,source", [(True, "table"), (False, "words")])
+    def test_pdf(self, tmp_path, lines, source):
+        path = tmp_path / "plan.pdf"
+        _make_pdf(path, TABLE, lines=lines)
+
+        rows = extract_amount_tables(path)
+
+        assert [(r.coverage_name, r.benefit_text, r.premium_amount, r.source) for r in rows] == [
+            ("암 진단비(유사암 제외)", "3,000만원", 32_400, source),
+            ("유사암 진단비", "600만원", 1_980, source),
+        ]
+        assert all(r.page_no == 1 for r in rows)
+
+    def test_two_tables_on_page(self, tmp_path):
+        """주계약 / 특약 표 2개 → row_index는 페이지 내 연번 (UNIQUE(document_id, page_no, row_index))"""
+        path = tmp_path / "plan.pdf"
+        _make_pdf(path, TABLE, [
+            ["특약명", "가입금액", "보험료(원)"],
+            ["뇌졸중 진단비", "1,000만원", "2,300"],
+        ], lines=True)
+
+        rows = extract_amount_tables(path)
+
+        assert [(r.coverage_name, r.page_no, r.row_index, r.source) for r in rows] == [
+            ("암 진단비(유사암 제외)", 1, 0, "table"),
+            ("유사암 진단비", 1, 1, "table"),
+            ("뇌졸중 진단비", 1, 2, "table"),
+        ]
+
+    def test_missing_file(self, tmp_path):
+        with pytest.raises(FileNotFoundError):
+            extract_amount_tables(tmp_path / "missing.pdf")
+
+
+class TestAmountFactIndex:
+    """STEP 4.24: document_id → 담보 행"""
+
+    def test_first_row_per_coverage(self):
+        index = AmountFactIndex()
+        index.register(1, [_fact(page_no=2, amount=1), _fact(page_no=1, row_index=5, amount=2)])
+
+        assert index.lookup(1, "A4200_1").benefit_amount == 2
+        assert index.lookup(1, "A4210") is None
+        assert index.lookup(2, "A4200_1") is None
+
+    def test_missing_and_negative_cache(self):
+        index = AmountFactIndex()
+        index.register(1, [])
+
+        assert index.missing([1, 2, 2, 3]) == [2, 3]
+        assert index.lookup(1, "A4200_1") is None
+
+    def test_lru_eviction(self):
+        index = AmountFactIndex(max_documents=2)
+        for doc_id in (1, 2, 3):
+            index.register(doc_id, [_fact(document_id=doc_id)])
+
+        assert index.missing([1, 2, 3]) == [1]
+        assert index.stats()["evictions"] == 1
+
+
+class TestRunAmountExtractor:
+    """STEP 4.24: fact 우선, 없으면 regex"""
+
+    def test_fact_used(self):
+        get_amount_fact_index().register(1, [_fact()])
+
+        result = run_amount_extractor("amount", PREVIEW, "가입설계서", document_id=1, coverage_code="A4200_1")
+        assert (result.amount_value, result.method, result.confidence) == (20_000_000, "table", "high")
+
+        lump_sum = run_amount_extractor("diagnosis_lump_sum", PREVIEW, "가입설계서", 1, "A4200_1")
+        assert (lump_sum.amount_text, lump_sum.method) == ("2,000만원", "table")
+
+    @pytest.mark.parametrize("doc_type,document_id,coverage_code", [
+        ("가입설계서", 2, "A4200_1"),   # 미등록 문서
+        ("가입설계서", 1, "A4210"),     # 행 없는 담보
+        ("상품요약서", 1, "A4200_1"),   # 표 fact 대상 아님
+    ])
+    def test_regex_fallback(self, doc_type, document_id, coverage_code):
+        get_amount_fact_index().register(1, [_fact()])
+
+        result = run_amount_extractor("amount", PREVIEW, doc_type, document_id, coverage_code)
+        assert result == run_extractor("amount", PREVIEW, doc_type)
+
+    def test_disabled(self, monkeypatch):
+        monkeypatch.setenv("AMOUNT_FACT_ENABLED", "0")
+
+        assert get_amount_fact_index() is None
+        result = run_amount_extractor("amount", PREVIEW, "가입설계서", 1, "A4200_1")
+        assert result.method == "regex"
+
+
+def _axis_item(coverage_code: str = "A4200_1") -> CompareAxisResult:
+    return CompareAxisResult(
+        insurer_code="MERITZ",
+        coverage_code=coverage_code,
+        coverage_name=None,
+        doc_type_counts={"가입설계서": 1},
+        evidence=[Evidence(document_id=1, doc_type="가입설계서", page_start=3, preview=PREVIEW, score=0.0)],
+    )
+
+
+class TestComparePaths:
+    """STEP 4.24: 비교표 셀 / 슬롯"""
+
+    def test_compare_cell(self):
+        get_amount_fact_index().register(1, [_fact()])
+
+        cell = build_insurer_compare_cell("MERITZ", _axis_item())
+
+        assert cell.best_evidence[0].amount.method == "table"
+        assert cell.resolved_amount.amount_value == 20_000_000
+
+    def test_compare_cell_fallback(self):
+        cell = build_insurer_compare_cell("MERITZ", _axis_item())
+
+        regex = run_extractor("amount", PREVIEW, "가입설계서")
+        assert cell.best_evidence[0].amount.method == "regex"
+        assert cell.best_evidence[0].amount.amount_value == regex.amount_value
+
+    def test_surgery_slot(self):
+        get_amount_fact_index().register(1, [_fact(coverage_code="A5100", amount=1_000_000, text="100만원")])
+        item = _axis_item("A5100")
+        item.evidence[0].preview = "질병수술비 1종 10만원 2종 30만원 3종 50만원"
+        features = EvidenceFeatureCache()
+        features.get(item.evidence[0]).coverage_code = "A5100"
+        value = extract_surgery_amount_slot(item.evidence, "MERITZ", features=features)
+
+        assert value.value == "100만원"
+        assert value.evidence_refs[0].document_id == 1
+
+
+class _FakeConn:
+    """cursor 실행 시 error 발생, savepoint 사용 여부 기록"""
+
+    def __init__(self, error: Exception):
+        self.error = error
+        self.savepoints = 0
+        self.rolled_back = False
+
+    @contextmanager
+    def transaction(self):
+        self.savepoints += 1
+        yield
+
+    def cursor(self, **kwargs):
+        raise self.error
+
+    def rollback(self):
+        self.rolled_back = True
+
+
+class TestRegisterAmountFacts:
+    """STEP 4.24: 마이그레이션 전 DB / 조회 실패"""
+
+    def test_missing_table_registers_empty(self):
+        conn = _FakeConn(psycopg.errors.UndefinedTable("relation \"coverage_amount_fact\" does not exist"))
+
+        register_amount_facts(conn, [_axis_item()])
+
+        # savepoint만 되돌림 (호출 측 트랜잭션 / SET LOCAL 유지)
+        assert conn.savepoints == 1 and not conn.rolled_back
+        assert get_amount_fact_index().missing([1]) == []  # 다음 요청은 재조회 안함
+        assert run_amount_extractor("amount", PREVIEW, "가입설계서", 1, "A4200_1").method == "regex"
+
+    def test_query_error_not_registered(self):
+        conn = _FakeConn(psycopg.errors.QueryCanceled("canceling statement due to statement timeout"))
+
+        register_amount_facts(conn, [_axis_item()])
+
+        assert not conn.rolled_back
+        assert get_amount_fact_index().missing([1]) == [1]  # 다음 요청에서 재조회
@@ -0,0 +1,116 @@
+"""
+STEP 4.16: 금액 토큰화 / 텍스트 인덱스 테스트
+
+- tokenize_amounts: 패턴별 전체 스캔과 같은 순서 / 중복 제거
+- AmountText: 라인 오프셋 테이블 / 키워드 위치 인덱스 = 문자열 슬라이스 결과
+- extract_surgery_count_limit: 가장 먼저 등장한 횟수 표현
+"""
+
+import pytest
+
+from services.extraction.amount_extractor import (
+    AmountText,
+    _find_amounts_with_positions,
+    extract_surgery_count_limit,
+    tokenize_amounts,
+)
+
+
+TABLE_TEXT = (
+    "담보명 가입금액 보험료(원)\n"
+    "암진단비 3,000만원 12,340원\n"
+    "\n"
+    "유사암진단비 600만원 1,200원\n"
+    "최초 1회한 일시금 지급"
+)
+
+
+class TestTokenizeAmounts:
+    """STEP 4.16: 1회 스캔 금액 토큰"""
+
+    def test_main_pattern(self):
+        tokens = tokenize_amounts("가입금액 1,000만원, 사망보험금 1억 5천만원")
+
+        assert [(t.position, t.text, t.unit, t.value, t.kind) for t in tokens] == [
+            (5, "1,000만원", "만원", 10_000_000, "main"),
+            (20, "1억 5천만원", "억원", 150_000_000, "main"),
+        ]
+
+    def test_simple_pattern_dedup_distance(self):
+        # 패턴 2 매칭은 앞서 찾은 금액과 5자 이상 떨어져 있을 때만 추가 (기존 동작)
+        tokens = tokenize_amounts("12345678만원")
+
+        assert [(t.position, t.kind) for t in tokens] == [(0, "main"), (5, "simple")]
+        assert [t.kind for t in tokenize_amounts("1234567만원")] == ["main"]
+
+    def test_complex_pattern(self):
+        tokens = tokenize_amounts("1억 2천 만 원")
+
+        assert [(t.text, t.value, t.kind) for t in tokens] == [("1억 2천 만 원", 120_000_000, "complex")]
+
+    def test_no_amount(self):
+        assert tokenize_amounts("보험금 지급 사유") == []
+        assert tokenize_amounts("원인 불명 (원)") == []
+
+    def test_tuple_view(self):
+        assert _find_amounts_with_positions(TABLE_TEXT) == [
+            (t.position, t.text, t.unit, t.value) for t in tokenize_amounts(TABLE_TEXT)
+        ]
+
+
+class TestAmountText:
+    """STEP 4.16: 라인 오프셋 / 키워드 위치 인덱스"""
+
+    @pytest.mark.parametrize("position", range(len(TABLE_TEXT) + 1))
+    def test_line_index_and_bounds(self, position):
+        doc = AmountText(TABLE_TEXT)
+
+        assert doc.line_index(position) == TABLE_TEXT[:position].count("\n")
+        start, end = doc.line_bounds(position)
+        line_start = TABLE_TEXT.rfind("\n", 0, position) + 1
+        line_end = TABLE_TEXT.find("\n", position)
+        assert (start, end) == (line_start, len(TABLE_TEXT) if line_end == -1 else line_end)
+
+    @pytest.mark.parametrize("keyword", ["보험료(원)", "진단비", "만원", "최초 1회", "없음"])
+    @pytest.mark.parametrize("start, end", [(0, 10), (5, 40), (20, 60), (0, len(TABLE_TEXT))])
+    def test_find_same_as_slice(self, keyword, start, end):
+        doc = AmountText(TABLE_TEXT)
+        idx = TABLE_TEXT[start:end].find(keyword)
+
+        assert doc.find(keyword, start, end) == (-1 if idx == -1 else start + idx)
+
+    def test_overlapping_keyword_positions(self):
+        assert AmountText("일당일당일당").keyword_positions("일당일당") == [0, 2]
+
+    def test_closest_distance(self):
+        doc = AmountText("보험료 10,000원 진단비")
+        start, end = doc.window(4, 40)
+
+        assert doc.closest_distance(["보험료"], 4, start, end) == 3
+        assert doc.closest_distance(["진단비", "보험료"], 4, start, end) == 3
+        assert doc.closest_distance(["일시금"], 4, start, end) == float("inf")
+
+
+class TestSurgeryCountLimit:
+    """STEP 4.16: 패턴별 첫 매칭 중 가장 앞선 것"""
+
+    def test_earliest_match(self):
+        result = extract_surgery_count_limit("수술비 통산 10회, 연 1회 한도")
+
+        assert result.count_text == "통산 10회"
+        assert result.count_value == 10
+        assert result.confidence == "high"
+
+    def test_position_before_pattern_order(self):
+        # 패턴 순서가 늦어도 먼저 등장한 표현 선택
+        result = extract_surgery_count_limit("3회까지 보장, 최대 5회")
+
+        assert result.count_text == "3회까지"
+        assert result.count_value == 3
+        assert result.confidence == "medium"
+
+    def test_not_found(self):
+        result = extract_surgery_count_limit("수술비 100만원")
+
+        assert result.confidence == "not_found"
+        assert result.reason == "횟수 제한 표현 미발견"
@@ -0,0 +1,122 @@
+"""
+STEP 4.21: batch 추출 (프로세스 풀) 테스트
+
+- 결과 = chunk별 단일 호출 결과, 입력 순서 유지 (작업 단위 / 워커 수 무관)
+- 입력은 in-flight 단위만큼만 읽는다 (스트리밍)
+- extract_slots_batch: chunk 1건 = evidence 1건, 약관은 policy evidence
+"""
+
+from itertools import count
+
+import pytest
+
+from services.extraction.amount_extractor import extract_amount
+from services.extraction.batch_extraction import (
+    extract_amount_batch,
+    extract_condition_batch,
+    extract_slots_batch,
+    get_extraction_batch_workers,
+)
+from services.extraction.condition_extractor import extract_condition_snippet
+
+
+TEXTS = [
+    ("암진단비(유사암제외) 3,000만원 최초 1회한", "가입설계서"),
+    ("보험료 15,000원 (월납) 납입기간 20년", "상품요약서"),
+    ("유사암진단비 600만원, 90일 면책", "사업방법서"),
+    ("", "가입설계서"),
+    ("수술 1회당 200만원, 다빈치 로봇수술 500만원", None),
+]
+
+ITEMS = [(chunk_id, text, doc_type) for chunk_id, (text, doc_type) in enumerate(TEXTS * 4, start=100)]
+
+
+class TestBatchEqualsSingle:
+    """STEP 4.21: batch 결과 = 단일 호출 결과 (입력 순서)"""
+
+    @pytest.mark.parametrize("workers,chunk_size", [(1, 3), (2, 3), (2, 100)])
+    def test_amount(self, workers, chunk_size):
+        results = list(extract_amount_batch(ITEMS, workers=workers, chunk_size=chunk_size))
+
+        assert [chunk_id for chunk_id, _ in results] == [chunk_id for chunk_id, _, _ in ITEMS]
+        assert [r for _, r in results] == [extract_amount(text, doc_type=dt) for _, text, dt in ITEMS]
+
+    @pytest.mark.parametrize("workers", [1, 2])
+    def test_condition(self, workers):
+        results = list(extract_condition_batch(ITEMS, workers=workers, chunk_size=4))
+
+        assert results == [(chunk_id, extract_condition_snippet(text)) for chunk_id, text, _ in ITEMS]
+
+    def test_empty(self):
+        assert list(extract_amount_batch([], workers=2)) == []
+
+    def test_workers_env(self, monkeypatch):
+        monkeypatch.setenv("EXTRACTION_BATCH_WORKERS", "3")
+
+        assert get_extraction_batch_workers() == 3
+
+
+class TestStreaming:
+    """STEP 4.21: 입력은 in-flight 단위만큼만 읽는다"""
+
+    def test_inline_reads_one_unit(self):
+        consumed = count()
+
+        def items():
+            for item in ITEMS:
+                next(consumed)
+                yield item
+
+        results = extract_amount_batch(items(), workers=1, chunk_size=2)
+        assert next(results)[0] == 100
+        assert next(consumed) == 2  # 첫 단위만 읽음
+
+    def test_pool_inflight_bound(self, monkeypatch):
+        monkeypatch.setenv("EXTRACTION_BATCH_INFLIGHT", "1")
+        consumed = count()
+
+        def items():
+            for chunk_id in range(10_000):
+                next(consumed)
+                yield (chunk_id, "암진단비 1,000만원", "가입설계서")
+
+        results = extract_amount_batch(items(), workers=2, chunk_size=10)
+        assert next(results)[0] == 0
+        results.close()  # 남은 단위 취소
+        assert next(consumed) <= 2 * 10 + 10
+
+
+class TestSlotsBatch:
+    """STEP 4.21: chunk별 슬롯 추출"""
+
+    def test_compare_chunk(self):
+        ((chunk_id, slots),) = extract_slots_batch(
+            [(7, "암진단비(유사암제외) 3,000만원 최초 1회한 지급", "가입설계서")],
+            coverage_codes=["A4200_1"],
+            insurer_code="SAMSUNG",
+            workers=1,
+        )
+
+        by_key = {s.slot_key: s.insurers[0] for s in slots}
+        assert chunk_id == 7
+        assert by_key["payout_amount"].value == "3,000만원"
+        assert by_key["payout_amount"].insurer_code == "SAMSUNG"
+        assert by_key["payout_amount"].evidence_refs[0].chunk_id == 7
+
+    def test_policy_chunk(self):
+        ((_, slots),) = extract_slots_batch(
+            [(8, "암보장개시일은 계약일부터 그 날을 포함하여 90일 면책", "약관")],
+            coverage_codes=["A4200_1"],
+            workers=1,
+        )
+
+        by_key = {s.slot_key: s.insurers[0] for s in slots}
+        assert by_key["waiting_period"].value == "90일"
+        assert by_key["payout_amount"].confidence == "not_found"  # 약관은 compare evidence 아님
+
+    def test_pool_matches_inline(self):
+        items = [(i, text, dt) for i, (text, dt) in enumerate(TEXTS)]
+
+        inline = list(extract_slots_batch(items, ["A5100"], query="다빈치", workers=1))
+        pooled = list(extract_slots_batch(items, ["A5100"], query="다빈치", workers=2, chunk_size=2))
+        assert pooled == inline
@@ -0,0 +1,206 @@
+"""
+STEP 4.17: chunk rule 추출 결과 저장 테스트
+
+- extract_chunk: 저장 결과를 다시 읽으면 on-the-fly 추출과 같은 객체
+- 버전이 바뀐 extractor만 재추출 / preview가 바뀌면 전체 재추출
+- StoredExtractionIndex: preview_hash / doc_type / 버전이 모두 같을 때만 사용
+- run_extractor: 저장 결과가 없으면 on-the-fly 추출
+"""
+
+import json
+
+import pytest
+
+from services.extraction import chunk_extraction
+from services.extraction.chunk_extraction import (
+    COMPARE_PREVIEW_LEN,
+    EXTRACTORS,
+    RuleExtractor,
+    StoredExtractionIndex,
+    clear_stored_extraction_index,
+    compare_preview,
+    current_versions,
+    extract_chunk,
+    get_stored_extraction_index,
+    preview_hash,
+    run_extractor,
+    stale_extractors,
+)
+
+
+CHUNK_TEXT = (
+    "담보명 가입금액 보험료(원)\n"
+    "암진단비(유사암제외) 3,000만원 12,340원\n"
+    "질병수술비 100만원 (연 1회 한도)\n"
+    "최초 1회한 일시금 지급, 90일 면책기간 후 보장"
+)
+
+
+@pytest.fixture(autouse=True)
+def _reset_index(monkeypatch):
+    monkeypatch.delenv("STORED_EXTRACTION_ENABLED", raising=False)
+    clear_stored_extraction_index()
+    yield
+    clear_stored_extraction_index()
+
+
+def _stored(content: str = CHUNK_TEXT, doc_type: str = "가입설계서") -> dict:
+    # DB(jsonb) 왕복과 같은 형태
+    return json.loads(json.dumps(extract_chunk(content, doc_type), ensure_ascii=False))
+
+
+class TestExtractChunk:
+    """STEP 4.17: 적재 시 추출 결과"""
+
+    def test_layout(self):
+        stored = _stored()
+
+        assert stored["preview_hash"] == preview_hash(compare_preview(CHUNK_TEXT))
+        assert stored["preview_len"] == COMPARE_PREVIEW_LEN
+        assert stored["doc_type"] == "가입설계서"
+        assert stored["versions"] == current_versions()
+        assert set(stored["results"]) == set(EXTRACTORS)
+
+    @pytest.mark.parametrize("name", list(EXTRACTORS))
+    @pytest.mark.parametrize("doc_type", ["가입설계서", "상품요약서", "사업방법서"])
+    def test_loaded_equals_live(self, name, doc_type):
+        stored = _stored(doc_type=doc_type)
+        text = compare_preview(CHUNK_TEXT)
+
+        loaded = EXTRACTORS[name].load(stored["results"][name])
+        assert loaded == EXTRACTORS[name].run(text, doc_type)
+
+    def test_yakgwan_skipped(self):
+        assert extract_chunk(CHUNK_TEXT, "약관") is None
+
+    def test_preview_truncated(self):
+        long_text = CHUNK_TEXT + "\n" + "가" * COMPARE_PREVIEW_LEN
+
+        stored = _stored(long_text)
+        assert stored["preview_hash"] == preview_hash(long_text[:COMPARE_PREVIEW_LEN].replace("\n", " ").strip())
+
+
+class TestStaleExtractors:
+    """STEP 4.17: 버전 / 입력 변경 감지"""
+
+    def test_up_to_date(self):
+        stored = _stored()
+
+        assert stale_extractors(stored, stored["preview_hash"]) == []
+
+    def test_missing_or_changed_input(self):
+        stored = _stored()
+
+        assert stale_extractors(None, stored["preview_hash"]) == list(EXTRACTORS)
+        assert stale_extractors(stored, preview_hash("다른 텍스트")) == list(EXTRACTORS)
+
+    def test_version_bump_reruns_only_that_extractor(self, monkeypatch):
+        stored = _stored()
+        condition = EXTRACTORS["condition"]
+        calls = []
+
+        def _run(text, doc_type):
+            calls.append(text)
+            return condition.run(text, doc_type)
+
+        def _fail(text, doc_type):
+            raise AssertionError("버전이 같은 extractor는 재실행하지 않음")
+
+        bumped = {
+            name: RuleExtractor(
+                name,
+                "2" if name == "condition" else extractor.version,
+                _run if name == "condition" else _fail,
+                extractor.load,
+            )
+            for name, extractor in EXTRACTORS.items()
+        }
+        monkeypatch.setattr(chunk_extraction, "EXTRACTORS", bumped)
+
+        assert stale_extractors(stored, stored["preview_hash"]) == ["condition"]
+        refreshed = extract_chunk(CHUNK_TEXT, "가입설계서", stored)
+        assert len(calls) == 1
+        assert refreshed["versions"]["condition"] == "2"
+        assert refreshed["results"] == stored["results"]
+
+
+class TestStoredExtractionIndex:
+    """STEP 4.17: 조회 경로 인덱스"""
+
+    def test_hit_returns_fresh_object(self):
+        index = StoredExtractionIndex()
+        index.register(_stored())
+        text = compare_preview(CHUNK_TEXT)
+
+        first = index.lookup("amount", text, "가입설계서")
+        assert first == EXTRACTORS["amount"].run(text, "가입설계서")
+        assert index.lookup("amount", text, "가입설계서") is not first
+        assert index.stats()["hits"] == 2
+
+    def test_miss_on_other_text_or_doc_type(self):
+        index = StoredExtractionIndex()
+        index.register(_stored())
+        text = compare_preview(CHUNK_TEXT)
+
+        assert index.lookup("amount", text[:50], "가입설계서") is None
+        assert index.lookup("amount", text, "상품요약서") is None
+        assert index.stats()["misses"] == 2
+
+    def test_stale_version(self):
+        stored = _stored()
+        stored["versions"]["amount"] = "0"
+        index = StoredExtractionIndex()
+        index.register(stored)
+
+        assert index.lookup("amount", compare_preview(CHUNK_TEXT), "가입설계서") is None
+        assert index.stats()["stale"] == 1
+
+    def test_ignores_missing_meta(self):
+        index = StoredExtractionIndex()
+        index.register(None)
+        index.register({})
+
+        assert len(index) == 0
+
+    def test_lru_eviction(self):
+        index = StoredExtractionIndex(max_entries=2)
+        first = _stored("암진단비 1,000만원")
+        index.register(first)
+        index.register(_stored("암진단비 2,000만원"))
+        index.register(first)  # 최근 사용으로 갱신
+        index.register(_stored("암진단비 3,000만원"))
+
+        assert len(index) == 2
+        assert index.lookup("amount", "암진단비 1,000만원", "가입설계서") is not None
+        assert index.lookup("amount", "암진단비 2,000만원", "가입설계서") is None
+        assert index.stats()["evictions"] == 1
+
+
+class TestRunExtractor:
+    """STEP 4.17: 저장 결과 우선 / on-the-fly fallback"""
+
+    def test_uses_stored_result(self, monkeypatch):
+        get_stored_extraction_index().register(_stored())
+        text = compare_preview(CHUNK_TEXT)
+        expected = EXTRACTORS["condition"].run(text, "가입설계서")
+
+        def _fail(text, doc_type):
+            raise AssertionError("저장 결과가 있으면 추출하지 않음")
+
+        monkeypatch.setitem(
+            chunk_extraction.EXTRACTORS, "condition",
+            RuleExtractor("condition", "1", _fail, EXTRACTORS["condition"].load),
+        )
+        assert run_extractor("condition", text, "가입설계서") == expected
+
+    @pytest.mark.parametrize("name", list(EXTRACTORS))
+    def test_live_fallback(self, name):
+        text = "유사암진단비 600만원, 연 1회 한도"
+
+        assert run_extractor(name, text, "가입설계서") == EXTRACTORS[name].run(text, "가입설계서")
+
+    def test_disabled(self, monkeypatch):
+        monkeypatch.setenv("STORED_EXTRACTION_ENABLED", "0")
+
+        assert get_stored_extraction_index() is None
+        assert run_extractor("amount", CHUNK_TEXT, "가입설계서") == EXTRACTORS["amount"].run(CHUNK_TEXT, "가입설계서")
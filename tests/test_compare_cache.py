@@ -0,0 +1,140 @@
+"""
+STEP 4.6: compare() 결과 캐시 테스트
+
+- raw / intent 키 구성 (표현이 다른 질의 → 같은 intent 키)
+- TTL / LRU / key_type별 통계
+- 슬롯 조건(트리거 키워드) 추출
+"""
+
+import pytest
+
+from services.extraction.slot_extractor import get_slot_query_conditions
+from services.retrieval import compare_cache
+from services.retrieval.compare_cache import CompareCache, build_intent_key, build_raw_key
+
+
+DOC_TYPES = ["가입설계서", "상품요약서", "사업방법서"]
+
+
+def _intent_key(query: str, **overrides):
+    params = dict(
+        insurers=["SAMSUNG", "MERITZ"],
+        resolved_coverage_codes=["A4200_1"],
+        resolved_policy_keywords=["암진단"],
+        plan_ids={},
+        top_k_per_insurer=10,
+        compare_doc_types=DOC_TYPES,
+        policy_doc_types=["약관"],
+        slot_query_conditions=get_slot_query_conditions(query),
+        amount_target_keyword=None,
+        corpus_fingerprint="100:100",
+    )
+    params.update(overrides)
+    return build_intent_key(**params)
+
+
+def _raw_key(query: str):
+    return build_raw_key(
+        query, ["SAMSUNG", "MERITZ"], None, 10, DOC_TYPES, ["약관"], None, 3, None, None, "100:100"
+    )
+
+
+class TestCacheKeys:
+    """STEP 4.6: 캐시 키 구성"""
+
+    def test_paraphrases_share_intent_key(self):
+        assert _intent_key("암진단비") == _intent_key("삼성 메리츠 암 진단비 얼마")
+        assert _raw_key("암진단비") != _raw_key("삼성 메리츠 암 진단비 얼마")
+
+    def test_slot_conditions_split_intent_key(self):
+        """조건부 슬롯 트리거가 다르면 다른 키"""
+        assert get_slot_query_conditions("경계성 종양 암진단비") == ("경계성 종양",)
+        assert _intent_key("암진단비") != _intent_key("경계성 종양 암진단비")
+
+    def test_resolved_inputs_split_intent_key(self):
+        base = _intent_key("암진단비")
+
+        assert base != _intent_key("암진단비", plan_ids={"SAMSUNG": 3})
+        assert base != _intent_key("암진단비", resolved_coverage_codes=["A4210"])
+        assert base != _intent_key("암진단비", amount_target_keyword="뇌졸중진단비")
+        assert base != _intent_key("암진단비", corpus_fingerprint="101:101")
+
+    def test_plan_ids_order_insensitive(self):
+        assert _intent_key("암", plan_ids={"SAMSUNG": 1, "MERITZ": 2}) == _intent_key(
+            "암", plan_ids={"MERITZ": 2, "SAMSUNG": 1}
+        )
+
+
+class TestCompareCache:
+    """STEP 4.6: TTL + LRU 캐시"""
+
+    def test_hit_miss_stats_by_key_type(self):
+        cache = CompareCache()
+
+        assert cache.get("intent", "k") is None
+        cache.put("intent", "k", {"v": 1})
+        assert cache.get("intent", "k") == {"v": 1}
+        assert cache.get("raw", "k") is None
+
+        stats = cache.stats()
+        assert stats["intent"]["hits"] == 1
+        assert stats["intent"]["misses"] == 1
+        assert stats["intent"]["entries"] == 1
+        assert stats["raw"]["misses"] == 1
+        assert stats["raw"]["entries"] == 0
+
+    def test_values_are_isolated(self):
+        cache = CompareCache()
+        value = {"items": [1]}
+        cache.put("raw", "k", value)
+        value["items"].append(2)
+
+        got = cache.get("raw", "k")
+        got["items"].append(3)
+
+        assert cache.get("raw", "k") == {"items": [1]}
+
+    def test_lru_eviction(self):
+        cache = CompareCache(max_entries=2)
+        cache.put("raw", "a", 1)
+        cache.put("intent", "b", 2)
+        cache.get("raw", "a")
+        cache.put("raw", "c", 3)
+
+        assert cache.get("intent", "b") is None
+        assert cache.get("raw", "a") == 1
+        assert cache.stats()["intent"]["evictions"] == 1
+
+    def test_ttl_expiration(self, monkeypatch):
+        now = [1000.0]
+        monkeypatch.setattr(compare_cache.time, "monotonic", lambda: now[0])
+        cache = CompareCache(ttl_sec=10)
+        cache.put("raw", "k", 1)
+
+        now[0] += 5
+        assert cache.get("raw", "k") == 1
+        now[0] += 10
+        assert cache.get("raw", "k") is None
+        assert cache.stats()["raw"]["expirations"] == 1
+
+
+class TestGetCompareCache:
+    """STEP 4.6: 프로세스 캐시 on/off"""
+
+    @pytest.fixture(autouse=True)
+    def _reset(self):
+        compare_cache.clear_compare_cache()
+        yield
+        compare_cache.clear_compare_cache()
+
+    def test_disabled_by_default(self, monkeypatch):
+        monkeypatch.delenv("COMPARE_CACHE_ENABLED", raising=False)
+        assert compare_cache.get_compare_cache() is None
+
+    def test_enabled_singleton(self, monkeypatch):
+        monkeypatch.setenv("COMPARE_CACHE_ENABLED", "1")
+        monkeypatch.setenv("COMPARE_CACHE_MAX_ENTRIES", "7")
+
+        cache = compare_cache.get_compare_cache()
+        assert cache is compare_cache.get_compare_cache()
+        assert cache.max_entries == 7
@@ -0,0 +1,134 @@
+"""
+STEP 4.1: Comparison Cube 단위 테스트
+
+- cube lookup 결과 == on-the-fly build_coverage_compare_result 결과
+- DB 직렬화 round-trip
+- 빌드 파라미터 불일치 시 미사용
+"""
+
+import json
+
+from services.retrieval.compare_cube import CompareCube, CubeCell, cells_from_compare_axis
+from services.retrieval.compare_service import (
+    CompareAxisResult,
+    Evidence,
+    build_coverage_compare_result,
+)
+
+
+DOC_TYPES = ["가입설계서", "상품요약서", "사업방법서"]
+
+
+def _make_compare_axis() -> list[CompareAxisResult]:
+    return [
+        CompareAxisResult(
+            insurer_code="SAMSUNG",
+            coverage_code="A4200_1",
+            coverage_name="암진단비(유사암제외)",
+            doc_type_counts={"가입설계서": 1, "상품요약서": 1},
+            evidence=[
+                Evidence(
+                    document_id=1,
+                    doc_type="가입설계서",
+                    page_start=3,
+                    preview="암 진단비 가입금액 3,000만원 보험료 12,000원",
+                ),
+                Evidence(
+                    document_id=2,
+                    doc_type="상품요약서",
+                    page_start=5,
+                    preview="암으로 진단확정된 경우 보험가입금액 3,000만원 지급. 다만 90일 면책기간 이후",
+                ),
+            ],
+        ),
+        CompareAxisResult(
+            insurer_code="MERITZ",
+            coverage_code="A4200_1",
+            coverage_name="암진단비(유사암제외)",
+            doc_type_counts={"사업방법서": 1},
+            evidence=[
+                Evidence(
+                    document_id=3,
+                    doc_type="사업방법서",
+                    page_start=10,
+                    preview="암진단비 2천만원을 최초 1회한 지급합니다.",
+                ),
+            ],
+        ),
+    ]
+
+
+def _make_cube(compare_axis: list[CompareAxisResult]) -> CompareCube:
+    return CompareCube(
+        cells=cells_from_compare_axis(compare_axis, plan_id=None),
+        compare_doc_types=DOC_TYPES,
+        top_k=10,
+        corpus_fingerprint="2:3",
+    )
+
+
+class TestCompareCube:
+    """STEP 4.1: comparison cube"""
+
+    def test_lookup_equals_on_the_fly(self):
+        """cube lookup으로 만든 비교표가 on-the-fly 결과와 동일"""
+        compare_axis = _make_compare_axis()
+        insurers = ["SAMSUNG", "MERITZ", "DB"]
+        cube = _make_cube(compare_axis)
+
+        expected = build_coverage_compare_result(compare_axis, insurers)
+        actual = build_coverage_compare_result(
+            compare_axis,
+            insurers,
+            cell_lookup=lambda ic, cc: cube.lookup(ic, cc, None),
+        )
+
+        assert actual == expected
+
+    def test_lookup_miss_falls_back(self):
+        """cube에 없는 셀은 None → on-the-fly 계산"""
+        cube = _make_cube(_make_compare_axis())
+
+        assert cube.lookup("SAMSUNG", "A4200_1", None) is not None
+        assert cube.lookup("SAMSUNG", "A4200_1", 77) is None
+        assert cube.lookup("DB", "A4200_1", None) is None
+
+    def test_lookup_returns_copy(self):
+        """lookup 결과를 수정해도 cube가 오염되지 않음"""
+        cube = _make_cube(_make_compare_axis())
+
+        cell = cube.lookup("SAMSUNG", "A4200_1", None)
+        cell.best_evidence.clear()
+        cell.doc_type_counts["약관"] = 99
+
+        again = cube.lookup("SAMSUNG", "A4200_1", None)
+        assert len(again.best_evidence) == 2
+        assert "약관" not in again.doc_type_counts
+
+    def test_db_round_trip(self):
+        """to_db_params → from_db_row 왕복 시 동일 셀"""
+        cube = _make_cube(_make_compare_axis())
+
+        for cell in cube.cells():
+            params = cell.to_db_params()
+            row = {
+                "insurer_code": params["insurer_code"],
+                "coverage_code": params["coverage_code"],
+                "plan_id": params["plan_id"],
+                "coverage_name": params["coverage_name"],
+                "doc_type_counts": json.loads(params["doc_type_counts"]),
+                "best_evidence": json.loads(params["best_evidence"]),
+                "resolved_amount": (
+                    json.loads(params["resolved_amount"])
+                    if params["resolved_amount"] else None
+                ),
+            }
+            assert CubeCell.from_db_row(row) == cell
+
+    def test_supports_build_params(self):
+        """compare_doc_types/top_k가 빌드 파라미터와 같을 때만 사용"""
+        cube = _make_cube(_make_compare_axis())
+
+        assert cube.supports(["사업방법서", "가입설계서", "상품요약서"], 10)
+        assert not cube.supports(["가입설계서"], 10)
+        assert not cube.supports(DOC_TYPES, 5)
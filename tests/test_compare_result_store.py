@@ -0,0 +1,247 @@
+"""
+STEP 4.13: 후속 질의 결과 저장소 테스트
+
+- 저장소: token 발급 / TTL / LRU / 재사용 비율
+- 병합: 보험사별 근거 / 셀 / 슬롯 재사용, diff_summary 재생성
+- insurer-only 후속 질의: 추가 보험사만 compare() 실행
+"""
+
+import pytest
+
+from api import compare as compare_api
+from api.compare import CompareRequest, QueryAnchor, _compare_with_result_store
+from services.extraction.slot_extractor import ComparisonSlot, SlotInsurerValue
+from services.retrieval import compare_result_store
+from services.retrieval.compare_result_store import CompareResultStore
+from services.retrieval.compare_service import (
+    CompareAxisResult,
+    CompareResponse,
+    Evidence,
+    PolicyAxisResult,
+    build_coverage_compare_result,
+    build_diff_summary,
+    merge_compare_responses,
+)
+
+
+def _evidence(document_id: int, doc_type: str = "가입설계서") -> Evidence:
+    return Evidence(document_id=document_id, doc_type=doc_type, page_start=1, preview="암진단비 3,000만원")
+
+
+def _response(insurers: list[str], coverage_codes: list[str] | None = None) -> CompareResponse:
+    """보험사별로 독립인 가짜 compare() 결과"""
+    coverage_codes = coverage_codes or ["A4200_1"]
+    compare_axis = [
+        CompareAxisResult(
+            insurer_code=ic,
+            coverage_code=coverage_codes[0],
+            coverage_name="암진단비",
+            doc_type_counts={"가입설계서": 1},
+            evidence=[_evidence(len(ic))],
+        )
+        for ic in insurers
+    ]
+    policy_axis = [
+        PolicyAxisResult(insurer_code=ic, keyword="암", evidence=[_evidence(100 + len(ic), "약관")])
+        for ic in insurers
+    ]
+    rows = build_coverage_compare_result(compare_axis, insurers)
+    slot = ComparisonSlot(
+        slot_key="payout_amount",
+        label="진단비 지급금액(일시금)",
+        comparable=True,
+        insurers=[SlotInsurerValue(insurer_code=ic, value="3,000만원") for ic in insurers],
+    )
+    return CompareResponse(
+        compare_axis=compare_axis,
+        policy_axis=policy_axis,
+        coverage_compare_result=rows,
+        diff_summary=build_diff_summary(rows),
+        slots=[slot],
+        resolved_coverage_codes=coverage_codes,
+        debug={"insurers": insurers, "insurer_counts": {"compare_axis": {ic: 1 for ic in insurers}}},
+    )
+
+
+class TestCompareResultStore:
+    """STEP 4.13: token 저장소"""
+
+    def test_put_get_isolated(self):
+        store = CompareResultStore()
+        response = _response(["SAMSUNG"])
+        token = store.put({"query": "암진단비"}, ["SAMSUNG"], response)
+
+        response.compare_axis.clear()
+        stored = store.get(token)
+
+        assert stored.insurers == ["SAMSUNG"]
+        assert len(stored.response.compare_axis) == 1
+        assert store.get("unknown") is None
+        assert store.stats()["hits"] == 1 and store.stats()["misses"] == 1
+
+    def test_ttl_expiration(self, monkeypatch):
+        store = CompareResultStore(ttl_sec=10)
+        token = store.put({}, ["SAMSUNG"], _response(["SAMSUNG"]))
+
+        now = compare_result_store.time.monotonic()
+        monkeypatch.setattr(compare_result_store.time, "monotonic", lambda: now + 11)
+
+        assert store.get(token) is None
+        assert store.stats()["expirations"] == 1
+        assert len(store) == 0
+
+    def test_lru_eviction(self):
+        store = CompareResultStore(max_entries=2)
+        first = store.put({}, ["A"], None)
+        second = store.put({}, ["B"], None)
+        store.get(first)
+        store.put({}, ["C"], None)
+
+        assert store.get(second) is None
+        assert store.get(first) is not None
+        assert store.stats()["evictions"] == 1
+
+    def test_byte_cap(self):
+        size = compare_result_store.estimate_bytes({}) + compare_result_store.estimate_bytes(_response(["A"]))
+        store = CompareResultStore(max_bytes=size * 2)
+        first = store.put({}, ["A"], _response(["A"]))
+        second = store.put({}, ["A"], _response(["A"]))
+        store.put({}, ["A"], _response(["A"]))
+
+        assert store.get(first) is None
+        assert store.get(second) is not None
+        assert store.stats()["evictions"] == 1
+        assert store.bytes <= store.max_bytes
+
+    def test_oversized_response_not_stored(self):
+        store = CompareResultStore(max_bytes=1024)
+
+        assert store.put({}, ["SAMSUNG"], _response(["SAMSUNG"])) is None
+        assert len(store) == 0
+        assert store.stats()["skipped"] == 1
+
+    def test_reuse_ratio(self):
+        store = CompareResultStore()
+        store.record_reuse(0, 2)
+        store.record_reuse(2, 1)
+
+        assert store.stats()["reuse_ratio"] == 0.4
+
+    def test_disabled_by_default(self, monkeypatch):
+        monkeypatch.delenv("COMPARE_RESULT_STORE_ENABLED", raising=False)
+        compare_result_store.clear_compare_result_store()
+        assert compare_result_store.get_compare_result_store() is None
+
+    def test_disabled_no_token(self, monkeypatch):
+        monkeypatch.setenv("COMPARE_RESULT_STORE_ENABLED", "0")
+        monkeypatch.setattr(compare_api, "is_hybrid_enabled", lambda: False)
+        monkeypatch.setattr(compare_api, "compare", lambda insurers, **kwargs: _response(insurers))
+        compare_result_store.clear_compare_result_store()
+
+        request = CompareRequest(insurers=["SAMSUNG"], query="암진단비")
+        result, token = _compare_with_result_store(request, ["SAMSUNG"], None, "new")
+
+        assert token is None
+        assert "result_store" not in result.debug
+
+
+class TestMergeCompareResponses:
+    """STEP 4.13: 보험사별 결과 병합"""
+
+    def test_merge_keeps_cells_and_rebuilds_diff(self):
+        base = _response(["SAMSUNG", "MERITZ"])
+        added = _response(["DB"])
+
+        merged = merge_compare_responses(
+            [(["SAMSUNG", "MERITZ"], base), (["DB"], added)],
+            ["MERITZ", "DB", "SAMSUNG"],
+        )
+        full = _response(["MERITZ", "DB", "SAMSUNG"])
+
+        assert [r.insurer_code for r in merged.compare_axis] == ["MERITZ", "DB", "SAMSUNG"]
+        assert [r.insurer_code for r in merged.policy_axis] == ["MERITZ", "DB", "SAMSUNG"]
+        assert merged.coverage_compare_result == full.coverage_compare_result
+        assert merged.coverage_compare_result[0].insurers[0] is base.coverage_compare_result[0].insurers[1]
+        assert merged.diff_summary == full.diff_summary
+        assert [iv.insurer_code for iv in merged.slots[0].insurers] == ["MERITZ", "DB", "SAMSUNG"]
+        assert merged.slots[0].diff_summary == "동일: 3,000만원"
+        assert merged.debug["insurer_counts"]["compare_axis"] == {"MERITZ": 1, "DB": 1, "SAMSUNG": 1}
+
+    def test_subset(self):
+        merged = merge_compare_responses(
+            [(["SAMSUNG", "MERITZ"], _response(["SAMSUNG", "MERITZ"]))],
+            ["MERITZ"],
+        )
+
+        assert [r.insurer_code for r in merged.compare_axis] == ["MERITZ"]
+        assert [c.insurer_code for c in merged.coverage_compare_result[0].insurers] == ["MERITZ"]
+
+
+class TestInsurerOnlyFollowUp:
+    """STEP 4.13: insurer-only 후속 질의는 추가 보험사만 조회"""
+
+    @pytest.fixture
+    def calls(self, monkeypatch):
+        monkeypatch.setenv("COMPARE_RESULT_STORE_ENABLED", "1")
+        monkeypatch.setattr(compare_api, "is_hybrid_enabled", lambda: False)
+        compare_result_store.clear_compare_result_store()
+        calls = []
+
+        def fake_compare(insurers, query, coverage_codes, **kwargs):
+            calls.append((list(insurers), query, coverage_codes))
+            return _response(insurers, coverage_codes or ["A4200_1", "A4210"])
+
+        monkeypatch.setattr(compare_api, "compare", fake_compare)
+        yield calls
+        compare_result_store.clear_compare_result_store()
+
+    def _follow_up(self, token, insurers, query="메리츠는?", **overrides):
+        anchor = QueryAnchor(
+            coverage_code="A4200_1", original_query="암진단비", intent="compare", result_token=token
+        )
+        return CompareRequest(insurers=insurers, query=query, anchor=anchor, **overrides)
+
+    def test_only_new_insurers_computed(self, calls):
+        request = CompareRequest(insurers=["SAMSUNG", "DB"], query="암진단비")
+        _, token = _compare_with_result_store(request, ["SAMSUNG", "DB"], None, "new")
+
+        follow_up = self._follow_up(token, ["SAMSUNG", "DB", "MERITZ"])
+        result, next_token = _compare_with_result_store(
+            follow_up, ["SAMSUNG", "DB", "MERITZ"], ["A4200_1"], "insurer_only"
+        )
+
+        # 추가 보험사는 원 질의 + 실제 사용한 coverage_codes로 조회
+        assert calls == [
+            (["SAMSUNG", "DB"], "암진단비", None),
+            (["MERITZ"], "암진단비", ["A4200_1", "A4210"]),
+        ]
+        assert [r.insurer_code for r in result.compare_axis] == ["SAMSUNG", "DB", "MERITZ"]
+        assert result.debug["result_store"]["reused_insurers"] == ["SAMSUNG", "DB"]
+        assert result.debug["result_store"]["computed_insurers"] == ["MERITZ"]
+        assert next_token != token
+
+        # 합집합이 저장되므로 보험사를 빼도 재조회 없음
+        result, _ = _compare_with_result_store(
+            self._follow_up(next_token, ["MERITZ"]), ["MERITZ"], ["A4200_1"], "insurer_only"
+        )
+        assert len(calls) == 2
+        assert [r.insurer_code for r in result.compare_axis] == ["MERITZ"]
+        assert result.debug["result_store"]["stats"]["reuse_ratio"] == round(3 / 6, 4)
+
+    @pytest.mark.parametrize("token, overrides, anchor_code, reason", [
+        ("unknown", {}, "A4200_1", "unknown_or_expired_token"),
+        (None, {"age": 40}, "A4200_1", "params_changed"),
+        (None, {}, "A5100", "anchor_coverage_changed"),
+    ])
+    def test_full_compare_when_not_reusable(self, calls, token, overrides, anchor_code, reason):
+        request = CompareRequest(insurers=["SAMSUNG"], query="암진단비")
+        _, stored_token = _compare_with_result_store(request, ["SAMSUNG"], None, "new")
+
+        follow_up = self._follow_up(token or stored_token, ["SAMSUNG", "MERITZ"], **overrides)
+        follow_up.anchor.coverage_code = anchor_code
+        result, _ = _compare_with_result_store(
+            follow_up, ["SAMSUNG", "MERITZ"], [anchor_code], "insurer_only"
+        )
+
+        assert calls[-1] == (["SAMSUNG", "MERITZ"], "메리츠는?", [anchor_code])
+        assert result.debug["result_store"]["miss_reason"] == reason
@@ -0,0 +1,130 @@
+"""
+STEP 4.14: /compare 응답 범위(view) 테스트
+
+- ui: 근거 목록 / 슬롯 trace / debug 생략, 비교표 / 요약 / 슬롯은 유지
+- full: 요약 debug만
+- debug(기본): 기존 응답과 동일
+"""
+
+import pytest
+
+from api.compare import CompareRequest, CoverageResolutionResponse, _FULL_VIEW_DEBUG_KEYS, _convert_response
+from services.extraction.llm_trace import LLMTrace
+from services.extraction.slot_extractor import ComparisonSlot, SlotInsurerValue
+from services.retrieval.compare_service import (
+    CompareAxisResult,
+    CompareResponse,
+    Evidence,
+    PolicyAxisResult,
+    build_coverage_compare_result,
+    build_diff_summary,
+)
+
+
+INSURERS = ["SAMSUNG", "MERITZ"]
+
+
+def _result() -> CompareResponse:
+    compare_axis = [
+        CompareAxisResult(
+            insurer_code=ic,
+            coverage_code="A4200_1",
+            coverage_name="암진단비",
+            doc_type_counts={"가입설계서": 1},
+            evidence=[Evidence(document_id=i, doc_type="가입설계서", page_start=1, preview="암진단비 3,000만원")],
+        )
+        for i, ic in enumerate(INSURERS)
+    ]
+    policy_axis = [
+        PolicyAxisResult(
+            insurer_code=ic,
+            keyword="암",
+            evidence=[Evidence(document_id=10 + i, doc_type="약관", page_start=3, preview="암의 정의")],
+        )
+        for i, ic in enumerate(INSURERS)
+    ]
+    rows = build_coverage_compare_result(compare_axis, INSURERS)
+    slot = ComparisonSlot(
+        slot_key="payout_amount",
+        label="진단비 지급금액(일시금)",
+        comparable=True,
+        insurers=[
+            SlotInsurerValue(
+                insurer_code=ic,
+                value="3,000만원",
+                trace=LLMTrace.rule_only(),
+            )
+            for ic in INSURERS
+        ],
+        diff_summary="동일: 3,000만원",
+    )
+    return CompareResponse(
+        compare_axis=compare_axis,
+        policy_axis=policy_axis,
+        coverage_compare_result=rows,
+        diff_summary=build_diff_summary(rows),
+        slots=[slot],
+        resolved_coverage_codes=["A4200_1"],
+        debug={
+            "query": "암진단비",
+            "insurers": INSURERS,
+            "resolved_coverage_codes": ["A4200_1"],
+            "timing_ms": {"compare_axis": 1.0},
+            "insurer_counts": {"compare_axis": {"SAMSUNG": 1, "MERITZ": 1}},
+            "recommended_coverage_details": [],
+        },
+    )
+
+
+def _convert(view: str):
+    return _convert_response(_result(), INSURERS, "암진단비", {"insurer_scope_method": "request_explicit"}, view=view)
+
+
+class TestCompareView:
+    """STEP 4.14: view별 응답 섹션"""
+
+    def test_default_view_is_debug(self):
+        assert CompareRequest(query="암진단비").view == "debug"
+
+    def test_ui_view(self):
+        response = _convert("ui")
+
+        assert response.compare_axis == [] and response.policy_axis == []
+        assert response.debug == {}
+        assert response.slots[0].insurers[0].trace is None
+        # 비교표 / 요약 / 근거 참조는 유지
+        assert response.coverage_compare_result[0].insurers[0].best_evidence[0].document_id == 0
+        assert response.diff_summary[0].bullets[0].evidence_refs
+        assert response.user_summary
+        assert response.anchor.coverage_code == "A4200_1"
+
+    @pytest.mark.parametrize("view, has_debug", [("ui", False), ("debug", True)])
+    def test_blocked_anchor_debug(self, view, has_debug):
+        response = _convert_response(
+            _result(), INSURERS, "암진단비", {},
+            intent_debug={"intent_locked": False},
+            coverage_resolution=CoverageResolutionResponse(status="suggest"),
+            view=view,
+        )
+
+        assert response.anchor is None
+        assert ("anchor_blocked" in response.debug) is has_debug
+        assert ("intent" in response.debug) is has_debug
+
+    def test_full_view(self):
+        response = _convert("full")
+
+        assert len(response.compare_axis) == 2 and len(response.policy_axis) == 2
+        assert set(response.debug) == set(_FULL_VIEW_DEBUG_KEYS)
+        assert response.slots[0].insurers[0].trace is not None
+
+    def test_debug_view_unchanged(self):
+        debug_response = _convert("debug")
+
+        assert "insurer_scope" in debug_response.debug
+        assert "recommended_coverage_details" in debug_response.debug
+        assert debug_response.model_dump(exclude={"debug"}) == _convert("full").model_dump(exclude={"debug"})
+
+    @pytest.mark.parametrize("view", ["ui", "full"])
+    def test_smaller_payload(self, view):
+        assert len(_convert(view).model_dump_json()) < len(_convert("debug").model_dump_json())
@@ -0,0 +1,99 @@
+"""
+STEP 4.22: 지급조건 키워드 automaton 테스트
+
+- 키워드 1-pass 스캔 + 구분자 index 결과 = 문장 분리 후 문장별 키워드 검색 결과
+- 겹치는 키워드 (진단확정 ⊃ 진단 / 확정, 대기 + 기타피부암)
+- 짧은 문장 제외 / 동점이면 앞 문장
+"""
+
+import random
+import re
+
+import pytest
+
+from services.extraction.condition_extractor import (
+    CONDITION_KEYWORDS,
+    SENTENCE_DELIMITERS,
+    _build_keyword_automaton,
+    _truncate_snippet,
+    extract_condition_snippet,
+)
+
+
+def _reference(text: str) -> tuple[str | None, list[str]]:
+    """기존 구현: 문장 분리 → 문장별 키워드 substring 검색"""
+    sentences = [s.strip() for s in re.split(SENTENCE_DELIMITERS, text) if len(s.strip()) > 5]
+    scored = []
+    for sentence in sentences:
+        matched = [kw for kw in CONDITION_KEYWORDS if kw in sentence]
+        if matched:
+            scored.append((len(matched), matched, sentence))
+    if not scored:
+        return None, []
+    scored.sort(key=lambda x: x[0], reverse=True)
+    return _truncate_snippet(scored[0][2]), scored[0][1]
+
+
+def _extract(text: str) -> tuple[str | None, list[str]]:
+    result = extract_condition_snippet.__wrapped__(text)
+    return result.snippet, list(result.matched_terms)
+
+
+class TestKeywordAutomaton:
+    """STEP 4.22: trie 정규식 + 겹침 후보"""
+
+    def test_contained_keywords(self):
+        pattern, index = _build_keyword_automaton(CONDITION_KEYWORDS)
+
+        assert pattern.findall("진단확정 후") == ["진단확정"]
+        assert [CONDITION_KEYWORDS[i] for i in index["진단확정"]] == ["진단", "진단확정", "확정"]
+
+    def test_overlapping_keywords(self):
+        pattern, index = _build_keyword_automaton(CONDITION_KEYWORDS)
+
+        assert pattern.findall("보험금 대기타피부암") == ["대기타피부암"]
+        assert {CONDITION_KEYWORDS[i] for i in index["대기타피부암"]} == {"대기", "기타피부암"}
+
+    def test_overlap_closure_chain(self):
+        pattern, index = _build_keyword_automaton(["ab", "bc", "cd"])
+
+        assert pattern.findall("xabcdx") == ["abcd"]
+        assert index["abcd"] == (0, 1, 2)
+
+
+class TestConditionSnippet:
+    """STEP 4.22: 스니펫 선택 = 기존 구현"""
+
+    def test_best_sentence(self):
+        text = "보험기간 20년 만기. 암 진단확정 시 최초 1회 지급; 90일 면책"
+
+        assert _extract(text) == ("암 진단확정 시 최초 1회 지급", ["진단", "진단확정", "확정", "최초", "1회"])
+
+    def test_tie_keeps_first_sentence(self):
+        assert _extract("유사암 진단비 지급\n갑상선 진단비 지급") == ("유사암 진단비 지급", ["진단", "유사암"])
+
+    def test_short_sentence_skipped(self):
+        # 키워드가 더 많아도 5자 이하 문장은 제외
+        assert _extract("면책 감액\n최초 진단 시 지급") == ("최초 진단 시 지급", ["진단", "최초"])
+        assert _extract("1회. 면책") == (None, [])
+
+    def test_no_keywords(self):
+        assert _extract("보험료 15,000원 (월납)") == (None, [])
+        assert _extract("   ") == (None, [])
+
+    def test_truncation(self):
+        text = "진단 " + "가" * 200
+
+        assert _extract(text) == _reference(text)
+        assert _extract(text)[0].endswith("...")
+
+    @pytest.mark.parametrize("seed", [0, 1, 2])
+    def test_matches_reference(self, seed):
+        fragments = CONDITION_KEYWORDS + [
+            "대기타", "지급사유사", "진", "단", "확", "정", "기타", "피부암",
+            ".", "\n", ";", " ", "가나다라", "1", "80일",
+        ]
+        rnd = random.Random(seed)
+        for _ in range(3000):
+            text = "".join(rnd.choice(fragments) for _ in range(rnd.randint(0, 16)))
+            assert _extract(text) == _reference(text), text
@@ -0,0 +1,144 @@
+"""
+STEP 4.8: Blue/Green corpus generation 테스트
+
+- 서빙 세대 인덱스/제약 정의 → staging DDL 변환
+- switch 전 검증 (build 안 된 세대 / 빈 세대 거부)
+- 전환 트랜잭션: lock timeout 시 rollback 후 재시도
+"""
+
+from unittest.mock import MagicMock
+
+import psycopg
+import pytest
+
+from services.ingestion import corpus_generation
+from services.ingestion.corpus_generation import (
+    _run_swap,
+    staging_constraint_ddl,
+    staging_index_ddl,
+    switch_generation,
+)
+
+
+def _mock_conn(fetchone_values):
+    cursor = MagicMock()
+    cursor.fetchone.side_effect = list(fetchone_values)
+
+    conn = MagicMock()
+    conn.cursor.return_value.__enter__ = MagicMock(return_value=cursor)
+    conn.cursor.return_value.__exit__ = MagicMock(return_value=False)
+    return conn, cursor
+
+
+class TestStagingDDL:
+    """STEP 4.8: 서빙 세대 정의 → staging DDL"""
+
+    def test_btree_index(self):
+        assert staging_index_ddl(
+            "CREATE INDEX idx_chunk_insurer ON public.chunk USING btree (insurer_id)"
+        ) == (
+            "CREATE INDEX IF NOT EXISTS idx_chunk_insurer "
+            "ON corpus_staging.chunk USING btree (insurer_id)"
+        )
+
+    def test_partial_hnsw_index(self):
+        ddl = staging_index_ddl(
+            "CREATE INDEX idx_chunk_embedding_hnsw ON public.chunk USING hnsw "
+            "(embedding vector_cosine_ops) WITH (m='16', ef_construction='64') "
+            "WHERE (embedding IS NOT NULL)"
+        )
+        assert ddl.startswith(
+            "CREATE INDEX IF NOT EXISTS idx_chunk_embedding_hnsw ON corpus_staging.chunk USING hnsw"
+        )
+        assert ddl.endswith("WHERE (embedding IS NOT NULL)")
+
+    def test_unique_index_and_unqualified_table(self):
+        assert staging_index_ddl(
+            "CREATE UNIQUE INDEX idx_x ON document USING btree (sha256)"
+        ) == "CREATE UNIQUE INDEX IF NOT EXISTS idx_x ON corpus_staging.document USING btree (sha256)"
+
+    def test_unexpected_definition(self):
+        with pytest.raises(ValueError):
+            staging_index_ddl("ALTER TABLE chunk ADD COLUMN x int")
+
+    def test_generation_fk_retargeted(self):
+        assert staging_constraint_ddl(
+            "FOREIGN KEY (document_id) REFERENCES document(document_id) ON DELETE CASCADE"
+        ) == (
+            "FOREIGN KEY (document_id) REFERENCES corpus_staging.document(document_id) "
+            "ON DELETE CASCADE"
+        )
+
+    def test_shared_table_fk_unchanged(self):
+        definition = "FOREIGN KEY (insurer_id) REFERENCES insurer(insurer_id) ON DELETE SET NULL"
+        assert staging_constraint_ddl(definition) == definition
+
+
+class TestSwitchGuards:
+    """STEP 4.8: switch 전 staging 세대 검증"""
+
+    def test_no_staging(self):
+        conn, _ = _mock_conn([{"exists": False}])
+
+        with pytest.raises(RuntimeError, match="no staging generation"):
+            switch_generation(conn)
+
+    def test_not_built(self):
+        conn, _ = _mock_conn([
+            {"exists": True},
+            {"generation_id": 3, "built_at": None, "chunk_count": None},
+        ])
+
+        with pytest.raises(RuntimeError, match="not built"):
+            switch_generation(conn)
+
+    def test_empty_generation(self):
+        conn, _ = _mock_conn([
+            {"exists": True},
+            {"generation_id": 3, "built_at": "2025-12-23", "chunk_count": 0},
+        ])
+
+        with pytest.raises(RuntimeError, match="no chunks"):
+            switch_generation(conn)
+
+
+class TestRunSwap:
+    """STEP 4.8: 전환 트랜잭션 lock timeout 재시도"""
+
+    @pytest.fixture(autouse=True)
+    def no_sleep(self, monkeypatch):
+        monkeypatch.setattr(corpus_generation.time, "sleep", lambda _: None)
+
+    def test_retry_then_commit(self):
+        conn, cursor = _mock_conn([{"exists": True}])
+        attempts = []
+
+        def swap(cur):
+            attempts.append(1)
+            if len(attempts) == 1:
+                raise psycopg.errors.LockNotAvailable("lock timeout")
+
+        _run_swap(conn, ("public", "corpus_staging"), swap, "corpus_switch", retries=3)
+
+        assert len(attempts) == 2
+        conn.rollback.assert_called_once()
+        conn.commit.assert_called_once()
+
+        executed = [call.args[0] for call in cursor.execute.call_args_list]
+        assert (
+            "LOCK TABLE public.document, public.chunk, corpus_staging.document, "
+            "corpus_staging.chunk IN ACCESS EXCLUSIVE MODE"
+        ) in executed
+        assert "SELECT bump_corpus_version(%s)" in executed
+
+    def test_gives_up_after_retries(self):
+        conn, _ = _mock_conn([])
+
+        def swap(cur):
+            raise psycopg.errors.LockNotAvailable("lock timeout")
+
+        with pytest.raises(RuntimeError, match="could not acquire locks"):
+            _run_swap(conn, ("public", "corpus_previous"), swap, "corpus_rollback", retries=2)
+
+        assert conn.rollback.call_count == 2
+        conn.commit.assert_not_called()
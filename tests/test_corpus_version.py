@@ -0,0 +1,183 @@
+"""
+STEP 4.7: corpus_version + LISTEN/NOTIFY 캐시 무효화 테스트
+
+- bump_corpus_version: SQL 함수 호출 + commit, 실패 시 None
+- invalidate_caches: 등록된 캐시 전체 호출, 실패 이름 반환
+- CorpusChangeListener.handle_notification: 중복 버전 무시, 지연 메트릭
+"""
+
+import json
+from unittest.mock import MagicMock
+
+import psycopg
+import pytest
+
+from services.retrieval import corpus_version
+from services.retrieval.corpus_version import (
+    CorpusChangeListener,
+    bump_corpus_version,
+    get_corpus_version,
+    invalidate_caches,
+    register_cache_invalidator,
+)
+
+
+@pytest.fixture(autouse=True)
+def isolated_registry(monkeypatch):
+    monkeypatch.setattr(corpus_version, "_invalidators", {})
+
+
+def _mock_conn(fetchone=None, execute_error=None):
+    cursor = MagicMock()
+    cursor.fetchone.return_value = fetchone
+    if execute_error is not None:
+        cursor.execute.side_effect = execute_error
+
+    conn = MagicMock()
+    conn.cursor.return_value.__enter__ = MagicMock(return_value=cursor)
+    conn.cursor.return_value.__exit__ = MagicMock(return_value=False)
+    return conn, cursor
+
+
+class TestBumpCorpusVersion:
+    """STEP 4.7: corpus_version 증가 (producer)"""
+
+    def test_bump_commits_and_returns_version(self):
+        conn, cursor = _mock_conn(fetchone={"version": 7})
+
+        assert bump_corpus_version(conn, "ingest") == 7
+        cursor.execute.assert_called_once_with(
+            "SELECT bump_corpus_version(%s) AS version", ("ingest",)
+        )
+        conn.commit.assert_called_once()
+
+    def test_bump_without_migration_returns_none(self):
+        conn, _ = _mock_conn(execute_error=psycopg.errors.UndefinedFunction("missing"))
+
+        assert bump_corpus_version(conn, "ingest") is None
+        conn.rollback.assert_called_once()
+        conn.commit.assert_not_called()
+
+    def test_get_corpus_version(self):
+        conn, _ = _mock_conn(fetchone={"version": 3})
+        assert get_corpus_version(conn) == 3
+
+        conn, _ = _mock_conn(fetchone=None)
+        assert get_corpus_version(conn) is None
+
+
+class TestInvalidateCaches:
+    """STEP 4.7: 캐시 무효화 registry"""
+
+    def test_all_invalidators_called(self):
+        calls = []
+        register_cache_invalidator("a", lambda: calls.append("a"))
+        register_cache_invalidator("b", lambda: calls.append("b"))
+
+        assert invalidate_caches() == []
+        assert calls == ["a", "b"]
+
+    def test_failure_does_not_stop_others(self):
+        calls = []
+
+        def broken():
+            raise RuntimeError("boom")
+
+        register_cache_invalidator("broken", broken)
+        register_cache_invalidator("ok", lambda: calls.append("ok"))
+
+        assert invalidate_caches() == ["broken"]
+        assert calls == ["ok"]
+
+    def test_same_name_replaced(self):
+        calls = []
+        register_cache_invalidator("a", lambda: calls.append(1))
+        register_cache_invalidator("a", lambda: calls.append(2))
+
+        invalidate_caches()
+        assert calls == [2]
+
+
+class TestHandleNotification:
+    """STEP 4.7: NOTIFY 처리 / 메트릭"""
+
+    def test_invalidates_and_records_lag(self):
+        calls = []
+        register_cache_invalidator("cache", lambda: calls.append(1))
+        listener = CorpusChangeListener("postgresql://unused")
+
+        payload = json.dumps({"version": 2, "source": "ingest", "at": 1000.0})
+        assert listener.handle_notification(payload) is True
+
+        metrics = listener.metrics
+        assert calls == [1]
+        assert metrics.notifications == 1
+        assert metrics.invalidations == 1
+        assert metrics.last_version == 2
+        assert metrics.last_source == "ingest"
+        assert metrics.last_lag_ms is not None and metrics.last_lag_ms > 0
+        assert metrics.to_dict()["avg_lag_ms"] == metrics.last_lag_ms
+
+    def test_stale_version_ignored(self):
+        calls = []
+        register_cache_invalidator("cache", lambda: calls.append(1))
+        listener = CorpusChangeListener("postgresql://unused")
+
+        listener.handle_notification(json.dumps({"version": 5, "source": "ingest"}))
+        assert listener.handle_notification(json.dumps({"version": 5, "source": "ingest"})) is False
+        assert listener.handle_notification(json.dumps({"version": 4, "source": "ingest"})) is False
+
+        assert calls == [1]
+        assert listener.metrics.notifications == 3
+        assert listener.metrics.stale_notifications == 2
+
+    def test_lag_without_timestamp_uses_received_at(self):
+        listener = CorpusChangeListener("postgresql://unused")
+
+        listener.handle_notification("not-json", received_at=0.0)
+
+        assert listener.metrics.invalidations == 1
+        assert listener.metrics.last_version is None
+        assert listener.metrics.last_lag_ms > 0
+
+    def test_failed_invalidations_counted(self):
+        def broken():
+            raise RuntimeError("boom")
+
+        register_cache_invalidator("broken", broken)
+        listener = CorpusChangeListener("postgresql://unused")
+
+        listener.handle_notification(json.dumps({"version": 1}))
+        assert listener.metrics.failed_invalidations == 1
+
+    def test_resync_after_missed_notification(self):
+        calls = []
+        register_cache_invalidator("cache", lambda: calls.append(1))
+        listener = CorpusChangeListener("postgresql://unused")
+
+        conn, _ = _mock_conn(fetchone={"version": 3})
+        listener._sync_version(conn)
+        assert listener.metrics.last_version == 3
+        assert calls == []
+
+        conn, _ = _mock_conn(fetchone={"version": 5})
+        listener._sync_version(conn)
+        assert listener.metrics.last_version == 5
+        assert listener.metrics.last_source == "resync"
+        assert calls == [1]
+
+    def test_known_version_from_prefork_snapshot(self):
+        # STEP 4.11: fork 전 스냅샷 이후 바뀌었으면 첫 연결에서 바로 무효화
+        calls = []
+        register_cache_invalidator("cache", lambda: calls.append(1))
+
+        listener = CorpusChangeListener("postgresql://unused", known_version=3)
+        conn, _ = _mock_conn(fetchone={"version": 3})
+        listener._sync_version(conn)
+        assert calls == []
+
+        listener = CorpusChangeListener("postgresql://unused", known_version=3)
+        conn, _ = _mock_conn(fetchone={"version": 4})
+        listener._sync_version(conn)
+        assert calls == [1]
+        assert listener.metrics.last_version == 4
@@ -0,0 +1,121 @@
+"""
+STEP 4.5: Coverage Availability Index 테스트
+
+- 보험사 비트셋 기반 has_coverage / has_documents / has_documents_any_plan / insurers_covering
+- plan 조건이 retrieval SQL과 동일 (plan_id IS NULL 또는 plan_id = X)
+- chunk 테이블 GROUP BY 결과로 빌드
+"""
+
+from unittest.mock import MagicMock
+
+from services.retrieval.coverage_availability import (
+    CoverageAvailability,
+    build_coverage_availability,
+)
+
+
+DOC_TYPES = ["가입설계서", "상품요약서", "사업방법서"]
+
+
+def _make_index() -> CoverageAvailability:
+    index = CoverageAvailability(["SAMSUNG", "MERITZ", "DB", "KB"])
+    index.add("SAMSUNG", "가입설계서", None, "A4200_1")
+    index.add("SAMSUNG", "약관", None, None)
+    index.add("MERITZ", "상품요약서", 7, "A4210")
+    index.add("MERITZ", "사업방법서", None, None)
+    index.add("DB", "약관", None, None)
+    return index
+
+
+class TestCoverageAvailability:
+    """STEP 4.5: 가용성 비트셋"""
+
+    def test_has_coverage_by_code(self):
+        index = _make_index()
+
+        assert index.has_coverage("SAMSUNG", ["A4200_1"], DOC_TYPES)
+        assert not index.has_coverage("SAMSUNG", ["A4210"], DOC_TYPES)
+        assert not index.has_coverage("SAMSUNG", ["A4200_1"], ["상품요약서"])
+        assert not index.has_coverage("KB", ["A4200_1"], DOC_TYPES)
+
+    def test_plan_condition_matches_sql(self):
+        """plan_id 없으면 공통 문서만, 있으면 (plan_id = X OR NULL)"""
+        index = _make_index()
+
+        assert not index.has_coverage("MERITZ", ["A4210"], DOC_TYPES)
+        assert not index.has_coverage("MERITZ", ["A4210"], DOC_TYPES, plan_id=8)
+        assert index.has_coverage("MERITZ", ["A4210"], DOC_TYPES, plan_id=7)
+        # 공통 문서는 plan 지정 시에도 포함
+        assert index.has_coverage("SAMSUNG", ["A4200_1"], DOC_TYPES, plan_id=3)
+
+    def test_has_coverage_without_codes(self):
+        """coverage_codes=None → coverage 태깅 chunk 존재 여부"""
+        index = _make_index()
+
+        assert index.has_coverage("SAMSUNG", None, DOC_TYPES)
+        assert not index.has_coverage("MERITZ", None, DOC_TYPES)
+        assert index.has_coverage("MERITZ", None, DOC_TYPES, plan_id=7)
+        assert not index.has_coverage("DB", None, DOC_TYPES)
+
+    def test_has_documents(self):
+        index = _make_index()
+
+        assert index.has_documents("MERITZ", DOC_TYPES)
+        assert index.has_documents("DB", ["약관"])
+        assert not index.has_documents("DB", DOC_TYPES)
+        assert not index.has_documents("UNKNOWN", ["약관"])
+
+    def test_has_documents_any_plan(self):
+        """plan 태깅된 약관만 있는 보험사도 plan 무관 조회(get_policy_axis)에서는 대상"""
+        index = _make_index()
+        index.add("KB", "약관", 7, None)
+
+        assert not index.has_documents("KB", ["약관"])
+        assert index.has_documents_any_plan("KB", ["약관"])
+        assert index.has_documents_any_plan("DB", ["약관"])
+        assert not index.has_documents_any_plan("MERITZ", ["약관"])
+        assert not index.has_documents_any_plan("UNKNOWN", ["약관"])
+
+    def test_insurers_covering(self):
+        index = _make_index()
+        index.add("DB", "가입설계서", None, "A4200_1")
+
+        assert index.insurers_covering("A4200_1") == ["SAMSUNG", "DB"]
+        assert index.insurers_covering("A4210") == ["MERITZ"]
+        assert index.insurers_covering("A4210", ["가입설계서"]) == []
+        assert index.insurers_covering("A9999") == []
+
+    def test_new_insurer_gets_bit(self):
+        """insurer 테이블에 없던 보험사도 등록"""
+        index = _make_index()
+        index.add("NEWCO", "가입설계서", None, "A4200_1")
+
+        assert index.has_coverage("NEWCO", ["A4200_1"], DOC_TYPES)
+        assert "NEWCO" in index.insurers_covering("A4200_1")
+
+
+class TestBuildCoverageAvailability:
+    """STEP 4.5: chunk 테이블 GROUP BY 결과로 빌드"""
+
+    def test_build_from_rows(self):
+        results = [
+            [{"n": 3, "max_id": 30}],
+            [{"insurer_code": "SAMSUNG"}, {"insurer_code": "MERITZ"}],
+            [
+                {"insurer_code": "SAMSUNG", "doc_type": "가입설계서", "plan_id": None, "coverage_code": "A4200_1"},
+                {"insurer_code": "MERITZ", "doc_type": "약관", "plan_id": None, "coverage_code": None},
+            ],
+        ]
+        cursor = MagicMock()
+        cursor.fetchone = lambda: results.pop(0)[0]
+        cursor.fetchall = lambda: results.pop(0)
+
+        conn = MagicMock()
+        conn.cursor.return_value.__enter__ = MagicMock(return_value=cursor)
+        conn.cursor.return_value.__exit__ = MagicMock(return_value=False)
+
+        index = build_coverage_availability(conn)
+
+        assert index.corpus_fingerprint == "3:30"
+        assert index.insurers_covering("A4200_1") == ["SAMSUNG"]
+        assert index.has_documents("MERITZ", ["약관"])
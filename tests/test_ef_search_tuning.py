@@ -0,0 +1,138 @@
+"""
+STEP 4.4: HNSW ef_search 파티션별 튜닝 테스트
+
+- recall 목표 기반 ef_search 선택
+- 파티션 값 적용 (doc_type 여러 개면 최대값)
+- get_compare_axis_vector가 보험사별 ef_search를 설정
+"""
+
+from unittest.mock import MagicMock
+
+import pytest
+
+from services.retrieval import ef_search_tuning
+from services.retrieval.compare_service import get_compare_axis_vector
+from services.retrieval.ef_search_tuning import (
+    EfSearchMeasurement,
+    choose_ef_search,
+    resolve_ef_search,
+)
+
+
+def _m(ef, recall, latency):
+    return EfSearchMeasurement(ef_search=ef, recall=recall, latency_ms=latency)
+
+
+class TestChooseEfSearch:
+    """STEP 4.4: recall 목표를 만족하는 최소 지연 선택"""
+
+    def test_min_latency_meeting_target(self):
+        measurements = [_m(20, 0.80, 1.0), _m(40, 0.96, 2.0), _m(100, 0.99, 4.0)]
+
+        assert choose_ef_search(measurements, 0.95).ef_search == 40
+        assert choose_ef_search(measurements, 0.98).ef_search == 100
+
+    def test_latency_noise_prefers_faster(self):
+        """측정 노이즈로 큰 ef_search가 더 빠르면 더 빠른 값 선택"""
+        measurements = [_m(40, 0.97, 3.0), _m(64, 0.99, 2.5)]
+
+        assert choose_ef_search(measurements, 0.95).ef_search == 64
+
+    def test_target_unreachable_returns_best_recall(self):
+        measurements = [_m(20, 0.50, 1.0), _m(40, 0.70, 2.0), _m(400, 0.70, 9.0)]
+
+        assert choose_ef_search(measurements, 0.95).ef_search == 40
+
+    def test_empty_raises(self):
+        with pytest.raises(ValueError):
+            choose_ef_search([], 0.95)
+
+
+class TestResolveEfSearch:
+    """STEP 4.4: 보험사 검색에 적용할 ef_search"""
+
+    TABLE = {
+        ("SAMSUNG", "가입설계서"): 64,
+        ("SAMSUNG", "상품요약서"): 200,
+        ("MERITZ", "가입설계서"): 20,
+    }
+
+    def test_max_over_doc_types(self):
+        assert resolve_ef_search(self.TABLE, "SAMSUNG", ["가입설계서", "상품요약서"], 40) == 200
+
+    def test_untuned_partition_uses_default(self):
+        assert resolve_ef_search(self.TABLE, "MERITZ", ["가입설계서"], 40) == 20
+        assert resolve_ef_search(self.TABLE, "MERITZ", ["가입설계서", "사업방법서"], 40) == 40
+        assert resolve_ef_search(self.TABLE, "DB", ["가입설계서"], 40) == 40
+
+
+class TestCompareAxisVectorEfSearch:
+    """STEP 4.4: get_compare_axis_vector가 파티션별 ef_search 적용"""
+
+    @pytest.fixture(autouse=True)
+    def _reset_cache(self, monkeypatch):
+        monkeypatch.delenv("COMPARE_AXIS_EF_SEARCH", raising=False)
+        monkeypatch.delenv("COMPARE_AXIS_EF_SEARCH_TUNED", raising=False)
+        ef_search_tuning.clear_ef_search_table()
+        yield
+        ef_search_tuning.clear_ef_search_table()
+
+    def _make_mock_conn(self, tuning_rows):
+        cursor = MagicMock()
+        cursor.executed = []
+        state = {"last": ""}
+
+        def execute(query, params=None):
+            cursor.executed.append(query)
+            state["last"] = query
+
+        def fetchall():
+            if "hnsw_ef_search_tuning" in state["last"]:
+                return tuning_rows
+            return []
+
+        cursor.execute = execute
+        cursor.fetchall = fetchall
+
+        conn = MagicMock()
+        conn.cursor.return_value.__enter__ = MagicMock(return_value=cursor)
+        conn.cursor.return_value.__exit__ = MagicMock(return_value=False)
+        return conn, cursor
+
+    def _ef_settings(self, cursor):
+        return [q for q in cursor.executed if q.startswith("SET LOCAL hnsw.ef_search")]
+
+    def test_tuned_per_insurer(self):
+        conn, cursor = self._make_mock_conn([
+            {"insurer_code": "SAMSUNG", "doc_type": "가입설계서", "ef_search": 200},
+            {"insurer_code": "MERITZ", "doc_type": "가입설계서", "ef_search": 20},
+        ])
+
+        get_compare_axis_vector(conn, ["SAMSUNG", "MERITZ", "DB"], ["가입설계서"], [0.0])
+
+        assert self._ef_settings(cursor) == [
+            "SET LOCAL hnsw.ef_search = 200",
+            "SET LOCAL hnsw.ef_search = 20",
+            "SET LOCAL hnsw.ef_search = 40",
+        ]
+
+    def test_explicit_ef_search_overrides(self):
+        conn, cursor = self._make_mock_conn([
+            {"insurer_code": "SAMSUNG", "doc_type": "가입설계서", "ef_search": 200},
+        ])
+
+        get_compare_axis_vector(conn, ["SAMSUNG"], ["가입설계서"], [0.0], ef_search=80)
+
+        assert self._ef_settings(cursor) == ["SET LOCAL hnsw.ef_search = 80"]
+        assert not any("hnsw_ef_search_tuning" in q for q in cursor.executed)
+
+    def test_disabled_uses_env_default(self, monkeypatch):
+        monkeypatch.setenv("COMPARE_AXIS_EF_SEARCH_TUNED", "0")
+        monkeypatch.setenv("COMPARE_AXIS_EF_SEARCH", "64")
+        conn, cursor = self._make_mock_conn([
+            {"insurer_code": "SAMSUNG", "doc_type": "가입설계서", "ef_search": 200},
+        ])
+
+        get_compare_axis_vector(conn, ["SAMSUNG"], ["가입설계서"], [0.0])
+
+        assert self._ef_settings(cursor) == ["SET LOCAL hnsw.ef_search = 64"]
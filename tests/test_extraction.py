@@ -103,7 +103,7 @@ class TestConditionExtractor:
         result = extract_condition_snippet("")
 
         assert result.snippet is None
-        assert result.matched_terms == []
+        assert result.matched_terms == ()
 
     def test_extract_condition_no_keywords(self):
         """키워드 없는 텍스트는 None 반환"""
@@ -111,7 +111,7 @@ class TestConditionExtractor:
         result = extract_condition_snippet(text)
 
         assert result.snippet is None
-        assert result.matched_terms == []
+        assert result.matched_terms == ()
 
     def test_extract_condition_truncate_long(self):
         """120자 초과 시 잘림"""
@@ -0,0 +1,125 @@
+"""
+STEP 4.23: rule extractor 마이크로 벤치마크 테스트
+
+- 고정 corpus 샘플 로드 / 케이스 구성 (요청 경로 extractor 전체)
+- 측정 결과 형식, 메모 설정 복원
+- baseline 비교 (ops/sec 하락 배수, p99 증가 배수)
+"""
+
+import pytest
+
+from services.extraction.extraction_bench import (
+    PII_SAMPLE_LINES,
+    BenchResult,
+    build_bench_cases,
+    check_bench,
+    get_extraction_bench_max_slowdown,
+    load_bench_corpus,
+    measure_case,
+    run_bench,
+)
+from services.extraction.extraction_memo import is_extraction_memo_enabled
+from services.extraction.llm_client import get_llm_max_chars_per_call
+
+
+@pytest.fixture(scope="module")
+def corpus():
+    return load_bench_corpus()
+
+
+class TestBenchCorpus:
+    """STEP 4.23: 고정 corpus 샘플 / 케이스"""
+
+    def test_corpus_covers_doc_types(self, corpus):
+        assert {chunk.doc_type for chunk in corpus.chunks} == {"가입설계서", "상품요약서", "사업방법서", "약관"}
+        assert corpus.requests
+
+    def test_cases(self, corpus):
+        cases = build_bench_cases(corpus)
+
+        assert list(cases) == [
+            "extract_amount[strict]",
+            "extract_amount[default]",
+            "extract_diagnosis_lump_sum",
+            "extract_surgery_amount",
+            "extract_condition_snippet",
+            "mask_pii",
+            "mask_pii[long]",
+            "extract_slots",
+            "CoverageExtractor.extract",
+        ]
+        assert len(cases["extract_slots"][1]) == len(corpus.requests)
+
+    def test_long_mask_pii_inputs(self, corpus):
+        """STEP 4.25: LLM 1회 입력 한도 길이 + PII 포함"""
+        func, calls = build_bench_cases(corpus)["mask_pii[long]"]
+
+        assert len(calls) == len(corpus.chunks)
+        for args, _ in calls:
+            assert len(args[0]) == get_llm_max_chars_per_call()
+            assert func(*args).mask_count >= len(PII_SAMPLE_LINES)
+
+    def test_slot_inputs_fill_slots(self, corpus):
+        func, calls = build_bench_cases(corpus)["extract_slots"]
+        args, kwargs = calls[0]
+
+        slots = func(*args, **kwargs)
+        assert any(ins.value for slot in slots for ins in slot.insurers)
+
+
+class TestMeasure:
+    """STEP 4.23: 측정"""
+
+    def test_measure_case(self):
+        result = measure_case("noop", (len, [(("abc",), {})] * 10), rounds=3)
+
+        assert result.calls == 30
+        assert result.ops_per_sec > 0
+        assert result.p99_us >= result.p50_us
+
+    def test_run_bench_restores_memo(self, corpus, monkeypatch):
+        monkeypatch.delenv("EXTRACTION_MEMO_ENABLED", raising=False)
+
+        results = run_bench(corpus, rounds=1, names=["mask_pii", "extract_condition_snippet"])
+
+        assert [r.name for r in results] == ["extract_condition_snippet", "mask_pii"]
+        assert all(r.calls == len(corpus.chunks) for r in results)
+        assert is_extraction_memo_enabled()
+
+
+class TestCheckBench:
+    """STEP 4.23: baseline 비교"""
+
+    BASELINE = {"ops_per_sec": 1000.0, "p99_us": 100.0}
+
+    def _result(self, ops_per_sec, p99_us):
+        return BenchResult(name="case", calls=100, ops_per_sec=ops_per_sec, p50_us=10.0, p99_us=p99_us)
+
+    def test_no_baseline(self):
+        assert check_bench(self._result(1.0, 1e6), None) == []
+
+    def test_within_threshold(self):
+        assert check_bench(self._result(700.0, 250.0), self.BASELINE) == []
+
+    def test_slowdown(self):
+        violations = check_bench(self._result(600.0, 100.0), self.BASELINE)
+
+        assert len(violations) == 1
+        assert violations[0].startswith("ops/sec")
+
+    def test_configurable_slowdown(self):
+        assert check_bench(self._result(900.0, 100.0), self.BASELINE, {"max_slowdown": 1.05})
+        assert not check_bench(self._result(600.0, 100.0), self.BASELINE, {"max_slowdown": 2.0})
+
+    def test_p99(self):
+        violations = check_bench(self._result(1000.0, 400.0), self.BASELINE)
+
+        assert violations == ["p99 400.0us > 3.0x baseline 100.0us"]
+
+    def test_p99_noise_floor(self):
+        assert check_bench(self._result(1000.0, 40.0), {"ops_per_sec": 1000.0, "p99_us": 5.0}) == []
+
+    def test_max_slowdown_env(self, monkeypatch):
+        monkeypatch.setenv("EXTRACTION_BENCH_MAX_SLOWDOWN", "1.2")
+
+        assert get_extraction_bench_max_slowdown() == 1.2
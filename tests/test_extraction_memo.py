@@ -0,0 +1,203 @@
+"""
+STEP 4.18: rule extractor 메모이제이션 테스트
+
+- 메모 결과 = 원본 함수 결과 (extractor / doc_type 조합 전체)
+- 키: extractor 이름 / 버전 / 인자(기본값 포함) / 텍스트 해시
+- 결과는 frozen, 용량은 추정 바이트로 제한 (LRU)
+"""
+
+import dataclasses
+
+import pytest
+
+from services.extraction.amount_extractor import (
+    extract_amount,
+    extract_diagnosis_lump_sum,
+    extract_surgery_amount,
+    extract_surgery_count_limit,
+)
+from services.extraction.condition_extractor import extract_condition_snippet
+from services.extraction.extraction_memo import (
+    ExtractionMemo,
+    clear_extraction_memo,
+    estimate_bytes,
+    get_extraction_memo,
+    memoize_extractor,
+)
+
+
+MEMOIZED = [
+    extract_amount,
+    extract_condition_snippet,
+    extract_diagnosis_lump_sum,
+    extract_surgery_amount,
+    extract_surgery_count_limit,
+]
+
+DOC_TYPES = [None, "가입설계서", "상품요약서", "사업방법서"]
+
+TEXTS = [
+    "",
+    "   ",
+    "보험금 지급 사유",
+    "암진단비 3,000만원",
+    "담보명 가입금액 보험료(원)\n암진단비(유사암제외) 3,000만원 12,340원\n유사암진단비 600만원 1,200원",
+    "질병수술비 100만원 (연 1회 한도), 통산 10회",
+    "1억 2천 만 원 사망보험금, 입원일당 3만원",
+    "암 진단 확정 시 최초 1회한 일시금 지급. 90일 면책기간 후 보장; 갑상선암은 20% 감액",
+    "보험료 15,000원 (월납) 납입기간 20년",
+    "수술 1회당 200만원, 다빈치 로봇수술 500만원",
+]
+
+
+@pytest.fixture(autouse=True)
+def _reset_memo(monkeypatch):
+    monkeypatch.delenv("EXTRACTION_MEMO_ENABLED", raising=False)
+    monkeypatch.delenv("EXTRACTION_MEMO_MAX_BYTES", raising=False)
+    clear_extraction_memo()
+    yield
+    clear_extraction_memo()
+
+
+def _call(func, text, doc_type):
+    if func in (extract_condition_snippet, extract_surgery_count_limit):
+        return func(text)
+    return func(text, doc_type=doc_type)
+
+
+def _call_uncached(func, text, doc_type):
+    if func in (extract_condition_snippet, extract_surgery_count_limit):
+        return func.__wrapped__(text)
+    return func.__wrapped__(text, doc_type=doc_type)
+
+
+class TestCachedEqualsUncached:
+    """STEP 4.18: 메모 결과 = 원본 결과"""
+
+    @pytest.mark.parametrize("func", MEMOIZED, ids=lambda f: f.extractor_name)
+    @pytest.mark.parametrize("doc_type", DOC_TYPES)
+    def test_equal(self, func, doc_type):
+        for text in TEXTS:
+            expected = _call_uncached(func, text, doc_type)
+
+            assert _call(func, text, doc_type) == expected  # miss → 저장
+            assert _call(func, text, doc_type) == expected  # hit
+
+        stats = get_extraction_memo().stats()["extractors"][func.extractor_name]
+        assert stats["hits"] == len(TEXTS)
+        assert stats["misses"] == len(TEXTS)
+
+    def test_doc_type_in_key(self):
+        text = TEXTS[4]
+
+        strict = extract_amount(text, doc_type="가입설계서")
+        default = extract_amount(text)
+        assert strict == extract_amount.__wrapped__(text, doc_type="가입설계서")
+        assert default == extract_amount.__wrapped__(text)
+        assert get_extraction_memo().stats()["extractors"]["amount"]["misses"] == 2
+
+    def test_positional_and_keyword_share_entry(self):
+        text = TEXTS[3]
+
+        first = extract_amount(text, "가입설계서")
+        assert extract_amount(text, doc_type="가입설계서") is first
+        assert extract_surgery_amount(text) is extract_surgery_amount(text, None)
+
+    def test_disabled(self, monkeypatch):
+        monkeypatch.setenv("EXTRACTION_MEMO_ENABLED", "0")
+
+        assert get_extraction_memo() is None
+        assert extract_amount(TEXTS[3]) == extract_amount.__wrapped__(TEXTS[3])
+
+
+class TestFrozenResults:
+    """STEP 4.18: 공유 결과는 변경 불가"""
+
+    @pytest.mark.parametrize("func", MEMOIZED, ids=lambda f: f.extractor_name)
+    def test_frozen(self, func):
+        result = _call(func, TEXTS[4], "가입설계서")
+        first_field = dataclasses.fields(result)[0].name
+
+        with pytest.raises(dataclasses.FrozenInstanceError):
+            setattr(result, first_field, None)
+
+    def test_frozen_with_mutable_field_not_stored(self):
+        @dataclasses.dataclass(frozen=True)
+        class Terms:
+            terms: list[str]
+
+        @memoize_extractor("test_frozen_list", version="1")
+        def extract_terms(text):
+            return Terms(text.split())
+
+        assert extract_terms("a b") is not extract_terms("a b")
+
+    def test_condition_terms_shared_as_tuple(self):
+        result = extract_condition_snippet("최초 1회 진단확정 시 지급합니다.")
+
+        assert isinstance(result.matched_terms, tuple)
+        assert extract_condition_snippet("최초 1회 진단확정 시 지급합니다.") is result
+
+    def test_mutable_result_not_stored(self):
+        @memoize_extractor("test_mutable", version="1")
+        def extract_words(text):
+            return text.split()
+
+        assert extract_words("a b") == ["a", "b"]
+        assert extract_words("a b") is not extract_words("a b")
+        assert get_extraction_memo().stats()["extractors"]["test_mutable"]["skipped"] == 3
+
+
+class TestExtractionMemo:
+    """STEP 4.18: 바이트 상한 LRU"""
+
+    def test_version_in_key(self):
+        calls = []
+
+        def _extract(text):
+            calls.append(text)
+            return len(text)
+
+        v1 = memoize_extractor("test_version", version="1")(_extract)
+        v2 = memoize_extractor("test_version", version="2")(_extract)
+
+        assert v1("abc") == v2("abc") == 3
+        assert v1("abc") == 3
+        assert calls == ["abc", "abc"]
+
+    def test_byte_cap_evicts_lru(self):
+        value = extract_amount(TEXTS[3])
+        entry_bytes = estimate_bytes(("amount", "1", None, b"0" * 16)) + estimate_bytes(value)
+        memo = ExtractionMemo(max_bytes=entry_bytes * 2)
+
+        memo.put(("amount", "1", None, b"a" * 16), value)
+        memo.put(("amount", "1", None, b"b" * 16), value)
+        memo.get(("amount", "1", None, b"a" * 16))  # 최근 사용으로 갱신
+        memo.put(("amount", "1", None, b"c" * 16), value)
+
+        assert len(memo) == 2
+        assert memo.bytes <= memo.max_bytes
+        assert memo.get(("amount", "1", None, b"a" * 16)) is value
+        assert memo.stats()["extractors"]["amount"]["evictions"] == 1
+
+    def test_oversized_value_skipped(self):
+        memo = ExtractionMemo(max_bytes=64)
+
+        memo.put(("amount", "1", None, b"a" * 16), extract_amount(TEXTS[3]))
+        assert len(memo) == 0
+        assert memo.stats()["extractors"]["amount"]["skipped"] == 1
+
+    def test_max_bytes_env(self, monkeypatch):
+        monkeypatch.setenv("EXTRACTION_MEMO_MAX_BYTES", "1024")
+
+        assert get_extraction_memo().max_bytes == 1024
+
+    def test_hit_rate(self):
+        extract_amount(TEXTS[3])
+        extract_amount(TEXTS[3])
+        extract_amount(TEXTS[3])
+
+        stats = get_extraction_memo().stats()
+        assert stats["extractors"]["amount"]["hit_rate"] == round(2 / 3, 4)
+        assert stats["entries"] == 1
+        assert stats["bytes"] > 0
@@ -274,6 +274,34 @@ class TestRefineAmountWithLLM:
         assert debug_info["called"]
         assert "hallucination" in debug_info["reason"]
 
+    @pytest.mark.asyncio
+    async def test_span_with_mask_token_upgrade(self):
+        """LLM은 마스킹된 chunk를 보므로 마스크 토큰이 든 span도 검증 통과 (원문 위치 기록)"""
+        preview_text = "문의 010-1234-5678 / 암진단비 1,000만원 지급"
+        cell = _make_cell(
+            "SAMSUNG",
+            [_make_evidence("가입설계서", None, "medium", preview_text)],
+        )
+
+        fake_llm = FakeLLMClient(responses={
+            "CANCER_DIAGNOSIS": _make_fake_llm_response(
+                "CANCER_DIAGNOSIS", "benefit_amount", 10_000_000, "medium", "[전화번호] / 암진단비 1,000만원"
+            )
+        })
+
+        updated_cell, debug_info = await refine_amount_with_llm_if_needed(
+            cell=cell,
+            insurer_code="SAMSUNG",
+            coverage_code="CANCER_DIAGNOSIS",
+            query="암진단비 얼마",
+            llm_client=fake_llm,
+        )
+
+        assert "010-1234-5678" not in fake_llm.call_history[0]["user_prompt"]
+        assert updated_cell.resolved_amount is not None
+        span = debug_info["span_original"]
+        assert preview_text[span["start"]:span["end"]] == "010-1234-5678 / 암진단비 1,000만원"
+
     @pytest.mark.asyncio
     async def test_unknown_label_no_upgrade(self):
         """label이 unknown이면 업그레이드 안함"""
@@ -0,0 +1,155 @@
+"""
+STEP 4.25: PII 단일 스캔 (PII_SCANNER) / 위치 맵 테스트
+
+- mask_pii 결과 = 유형별 순차 마스킹 (rrn → email → phone → account) 결과
+- MaskResult.spans: 마스킹 텍스트 토큰 위치 ↔ 원문 위치
+- find_span_in_text / find_masked_span: 공백 정규화 span 검색 + 마스킹 텍스트 → 원문 구간
+"""
+
+import random
+
+import pytest
+
+from services.extraction.llm_client import find_masked_span, find_span_in_text, validate_span_in_text
+from services.extraction.pii_masker import (
+    MASK_TOKENS,
+    mask_account,
+    mask_email,
+    mask_phone,
+    mask_pii,
+    mask_rrn,
+    scan_pii,
+)
+
+
+def _sequential(text: str) -> tuple[str, int]:
+    """STEP 4.25 이전 mask_pii (유형별 순차 치환)"""
+    total = 0
+    for mask in (mask_rrn, mask_email, mask_phone, mask_account):
+        text, count = mask(text)
+        total += count
+    return text, total
+
+
+_FRAGMENTS = [
+    "850101-1234567", "8501011234567", "850101 1234567", "010-1234-5678", "01012345678",
+    "02-123-4567", "agent@example.com", "a.b@c.co.kr", "123-456-789012", "1234567890123",
+    "12", "-", " ", "  ", "\n", "@", "보험료", "가입금액 3,000만원", "연락처", "x",
+]
+
+
+class TestSequentialEquivalence:
+    """STEP 4.25: 순차 마스킹과 같은 결과"""
+
+    @pytest.mark.parametrize("text", [
+        "주민번호 850101-1234567 연락처 010-1234-5678",
+        "12 850101-1234567",                   # 계좌 후보가 주민번호를 포함
+        "계좌 123-456-789012 agent@example.com",
+        "850101-1234567agent@example.com",      # 인접
+        "01012345678901234",                   # 전화 / 계좌 경계
+        "",
+    ])
+    def test_cases(self, text):
+        result = mask_pii(text)
+
+        assert (result.masked_text, result.mask_count) == _sequential(text)
+
+    def test_fuzz(self):
+        rng = random.Random(25)
+        for _ in range(3000):
+            text = "".join(rng.choice(_FRAGMENTS) for _ in range(rng.randint(1, 12)))
+            result = mask_pii(text)
+            assert (result.masked_text, result.mask_count) == _sequential(text), text
+
+    def test_no_pii_returns_same_text(self):
+        text = "암진단비 가입금액 3,000만원"
+
+        result = mask_pii(text)
+        assert result.masked_text is text
+        assert result.spans == []
+
+
+class TestSpanMap:
+    """STEP 4.25: 마스킹 위치 ↔ 원문 위치"""
+
+    TEXT = "계약자 850101-1234567 / 연락처 010-1234-5678 / agent@example.com"
+
+    def test_spans(self):
+        result = mask_pii(self.TEXT)
+
+        assert [s.kind for s in result.spans] == ["rrn", "phone", "email"]
+        for span in result.spans:
+            assert result.masked_text[span.masked_start:span.masked_end] == MASK_TOKENS[span.kind]
+        assert [(k, self.TEXT[s:e]) for k, s, e in scan_pii(self.TEXT)] == [
+            ("rrn", "850101-1234567"),
+            ("phone", "010-1234-5678"),
+            ("email", "agent@example.com"),
+        ]
+
+    def test_original_span(self):
+        result = mask_pii(self.TEXT)
+        masked = result.masked_text
+
+        start = masked.index("연락처")
+        assert self.TEXT[slice(*result.original_span(start, start + 3))] == "연락처"
+
+        # 토큰 전체 → 원문 PII 전체
+        phone = result.spans[1]
+        original = result.original_span(phone.masked_start, phone.masked_end)
+        assert self.TEXT[slice(*original)] == "010-1234-5678"
+
+        assert result.original_offset(len(masked)) == len(self.TEXT)
+
+
+class TestFindSpanInText:
+    """STEP 4.25: 공백 정규화 span 검색"""
+
+    CHUNK = "암진단비\n  가입금액   1,000  만원 지급"
+
+    def test_original_offsets(self):
+        start, end = find_span_in_text("1,000 만원", self.CHUNK)
+
+        assert self.CHUNK[start:end] == "1,000  만원"
+        assert find_span_in_text("가입금액 1,000", self.CHUNK) == (self.CHUNK.index("가입금액"), self.CHUNK.index("1,000") + 5)
+
+    def test_not_found(self):
+        assert find_span_in_text("2억원", self.CHUNK) is None
+        assert find_span_in_text("   ", self.CHUNK) is None
+        assert find_span_in_text(None, self.CHUNK) is None
+
+    def test_validate_matches_normalized_comparison(self):
+        rng = random.Random(50)
+        words = ["1,000", "만원", "암", "진단비", "00"]
+        for _ in range(500):
+            chunk = "".join(rng.choice(words + [" ", "  ", "\n"]) for _ in range(rng.randint(1, 10)))
+            span = " ".join(rng.choice(words) for _ in range(rng.randint(1, 3)))
+            expected = " ".join(span.split()) in " ".join(chunk.split())
+            assert validate_span_in_text(span, chunk) == expected, (span, chunk)
+
+
+class TestFindMaskedSpan:
+    """STEP 4.25: LLM span(마스킹 텍스트 기준) → 원문 구간"""
+
+    CHUNK = "상담 문의 010-1234-5678 (평일)\n암진단비 가입금액  1,000만원"
+
+    def test_span_with_mask_token(self):
+        result = mask_pii(self.CHUNK)
+
+        # LLM은 마스킹된 chunk만 보므로 span에 토큰이 포함될 수 있음
+        assert not validate_span_in_text("문의 [전화번호] (평일)", self.CHUNK)
+        start, end = find_masked_span("문의 [전화번호] (평일)", result)
+
+        assert self.CHUNK[start:end] == "문의 010-1234-5678 (평일)"
+
+    def test_span_after_mask(self):
+        result = mask_pii(self.CHUNK)
+        start, end = find_masked_span("가입금액 1,000만원", result)
+
+        assert self.CHUNK[start:end] == "가입금액  1,000만원"
+
+    def test_not_found(self):
+        result = mask_pii(self.CHUNK)
+
+        # 원문 PII는 LLM이 볼 수 없음 → 환각
+        assert find_masked_span("010-1234-5678", result) is None
+        assert find_masked_span(None, result) is None
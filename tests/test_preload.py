@@ -0,0 +1,63 @@
+"""
+STEP 4.11: pre-fork 공유 캐시 preload 테스트
+
+- config/*.yaml 전체가 프로세스 캐시에 남는지
+- DB가 없어도 preload가 실패하지 않는지 (워커가 lazy 로드)
+"""
+
+import gc
+
+import pytest
+
+from api import config_loader, preload
+from services.retrieval import db_router
+
+
+@pytest.fixture(autouse=True)
+def reset_preload(monkeypatch):
+    monkeypatch.setattr(preload, "_preloaded", None)
+    config_loader.clear_cache()
+    yield
+    config_loader.clear_cache()
+
+
+class TestConfigPreload:
+    """STEP 4.11: config YAML preload"""
+
+    def test_all_files_cached(self):
+        filenames = config_loader.preload()
+
+        assert "coverage_domain.yaml" in filenames
+        assert "mappings/insurer_alias.yaml" in filenames
+        assert config_loader._load_yaml.cache_info().currsize == len(filenames)
+
+        config_loader.get_coverage_domains()
+        assert config_loader._load_yaml.cache_info().misses == len(filenames)
+
+
+def _refuse(*args, **kwargs):
+    raise OSError("connection refused")
+
+
+class TestPreloadSharedCaches:
+    """STEP 4.11: fork 전 preload"""
+
+    def test_database_unavailable(self, monkeypatch):
+        monkeypatch.setattr(db_router, "connect_read", _refuse)
+
+        result = preload.preload_shared_caches(freeze=False)
+
+        assert "database" in result.errors
+        assert result.corpus_version is None
+        assert {"modules", "config"} <= set(result.timings_ms)
+        assert preload.get_preloaded_corpus_version() is None
+
+    def test_freeze(self, monkeypatch):
+        monkeypatch.setattr(db_router, "connect_read", _refuse)
+
+        try:
+            result = preload.preload_shared_caches(freeze=True)
+            assert result.frozen_objects > 0
+            assert gc.get_freeze_count() > 0
+        finally:
+            gc.unfreeze()
@@ -0,0 +1,208 @@
+"""
+STEP 4.3: Hot retrieval SQL 쿼리 플랜 회귀 가드 테스트
+
+- EXPLAIN JSON 요약 / 판정 단위 테스트
+- ExplainCapture: 원래 쿼리 실행 전 EXPLAIN 캡처
+- QUERY_PLAN_DATABASE_URL이 설정된 경우 합성 corpus 대상 실제 플랜 판정
+"""
+
+import json
+import os
+from pathlib import Path
+from unittest.mock import MagicMock
+
+import pytest
+import yaml
+
+from services.retrieval.query_plan import (
+    EXPLAIN_PREFIX,
+    ExplainCapture,
+    PlanSummary,
+    check_plan,
+    summarize_plans,
+)
+
+
+FIXTURES_DIR = Path(__file__).parent / "fixtures"
+BASELINE_PATH = Path(__file__).parent.parent / "artifacts" / "bench" / "query_plan_baseline.json"
+
+
+def _plan(root: dict, execution_ms: float = 1.0) -> dict:
+    return {"Plan": root, "Execution Time": execution_ms, "Planning Time": 0.5}
+
+
+INDEX_PLAN = _plan({
+    "Node Type": "Nested Loop",
+    "Shared Hit Blocks": 40,
+    "Shared Read Blocks": 2,
+    "Plans": [
+        {
+            "Node Type": "Index Scan",
+            "Relation Name": "insurer",
+            "Index Name": "idx_insurer_code",
+            "Plan Rows": 1,
+            "Actual Rows": 1,
+        },
+        {
+            "Node Type": "Bitmap Heap Scan",
+            "Relation Name": "chunk",
+            "Plan Rows": 50,
+            "Actual Rows": 40,
+            "Plans": [
+                {
+                    "Node Type": "Bitmap Index Scan",
+                    "Index Name": "idx_chunk_insurer_doctype",
+                    "Plan Rows": 50,
+                    "Actual Rows": 40,
+                },
+            ],
+        },
+    ],
+}, execution_ms=2.0)
+
+SEQ_PLAN = _plan({
+    "Node Type": "Seq Scan",
+    "Relation Name": "chunk",
+    "Shared Hit Blocks": 900,
+    "Shared Read Blocks": 0,
+    "Plan Rows": 5,
+    "Actual Rows": 5000,
+}, execution_ms=30.0)
+
+
+class TestSummarizePlans:
+    """STEP 4.3: EXPLAIN JSON 요약"""
+
+    def test_index_plan(self):
+        summary = summarize_plans([INDEX_PLAN])
+
+        assert summary.statements == 1
+        assert summary.index_names == ["idx_insurer_code", "idx_chunk_insurer_doctype"]
+        assert summary.seq_scan_relations == []
+        assert summary.shared_blocks == 42
+        assert summary.execution_ms == 2.0
+        assert summary.max_row_estimate_error == 1.25
+
+    def test_multiple_statements_accumulate(self):
+        summary = summarize_plans([INDEX_PLAN, SEQ_PLAN])
+
+        assert summary.statements == 2
+        assert summary.seq_scan_relations == ["chunk"]
+        assert summary.shared_blocks == 942
+        assert summary.execution_ms == 32.0
+        assert summary.max_row_estimate_error == 1000.0
+
+
+class TestCheckPlan:
+    """STEP 4.3: 기대치 / baseline 판정"""
+
+    CASE = {
+        "forbid_seq_scan": ["chunk"],
+        "expect_index_any": ["idx_chunk_insurer_doctype", "idx_chunk_insurer"],
+    }
+
+    def test_pass(self):
+        assert check_plan(summarize_plans([INDEX_PLAN]), self.CASE) == []
+
+    def test_seq_scan_and_missing_index(self):
+        violations = check_plan(summarize_plans([SEQ_PLAN]), self.CASE)
+
+        assert any("Seq Scan on chunk" in v for v in violations)
+        assert any("expected indexes" in v for v in violations)
+        assert any("row estimate error" in v for v in violations)
+
+    def test_buffer_regression(self):
+        summary = PlanSummary(index_names=["idx_chunk_insurer"], shared_hit_blocks=300)
+
+        violations = check_plan(summary, self.CASE, baseline={"shared_blocks": 100})
+        assert violations == ["shared blocks 300 > 2.0x baseline 100"]
+
+        assert check_plan(
+            summary, self.CASE, baseline={"shared_blocks": 100},
+            thresholds={"max_buffer_ratio": 5.0},
+        ) == []
+
+    def test_time_regression_ignores_fast_queries(self):
+        case = {"expect_index_any": []}
+
+        fast = PlanSummary(execution_ms=4.0)
+        assert check_plan(fast, case, baseline={"execution_ms": 0.5}) == []
+
+        slow = PlanSummary(execution_ms=40.0)
+        assert check_plan(slow, case, baseline={"execution_ms": 10.0}) == [
+            "execution 40.0ms > 3.0x baseline 10.0ms"
+        ]
+
+
+class TestExplainCapture:
+    """STEP 4.3: 조회 쿼리마다 EXPLAIN 후 원래 쿼리 실행"""
+
+    def test_explain_then_execute(self):
+        cursor = MagicMock()
+        cursor.executed = []
+        cursor.execute = lambda q, p=None: cursor.executed.append((q, p))
+        cursor.fetchone = lambda: {"QUERY PLAN": json.dumps([INDEX_PLAN])}
+        cursor.fetchall = lambda: [{"x": 1}]
+
+        conn = MagicMock()
+        conn.cursor.return_value.__enter__ = MagicMock(return_value=cursor)
+        conn.cursor.return_value.__exit__ = MagicMock(return_value=False)
+
+        capture = ExplainCapture(conn)
+        with capture.cursor() as cur:
+            cur.execute("SELECT 1 WHERE x = %s", (1,))
+            rows = cur.fetchall()
+            cur.execute("SET LOCAL enable_seqscan = off")
+
+        assert rows == [{"x": 1}]
+        assert cursor.executed == [
+            (EXPLAIN_PREFIX + "SELECT 1 WHERE x = %s", (1,)),
+            ("SELECT 1 WHERE x = %s", (1,)),
+            ("SET LOCAL enable_seqscan = off", None),
+        ]
+        assert capture.plans == [INDEX_PLAN]
+
+
+@pytest.mark.skipif(
+    not os.environ.get("QUERY_PLAN_DATABASE_URL"),
+    reason="QUERY_PLAN_DATABASE_URL not set (seed with tools/query_plan_guard.py seed)",
+)
+class TestQueryPlansLive:
+    """STEP 4.3: 합성 corpus 대상 실제 플랜 판정"""
+
+    @pytest.fixture(scope="class")
+    def conn(self):
+        import psycopg
+        from psycopg.rows import dict_row
+
+        from services.retrieval.query_plan import get_synthetic_chunk_count
+
+        conn = psycopg.connect(os.environ["QUERY_PLAN_DATABASE_URL"], row_factory=dict_row)
+        if get_synthetic_chunk_count(conn) == 0:
+            conn.close()
+            pytest.skip("synthetic corpus not seeded")
+        yield conn
+        conn.close()
+
+    @pytest.fixture(scope="class")
+    def config(self):
+        with open(FIXTURES_DIR / "query_plan_cases.yaml", encoding="utf-8") as f:
+            return yaml.safe_load(f)
+
+    def test_cases(self, conn, config):
+        from services.retrieval.query_plan import run_plan_case
+
+        baseline = {}
+        if BASELINE_PATH.exists():
+            baseline = json.loads(BASELINE_PATH.read_text(encoding="utf-8"))["cases"]
+
+        failures = {}
+        for case in config["cases"]:
+            summary = run_plan_case(conn, case, config.get("planner_settings"))
+            violations = check_plan(
+                summary, case, baseline.get(case["name"]), config.get("thresholds")
+            )
+            if violations:
+                failures[case["name"]] = violations
+
+        assert failures == {}
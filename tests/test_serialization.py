@@ -0,0 +1,119 @@
+"""
+STEP 4.15: /compare 응답 직렬화 fast path 테스트
+
+- orjson 직렬화 결과 = CompareResponseModel 직렬화 결과 (view별)
+- 직렬화 결과(JSON / MessagePack)는 CompareResponseModel 검증을 통과 (라우트는 재검증 안함)
+- Accept 헤더 협상 (MessagePack은 선택 의존성)
+- OpenAPI 스키마 유지
+"""
+
+import json
+
+import pytest
+from fastapi.testclient import TestClient
+
+from api import compare as compare_api
+from api import serialization
+from api.compare import CompareResponseModel, _response_payload
+from api.main import app
+from api.serialization import dumps_json, dumps_msgpack, negotiate_media_type
+from tests.test_compare_view import INSURERS, _result
+
+
+def _payload(view: str = "debug"):
+    return _response_payload(
+        _result(), INSURERS, "암진단비", {"insurer_scope_method": "request_explicit"},
+        result_token="token", view=view,
+    )
+
+
+class TestDumpsJson:
+    """STEP 4.15: dataclass payload 직접 직렬화"""
+
+    @pytest.mark.parametrize("view", ["ui", "full", "debug"])
+    def test_same_as_response_model(self, view):
+        payload = _payload(view)
+        expected = CompareResponseModel.model_validate(payload, from_attributes=True).model_dump(mode="json")
+
+        assert json.loads(dumps_json(payload)) == expected
+
+    def test_cell_resolved_amount_not_exposed(self):
+        cell = json.loads(dumps_json(_payload()))["coverage_compare_result"][0]["insurers"][0]
+        assert set(cell) == {"insurer_code", "doc_type_counts", "best_evidence"}
+
+    def test_debug_values(self):
+        payload = _payload()
+        payload["debug"]["non_str_keys"] = {1: "a"}
+        payload["debug"]["codes"] = {"A4200_1"}
+
+        debug = json.loads(dumps_json(payload))["debug"]
+        assert debug["non_str_keys"] == {"1": "a"}
+        assert debug["codes"] == ["A4200_1"]
+
+
+class TestResponseModelRoundTrip:
+    """STEP 4.15: fast path 출력이 응답 모델 계약을 지키는지 (view별)"""
+
+    @pytest.mark.parametrize("view", ["ui", "full", "debug"])
+    def test_json(self, view):
+        data = json.loads(dumps_json(_payload(view)))
+
+        model = CompareResponseModel.model_validate(data)
+        assert model.model_dump(mode="json") == data
+
+    @pytest.mark.parametrize("view", ["ui", "full", "debug"])
+    def test_msgpack(self, view):
+        msgpack = pytest.importorskip("msgpack")
+        payload = _payload(view)
+
+        data = msgpack.unpackb(dumps_msgpack(payload))
+
+        model = CompareResponseModel.model_validate(data)
+        assert model.model_dump(mode="json") == json.loads(dumps_json(payload))
+
+
+class TestNegotiateMediaType:
+    """STEP 4.15: Accept 협상"""
+
+    @pytest.fixture
+    def msgpack_available(self, monkeypatch):
+        monkeypatch.setattr(serialization, "is_msgpack_available", lambda: True)
+
+    @pytest.mark.parametrize("accept, expected", [
+        (None, "application/json"),
+        ("*/*", "application/json"),
+        ("application/msgpack", "application/msgpack"),
+        ("application/x-msgpack", "application/msgpack"),
+        ("application/json, application/msgpack", "application/json"),
+        ("application/msgpack, application/json", "application/msgpack"),
+        ("application/json;q=0.5, application/msgpack", "application/msgpack"),
+        ("application/msgpack;q=0", "application/json"),
+    ])
+    def test_negotiate(self, msgpack_available, accept, expected):
+        assert negotiate_media_type(accept) == expected
+
+    def test_json_without_msgpack(self, monkeypatch):
+        monkeypatch.setattr(serialization, "is_msgpack_available", lambda: False)
+        assert negotiate_media_type("application/msgpack") == "application/json"
+
+
+class TestCompareRoute:
+    """STEP 4.15: 라우트는 payload를 바로 직렬화"""
+
+    def test_json_response(self, monkeypatch):
+        async def fake_payload(request):
+            return _payload(request.view)
+
+        monkeypatch.setattr(compare_api, "build_compare_payload", fake_payload)
+        response = TestClient(app).post("/compare", json={"query": "암진단비", "view": "ui"})
+
+        assert response.status_code == 200
+        assert response.headers["content-type"] == "application/json"
+        assert response.json() == json.loads(dumps_json(_payload("ui")))
+
+    def test_openapi_schema_kept(self):
+        schema = TestClient(app).get("/openapi.json").json()
+        content = schema["paths"]["/compare"]["post"]["responses"]["200"]["content"]
+
+        assert content["application/json"]["schema"]["$ref"].endswith("/CompareResponseModel")
+        assert "application/msgpack" in content
@@ -0,0 +1,254 @@
+"""
+STEP 4.10: 보험사 shard + scatter-gather 테스트
+
+- shard map 파싱 / 보험사 그룹핑
+- scatter: shard별 실행, 소요시간, 예외 전파
+- gather: 단일 DB 조회와 같은 보험사 순서
+- shard writer: home 시퀀스 id 발급 / 카탈로그 행 복사
+- SHARD_TEST_HOME_URL / SHARD_TEST_SHARD_URL이 설정된 경우
+  로컬 Postgres 2대로 shard 조회 결과가 단일 DB 결과와 같은지 확인
+"""
+
+import os
+from dataclasses import asdict
+from unittest.mock import MagicMock
+
+import psycopg
+import pytest
+
+from services.ingestion.db_writer import DBWriter
+from services.retrieval import sharding
+from services.retrieval.compare_service import _gather_shard_results
+from services.retrieval.sharding import (
+    HOME_SHARD,
+    ShardConnections,
+    ShardMap,
+    parse_shard_map,
+    scatter,
+)
+
+
+SHARD_A = "postgresql://app@shard-a:5432/inca_rag"
+SHARD_B = "postgresql://app@shard-b:5432/inca_rag"
+
+
+def _shard_map():
+    return parse_shard_map({
+        "shards": {
+            "a": {"dsn": SHARD_A, "insurers": ["samsung", "LOTTE"]},
+            "b": {"dsn": SHARD_B, "insurers": ["KB"]},
+        }
+    })
+
+
+class TestShardMap:
+    """STEP 4.10: shard map 파싱 / 그룹핑"""
+
+    def test_group_keeps_input_order(self):
+        shard_map = _shard_map()
+
+        assert shard_map.group(["KB", "MERITZ", "SAMSUNG", "LOTTE"]) == {
+            "b": ["KB"],
+            HOME_SHARD: ["MERITZ"],
+            "a": ["SAMSUNG", "LOTTE"],
+        }
+        assert shard_map.dsn_for("lotte") == SHARD_A
+        assert shard_map.dsn_for("MERITZ") is None
+
+    def test_empty_map_is_unsharded(self):
+        assert not ShardMap().is_sharded
+        assert ShardMap().group(["SAMSUNG", "KB"]) == {HOME_SHARD: ["SAMSUNG", "KB"]}
+
+    def test_env_dsn(self, monkeypatch):
+        monkeypatch.setenv("SHARD_A_DATABASE_URL", SHARD_A)
+        shard_map = parse_shard_map({
+            "shards": {"a": {"dsn": "${SHARD_A_DATABASE_URL}", "insurers": ["KB"]}}
+        })
+        assert shard_map.dsn_for("KB") == SHARD_A
+
+    @pytest.mark.parametrize("data, message", [
+        ({"shards": {"a": {"dsn": "${SHARD_UNSET_URL}", "insurers": ["KB"]}}}, "unset"),
+        ({"shards": {"home": {"dsn": SHARD_A, "insurers": ["KB"]}}}, "reserved"),
+        ({"shards": {
+            "a": {"dsn": SHARD_A, "insurers": ["KB"]},
+            "b": {"dsn": SHARD_B, "insurers": ["kb"]},
+        }}, "mapped to both"),
+    ])
+    def test_invalid(self, monkeypatch, data, message):
+        monkeypatch.delenv("SHARD_UNSET_URL", raising=False)
+        with pytest.raises(ValueError, match=message):
+            parse_shard_map(data)
+
+
+class TestScatter:
+    """STEP 4.10: shard별 동시 실행"""
+
+    @pytest.fixture
+    def connections(self, monkeypatch):
+        monkeypatch.setattr(
+            psycopg, "connect", lambda dsn, **kwargs: MagicMock(name=dsn, dsn=dsn)
+        )
+        home = MagicMock(dsn="home")
+        return ShardConnections(_shard_map(), home)
+
+    def test_scatter_per_shard(self, connections):
+        results, timings = scatter(
+            connections,
+            ["SAMSUNG", "MERITZ", "KB", "LOTTE"],
+            lambda conn, insurers: (conn.dsn, insurers),
+        )
+
+        assert results == {
+            "a": (SHARD_A, ["SAMSUNG", "LOTTE"]),
+            HOME_SHARD: ("home", ["MERITZ"]),
+            "b": (SHARD_B, ["KB"]),
+        }
+        assert set(timings) == {"a", HOME_SHARD, "b"}
+
+    def test_shard_error_propagates(self, connections):
+        def stage(conn, insurers):
+            if conn.dsn == SHARD_B:
+                raise psycopg.OperationalError("shard down")
+            return insurers
+
+        with pytest.raises(psycopg.OperationalError):
+            scatter(connections, ["SAMSUNG", "KB"], stage)
+
+    def test_close_keeps_home(self, connections):
+        shard_conn = connections.get("a")
+        connections.close()
+
+        shard_conn.close.assert_called_once()
+        connections.get(HOME_SHARD).close.assert_not_called()
+
+
+class TestGather:
+    """STEP 4.10: shard 결과 병합"""
+
+    def test_list_results_in_insurer_order(self):
+        def evidence(insurer_code):
+            return MagicMock(insurer_code=insurer_code)
+
+        merged, counts = _gather_shard_results(
+            {
+                "a": ([evidence("LOTTE"), evidence("LOTTE")], {"LOTTE": 2}),
+                HOME_SHARD: ([evidence("SAMSUNG")], {"SAMSUNG": 1}),
+            },
+            ["SAMSUNG", "LOTTE"],
+        )
+
+        assert [e.insurer_code for e in merged] == ["SAMSUNG", "LOTTE", "LOTTE"]
+        assert counts == {"LOTTE": 2, "SAMSUNG": 1}
+
+    def test_dict_results_merged(self):
+        merged, timings = _gather_shard_results(
+            {
+                "a": ({("LOTTE", "A4200_1"): ["e1"]}, {"LOTTE": 1.5}),
+                HOME_SHARD: ({("SAMSUNG", "A4200_1"): ["e2"]}, {"SAMSUNG": 2.0}),
+            },
+            ["SAMSUNG", "LOTTE"],
+        )
+
+        assert merged == {("LOTTE", "A4200_1"): ["e1"], ("SAMSUNG", "A4200_1"): ["e2"]}
+        assert timings == {"LOTTE": 1.5, "SAMSUNG": 2.0}
+
+
+def _mock_conn(fetchone_values=(), fetchall_values=()):
+    cursor = MagicMock()
+    cursor.fetchone.side_effect = list(fetchone_values)
+    cursor.fetchall.side_effect = list(fetchall_values)
+
+    conn = MagicMock()
+    conn.cursor.return_value.__enter__ = MagicMock(return_value=cursor)
+    conn.cursor.return_value.__exit__ = MagicMock(return_value=False)
+    return conn, cursor
+
+
+class TestShardWriter:
+    """STEP 4.10: shard 적재 (카탈로그는 home)"""
+
+    def _writer(self, shard_conn, catalog_conn):
+        writer = DBWriter(SHARD_A, catalog_db_url="postgresql://app@home:5432/inca_rag")
+        writer._conn = shard_conn
+        writer._catalog_conn = catalog_conn
+        return writer
+
+    def test_home_writer_uses_own_connection(self):
+        writer = DBWriter("postgresql://app@home:5432/inca_rag")
+        writer._conn = MagicMock()
+
+        assert not writer.is_shard
+        assert writer.catalog_conn is writer._conn
+        assert writer._allocate_ids("chunk", "chunk_id", 3) is None
+
+    def test_chunk_ids_from_home_sequence(self):
+        shard_conn, shard_cursor = _mock_conn()
+        catalog_conn, _ = _mock_conn(fetchall_values=[[{"id": 101}, {"id": 102}]])
+        writer = self._writer(shard_conn, catalog_conn)
+
+        assert writer.insert_chunks_batch([{"document_id": 7}, {"document_id": 7}]) == 2
+
+        rows = shard_cursor.executemany.call_args.args[1]
+        assert [row["chunk_id"] for row in rows] == [101, 102]
+
+    def test_catalog_rows_copied_once(self):
+        shard_conn, shard_cursor = _mock_conn()
+        catalog_conn, _ = _mock_conn(fetchone_values=[
+            {"insurer_id": 3, "insurer_code": "LOTTE", "meta": {"a": 1}},
+            {"product_id": 9, "insurer_id": 3, "product_name": "P"},
+        ])
+        writer = self._writer(shard_conn, catalog_conn)
+
+        writer.ensure_catalog_rows(3, 9, None)
+        writer.ensure_catalog_rows(3, 9, None)
+
+        inserts = [call.args for call in shard_cursor.execute.call_args_list]
+        assert [sql.split(" (")[0] for sql, _ in inserts] == [
+            "INSERT INTO insurer",
+            "INSERT INTO product",
+        ]
+        assert isinstance(inserts[0][1][2], psycopg.types.json.Jsonb)
+
+
+@pytest.mark.skipif(
+    not (os.environ.get("SHARD_TEST_HOME_URL") and os.environ.get("SHARD_TEST_SHARD_URL")),
+    reason="SHARD_TEST_HOME_URL / SHARD_TEST_SHARD_URL not set",
+)
+class TestShardedCompareLive:
+    """
+    STEP 4.10: 로컬 Postgres 2대
+
+    SHARD_TEST_HOME_URL: 전체 corpus, SHARD_TEST_SHARD_URL: 같은 corpus 복사본
+    (LOTTE만 shard에서 조회하므로 같은 데이터면 단일 DB 결과와 같아야 함)
+    """
+
+    def test_same_response_as_single_db(self, tmp_path, monkeypatch):
+        from services.retrieval import compare_service
+        from services.retrieval.compare_service import compare
+
+        home = os.environ["SHARD_TEST_HOME_URL"]
+        monkeypatch.setattr(compare_service, "get_compare_cache", lambda: None)
+
+        def run():
+            response = compare(
+                insurers=["SAMSUNG", "LOTTE"], query="암진단비", db_url=home,
+            )
+            return [asdict(e) for e in response.compare_axis], response.debug
+
+        sharding.clear_shard_map()
+        expected, _ = run()
+
+        shard_map_path = tmp_path / "shards.yaml"
+        shard_map_path.write_text(
+            f"shards:\n  s1:\n    dsn: {os.environ['SHARD_TEST_SHARD_URL']}\n    insurers: [LOTTE]\n"
+        )
+        monkeypatch.setenv("INSURER_SHARD_MAP", str(shard_map_path))
+        sharding.clear_shard_map()
+        try:
+            actual, debug = run()
+        finally:
+            sharding.clear_shard_map()
+
+        assert actual == expected
+        assert debug["shards"] == {HOME_SHARD: ["SAMSUNG"], "s1": ["LOTTE"]}
+        assert set(debug["shard_timing_ms"]["compare_axis"]) == {HOME_SHARD, "s1"}
@@ -0,0 +1,340 @@
+"""
+STEP 4.19: 슬롯 규칙 컴파일 테스트
+
+- KeywordSet / EvidenceFeatures: 기존 `kw in preview` / `kw.lower() in preview_lower` 의미 유지
+- STEP 4.20: SlotVocabulary hit set 공유, doc_type 우선순위 / page 순서 feature
+- compile_slot_rules: 응답 slot_key / stub 제외 / 인자 전달 / 잘못된 정의
+- slot_definitions.yaml과 코드 내 fallback 정의는 같은 규칙으로 컴파일
+- extract_slots: 규칙 순서대로 슬롯 생성, query 트리거, slot_key별 시간
+"""
+
+from dataclasses import dataclass
+
+import pytest
+
+from services.extraction import slot_extractor
+from services.extraction.slot_extractor import (
+    SLOT_DEFINITIONS_BY_COVERAGE_TYPE,
+    SUBTYPE_QUERY_KEYWORDS,
+    SURGERY_METHOD_QUERY_KEYWORDS,
+    HOSPITAL_TIER_QUERY_KEYWORDS,
+    MINOR_EXCLUSION_QUERY_KEYWORDS,
+    SURGERY_GRADE_QUERY_KEYWORDS,
+    clear_slot_rules,
+    extract_slots,
+    get_slot_query_conditions,
+    get_slot_rules,
+    load_slot_definitions_from_yaml,
+)
+from services.extraction.slot_rules import (
+    EvidenceFeatureCache,
+    EvidenceFeatures,
+    KeywordSet,
+    SlotVocabulary,
+    compile_slot_rules,
+)
+
+
+@dataclass
+class MockEvidence:
+    document_id: int
+    doc_type: str
+    page_start: int
+    preview: str
+    chunk_id: int | None = None
+
+
+@dataclass
+class MockAxisItem:
+    insurer_code: str
+    evidence: list
+
+
+@pytest.fixture(autouse=True)
+def _reset_rules():
+    clear_slot_rules()
+    yield
+    clear_slot_rules()
+
+
+def _rule_signature(rules):
+    return {
+        coverage_type: [
+            (r.slot_key, r.label, r.comparable, r.extractor, r.evidence, r.query_trigger, r.params)
+            for r in ct_rules
+        ]
+        for coverage_type, ct_rules in rules.coverage_types.items()
+    }
+
+
+class TestKeywordSet:
+    """STEP 4.19: 키워드 matcher"""
+
+    def test_raw_match(self):
+        keywords = KeywordSet(["상급종합병원", "종합병원", "의원"])
+        scan = _features("종합병원 이상에서 상급종합병원 수술 시")
+
+        assert keywords.any_in(scan)
+        assert keywords.first_in(scan) == "상급종합병원"  # 위치가 아니라 목록 순서
+        assert keywords.all_in(scan) == ["상급종합병원", "종합병원"]
+
+    def test_lower_match(self):
+        keywords = KeywordSet(["Da Vinci", "로봇수술"], lower=True)
+        scan = _features("DA VINCI 로봇을 이용한 수술")
+
+        assert keywords.keywords == ("da vinci", "로봇수술")
+        assert keywords.first_in(scan) == "da vinci"
+        assert scan.find("da vinci", lower=True) == 0
+        assert not KeywordSet(["Da Vinci"]).any_in(scan)  # raw는 대소문자 구분
+
+    def test_no_match(self):
+        keywords = KeywordSet(["제자리암"])
+        scan = _features("암진단비 3,000만원")
+
+        assert not keywords.any_in(scan)
+        assert keywords.first_in(scan) is None
+        assert keywords.all_in(scan) == []
+
+    def test_search_text(self):
+        keywords = KeywordSet(["제외", "면책"])
+
+        assert keywords.search("90일 면책기간")
+        assert not keywords.search("보장 개시")
+
+    def test_features_shared_per_evidence(self):
+        cache = EvidenceFeatureCache()
+        ev = MockEvidence(1, "약관", 1, "Carcinoma In Situ")
+
+        features = cache.get(ev)
+        assert cache.get(ev) is features
+        assert features.lower == "carcinoma in situ"
+        assert cache.get(MockEvidence(1, "약관", 1, "Carcinoma In Situ")) is not features
+
+    def test_views_shared_per_list(self):
+        cache = EvidenceFeatureCache()
+        evidence = [MockEvidence(1, "약관", 1, "a"), MockEvidence(2, "가입설계서", 2, "b")]
+
+        views = cache.views(evidence)
+        assert cache.views(evidence) is views
+        assert [v.evidence for v in views] == evidence
+        assert cache.views(list(evidence)) == views  # 다른 목록이어도 evidence feature는 공유
+
+
+class TestSlotVocabulary:
+    """STEP 4.20: 어휘별 hit set 공유"""
+
+    vocabulary = SlotVocabulary("method", ["다빈치", "Da Vinci", "로봇수술", "내시경"], lower=True)
+
+    def test_subsets_share_hits(self):
+        davinci = self.vocabulary.subset(["다빈치", "Da Vinci"])
+        endoscopic = self.vocabulary.subset(["내시경"])
+        features = _features("DA VINCI 로봇수술")
+
+        assert davinci.first_in(features) == "da vinci"
+        assert not endoscopic.any_in(features)
+        assert features.hits(self.vocabulary) == {"da vinci", "로봇수술"}
+        assert features.hits(self.vocabulary) is features.hits(self.vocabulary)  # 어휘당 1회
+
+    def test_subset_outside_vocabulary(self):
+        with pytest.raises(ValueError, match="method"):
+            self.vocabulary.subset(["robot"])
+
+    def test_doc_type_priority(self):
+        policy = EvidenceFeatures(MockEvidence(1, "약관", 0, "x"))
+        summary = EvidenceFeatures(MockEvidence(2, "상품요약서", 7, "x"))
+
+        assert (policy.policy_priority, policy.compare_priority) == (4, 0)
+        assert (summary.policy_priority, summary.compare_priority) == (2, 3)
+        assert policy.page_order == float("inf")  # page_start 없음 → 마지막
+        assert summary.page_order == 7
+
+
+def _features(preview):
+    return EvidenceFeatures(MockEvidence(1, "약관", 1, preview))
+
+
+def _extract_first(evidence_list, insurer_code):
+    return evidence_list[0] if evidence_list else None
+
+
+def _extract_subtype(evidence_list, insurer_code, subtype, query="", features=None):
+    return (subtype, query, features)
+
+
+FUNCTIONS = {"_extract_first": _extract_first, "_extract_subtype": _extract_subtype}
+
+
+class TestCompileSlotRules:
+    """STEP 4.19: 정의 → 규칙 컴파일"""
+
+    def test_compile(self):
+        rules = compile_slot_rules(
+            {
+                "version": 0.6,
+                "coverage_types": {
+                    "cancer": {
+                        "slots": [
+                            {
+                                "slot_key": "lump_sum",
+                                "response_slot_key": "payout_amount",
+                                "label": "금액",
+                                "comparable": True,
+                                "function": "_extract_first",
+                            },
+                            {
+                                "slot_key": "subtype_in_situ_covered",
+                                "label": "제자리암",
+                                "extractor": "subtype",
+                                "evidence": "all",
+                                "query_trigger": ["제자리암", "유사암"],
+                                "params": {"subtype": "in_situ"},
+                            },
+                            {"slot_key": "daily", "label": "일당", "extractor": "stub"},
+                        ]
+                    }
+                },
+                "extractors": {
+                    "subtype": {"function": "_extract_subtype"},
+                    "stub": {"type": "stub"},
+                },
+            },
+            FUNCTIONS,
+        )
+
+        assert rules.version == "0.6"
+        lump_sum, subtype = rules.for_coverage_type("cancer")  # stub 제외
+        assert lump_sum.slot_key == "payout_amount"
+        assert lump_sum.comparable
+        assert not lump_sum.pass_query and not lump_sum.pass_features
+        assert subtype.evidence == "all"
+        assert subtype.pass_query and subtype.pass_features
+        assert rules.query_triggers == ("유사암", "제자리암")
+        assert rules.for_coverage_type("surgery") == ()
+
+        features = EvidenceFeatureCache()
+        assert subtype.extract([], "SAMSUNG", "제자리암 보장?", features) == ("in_situ", "제자리암 보장?", features)
+
+    def test_trigger(self):
+        rules = compile_slot_rules(
+            {"coverage_types": {"cancer": {"slots": [
+                {"slot_key": "a", "label": "A", "function": "_extract_first"},
+                {"slot_key": "b", "label": "B", "function": "_extract_first", "query_trigger": ["다빈치"]},
+            ]}}},
+            FUNCTIONS,
+        )
+        always, triggered = rules.for_coverage_type("cancer")
+
+        assert always.is_triggered("")
+        assert not triggered.is_triggered("암진단비 비교")
+        assert triggered.is_triggered("다빈치 수술비 비교")
+
+    def test_unknown_function(self):
+        with pytest.raises(ValueError, match="_missing"):
+            compile_slot_rules(
+                {"coverage_types": {"cancer": {"slots": [
+                    {"slot_key": "a", "label": "A", "function": "_missing"},
+                ]}}},
+                FUNCTIONS,
+            )
+
+    def test_unknown_evidence(self):
+        with pytest.raises(ValueError, match="evidence"):
+            compile_slot_rules(
+                {"coverage_types": {"cancer": {"slots": [
+                    {"slot_key": "a", "label": "A", "function": "_extract_first", "evidence": "약관"},
+                ]}}},
+                FUNCTIONS,
+            )
+
+
+class TestSlotDefinitions:
+    """STEP 4.19: slot_definitions.yaml = 코드 내 fallback 정의"""
+
+    def test_yaml_matches_fallback(self):
+        fallback = compile_slot_rules(
+            {
+                "coverage_types": {
+                    coverage_type: {"slots": slots}
+                    for coverage_type, slots in SLOT_DEFINITIONS_BY_COVERAGE_TYPE.items()
+                }
+            },
+            slot_extractor._slot_functions(),
+        )
+
+        compiled = _rule_signature(get_slot_rules())
+
+        assert load_slot_definitions_from_yaml() is not None
+        # hospitalization_daily는 YAML에만 정의 (existence_status 외 stub)
+        assert {ct: compiled[ct] for ct in SLOT_DEFINITIONS_BY_COVERAGE_TYPE} == _rule_signature(fallback)
+
+    def test_fallback_without_yaml(self, monkeypatch):
+        monkeypatch.setattr(slot_extractor, "load_slot_definitions_from_yaml", lambda *args: None)
+
+        rules = get_slot_rules()
+        assert rules.version is None
+        assert set(rules.coverage_types) == set(SLOT_DEFINITIONS_BY_COVERAGE_TYPE)
+
+    def test_query_triggers(self):
+        expected = set(
+            SUBTYPE_QUERY_KEYWORDS
+            + SURGERY_METHOD_QUERY_KEYWORDS
+            + HOSPITAL_TIER_QUERY_KEYWORDS
+            + MINOR_EXCLUSION_QUERY_KEYWORDS
+            + SURGERY_GRADE_QUERY_KEYWORDS
+        )
+
+        assert get_slot_rules().query_triggers == tuple(sorted(expected))
+        assert get_slot_query_conditions("삼성 다빈치 수술비, 상급종합병원") == ("다빈치", "상급종합", "종합병원")
+
+    def test_compiled_once(self):
+        assert get_slot_rules() is get_slot_rules()
+
+        first = get_slot_rules()
+        clear_slot_rules()
+        assert get_slot_rules() is not first
+
+
+def _axis(insurer_code, *evidence):
+    return [MockAxisItem(insurer_code=insurer_code, evidence=list(evidence))]
+
+
+class TestExtractSlots:
+    """STEP 4.19: 컴파일된 규칙으로 슬롯 추출"""
+
+    compare_axis = _axis(
+        "SAMSUNG",
+        MockEvidence(1, "가입설계서", 3, "암진단비(유사암제외) 3,000만원 최초 1회한 지급", 11),
+    )
+    policy_axis = _axis(
+        "SAMSUNG",
+        MockEvidence(2, "약관", 20, "제자리암은 암의 정의에서 제외하며 유사암진단비로 지급합니다. 90일 면책", 21),
+    )
+
+    def test_slot_order_follows_rules(self):
+        slots = extract_slots(["SAMSUNG"], self.compare_axis, self.policy_axis, ["A4200_1"], query="암진단비")
+
+        expected = [r.slot_key for r in get_slot_rules().for_coverage_type("cancer_diagnosis") if not r.query_trigger]
+        assert [s.slot_key for s in slots] == expected
+        assert slots[0].slot_key == "payout_amount"
+        assert slots[0].insurers[0].value == "3,000만원"
+
+    def test_query_trigger_adds_slots(self):
+        slots = extract_slots(["SAMSUNG"], self.compare_axis, self.policy_axis, ["A4200_1"], query="제자리암 보장")
+        by_key = {s.slot_key: s for s in slots}
+
+        assert "subtype_in_situ_covered" in by_key
+        assert "surgery_method" not in by_key
+        # evidence: all → 약관 evidence도 사용
+        assert by_key["subtype_in_situ_covered"].insurers[0].evidence_refs[0].document_id == 2
+
+    def test_slot_timings(self):
+        timings = {}
+        slots = extract_slots(
+            ["SAMSUNG"], self.compare_axis, self.policy_axis, ["A4200_1"], query="암진단비", slot_timings=timings,
+        )
+
+        assert list(timings) == [s.slot_key for s in slots]
+        assert all(ms >= 0 for ms in timings.values())
+
+    def test_unknown_coverage_type(self):
+        assert extract_slots(["SAMSUNG"], self.compare_axis, self.policy_axis, ["Z9999"]) == []
@@ -0,0 +1,123 @@
+"""
+STEP 4.12: 시작 warmup + /ready 테스트
+
+- 대표 질의 로드 (config YAML / eval goldset CSV)
+- 단계 실패가 있어도 warmup은 끝나고 ready
+- /ready: warmup 완료 전 503, 완료 후 200
+"""
+
+import asyncio
+from unittest.mock import MagicMock
+
+import pytest
+
+from api import config_loader, warmup
+from api.warmup import WarmupState, load_warmup_queries, prewarm_relations, run_warmup
+
+
+@pytest.fixture
+def no_database(monkeypatch):
+    """DB를 쓰는 단계는 고정값으로"""
+    monkeypatch.setattr(warmup, "_warm_database", lambda: {"read_candidates": 1})
+    monkeypatch.setattr(warmup, "_replay", lambda: {"count": 0, "failed": 0, "max_ms": 0.0})
+
+
+class TestWarmupQueries:
+    """STEP 4.12: 대표 질의"""
+
+    def test_config_queries(self):
+        queries = config_loader.get_warmup_queries()
+
+        assert queries
+        assert all(q["query"] and q["insurers"] for q in queries)
+
+    def test_goldset_csv_grouped_by_query(self, tmp_path):
+        goldset = tmp_path / "goldset.csv"
+        goldset.write_text(
+            "query,insurer,coverage_code,slot_key,expected_value,expected_doc_type\n"
+            "암진단비,SAMSUNG,A4200_1,existence_status,있음,\n"
+            "암진단비,MERITZ,A4200_1,existence_status,있음,\n"
+            "수술비,SAMSUNG,A5100,existence_status,있음,\n",
+            encoding="utf-8",
+        )
+
+        assert load_warmup_queries(goldset) == [
+            {"query": "암진단비", "insurers": ["SAMSUNG", "MERITZ"]},
+            {"query": "수술비", "insurers": ["SAMSUNG"]},
+        ]
+
+    def test_slot_goldset_insurers_column(self, tmp_path):
+        goldset = tmp_path / "goldset.csv"
+        goldset.write_text(
+            'case_id,query,insurers,coverage_codes\nu1,삼성 암진단비,"SAMSUNG,MERITZ",A4200_1\n',
+            encoding="utf-8",
+        )
+
+        assert load_warmup_queries(goldset) == [
+            {"query": "삼성 암진단비", "insurers": ["SAMSUNG", "MERITZ"]},
+        ]
+
+
+class TestRunWarmup:
+    """STEP 4.12: warmup 단계 실행"""
+
+    def test_all_steps(self, no_database, monkeypatch):
+        monkeypatch.setenv("WARMUP_PG_PREWARM", "1")
+        monkeypatch.setattr(warmup, "_pg_prewarm", lambda: {"blocks": {}})
+
+        state = run_warmup(WarmupState())
+
+        assert state.ready
+        assert [s.name for s in state.steps] == ["config", "slot_rules", "imports", "database", "pg_prewarm", "queries"]
+        assert all(s.ok for s in state.steps)
+
+    def test_failed_step_does_not_block_ready(self, no_database, monkeypatch):
+        def broken():
+            raise RuntimeError("connection refused")
+
+        monkeypatch.setattr(warmup, "_warm_database", broken)
+
+        state = run_warmup(WarmupState())
+
+        assert state.ready
+        database = next(s for s in state.steps if s.name == "database")
+        assert not database.ok
+        assert database.detail == "connection refused"
+
+    def test_disabled(self, monkeypatch):
+        monkeypatch.setenv("WARMUP_ENABLED", "0")
+
+        state = run_warmup(WarmupState())
+
+        assert state.ready
+        assert state.steps == []
+
+
+class TestReadyEndpoint:
+    """STEP 4.12: /ready"""
+
+    def test_not_ready_until_warmup(self, no_database, monkeypatch):
+        from api.main import readiness_check
+
+        state = WarmupState()
+        monkeypatch.setattr(warmup, "_state", state)
+
+        assert asyncio.run(readiness_check()).status_code == 503
+
+        run_warmup(state)
+        assert asyncio.run(readiness_check()).status_code == 200
+
+
+class TestPgPrewarm:
+    """STEP 4.12: pg_prewarm 대상"""
+
+    def test_chunk_indexes_by_default(self):
+        cursor = MagicMock()
+        cursor.fetchall.return_value = [{"relation": "idx_chunk_a"}, {"relation": "idx_chunk_b"}]
+        cursor.fetchone.side_effect = [{"blocks": 10}, {"blocks": 5}]
+        conn = MagicMock()
+        conn.cursor.return_value.__enter__ = MagicMock(return_value=cursor)
+        conn.cursor.return_value.__exit__ = MagicMock(return_value=False)
+
+        assert prewarm_relations(conn) == {"idx_chunk_a": 10, "idx_chunk_b": 5}
+        cursor.execute.assert_called_with("SELECT pg_prewarm(%s::regclass) AS blocks", ("idx_chunk_b",))
@@ -2,10 +2,19 @@
 Step H-1.5: amount/condition 추출 품질 리포트
 
 8개 보험사 전체 chunk에서 추출 성공률/오탐 의심 패턴을 계측
+
+STEP 4.21: 추출은 batch API(프로세스 풀)로 실행 → --all(샘플링 없이 전체 chunk)도
+코어 수만큼 병렬로 처리된다.
+
+Usage:
+    python tools/audit_extraction_quality.py
+    python tools/audit_extraction_quality.py --sample-size 200 --workers 8
+    python tools/audit_extraction_quality.py --all
 """
 
 from __future__ import annotations
 
+import argparse
 import os
 import sys
 from collections import defaultdict
@@ -18,8 +27,9 @@ from psycopg2.extras import RealDictCursor
 # 프로젝트 루트를 path에 추가
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from services.extraction.amount_extractor import extract_amount
-from services.extraction.condition_extractor import extract_condition_snippet
+from services.extraction.amount_extractor import AmountExtract, extract_amount
+from services.extraction.batch_extraction import extract_amount_batch, extract_condition_batch
+from services.extraction.condition_extractor import ConditionExtract, extract_condition_snippet
 
 
 def get_db_url() -> str:
@@ -90,11 +100,11 @@ def get_db_connection():
     return psycopg2.connect(get_db_url())
 
 
-def fetch_samples(conn, insurer_code: str, doc_type: str, limit: int = SAMPLE_SIZE_PER_GROUP) -> list[dict]:
+def fetch_samples(conn, insurer_code: str, doc_type: str, limit: int | None = SAMPLE_SIZE_PER_GROUP) -> list[dict]:
     """
     보험사/doc_type별 샘플 chunk 조회
 
-    coverage_code가 있는 chunk만 대상 (담보 관련 chunk)
+    coverage_code가 있는 chunk만 대상 (담보 관련 chunk), limit=None이면 전체
     """
     query = """
         SELECT
@@ -139,23 +149,30 @@ def check_premium_nearby(preview: str, amount_text: str) -> bool:
     return False
 
 
-def analyze_chunk(chunk: dict, doc_type: str) -> tuple[dict, dict, list[str]]:
+def analyze_chunk(
+    chunk: dict,
+    doc_type: str,
+    amount_result: AmountExtract | None = None,
+    condition_result: ConditionExtract | None = None,
+) -> tuple[dict, dict, list[str]]:
     """
     단일 chunk 분석
 
     Args:
         chunk: chunk 데이터
         doc_type: 문서 유형 (가입설계서/상품요약서/사업방법서)
+        amount_result / condition_result: batch 추출 결과 (없으면 여기서 추출)
 
     Returns:
         (amount_result, condition_result, flag_reasons)
     """
     content = chunk["content"] or ""
-    preview = content[:200]  # 미리보기용
 
     # 추출 실행 (doc_type 전달)
-    amount_result = extract_amount(content, doc_type=doc_type)
-    condition_result = extract_condition_snippet(content)
+    if amount_result is None:
+        amount_result = extract_amount(content, doc_type=doc_type)
+    if condition_result is None:
+        condition_result = extract_condition_snippet(content)
 
     # 오탐 의심 플래그
     flag_reasons = []
@@ -190,9 +207,12 @@ def analyze_chunk(chunk: dict, doc_type: str) -> tuple[dict, dict, list[str]]:
     )
 
 
-def run_audit(sample_size: int = SAMPLE_SIZE_PER_GROUP) -> dict[str, GroupStats]:
+def run_audit(sample_size: int | None = SAMPLE_SIZE_PER_GROUP, workers: int | None = None) -> dict[str, GroupStats]:
     """
     전체 보험사/doc_type에 대해 audit 실행
+
+    STEP 4.21: 샘플 조회 후 전체 chunk를 batch API로 한 번에 추출
+    (sample_size=None이면 샘플링 없이 전체 chunk)
     """
     conn = get_db_connection()
 
@@ -201,54 +221,70 @@ def run_audit(sample_size: int = SAMPLE_SIZE_PER_GROUP) -> dict[str, GroupStats]
         cur.execute("SELECT insurer_code FROM insurer ORDER BY insurer_code")
         insurers = [row["insurer_code"] for row in cur.fetchall()]
 
+    samples_by_group: dict[tuple[str, str], list[dict]] = {
+        (insurer_code, doc_type): fetch_samples(conn, insurer_code, doc_type, sample_size)
+        for insurer_code in insurers
+        for doc_type in TARGET_DOC_TYPES
+    }
+    conn.close()
+
+    items = [
+        (chunk["chunk_id"], chunk["content"] or "", doc_type)
+        for (_, doc_type), samples in samples_by_group.items()
+        for chunk in samples
+    ]
+    amounts = dict(extract_amount_batch(items, workers=workers))
+    conditions = dict(extract_condition_batch(items, workers=workers))
+
     results: dict[str, GroupStats] = {}
 
-    for insurer_code in insurers:
-        for doc_type in TARGET_DOC_TYPES:
-            key = f"{insurer_code}|{doc_type}"
-            stats = GroupStats(insurer_code=insurer_code, doc_type=doc_type)
-
-            # 샘플 조회
-            samples = fetch_samples(conn, insurer_code, doc_type, sample_size)
-            stats.total_samples = len(samples)
-
-            if not samples:
-                results[key] = stats
-                continue
-
-            # 각 샘플 분석
-            for chunk in samples:
-                amount_info, condition_info, flags = analyze_chunk(chunk, doc_type)
-
-                # 성공 카운트
-                if amount_info["amount_value"] is not None:
-                    stats.amount_extracted += 1
-
-                if condition_info["snippet"] is not None:
-                    stats.condition_extracted += 1
-
-                # 플래그 카운트
-                if flags:
-                    stats.flagged_count += 1
-                    stats.flagged_samples.append(FlaggedSample(
-                        insurer_code=insurer_code,
-                        doc_type=doc_type,
-                        chunk_id=chunk["chunk_id"],
-                        preview=chunk["content"][:150] if chunk["content"] else "",
-                        amount_text=amount_info["amount_text"],
-                        amount_value=amount_info["amount_value"],
-                        unit=amount_info["unit"],
-                        confidence=amount_info["confidence"],
-                        flag_reason=", ".join(flags),
-                    ))
+    for (insurer_code, doc_type), samples in samples_by_group.items():
+        key = f"{insurer_code}|{doc_type}"
+        stats = GroupStats(insurer_code=insurer_code, doc_type=doc_type)
+        stats.total_samples = len(samples)
 
+        if not samples:
             results[key] = stats
+            continue
+
+        # 각 샘플 분석
+        for chunk in samples:
+            amount_info, condition_info, flags = analyze_chunk(
+                chunk, doc_type, amounts[chunk["chunk_id"]], conditions[chunk["chunk_id"]],
+            )
+
+            # 성공 카운트
+            if amount_info["amount_value"] is not None:
+                stats.amount_extracted += 1
+
+            if condition_info["snippet"] is not None:
+                stats.condition_extracted += 1
+
+            # 플래그 카운트
+            if flags:
+                stats.flagged_count += 1
+                stats.flagged_samples.append(FlaggedSample(
+                    insurer_code=insurer_code,
+                    doc_type=doc_type,
+                    chunk_id=chunk["chunk_id"],
+                    preview=chunk["content"][:150] if chunk["content"] else "",
+                    amount_text=amount_info["amount_text"],
+                    amount_value=amount_info["amount_value"],
+                    unit=amount_info["unit"],
+                    confidence=amount_info["confidence"],
+                    flag_reason=", ".join(flags),
+                ))
+
+        results[key] = stats
 
-    conn.close()
     return results
 
 
-def generate_report(results: dict[str, GroupStats], output_path: str):
+def generate_report(
+    results: dict[str, GroupStats],
+    output_path: str,
+    sample_size: int | None = SAMPLE_SIZE_PER_GROUP,
+):
     """
     Markdown 리포트 생성
     """
@@ -265,7 +301,7 @@ def generate_report(results: dict[str, GroupStats], output_path: str):
         "",
         "compare_axis 대상 doc_type(가입설계서/상품요약서/사업방법서)에서 amount/condition 추출 성공률 계측.",
         "",
-        f"- 샘플 수: 보험사×doc_type별 최대 {SAMPLE_SIZE_PER_GROUP}개",
+        f"- 샘플 수: 보험사×doc_type별 최대 {sample_size}개" if sample_size else "- 샘플 수: 전체 chunk",
         "- 대상: coverage_code가 태깅된 chunk만 (담보 관련)",
         "",
         "---",
@@ -416,20 +452,27 @@ def generate_report(results: dict[str, GroupStats], output_path: str):
 
 def main():
     """메인 함수"""
+    parser = argparse.ArgumentParser(description="amount/condition 추출 품질 리포트")
+    parser.add_argument("--sample-size", type=int, default=SAMPLE_SIZE_PER_GROUP, help="보험사×doc_type별 샘플 수")
+    parser.add_argument("--all", action="store_true", help="샘플링 없이 전체 chunk")
+    parser.add_argument("--workers", type=int, default=None, help="추출 프로세스 수 (기본: EXTRACTION_BATCH_WORKERS)")
+    args = parser.parse_args()
+    sample_size = None if args.all else args.sample_size
+
     print("Starting extraction quality audit...")
-    print(f"Sample size per group: {SAMPLE_SIZE_PER_GROUP}")
+    print(f"Sample size per group: {sample_size or 'all'}")
     print(f"Target doc_types: {TARGET_DOC_TYPES}")
     print()
 
     # Audit 실행
-    results = run_audit()
+    results = run_audit(sample_size, workers=args.workers)
 
     # 리포트 생성
     output_path = os.path.join(
         os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
         "artifacts/audit/extraction_quality_report.md"
     )
-    generate_report(results, output_path)
+    generate_report(results, output_path, sample_size)
 
     # 콘솔 요약
     print("\n=== Summary ===")
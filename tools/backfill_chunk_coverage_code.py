@@ -24,6 +24,11 @@ from dataclasses import dataclass, field
 import psycopg
 from psycopg.rows import dict_row
 
+# 프로젝트 루트를 path에 추가
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from services.retrieval.corpus_version import bump_corpus_version
+
 
 def get_db_url() -> str:
     return os.environ.get(
@@ -182,6 +187,7 @@ def backfill_chunks(
                         conn.rollback()
 
         if not dry_run:
+            bump_corpus_version(conn, "backfill_chunk_coverage_code")
             print(f"Backfill completed.")
 
     finally:
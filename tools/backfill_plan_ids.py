@@ -32,6 +32,7 @@ from services.ingestion.plan_detector import (
     find_matching_plan_id,
 )
 from services.ingestion.utils import find_manifest_for_pdf
+from services.retrieval.corpus_version import bump_corpus_version
 
 
 def get_db_url() -> str:
@@ -294,6 +295,8 @@ def backfill_plan_ids(
         print(f"  Errors:     {stats['errors']}")
         if dry_run:
             print("\n  [DRY-RUN MODE - no actual changes made]")
+        elif stats["updated"] > 0:
+            bump_corpus_version(conn, "backfill_plan_ids")
 
         return stats
 
@@ -25,6 +25,7 @@ from psycopg.rows import dict_row
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from services.ingestion.coverage_extractor import CoverageExtractor, reset_extractor
+from services.retrieval.corpus_version import bump_corpus_version
 
 
 def get_db_url() -> str:
@@ -153,6 +154,7 @@ def backfill_terms_coverage(
                         conn.rollback()
 
         if not dry_run:
+            bump_corpus_version(conn, "backfill_terms_for_policy")
             print("Backfill completed.")
 
     finally:
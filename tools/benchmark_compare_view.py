@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""
+STEP 4.14: /compare view별 응답 크기 / 지연 비교
+
+같은 요청을 view=ui / full / debug로 번갈아 호출하여
+응답 바이트 수와 지연(p50 / 최대)을 비교한다.
+검색 비용은 view와 무관하므로 차이는 응답 모델 변환 + 직렬화 + 전송 비용이다.
+
+Usage:
+    python tools/benchmark_compare_view.py
+    python tools/benchmark_compare_view.py --base-url http://localhost:8000 --iterations 20
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import statistics
+import sys
+import time
+
+import requests
+
+VIEWS = ("ui", "full", "debug")
+
+COMPARE_REQUEST = {
+    "insurers": ["SAMSUNG", "MERITZ", "LOTTE", "DB", "KB", "HANWHA", "HYUNDAI", "HEUNGKUK"],
+    "query": "암진단비",
+    "coverage_codes": ["A4200_1"],
+    "top_k_per_insurer": 10,
+}
+
+
+def run_view(base_url: str, view: str) -> tuple[float, int]:
+    start = time.perf_counter()
+    response = requests.post(f"{base_url}/compare", json={**COMPARE_REQUEST, "view": view}, timeout=60)
+    elapsed = (time.perf_counter() - start) * 1000
+    response.raise_for_status()
+    return elapsed, len(response.content)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="/compare view별 응답 크기 / 지연 비교")
+    parser.add_argument("--base-url", default="http://localhost:8000")
+    parser.add_argument("--iterations", type=int, default=10)
+    parser.add_argument("--json", action="store_true", help="JSON 출력")
+    args = parser.parse_args()
+
+    # 첫 요청(캐시 / 연결 warmup)은 제외
+    for view in VIEWS:
+        run_view(args.base_url, view)
+
+    samples: dict[str, list[float]] = {view: [] for view in VIEWS}
+    sizes: dict[str, int] = {}
+    for _ in range(args.iterations):
+        for view in VIEWS:
+            elapsed, size = run_view(args.base_url, view)
+            samples[view].append(elapsed)
+            sizes[view] = size
+
+    results = [
+        {
+            "view": view,
+            "bytes": sizes[view],
+            "p50_ms": round(statistics.median(samples[view]), 1),
+            "max_ms": round(max(samples[view]), 1),
+        }
+        for view in VIEWS
+    ]
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return 0
+
+    print("")
+    print("=" * 52)
+    print(f"/compare view benchmark ({len(COMPARE_REQUEST['insurers'])} insurers, {args.iterations} iterations)")
+    print("=" * 52)
+    print(f"  {'view':<6} {'bytes':>10} {'p50 ms':>8} {'max ms':>8}")
+    for r in results:
+        print(f"  {r['view']:<6} {r['bytes']:>10,} {r['p50_ms']:>8.1f} {r['max_ms']:>8.1f}")
+    print("=" * 52)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
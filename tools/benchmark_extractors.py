@@ -0,0 +1,144 @@
+#!/usr/bin/env python3
+"""
+STEP 4.23: rule extractor 마이크로 벤치마크 회귀 가드
+
+tests/fixtures/extraction_bench_corpus.yaml의 고정 chunk 샘플로 extract_amount
+(strict / default), extract_diagnosis_lump_sum, extract_surgery_amount,
+extract_condition_snippet, mask_pii (chunk / LLM 입력 한도 길이), extract_slots,
+CoverageExtractor.extract의 ops/sec / p99를 측정하고
+artifacts/bench/extraction_baseline.json과 비교한다.
+baseline 대비 허용 배수를 넘게 느려지면 exit 1.
+
+DB 없이 실행된다 (CoverageExtractor는 ontology 매칭만 사용).
+시간 baseline은 머신에 종속되므로 같은 머신에서 --update-baseline으로 저장한 값과 비교한다.
+
+Usage:
+    python tools/benchmark_extractors.py
+    python tools/benchmark_extractors.py --update-baseline
+    python tools/benchmark_extractors.py --max-slowdown 1.2 --case extract_slots --json
+    EXTRACTION_BENCH_MAX_SLOWDOWN=2.0 python tools/benchmark_extractors.py
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import platform
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from services.extraction.extraction_bench import (
+    DEFAULT_CORPUS_PATH,
+    DEFAULT_THRESHOLDS,
+    check_bench,
+    get_extraction_bench_max_slowdown,
+    load_bench_corpus,
+    run_bench,
+)
+
+
+PROJECT_ROOT = Path(__file__).parent.parent
+DEFAULT_BASELINE_PATH = PROJECT_ROOT / "artifacts" / "bench" / "extraction_baseline.json"
+
+
+def load_baseline(path: Path) -> dict:
+    if not path.exists():
+        return {}
+    with open(path, encoding="utf-8") as f:
+        return json.load(f).get("cases", {})
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="rule extractor 마이크로 벤치마크 회귀 가드")
+    parser.add_argument("--corpus", type=str, default=str(DEFAULT_CORPUS_PATH), help="고정 corpus 샘플 YAML")
+    parser.add_argument("--baseline", type=str, default=str(DEFAULT_BASELINE_PATH))
+    parser.add_argument(
+        "--case",
+        action="append",
+        default=None,
+        help="실행할 케이스 이름 (반복 지정 가능, 생략하면 전체)",
+    )
+    parser.add_argument("--rounds", type=int, default=100, help="corpus 반복 횟수 (warm-up 1회 별도)")
+    parser.add_argument(
+        "--max-slowdown",
+        type=float,
+        default=None,
+        help="허용 ops/sec 하락 배수 (기본: EXTRACTION_BENCH_MAX_SLOWDOWN 또는 1.5)",
+    )
+    parser.add_argument(
+        "--max-p99-ratio",
+        type=float,
+        default=DEFAULT_THRESHOLDS["max_p99_ratio"],
+        help="허용 p99 증가 배수",
+    )
+    parser.add_argument(
+        "--update-baseline",
+        action="store_true",
+        help="baseline 비교 없이 현재 측정값을 baseline으로 저장",
+    )
+    parser.add_argument("--json", action="store_true", help="JSON 출력")
+    args = parser.parse_args()
+
+    corpus = load_bench_corpus(args.corpus)
+    baseline = {} if args.update_baseline else load_baseline(Path(args.baseline))
+    thresholds = {
+        "max_slowdown": args.max_slowdown or get_extraction_bench_max_slowdown(),
+        "max_p99_ratio": args.max_p99_ratio,
+    }
+
+    results: dict[str, dict] = {}
+    failed = 0
+    for result in run_bench(corpus, rounds=args.rounds, names=args.case):
+        violations = check_bench(result, baseline.get(result.name), thresholds)
+        results[result.name] = {**result.to_dict(), "violations": violations}
+        if violations:
+            failed += 1
+
+    if args.json:
+        print(json.dumps(results, ensure_ascii=False, indent=2))
+    else:
+        print("")
+        print("=" * 78)
+        print(
+            f"Extractor Benchmark ({len(corpus.chunks)} chunks, {len(corpus.requests)} slot queries, "
+            f"{args.rounds} rounds, max slowdown {thresholds['max_slowdown']}x)"
+        )
+        print("=" * 78)
+        print(f"  {'case':<30} {'ops/sec':>10} {'p50 us':>9} {'p99 us':>9} {'base ops/sec':>13}")
+        for name, r in results.items():
+            status = "FAIL" if r["violations"] else "OK"
+            base_ops = (baseline.get(name) or {}).get("ops_per_sec")
+            base_text = f"{base_ops:.1f}" if base_ops else "-"
+            print(
+                f"  {name:<30} {r['ops_per_sec']:>10.1f} {r['p50_us']:>9.2f} {r['p99_us']:>9.2f} "
+                f"{base_text:>13} [{status}]"
+            )
+            for v in r["violations"]:
+                print(f"      - {v}")
+        print("=" * 78)
+
+    if args.update_baseline:
+        baseline_path = Path(args.baseline)
+        baseline_path.parent.mkdir(parents=True, exist_ok=True)
+        payload = {
+            "python": platform.python_version(),
+            "machine": platform.machine(),
+            "corpus_chunks": len(corpus.chunks),
+            "rounds": args.rounds,
+            "cases": {
+                name: {k: v for k, v in r.items() if k not in ("name", "violations")}
+                for name, r in results.items()
+            },
+        }
+        with open(baseline_path, "w", encoding="utf-8") as f:
+            json.dump(payload, f, ensure_ascii=False, indent=2)
+            f.write("\n")
+        print(f"[baseline] saved: {baseline_path}")
+
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,205 @@
+#!/usr/bin/env python3
+"""
+STEP 4.11: pre-fork 서버 vs uvicorn --workers 비교 (메모리 / 첫 요청 지연)
+
+두 방식으로 API를 차례로 띄워서 측정한다.
+- uvicorn:  uvicorn api.main:app --workers N (워커마다 import / 캐시 빌드)
+- prefork:  python -m api.server --workers N (부모에서 preload 후 fork)
+
+측정 항목:
+- ready_ms: 프로세스 시작 → /health 200
+- first: 준비 직후 /compare 순차 요청 (워커 수 × 2, 요청마다 새 연결이라 여러 워커에 분산)
+  첫 요청 / 최대 지연 - 아직 warmup 중이거나 캐시가 빈 워커가 있으면 여기서 보인다
+- steady p50: 이후 순차 요청 지연
+- 워커 메모리 (/proc/<pid>/smaps_rollup): RSS, PSS(공유 페이지를 나눠 계산), USS(고유)
+  copy-on-write 공유 효과는 RSS가 아니라 PSS / USS 합계에서 보인다
+
+Usage:
+    python tools/benchmark_prefork.py --workers 4
+    python tools/benchmark_prefork.py --workers 4 --modes prefork --requests 20
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+import requests
+
+ROOT = Path(__file__).parent.parent
+
+COMPARE_REQUEST = {
+    "insurers": ["SAMSUNG", "MERITZ", "LOTTE", "DB"],
+    "query": "암진단비",
+}
+
+
+def server_command(mode: str, port: int, workers: int) -> list[str]:
+    if mode == "uvicorn":
+        return [
+            sys.executable, "-m", "uvicorn", "api.main:app",
+            "--host", "127.0.0.1", "--port", str(port),
+            "--workers", str(workers), "--log-level", "warning",
+        ]
+    return [
+        sys.executable, "-m", "api.server",
+        "--host", "127.0.0.1", "--port", str(port),
+        "--workers", str(workers), "--log-level", "warning",
+    ]
+
+
+def child_pids(pid: int) -> list[int]:
+    """pid의 하위 프로세스 (재귀)"""
+    children: dict[int, list[int]] = {}
+    for entry in Path("/proc").iterdir():
+        if not entry.name.isdigit():
+            continue
+        try:
+            stat = (entry / "stat").read_text()
+        except OSError:
+            continue
+        ppid = int(stat.rsplit(")", 1)[1].split()[1])
+        children.setdefault(ppid, []).append(int(entry.name))
+
+    result: list[int] = []
+    stack = [pid]
+    while stack:
+        for child in children.get(stack.pop(), []):
+            result.append(child)
+            stack.append(child)
+    return result
+
+
+def memory_kb(pid: int) -> dict[str, int]:
+    """smaps_rollup 기준 RSS / PSS / USS (kB)"""
+    values: dict[str, int] = {}
+    for line in Path(f"/proc/{pid}/smaps_rollup").read_text().splitlines()[1:]:
+        key, _, rest = line.partition(":")
+        values[key] = int(rest.split()[0])
+    return {
+        "rss": values.get("Rss", 0),
+        "pss": values.get("Pss", 0),
+        "uss": values.get("Private_Clean", 0) + values.get("Private_Dirty", 0),
+    }
+
+
+def post_compare(base_url: str) -> float:
+    start = time.perf_counter()
+    response = requests.post(f"{base_url}/compare", json=COMPARE_REQUEST, timeout=60)
+    elapsed = (time.perf_counter() - start) * 1000
+    response.raise_for_status()
+    return elapsed
+
+
+def run_mode(mode: str, port: int, workers: int, n_requests: int) -> dict:
+    base_url = f"http://127.0.0.1:{port}"
+    started = time.perf_counter()
+    proc = subprocess.Popen(
+        server_command(mode, port, workers),
+        cwd=ROOT,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+
+    try:
+        while True:
+            if proc.poll() is not None:
+                raise RuntimeError(f"{mode} server exited with {proc.returncode}")
+            try:
+                if requests.get(f"{base_url}/health", timeout=1).status_code == 200:
+                    break
+            except requests.ConnectionError:
+                pass
+            if time.perf_counter() - started > 120:
+                raise RuntimeError(f"{mode} server not ready in 120s")
+            time.sleep(0.05)
+        ready_ms = (time.perf_counter() - started) * 1000
+
+        first = [post_compare(base_url) for _ in range(workers * 2)]
+        steady = [post_compare(base_url) for _ in range(n_requests)]
+
+        # 워커 프로세스만 (uvicorn은 spawn 워커 외 helper 프로세스가 있을 수 있음)
+        pids = [pid for pid in child_pids(proc.pid) if memory_kb(pid)["rss"] > 20_000]
+        worker_memory = [memory_kb(pid) for pid in pids]
+        parent_memory = memory_kb(proc.pid)
+    finally:
+        proc.terminate()
+        try:
+            proc.wait(timeout=15)
+        except subprocess.TimeoutExpired:
+            proc.kill()
+
+    return {
+        "mode": mode,
+        "workers": len(worker_memory),
+        "ready_ms": round(ready_ms, 1),
+        "first_ms": {
+            "first": round(first[0], 1),
+            "max": round(max(first), 1),
+        },
+        "steady_p50_ms": round(statistics.median(steady), 1),
+        "worker_kb": {
+            key: sum(m[key] for m in worker_memory) for key in ("rss", "pss", "uss")
+        },
+        "parent_kb": parent_memory,
+    }
+
+
+def print_report(results: list[dict]) -> None:
+    print("")
+    print("=" * 72)
+    print("Pre-fork benchmark")
+    print("=" * 72)
+    print(
+        f"  {'mode':<8} {'workers':>7} {'ready':>8} {'first':>8} {'1st max':>8} {'steady':>7}"
+        f" {'RSS MB':>8} {'PSS MB':>8} {'USS MB':>8}"
+    )
+    for r in results:
+        mem = r["worker_kb"]
+        print(
+            f"  {r['mode']:<8} {r['workers']:>7} {r['ready_ms']:>8.0f} "
+            f"{r['first_ms']['first']:>8.1f} {r['first_ms']['max']:>8.1f} "
+            f"{r['steady_p50_ms']:>7.1f} {mem['rss'] / 1024:>8.1f} "
+            f"{mem['pss'] / 1024:>8.1f} {mem['uss'] / 1024:>8.1f}"
+        )
+    print("  (ms; 메모리는 워커 합계, 부모 프로세스 제외)")
+    print("=" * 72)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="pre-fork vs uvicorn --workers 벤치마크")
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--requests", type=int, default=10, help="steady 구간 순차 요청 수")
+    parser.add_argument(
+        "--modes",
+        nargs="+",
+        choices=["uvicorn", "prefork"],
+        default=["uvicorn", "prefork"],
+    )
+    parser.add_argument("--json", action="store_true", help="JSON 출력")
+    args = parser.parse_args()
+
+    if not Path("/proc/self/smaps_rollup").exists():
+        print("[ERROR] /proc/<pid>/smaps_rollup not available (Linux 4.14+ required)")
+        return 1
+
+    results = [
+        run_mode(mode, args.port + i, args.workers, args.requests)
+        for i, mode in enumerate(args.modes)
+    ]
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+    else:
+        print_report(results)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
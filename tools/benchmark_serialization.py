@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+"""
+STEP 4.15: /compare 응답 직렬화 벤치마크 (응답 크기별)
+
+보험사 수 / top_k를 바꿔 가며 실제 compare 결과 payload를 만든 뒤
+직렬화 비용만 비교한다 (검색 비용 제외).
+
+- model:   payload → CompareResponseModel → FastAPI response_model 검증/직렬화 → JSON
+           (fast path 이전 경로와 같은 단계)
+- orjson:  payload → orjson (api/serialization.py)
+- msgpack: payload → MessagePack (msgpack 설치 시)
+
+Usage:
+    DATABASE_URL=postgresql://... python tools/benchmark_serialization.py
+    python tools/benchmark_serialization.py --iterations 50 --json
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import statistics
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from fastapi.responses import JSONResponse
+from fastapi.routing import serialize_response
+from fastapi.utils import create_model_field
+
+from api.compare import CompareRequest, CompareResponseModel, build_compare_payload
+from api.serialization import dumps_json, dumps_msgpack, is_msgpack_available
+
+INSURERS = ["SAMSUNG", "MERITZ", "LOTTE", "DB", "KB", "HANWHA", "HYUNDAI", "HEUNGKUK"]
+SIZES = [(1, 10), (2, 10), (4, 10), (8, 10), (8, 30)]
+
+
+def _median_ms(fn, iterations: int) -> float:
+    samples = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    return round(statistics.median(samples), 3)
+
+
+def bench_size(n_insurers: int, top_k: int, iterations: int) -> dict:
+    request = CompareRequest(
+        insurers=INSURERS[:n_insurers],
+        query="암진단비",
+        coverage_codes=["A4200_1"],
+        top_k_per_insurer=top_k,
+    )
+    payload = asyncio.run(build_compare_payload(request))
+    field = create_model_field(name="Response_compare", type_=CompareResponseModel, mode="serialization")
+    loop = asyncio.new_event_loop()
+
+    def model_path() -> bytes:
+        model = CompareResponseModel.model_validate(payload, from_attributes=True)
+        content = loop.run_until_complete(serialize_response(field=field, response_content=model))
+        return JSONResponse(content).body
+
+    result = {
+        "insurers": n_insurers,
+        "top_k": top_k,
+        "bytes": len(dumps_json(payload)),
+        "model_ms": _median_ms(model_path, iterations),
+        "orjson_ms": _median_ms(lambda: dumps_json(payload), iterations),
+        "msgpack_ms": None,
+        "msgpack_bytes": None,
+    }
+    loop.close()
+    if is_msgpack_available():
+        result["msgpack_ms"] = _median_ms(lambda: dumps_msgpack(payload), iterations)
+        result["msgpack_bytes"] = len(dumps_msgpack(payload))
+    return result
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="/compare 응답 직렬화 벤치마크")
+    parser.add_argument("--iterations", type=int, default=30)
+    parser.add_argument("--json", action="store_true", help="JSON 출력")
+    args = parser.parse_args()
+
+    results = [bench_size(n, top_k, args.iterations) for n, top_k in SIZES]
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return 0
+
+    print("")
+    print("=" * 72)
+    print(f"/compare serialization benchmark (median of {args.iterations})")
+    print("=" * 72)
+    print(f"  {'insurers':>8} {'top_k':>5} {'bytes':>10} {'model ms':>9} {'orjson ms':>9} {'speedup':>7} {'msgpack ms':>10}")
+    for r in results:
+        msgpack_ms = f"{r['msgpack_ms']:>10.3f}" if r["msgpack_ms"] is not None else f"{'-':>10}"
+        print(
+            f"  {r['insurers']:>8} {r['top_k']:>5} {r['bytes']:>10,} {r['model_ms']:>9.3f} "
+            f"{r['orjson_ms']:>9.3f} {r['model_ms'] / r['orjson_ms']:>6.1f}x {msgpack_ms}"
+        )
+    print("=" * 72)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
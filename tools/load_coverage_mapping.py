@@ -28,6 +28,7 @@ from psycopg.rows import dict_row
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
 from services.ingestion.normalize import normalize_coverage_name
+from services.retrieval.corpus_version import bump_corpus_version
 
 
 def get_db_url() -> str:
@@ -456,6 +457,7 @@ def load_coverage_mapping(
         create_missing_insurer=create_missing_insurer,
     ) as loader:
         stats = loader.load_from_dataframe(df, dry_run=dry_run)
+        bump_corpus_version(loader.conn, "load_coverage_mapping")
 
     return stats
 
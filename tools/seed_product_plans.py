@@ -15,6 +15,11 @@ import sys
 import psycopg
 from psycopg.rows import dict_row
 
+# 프로젝트 루트를 path에 추가
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from services.retrieval.corpus_version import bump_corpus_version
+
 
 def get_db_url() -> str:
     return os.environ.get(
@@ -129,6 +134,7 @@ def seed_product_plans():
                     print(f"  + Created plan: {plan['plan_name']} (id={plan_id})")
 
             conn.commit()
+            bump_corpus_version(conn, "seed_product_plans")
             print("\n[DONE] Product plans seeded successfully")
 
     except Exception as e: